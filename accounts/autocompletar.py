@@ -0,0 +1,90 @@
+from django import forms
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.urls import reverse_lazy
+
+from core.paginacion import paginar_keyset
+
+
+# --- Autocompletado de Usuarios ---
+#
+# El selector de responsable ya no vuelca toda la tabla de usuarios en un
+# <select>: solo se renderiza la opción seleccionada y el resto se pide por
+# AJAX (Select2) a accounts:autocompletar_usuarios, paginado por cursor.
+
+CAMPOS_USUARIO = ("id", "username", "first_name", "last_name")
+ORDEN_USUARIOS = ("username", "id")
+
+
+def etiqueta_usuario(user) -> str:
+    nombre = user.get_full_name()
+    return f"{nombre} ({user.username})" if nombre else user.username
+
+
+def buscar_usuarios(consulta: str, cursor: str | None = None, tamano: int | None = None):
+    """
+    Busca por prefijo de nombre, apellido o username; cada palabra de la
+    consulta debe coincidir con alguno de ellos ("juan pe" → Juan Pérez).
+
+    Los prefijos (istartswith) aprovechan los índices sin distinción de
+    mayúsculas de accounts/migrations/0001_indices_usuarios.
+    """
+    qs = User.objects.only(*CAMPOS_USUARIO)
+    for palabra in consulta.split()[:3]:
+        qs = qs.filter(
+            Q(username__istartswith=palabra)
+            | Q(first_name__istartswith=palabra)
+            | Q(last_name__istartswith=palabra)
+        )
+    tamano = tamano or getattr(settings, "AUTOCOMPLETAR_PAGINA", 20)
+    return paginar_keyset(qs, ORDEN_USUARIOS, cursor, tamano)
+
+
+class AutocompletarUsuarioSelect(forms.Select):
+    """
+    <select> que solo contiene la opción vacía y la seleccionada (resuelta
+    por clave primaria); las demás se cargan bajo demanda desde `url`.
+    """
+
+    def __init__(self, url=reverse_lazy("accounts:autocompletar_usuarios"), attrs=None):
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context["widget"]["attrs"]["data-autocompletar-url"] = str(self.url)
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        seleccionados = [v for v in value if v not in (None, "")]
+        opciones = []
+        field = getattr(self.choices, "field", None)
+        if field is not None and field.empty_label is not None:
+            opciones.append(("", field.empty_label))
+        if seleccionados and field is not None:
+            for user in field.queryset.filter(pk__in=seleccionados):
+                opciones.append((str(user.pk), field.label_from_instance(user)))
+
+        grupos = []
+        for indice, (valor, etiqueta) in enumerate(opciones):
+            seleccionado = valor in seleccionados or (not seleccionados and valor == "")
+            grupos.append((None, [self.create_option(name, valor, etiqueta, seleccionado, indice, attrs=attrs)], indice))
+        return grupos
+
+
+class UsuarioChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField de usuarios con widget de autocompletado. La
+    validación ya resuelve el id enviado con un único get(pk=...).
+    """
+
+    widget = AutocompletarUsuarioSelect
+
+    def __init__(self, queryset=None, **kwargs):
+        if queryset is None:
+            queryset = User.objects.only(*CAMPOS_USUARIO)
+        super().__init__(queryset, **kwargs)
+
+    def label_from_instance(self, obj):
+        return etiqueta_usuario(obj)
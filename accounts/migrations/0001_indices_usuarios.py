@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+# Índices para la búsqueda por prefijo del autocompletado de usuarios.
+# Django traduce istartswith a:
+#   - SQLite:     col LIKE 'x%'  (sin distinción de mayúsculas → índice COLLATE NOCASE)
+#   - PostgreSQL: UPPER(col) LIKE UPPER('x%')  (→ índice por expresión con pattern_ops)
+CAMPOS = ("username", "first_name", "last_name")
+
+
+def crear_indices(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for campo in CAMPOS:
+        if vendor == "sqlite":
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS auth_user_{campo}_nocase_idx "
+                f"ON auth_user ({campo} COLLATE NOCASE)"
+            )
+        elif vendor == "postgresql":
+            schema_editor.execute(
+                f"CREATE INDEX IF NOT EXISTS auth_user_{campo}_upper_idx "
+                f"ON auth_user (UPPER({campo}) varchar_pattern_ops)"
+            )
+
+
+def eliminar_indices(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for campo in CAMPOS:
+        if vendor == "sqlite":
+            schema_editor.execute(f"DROP INDEX IF EXISTS auth_user_{campo}_nocase_idx")
+        elif vendor == "postgresql":
+            schema_editor.execute(f"DROP INDEX IF EXISTS auth_user_{campo}_upper_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indices, eliminar_indices),
+    ]
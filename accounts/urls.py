@@ -22,6 +22,7 @@ urlpatterns = [
     path("signup/", views.signup, name="signup"),
     path("profile/", views.profile, name="profile"),
     path("profile/edit/", views.profile_edit, name="profile_edit"),
+    path("usuarios/autocompletar/", views.autocompletar_usuarios, name="autocompletar_usuarios"),
 
     # --- Gestión de Seguridad (Cambio de Contraseña) ---
     path(
@@ -4,6 +4,11 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib import messages
 from django import forms
 from django.contrib.auth.models import User
+from django.http import HttpResponseBadRequest, JsonResponse
+
+from core.paginacion import CursorInvalido
+
+from .autocompletar import buscar_usuarios, etiqueta_usuario
 
 # --- Formulario de Edición de Perfil ---
 class UserUpdateForm(forms.ModelForm):
@@ -66,4 +71,22 @@ def profile_edit(request):
     else:
         form = UserUpdateForm(instance=request.user)
 
-    return render(request, "accounts/profile_edit.html", {"form": form})
\ No newline at end of file
+    return render(request, "accounts/profile_edit.html", {"form": form})
+
+
+@user_passes_test(lambda u: u.is_staff)
+def autocompletar_usuarios(request):
+    """
+    Opciones del selector de responsable (formato Select2), paginadas por
+    cursor: ?q=juan&cursor=... → {"results": [...], "siguiente": ...}.
+    """
+    try:
+        pagina = buscar_usuarios(request.GET.get("q", "").strip(), request.GET.get("cursor"))
+    except CursorInvalido:
+        return HttpResponseBadRequest("Cursor inválido.")
+
+    return JsonResponse({
+        "results": [{"id": u.pk, "text": etiqueta_usuario(u)} for u in pagina.items],
+        "siguiente": pagina.siguiente,
+        "pagination": {"more": pagina.hay_mas},
+    })
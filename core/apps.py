@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    """
+    Configuración del proyecto base (core).
+
+    En ready() se conectan los ajustes por conexión de la base de datos
+    (PRAGMAs de SQLite) y los signals de invalidación de caché.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .db import aplicar_pragmas_sqlite
+
+        connection_created.connect(aplicar_pragmas_sqlite, dispatch_uid="core_pragmas_sqlite")
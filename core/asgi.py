@@ -13,4 +13,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Importado después de configurar Django (usa settings y el ORM)
+from core.sse import RUTA_EVENTOS, canal_eventos  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """
+    El canal de eventos (SSE) se atiende aquí, fuera del stack de Django:
+    sus conexiones duran horas. Todo lo demás pasa a Django.
+    """
+    if scope["type"] == "http" and scope["path"] == RUTA_EVENTOS:
+        return await canal_eventos(scope, receive, send)
+    return await django_application(scope, receive, send)
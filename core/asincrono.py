@@ -0,0 +1,50 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+
+from django.contrib.auth.views import redirect_to_login
+from django.utils.functional import empty
+
+
+# --- Helpers para Vistas Asíncronas (ASGI) ---
+#
+# En Django 4.2 request.user es un objeto perezoso síncrono: resolverlo
+# consulta sesión y usuario en la base de datos, lo que no se permite
+# directamente dentro del event loop. Se resuelve una vez en un hilo y,
+# desde ahí, la vista y el template lo usan sin volver a consultar.
+
+
+def usuario_resuelto(request):
+    """El usuario de la request si ya fue cargado; None si sigue pendiente."""
+    user = getattr(request, "user", None)
+    if user is None or getattr(user, "_wrapped", None) is empty:
+        return None
+    return user
+
+
+def _resolver_usuario(request):
+    user = request.user
+    user.is_authenticated  # fuerza la carga del objeto perezoso (y de la sesión)
+    return user
+
+
+async def ausuario(request):
+    """Equivalente asíncrono de `request.user`."""
+    user = usuario_resuelto(request)
+    if user is None:
+        user = await sync_to_async(_resolver_usuario)(request)
+    return user
+
+
+def login_requerido_async(vista):
+    """
+    @login_required para vistas `async def` (el de Django 4.2 solo
+    envuelve vistas síncronas). Redirige a LOGIN_URL con ?next=.
+    """
+    @wraps(vista)
+    async def envoltura(request, *args, **kwargs):
+        user = await ausuario(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await vista(request, *args, **kwargs)
+    return envoltura
@@ -0,0 +1,215 @@
+import hashlib
+import os
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .routers import leer_de_primaria
+
+
+# --- Backend de Caché por Entorno ---
+#
+# CACHE_BACKEND=locmem (por defecto), file o redis; CACHE_LOCATION indica el
+# directorio (file) o la URL (redis, p. ej. redis://127.0.0.1:6379/1).
+
+BACKENDS_CACHE = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+
+
+def configurar_cache(base_dir) -> dict:
+    """Construye CACHES a partir de las variables de entorno."""
+    tipo = os.getenv("CACHE_BACKEND", "locmem").lower()
+    if tipo not in BACKENDS_CACHE:
+        raise ValueError(f"CACHE_BACKEND no soportado: {tipo!r} ({', '.join(BACKENDS_CACHE)})")
+
+    por_defecto = {
+        "locmem": "vehiculos-corporativos",
+        "file": str(base_dir / ".cache"),
+        "redis": "redis://127.0.0.1:6379/1",
+    }
+    return {
+        "default": {
+            "BACKEND": BACKENDS_CACHE[tipo],
+            "LOCATION": os.getenv("CACHE_LOCATION", por_defecto[tipo]),
+            "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "300")),
+            "KEY_PREFIX": os.getenv("CACHE_KEY_PREFIX", "sgv"),
+        }
+    }
+
+
+# --- Generaciones (invalidación O(1)) ---
+#
+# Cada grupo de datos (vehiculos, paginas, usuarios) tiene un contador en
+# caché que forma parte de las claves que dependen de él. Invalidar es
+# incrementar el contador: las entradas anteriores quedan inalcanzables y
+# expiran solas, sin recorrer ni borrar claves.
+
+GENERACIONES = ("vehiculos", "paginas", "usuarios")
+
+
+def _clave_generacion(grupo: str) -> str:
+    return f"gen:{grupo}"
+
+
+def generaciones(*grupos: str) -> dict:
+    """Generación vigente de cada grupo, en una sola lectura de caché."""
+    claves = {_clave_generacion(g): g for g in grupos}
+    encontradas = cache.get_many(list(claves))
+    resultado = {}
+    for clave, grupo in claves.items():
+        if clave not in encontradas:
+            cache.add(clave, 1, None)
+            encontradas[clave] = cache.get(clave, 1)
+        resultado[grupo] = encontradas[clave]
+    return resultado
+
+
+def generacion(grupo: str) -> int:
+    return generaciones(grupo)[grupo]
+
+
+def incrementar_generacion(*grupos: str) -> None:
+    for grupo in grupos:
+        clave = _clave_generacion(grupo)
+        try:
+            cache.incr(clave)
+        except ValueError:
+            # La clave fue desalojada: se reinicia en una generación nueva
+            cache.set(clave, generacion(grupo) + 1, None)
+
+
+def _armar_clave(prefijo: str, grupos, gens: dict, partes) -> str:
+    version = ".".join(f"{g}{gens[g]}" for g in grupos)
+    return ":".join([prefijo, version, *map(str, partes)])
+
+
+def clave_versionada(prefijo: str, grupos, *partes) -> str:
+    """Clave que queda obsoleta al incrementar cualquiera de `grupos`."""
+    return _armar_clave(prefijo, grupos, generaciones(*grupos), partes)
+
+
+async def ageneraciones(*grupos: str) -> dict:
+    claves = {_clave_generacion(g): g for g in grupos}
+    encontradas = await cache.aget_many(list(claves))
+    resultado = {}
+    for clave, grupo in claves.items():
+        if clave not in encontradas:
+            await cache.aadd(clave, 1, None)
+            encontradas[clave] = await cache.aget(clave, 1)
+        resultado[grupo] = encontradas[clave]
+    return resultado
+
+
+async def aclave_versionada(prefijo: str, grupos, *partes) -> str:
+    return _armar_clave(prefijo, grupos, await ageneraciones(*grupos), partes)
+
+
+# --- Respuestas Cacheadas por Vista ---
+
+def grupo_navbar(user_pk) -> str:
+    """
+    Grupo de generación de los datos propios de un usuario que muestra la
+    navbar (p. ej. mensajes no leídos). Incrementarlo invalida solo las
+    respuestas cacheadas de ese usuario.
+    """
+    return f"navbar:{user_pk}"
+
+
+def _alcance(request) -> str:
+    """
+    Las páginas incluyen la navbar del usuario y el token CSRF del formulario
+    de salida, por lo que se cachean por sesión; las anónimas se comparten.
+    """
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return "anon"
+    return f"sesion:{request.session.session_key}.{generacion(grupo_navbar(user.pk))}"
+
+
+def _clave_respuesta(request, vista, grupos, condicion) -> str | None:
+    """Clave de la respuesta cacheada, o None si esta request no se cachea."""
+    if (
+        request.method not in ("GET", "HEAD")
+        or len(get_messages(request))
+        or (condicion is not None and not condicion(request))
+    ):
+        return None
+    ruta = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return clave_versionada(f"respuesta:{vista.__module__}.{vista.__name__}", grupos, _alcance(request), ruta)
+
+
+def _para_guardar(response):
+    if hasattr(response, "render") and callable(response.render):
+        response = response.render()
+    if response.status_code == 200 and not response.streaming and not response.cookies:
+        return response, (response.content, response["Content-Type"])
+    return response, None
+
+
+def _timeout_respuestas(timeout):
+    return timeout if timeout is not None else getattr(settings, "RESPUESTAS_CACHE_TIMEOUT", 300)
+
+
+def cachear_respuesta(*grupos: str, timeout: int | None = None, condicion=None):
+    """
+    Cachea respuestas GET 200 de una vista con claves versionadas por
+    `grupos` (ver GENERACIONES), la ruta completa y el alcance del usuario.
+
+    La respuesta que se guarda se genera leyendo de la primaria (ver
+    leer_de_primaria), también en vistas con @usar_replica.
+
+    No se cachea cuando hay mensajes flash pendientes (se consumirían en la
+    respuesta guardada) ni cuando `condicion(request)` es falsa.
+
+        @cachear_respuesta("vehiculos", "usuarios", condicion=lambda r: r.user.is_staff)
+        def detalle_vehiculos(request): ...
+
+    Acepta también vistas `async def`: la clave se calcula en un hilo (sesión
+    y usuario son síncronos) y la caché se lee y escribe con su API asíncrona.
+    """
+    def decorador(vista):
+        if iscoroutinefunction(vista):
+            @wraps(vista)
+            async def envoltura_async(request, *args, **kwargs):
+                clave = await sync_to_async(_clave_respuesta)(request, vista, grupos, condicion)
+                if clave is None:
+                    return await vista(request, *args, **kwargs)
+
+                guardada = await cache.aget(clave)
+                if guardada is not None:
+                    contenido, tipo = guardada
+                    return HttpResponse(contenido, content_type=tipo)
+
+                with leer_de_primaria():
+                    response, valor = _para_guardar(await vista(request, *args, **kwargs))
+                if valor is not None:
+                    await cache.aset(clave, valor, _timeout_respuestas(timeout))
+                return response
+            return envoltura_async
+
+        @wraps(vista)
+        def envoltura(request, *args, **kwargs):
+            clave = _clave_respuesta(request, vista, grupos, condicion)
+            if clave is None:
+                return vista(request, *args, **kwargs)
+
+            guardada = cache.get(clave)
+            if guardada is not None:
+                contenido, tipo = guardada
+                return HttpResponse(contenido, content_type=tipo)
+
+            with leer_de_primaria():
+                response, valor = _para_guardar(vista(request, *args, **kwargs))
+            if valor is not None:
+                cache.set(clave, valor, _timeout_respuestas(timeout))
+            return response
+        return envoltura
+    return decorador
@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+
+from .cache import GENERACIONES, generaciones
+
+
+def cache_fragmentos(request):
+    """
+    Generaciones vigentes para versionar los {% cache %} de los templates:
+
+        {% cache fragmentos_timeout "navbar" gen_cache.usuarios user.pk %}
+    """
+    return {
+        "gen_cache": generaciones(*GENERACIONES),
+        "fragmentos_timeout": getattr(settings, "FRAGMENTOS_CACHE_TIMEOUT", 600),
+    }
+
+
+def eventos(request):
+    """
+    URL del canal SSE (core/sse.py). Solo existe bajo ASGI: con WSGI la
+    página no abre un EventSource que respondería 404 en cada reintento.
+    """
+    if isinstance(request, ASGIRequest) and request.user.is_authenticated:
+        from .sse import RUTA_EVENTOS
+
+        return {"eventos_url": RUTA_EVENTOS}
+    return {"eventos_url": None}
@@ -0,0 +1,104 @@
+import os
+
+
+# --- Configuración de Base de Datos por Entorno ---
+#
+# DB_ENGINE=sqlite (por defecto) o postgres. Variables comunes:
+#   DB_CONN_MAX_AGE       segundos que se reutiliza una conexión (0 = por request)
+#   DB_CONN_HEALTH_CHECKS verifica la conexión reutilizada antes de usarla
+# SQLite:
+#   DB_NAME, SQLITE_BUSY_TIMEOUT_MS, SQLITE_MMAP_SIZE
+# PostgreSQL:
+#   DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+#   DB_REPLICAS      hosts de réplicas de lectura separados por coma
+#   DB_PGBOUNCER     True si las conexiones pasan por PgBouncer (pool externo)
+
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+PREFIJO_REPLICA = "replica"
+
+
+def _bool(nombre: str, por_defecto: str) -> bool:
+    return os.getenv(nombre, por_defecto) == "True"
+
+
+def _comunes() -> dict:
+    return {
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": _bool("DB_CONN_HEALTH_CHECKS", "True"),
+    }
+
+
+def _sqlite(base_dir) -> dict:
+    return {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DB_NAME", str(base_dir / "db.sqlite3")),
+            # Espera del driver ante "database is locked" (segundos); el
+            # busy_timeout de SQLite se fija además por PRAGMA al conectar
+            "OPTIONS": {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+            **_comunes(),
+        }
+    }
+
+
+def _postgres() -> dict:
+    pgbouncer = _bool("DB_PGBOUNCER", "False")
+    primaria = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("DB_NAME", "vehiculos"),
+        "USER": os.getenv("DB_USER", "vehiculos"),
+        "PASSWORD": os.getenv("DB_PASSWORD", ""),
+        "HOST": os.getenv("DB_HOST", "localhost"),
+        "PORT": os.getenv("DB_PORT", "5432"),
+        # En modo transacción PgBouncer no conserva cursores de servidor
+        # entre sentencias (.iterator() de exportaciones)
+        "DISABLE_SERVER_SIDE_CURSORS": pgbouncer,
+        **_comunes(),
+    }
+
+    bases = {"default": primaria}
+    hosts = [h.strip() for h in os.getenv("DB_REPLICAS", "").split(",") if h.strip()]
+    for i, host in enumerate(hosts, start=1):
+        bases[f"{PREFIJO_REPLICA}_{i}"] = {
+            **primaria,
+            "HOST": host,
+            # En tests las réplicas apuntan a la base de pruebas primaria
+            "TEST": {"MIRROR": "default"},
+        }
+    return bases
+
+
+def configurar_bases_de_datos(base_dir) -> dict:
+    """Construye DATABASES a partir de las variables de entorno."""
+    motor = os.getenv("DB_ENGINE", "sqlite").lower()
+    if motor in ("postgres", "postgresql"):
+        return _postgres()
+    if motor != "sqlite":
+        raise ValueError(f"DB_ENGINE no soportado: {motor!r} (usar sqlite o postgres)")
+    return _sqlite(base_dir)
+
+
+def alias_replicas(databases: dict) -> list:
+    return sorted(alias for alias in databases if alias.startswith(PREFIJO_REPLICA))
+
+
+# --- Ajustes de SQLite al Conectar ---
+
+def aplicar_pragmas_sqlite(sender, connection, **kwargs) -> None:
+    """
+    Receptor de `connection_created`. WAL permite lectores concurrentes con
+    un escritor; synchronous=NORMAL es seguro con WAL y evita un fsync por
+    commit; busy_timeout hace esperar en vez de fallar con "database is locked".
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        # Las bases en memoria (tests) no admiten WAL ni mmap
+        if not connection.is_in_memory_db():
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE:d}")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS:d}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
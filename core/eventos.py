@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+
+# --- Eventos en Tiempo Real (pub/sub) ---
+#
+# Las vistas y signals publican eventos (mensaje nuevo, vehículo creado,
+# editado o eliminado) y el canal SSE de core/sse.py los empuja a los
+# navegadores conectados, en vez de que estos consulten cada N segundos.
+#
+# Cada proceso ASGI tiene un Centro con sus suscripciones. El backend decide
+# cómo llega un evento publicado a los Centros:
+#
+#   - local: directo al Centro del mismo proceso (runserver/un worker).
+#   - redis: PUBLISH a un canal que escucha cada worker (varios procesos,
+#     o publicadores WSGI/`procesar_tareas` distintos del servidor ASGI).
+#
+# Cada evento declara su audiencia (usuarios y/o todo el staff); el Centro
+# solo lo entrega a las suscripciones que pueden verlo. Los eventos son de
+# mejor esfuerzo: un fallo al publicar nunca interrumpe el guardado.
+
+BACKENDS_EVENTOS = {
+    "local": "core.eventos.BackendLocal",
+    "redis": "core.eventos.BackendRedis",
+}
+
+
+@dataclass
+class Evento:
+    tipo: str
+    datos: dict
+    # Audiencia: estos usuarios y, si `staff`, todos los administradores
+    usuarios: tuple = ()
+    staff: bool = False
+    # Datos distintos para cada destinatario, por id de usuario (str)
+    por_usuario: dict = field(default_factory=dict)
+    # Marca de tiempo en ns: ordena y permite reanudar con Last-Event-ID
+    id: int = 0
+
+    def visible_para(self, usuario_id: int, es_staff: bool) -> bool:
+        return (self.staff and es_staff) or usuario_id in self.usuarios
+
+    def datos_para(self, usuario_id: int) -> dict:
+        propios = self.por_usuario.get(str(usuario_id))
+        return {**self.datos, **propios} if propios else self.datos
+
+    def a_json(self) -> str:
+        return json.dumps(asdict(self), separators=(",", ":"), default=str)
+
+    @classmethod
+    def desde_json(cls, crudo) -> "Evento":
+        valores = json.loads(crudo)
+        valores["usuarios"] = tuple(valores.get("usuarios", ()))
+        return cls(**valores)
+
+
+# --- Suscripciones y Centro (por proceso) ---
+
+class Suscripcion:
+    """
+    Cola de eventos de una conexión. Vive en el event loop del servidor;
+    recibir() puede llamarse desde cualquier hilo (vistas síncronas).
+    """
+
+    def __init__(self, usuario_id: int, es_staff: bool, loop, maximo: int):
+        self.usuario_id = usuario_id
+        self.es_staff = es_staff
+        self.loop = loop
+        self.cola = asyncio.Queue(maxsize=maximo)
+        # Un cliente que no consume a tiempo se desconecta y vuelve a
+        # conectar con Last-Event-ID en vez de acumular memoria sin límite
+        self.desbordada = False
+
+    def _encolar(self, evento: Evento) -> None:
+        try:
+            self.cola.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.desbordada = True
+
+    def recibir(self, evento: Evento) -> None:
+        if evento.visible_para(self.usuario_id, self.es_staff):
+            try:
+                self.loop.call_soon_threadsafe(self._encolar, evento)
+            except RuntimeError:
+                pass  # el event loop ya se cerró (apagado del servidor)
+
+
+class Centro:
+    def __init__(self, backend):
+        self.backend = backend
+        self._suscripciones = set()
+        self._recientes = deque(maxlen=getattr(settings, "EVENTOS_RECIENTES", 500))
+        self._lock = threading.Lock()
+        self._escucha = None
+
+    def entregar(self, evento: Evento) -> None:
+        with self._lock:
+            self._recientes.append(evento)
+            suscripciones = list(self._suscripciones)
+        for suscripcion in suscripciones:
+            suscripcion.recibir(evento)
+
+    def suscribir(self, usuario_id: int, es_staff: bool, ultimo_id: int | None = None) -> tuple:
+        """
+        Registra una conexión y devuelve (suscripcion, pendientes): los
+        eventos recientes posteriores a `ultimo_id` que la conexión anterior
+        no alcanzó a recibir (reanudación de EventSource).
+        """
+        loop = asyncio.get_running_loop()
+        self._iniciar_escucha(loop)
+        suscripcion = Suscripcion(usuario_id, es_staff, loop, getattr(settings, "EVENTOS_COLA_MAXIMA", 100))
+        with self._lock:
+            self._suscripciones.add(suscripcion)
+            recientes = list(self._recientes) if ultimo_id is not None else []
+        pendientes = [e for e in recientes if e.id > ultimo_id and e.visible_para(usuario_id, es_staff)]
+        return suscripcion, pendientes
+
+    def desuscribir(self, suscripcion: Suscripcion) -> None:
+        with self._lock:
+            self._suscripciones.discard(suscripcion)
+
+    @property
+    def conexiones(self) -> int:
+        return len(self._suscripciones)
+
+    def _iniciar_escucha(self, loop) -> None:
+        """Los backends remotos escuchan en una tarea del event loop, iniciada con la primera conexión."""
+        if self.backend.remoto and (self._escucha is None or self._escucha.done()):
+            self._escucha = loop.create_task(self.backend.escuchar(self))
+
+
+# --- Backends ---
+
+class BackendLocal:
+    """Publicador y suscriptores en el mismo proceso."""
+
+    remoto = False
+
+    def publicar(self, evento: Evento) -> None:
+        centro().entregar(evento)
+
+    async def escuchar(self, centro: Centro) -> None:
+        return None
+
+
+class BackendRedis:
+    """
+    Fan-out entre procesos con PUBLISH/SUBSCRIBE de Redis (requiere el
+    paquete `redis`, el mismo que usa CACHE_BACKEND=redis).
+    """
+
+    canal = "sgv:eventos"
+    remoto = True
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured("EVENTOS_BACKEND=redis requiere el paquete 'redis'.") from exc
+        self.url = url
+        self.cliente = redis.Redis.from_url(url)
+
+    def publicar(self, evento: Evento) -> None:
+        self.cliente.publish(self.canal, evento.a_json())
+
+    async def escuchar(self, centro: Centro) -> None:
+        import redis.asyncio
+
+        espera = 1
+        while True:
+            try:
+                cliente = redis.asyncio.Redis.from_url(self.url)
+                async with cliente.pubsub() as pubsub:
+                    await pubsub.subscribe(self.canal)
+                    espera = 1
+                    async for mensaje in pubsub.listen():
+                        if mensaje["type"] == "message":
+                            centro.entregar(Evento.desde_json(mensaje["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Se perdió la suscripción a Redis; reintentando en %ss", espera)
+                await asyncio.sleep(espera)
+                espera = min(espera * 2, 30)
+
+
+@lru_cache(maxsize=1)
+def backend():
+    nombre = getattr(settings, "EVENTOS_BACKEND", "local")
+    clase = import_string(BACKENDS_EVENTOS.get(nombre, nombre))
+    if clase is BackendRedis:
+        return clase(getattr(settings, "EVENTOS_REDIS_URL", "redis://127.0.0.1:6379/2"))
+    return clase()
+
+
+@lru_cache(maxsize=1)
+def centro() -> Centro:
+    return Centro(backend())
+
+
+# --- Publicación ---
+
+def publicar(tipo: str, datos: dict, usuarios=(), staff: bool = False, por_usuario: dict | None = None) -> None:
+    """Publica un evento ya confirmado en la base de datos (ver publicar_al_confirmar)."""
+    evento = Evento(
+        tipo=tipo,
+        datos=datos,
+        usuarios=tuple(pk for pk in dict.fromkeys(usuarios) if pk is not None),
+        staff=staff,
+        por_usuario={str(pk): valores for pk, valores in (por_usuario or {}).items()},
+        id=time.time_ns(),
+    )
+    if not evento.usuarios and not evento.staff:
+        return
+    try:
+        backend().publicar(evento)
+    except Exception:
+        logger.exception("No se pudo publicar el evento %s", tipo)
+
+
+def publicar_al_confirmar(tipo: str, datos: dict, usuarios=(), staff: bool = False, por_usuario: dict | None = None) -> None:
+    """
+    Publica tras el COMMIT: un cliente que reaccione al evento consultando
+    la base de datos ya ve el cambio, y un rollback no notifica nada.
+    """
+    usuarios = tuple(usuarios)
+    transaction.on_commit(lambda: publicar(tipo, datos, usuarios, staff, por_usuario))
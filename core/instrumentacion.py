@@ -0,0 +1,220 @@
+import logging
+import threading
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+from django.conf import settings
+from django.template.base import Template
+
+
+logger = logging.getLogger(__name__)
+
+
+# --- Medición por Request ---
+
+@dataclass
+class Medicion:
+    """Acumuladores de una request: consultas SQL, tiempo en BD y en templates."""
+
+    consultas: int = 0
+    db: float = 0.0
+    templates: float = 0.0
+    total: float = 0.0
+    _profundidad_template: int = 0
+
+    def envolver_sql(self, execute, sql, params, many, context):
+        """execute_wrapper de Django: cuenta y cronometra cada consulta."""
+        inicio = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += perf_counter() - inicio
+            self.consultas += 1
+
+
+_medicion_actual: ContextVar = ContextVar("medicion_actual", default=None)
+
+
+def medicion_actual() -> Medicion | None:
+    return _medicion_actual.get()
+
+
+# Las consultas se cuentan con un execute_wrapper permanente por conexión que
+# delega en la medición del contexto actual. Funciona igual en vistas ASGI:
+# el ORM asíncrono ejecuta en otro hilo (con otras conexiones), pero
+# sync_to_async propaga el ContextVar.
+def _sql_medido(execute, sql, params, many, context):
+    medicion = _medicion_actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    return medicion.envolver_sql(execute, sql, params, many, context)
+
+
+def envolver_conexion(connection, **kwargs) -> None:
+    """Receiver de connection_created (también sirve para conexiones ya abiertas)."""
+    if _sql_medido not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_sql_medido)
+
+
+def instalar_medicion_sql() -> None:
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(envolver_conexion, dispatch_uid="core_medicion_sql")
+    for alias in connections:
+        envolver_conexion(connections[alias])
+
+
+# El tiempo de templates se mide envolviendo Template.render una sola vez.
+# Solo se cronometra el template de nivel superior (los {% include %} quedan
+# dentro de su tiempo); incluye las consultas que disparen querysets perezosos.
+_render_original = Template.render
+
+
+def _render_medido(self, context):
+    medicion = _medicion_actual.get()
+    if medicion is None or medicion._profundidad_template:
+        return _render_original(self, context)
+
+    medicion._profundidad_template += 1
+    inicio = perf_counter()
+    try:
+        return _render_original(self, context)
+    finally:
+        medicion._profundidad_template -= 1
+        medicion.templates += perf_counter() - inicio
+
+
+def instalar_medicion_templates() -> None:
+    if Template.render is not _render_medido:
+        Template.render = _render_medido
+
+
+# --- Histograma Rodante (en proceso) ---
+
+# Límites superiores (ms) de cada bucket; el último acumula el resto
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def _percentil(valores: list, p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, round(p / 100 * (len(ordenados) - 1)))
+    return ordenados[indice]
+
+
+class RegistroMetricas:
+    """
+    Guarda las últimas N mediciones por vista (ventana rodante) y resume
+    percentiles e histograma bajo demanda. Es por proceso: cada worker
+    expone sus propias cifras.
+    """
+
+    def __init__(self, ventana: int = 500):
+        self.ventana = ventana
+        self._datos = defaultdict(lambda: deque(maxlen=self.ventana))
+        self._lock = threading.Lock()
+
+    def registrar(self, vista: str, medicion: Medicion) -> None:
+        with self._lock:
+            self._datos[vista].append(
+                (medicion.total * 1000, medicion.db * 1000, medicion.templates * 1000, medicion.consultas)
+            )
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def resumen(self) -> dict:
+        with self._lock:
+            copia = {vista: list(filas) for vista, filas in self._datos.items()}
+
+        resultado = {}
+        for vista, filas in sorted(copia.items()):
+            totales = [f[0] for f in filas]
+            consultas = [f[3] for f in filas]
+
+            buckets = [0] * (len(BUCKETS_MS) + 1)
+            for ms in totales:
+                indice = next((i for i, limite in enumerate(BUCKETS_MS) if ms <= limite), len(BUCKETS_MS))
+                buckets[indice] += 1
+
+            resultado[vista] = {
+                "muestras": len(filas),
+                "total_ms": {
+                    "p50": round(_percentil(totales, 50), 2),
+                    "p95": round(_percentil(totales, 95), 2),
+                    "max": round(max(totales), 2),
+                },
+                "db_ms_p50": round(_percentil([f[1] for f in filas], 50), 2),
+                "templates_ms_p50": round(_percentil([f[2] for f in filas], 50), 2),
+                "consultas": {
+                    "promedio": round(sum(consultas) / len(consultas), 2),
+                    "max": max(consultas),
+                },
+                "histograma_ms": {
+                    (f"<={limite}" if i < len(BUCKETS_MS) else f">{BUCKETS_MS[-1]}"): n
+                    for i, (limite, n) in enumerate(zip(BUCKETS_MS + (None,), buckets))
+                },
+            }
+        return resultado
+
+
+registro = RegistroMetricas(ventana=getattr(settings, "INSTRUMENTACION_VENTANA", 500))
+
+
+# --- Presupuestos por Vista ---
+
+class PresupuestoExcedido(AssertionError):
+    """Una vista superó su presupuesto de consultas o de tiempo (modo estricto)."""
+
+
+@dataclass(frozen=True)
+class Presupuesto:
+    consultas: int | None = None
+    ms: float | None = None
+
+    def infracciones(self, medicion: Medicion) -> list:
+        errores = []
+        if self.consultas is not None and medicion.consultas > self.consultas:
+            errores.append(f"{medicion.consultas} consultas (máximo {self.consultas})")
+        if self.ms is not None and medicion.total * 1000 > self.ms:
+            errores.append(f"{medicion.total * 1000:.1f} ms (máximo {self.ms} ms)")
+        return errores
+
+
+def presupuesto_consultas(consultas: int | None = None, ms: float | None = None):
+    """
+    Declara el presupuesto de una vista directamente en el código:
+
+        @presupuesto_consultas(consultas=5)
+        def detalle_vehiculos(request): ...
+
+    Para vistas de terceros usar el setting PRESUPUESTOS_VISTAS.
+    """
+    def decorador(vista):
+        vista.presupuesto = Presupuesto(consultas=consultas, ms=ms)
+        return vista
+    return decorador
+
+
+def presupuesto_de(nombre_vista: str, vista) -> Presupuesto | None:
+    """El setting PRESUPUESTOS_VISTAS tiene prioridad sobre el decorador."""
+    configurados = getattr(settings, "PRESUPUESTOS_VISTAS", {})
+    if nombre_vista in configurados:
+        return Presupuesto(**configurados[nombre_vista])
+    return getattr(vista, "presupuesto", None)
+
+
+def verificar_presupuesto(nombre_vista: str, presupuesto: Presupuesto, medicion: Medicion) -> None:
+    infracciones = presupuesto.infracciones(medicion)
+    if not infracciones:
+        return
+
+    mensaje = f"Vista '{nombre_vista}' excedió su presupuesto: {', '.join(infracciones)}"
+    if getattr(settings, "PRESUPUESTOS_ESTRICTO", False):
+        raise PresupuestoExcedido(mensaje)
+    logger.warning(mensaje)
@@ -0,0 +1,145 @@
+from time import perf_counter, time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .asincrono import usuario_resuelto
+from .db import alias_replicas
+
+from .instrumentacion import (
+    Medicion,
+    _medicion_actual,
+    instalar_medicion_sql,
+    instalar_medicion_templates,
+    presupuesto_de,
+    registro,
+    verificar_presupuesto,
+)
+from .routers import CLAVE_ESCRITURA
+
+
+class InstrumentacionMiddleware:
+    """
+    Mide cada request: cantidad de consultas SQL, tiempo total en BD,
+    tiempo de render de templates y tiempo total.
+
+    - Publica las cifras en la cabecera `Server-Timing` (DEBUG o staff)
+    - Las acumula en el histograma rodante expuesto en /metricas/
+    - Verifica el presupuesto declarado para la vista (PRESUPUESTOS_VISTAS
+      o @presupuesto_consultas): registra un warning o, con
+      PRESUPUESTOS_ESTRICTO (tests), lanza PresupuestoExcedido.
+
+    Debe ir primero en MIDDLEWARE para que el tiempo total incluya al resto.
+    Soporta WSGI y ASGI sin cambiar de hilo (vistas `async def` incluidas).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.es_async = iscoroutinefunction(get_response)
+        if self.es_async:
+            markcoroutinefunction(self)
+        instalar_medicion_templates()
+        instalar_medicion_sql()
+
+    def __call__(self, request):
+        if self.es_async:
+            return self.__acall__(request)
+
+        medicion = Medicion()
+        token = _medicion_actual.set(medicion)
+        inicio = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            medicion.total = perf_counter() - inicio
+            _medicion_actual.reset(token)
+        return self._procesar(request, response, medicion, self._expone_cabecera(request))
+
+    async def __acall__(self, request):
+        medicion = Medicion()
+        token = _medicion_actual.set(medicion)
+        inicio = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            medicion.total = perf_counter() - inicio
+            _medicion_actual.reset(token)
+
+        if settings.DEBUG or usuario_resuelto(request) is not None:
+            expone = self._expone_cabecera(request)
+        else:
+            # La vista no llegó a cargar el usuario: resolverlo consulta la BD
+            expone = await sync_to_async(self._expone_cabecera)(request)
+        return self._procesar(request, response, medicion, expone)
+
+    def _procesar(self, request, response, medicion: Medicion, expone: bool):
+        match = request.resolver_match
+        if match is not None:
+            nombre = match.view_name or request.path
+            registro.registrar(nombre, medicion)
+            presupuesto = presupuesto_de(nombre, match.func)
+            if presupuesto is not None:
+                verificar_presupuesto(nombre, presupuesto, medicion)
+
+        if expone:
+            response["Server-Timing"] = (
+                f'db;dur={medicion.db * 1000:.1f};desc="{medicion.consultas} consultas", '
+                f"tpl;dur={medicion.templates * 1000:.1f}, "
+                f"total;dur={medicion.total * 1000:.1f}"
+            )
+        return response
+
+    @staticmethod
+    def _expone_cabecera(request) -> bool:
+        if settings.DEBUG:
+            return True
+        user = getattr(request, "user", None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+
+class ReplicaPegajosaMiddleware:
+    """
+    Marca en la sesión el momento de cada request que escribe (POST, PUT,
+    PATCH, DELETE) para que @usar_replica lea de la primaria mientras la
+    réplica pueda no tener aún esos cambios.
+
+    Sin réplicas configuradas se desactiva. Debe ir después de SessionMiddleware.
+    """
+
+    METODOS_ESCRITURA = ("POST", "PUT", "PATCH", "DELETE")
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not alias_replicas(settings.DATABASES):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.es_async = iscoroutinefunction(get_response)
+        if self.es_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.es_async:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._marcar(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if request.method in self.METODOS_ESCRITURA:
+            # Escribir en la sesión puede cargarla desde la base de datos
+            await sync_to_async(self._marcar)(request, response)
+        return response
+
+    def _marcar(self, request, response) -> None:
+        if request.method in self.METODOS_ESCRITURA and response.status_code < 400:
+            sesion = getattr(request, "session", None)
+            if sesion is not None:
+                sesion[CLAVE_ESCRITURA] = time()
@@ -0,0 +1,118 @@
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+# --- Paginación por Cursor (Keyset) ---
+#
+# En vez de OFFSET (que recorre todas las filas anteriores), cada página se
+# pide "a partir de" los valores de orden de la última fila entregada.
+# Con un índice sobre las columnas de orden, la página 1000 cuesta lo mismo
+# que la primera.
+
+
+class CursorInvalido(ValueError):
+    """El cursor recibido no pudo decodificarse o no corresponde al orden."""
+
+
+@dataclass
+class PaginaKeyset:
+    items: list
+    siguiente: str | None = None
+    hay_mas: bool = False
+    orden: tuple = field(default_factory=tuple)
+
+
+def _codificar(valores: list) -> str:
+    # isoformat() completo: DjangoJSONEncoder recorta a milisegundos y el
+    # cursor debe conservar los microsegundos exactos para no saltar filas
+    valores = [v.isoformat() if isinstance(v, datetime) else v for v in valores]
+    crudo = json.dumps(valores, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def _decodificar(cursor: str, campos: list, modelo) -> list:
+    try:
+        relleno = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+    except (ValueError, TypeError) as exc:
+        raise CursorInvalido("Cursor mal formado.") from exc
+
+    if not isinstance(valores, list) or len(valores) != len(campos):
+        raise CursorInvalido("El cursor no corresponde al orden del listado.")
+
+    # Cada valor se convierte con el campo de orden (los DateTime viajan
+    # como ISO-8601): uno alterado responde 400 en vez de llegar al filtro
+    for i, nombre in enumerate(campos):
+        if not isinstance(valores[i], (str, int, float)):
+            raise CursorInvalido("Valor inválido en el cursor.")
+        try:
+            valores[i] = modelo._meta.get_field(nombre).to_python(valores[i])
+        except (ValidationError, TypeError, ValueError) as exc:
+            raise CursorInvalido("Valor inválido en el cursor.") from exc
+        if valores[i] is None:
+            raise CursorInvalido("Valor inválido en el cursor.")
+    return valores
+
+
+def _filtro_posterior(orden: tuple, valores: list) -> Q:
+    """
+    Construye la comparación lexicográfica (a, b) > (va, vb) respetando
+    el sentido de cada columna:  a > va  OR  (a = va AND b > vb)
+    """
+    filtro = Q()
+    iguales = Q()
+    for campo, valor in zip(orden, valores):
+        nombre = campo.lstrip("-")
+        operador = "lt" if campo.startswith("-") else "gt"
+        filtro |= iguales & Q(**{f"{nombre}__{operador}": valor})
+        iguales &= Q(**{nombre: valor})
+    return filtro
+
+
+def _consulta_pagina(qs, orden: tuple, cursor: str | None, tamano: int):
+    """QuerySet de la página (con una fila extra) y los atributos del cursor."""
+    campos = [c.lstrip("-") for c in orden]
+    atributos = [qs.model._meta.get_field(c).attname for c in campos]
+    qs = qs.order_by(*orden)
+
+    if cursor:
+        valores = _decodificar(cursor, campos, qs.model)
+        qs = qs.filter(_filtro_posterior(orden, valores))
+
+    # Se pide una fila extra solo para saber si existe otra página
+    return qs[: tamano + 1], atributos
+
+
+def _armar_pagina(items: list, tamano: int, atributos: list, orden: tuple) -> PaginaKeyset:
+    hay_mas = len(items) > tamano
+    items = items[:tamano]
+
+    siguiente = None
+    if hay_mas:
+        ultimo = items[-1]
+        siguiente = _codificar([getattr(ultimo, a) for a in atributos])
+
+    return PaginaKeyset(items=items, siguiente=siguiente, hay_mas=hay_mas, orden=orden)
+
+
+def paginar_keyset(qs, orden: tuple, cursor: str | None, tamano: int) -> PaginaKeyset:
+    """
+    Devuelve una página de `qs` ordenada por `orden` a partir de `cursor`.
+
+    `orden` debe terminar en una columna única (normalmente "id") para que
+    el cursor sea determinista aunque existan valores repetidos.
+    """
+    consulta, atributos = _consulta_pagina(qs, orden, cursor, tamano)
+    return _armar_pagina(list(consulta), tamano, atributos, orden)
+
+
+async def apaginar_keyset(qs, orden: tuple, cursor: str | None, tamano: int) -> PaginaKeyset:
+    """Versión asíncrona de paginar_keyset (vistas ASGI)."""
+    consulta, atributos = _consulta_pagina(qs, orden, cursor, tamano)
+    return _armar_pagina([item async for item in consulta], tamano, atributos, orden)
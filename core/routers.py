@@ -0,0 +1,101 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.conf import settings
+
+from .db import alias_replicas
+
+
+# --- Enrutamiento a Réplicas de Lectura ---
+#
+# Las lecturas solo van a una réplica dentro de una vista marcada con
+# @usar_replica; el resto (incluidas sesión y autenticación) sigue en la
+# primaria. Las escrituras siempre van a la primaria.
+
+_leer_de_replica: ContextVar = ContextVar("leer_de_replica", default=False)
+
+# Clave de sesión con la marca de la última escritura del usuario
+CLAVE_ESCRITURA = "_db_ultima_escritura"
+
+
+class ReplicaRouter:
+    def __init__(self):
+        self.replicas = alias_replicas(settings.DATABASES)
+
+    def db_for_read(self, model, **hints):
+        if self.replicas and _leer_de_replica.get():
+            return random.choice(self.replicas)
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Todas las bases contienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas reciben el esquema por replicación
+        return db == "default"
+
+
+def usar_replica(vista):
+    """
+    Envía a una réplica las lecturas de una vista de solo lectura. Se omite
+    en métodos que escriben y durante REPLICA_LECTURA_PROPIA segundos tras
+    una escritura del usuario (ver ReplicaPegajosaMiddleware), para que vea
+    sus propios cambios pese al retraso de replicación.
+
+    Con vistas `async def` el ContextVar llega a los hilos del ORM
+    asíncrono a través de sync_to_async.
+    """
+    if iscoroutinefunction(vista):
+        @wraps(vista)
+        async def envoltura_async(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD") or await sync_to_async(escritura_reciente)(request):
+                return await vista(request, *args, **kwargs)
+            token = _leer_de_replica.set(True)
+            try:
+                return await vista(request, *args, **kwargs)
+            finally:
+                _leer_de_replica.reset(token)
+        return envoltura_async
+
+    @wraps(vista)
+    def envoltura(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or escritura_reciente(request):
+            return vista(request, *args, **kwargs)
+        token = _leer_de_replica.set(True)
+        try:
+            return vista(request, *args, **kwargs)
+        finally:
+            _leer_de_replica.reset(token)
+    return envoltura
+
+
+@contextmanager
+def leer_de_primaria():
+    """
+    Lecturas a la primaria dentro del bloque, aunque la vista use
+    @usar_replica. Para calcular lo que se guarda en una caché compartida:
+    un valor leído de una réplica atrasada justo después de incrementar una
+    generación quedaría cacheado hasta su expiración.
+    """
+    token = _leer_de_replica.set(False)
+    try:
+        yield
+    finally:
+        _leer_de_replica.reset(token)
+
+
+def escritura_reciente(request) -> bool:
+    sesion = getattr(request, "session", None)
+    if sesion is None:
+        return False
+    marca = sesion.get(CLAVE_ESCRITURA)
+    return marca is not None and time() - marca < getattr(settings, "REPLICA_LECTURA_PROPIA", 5)
@@ -1,6 +1,9 @@
 import os
 from pathlib import Path
 
+from core.cache import configurar_cache
+from core.db import configurar_bases_de_datos
+
 # ------------------------------------------------------------------------------
 # BASE DIR
 # ------------------------------------------------------------------------------
@@ -30,14 +33,21 @@ INSTALLED_APPS = [
     "vehiculos",
     "pages",
     "messaging",
+    "tareas",
+    "telemetria",
+    "mantenimiento",
+    "reservas",
 ]
 
 # ------------------------------------------------------------------------------
 # MIDDLEWARE
 # ------------------------------------------------------------------------------
 MIDDLEWARE = [
+    # Primero: su medición de tiempo total envuelve al resto de middlewares
+    "core.middleware.InstrumentacionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middleware.ReplicaPegajosaMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -51,6 +61,11 @@ MIDDLEWARE = [
 ROOT_URLCONF = "urls"
 WSGI_APPLICATION = "core.wsgi.application"
 
+# True: las vistas de lectura (dashboard, listado de vehículos, páginas) usan
+# sus versiones async def. Conviene solo al servir con ASGI (core.asgi):
+# bajo WSGI cada vista asíncrona corre en su propio event loop.
+VISTAS_ASYNC = os.getenv("VISTAS_ASYNC", "False") == "True"
+
 # ------------------------------------------------------------------------------
 # TEMPLATES
 # ------------------------------------------------------------------------------
@@ -65,6 +80,9 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.cache_fragmentos',
+                'core.context_processors.eventos',
+                'messaging.context_processors.mensajes',
             ],
         },
     },
@@ -73,12 +91,28 @@ TEMPLATES = [
 # ------------------------------------------------------------------------------
 # DATABASE
 # ------------------------------------------------------------------------------
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-    }
-}
+# Definida por variables de entorno (ver core/db.py). Por defecto SQLite local
+# con conexiones persistentes, WAL y busy_timeout.
+DATABASES = configurar_bases_de_datos(BASE_DIR)
+
+# Con DB_REPLICAS, las vistas marcadas con @usar_replica leen de réplicas
+DATABASE_ROUTERS = ["core.routers.ReplicaRouter"]
+
+# Segundos tras una escritura en que el usuario sigue leyendo de la primaria
+REPLICA_LECTURA_PROPIA = int(os.getenv("REPLICA_LECTURA_PROPIA", "5"))
+
+# ------------------------------------------------------------------------------
+# CACHE
+# ------------------------------------------------------------------------------
+# locmem por defecto; CACHE_BACKEND=file|redis y CACHE_LOCATION (ver core/cache.py).
+# Las claves se versionan por generación y las incrementan los signals.
+CACHES = configurar_cache(BASE_DIR)
+
+# Segundos que viven las respuestas cacheadas (páginas, listado staff)
+RESPUESTAS_CACHE_TIMEOUT = int(os.getenv("RESPUESTAS_CACHE_TIMEOUT", "300"))
+
+# Segundos que viven los fragmentos {% cache %} (navbar)
+FRAGMENTOS_CACHE_TIMEOUT = int(os.getenv("FRAGMENTOS_CACHE_TIMEOUT", "600"))
 
 # ------------------------------------------------------------------------------
 # AUTHENTICATION
@@ -102,7 +136,169 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 # ------------------------------------------------------------------------------
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 CKEDITOR_UPLOAD_PATH = "uploads/"
+# Las imágenes subidas desde el editor se reducen y limpian en segundo plano
+CKEDITOR_IMAGE_BACKEND = "pages.imagenes.BackendEditor"
 LANGUAGE_CODE = "es-cl"
 TIME_ZONE = "America/Santiago"
 USE_I18N = True
 USE_TZ = True
+
+# ------------------------------------------------------------------------------
+# VEHICULOS
+# ------------------------------------------------------------------------------
+# Segundos que se mantienen en caché las métricas del dashboard (se invalidan
+# igualmente ante cualquier cambio en Vehiculo mediante signals)
+FLOTA_STATS_CACHE_TIMEOUT = int(os.getenv("FLOTA_STATS_CACHE_TIMEOUT", "300"))
+
+# Facetas del admin de vehículos (marca / estado / año): conteos cacheados
+# que alimentan filtros, jerarquía de fechas y paginador (también se
+# invalidan ante cualquier cambio en Vehiculo)
+ADMIN_FACETAS_TIMEOUT = int(os.getenv("ADMIN_FACETAS_TIMEOUT", "3600"))
+
+# Filas leídas por lote al exportar (values_list().iterator(chunk_size=...))
+EXPORTACION_CHUNK_SIZE = int(os.getenv("EXPORTACION_CHUNK_SIZE", "2000"))
+
+# Tamaño de página del listado de vehículos (paginación por cursor)
+LISTADO_PAGINA = int(os.getenv("LISTADO_PAGINA", "50"))
+LISTADO_MAX_PAGINA = 200
+
+# Filas por lote en la importación masiva (validación + bulk_create)
+IMPORTACION_CHUNK_SIZE = int(os.getenv("IMPORTACION_CHUNK_SIZE", "1000"))
+
+# Opciones por página del autocompletado de usuarios (selector de responsable)
+AUTOCOMPLETAR_PAGINA = int(os.getenv("AUTOCOMPLETAR_PAGINA", "20"))
+
+# Sincronización incremental: vehículos por respuesta y margen (s) para no
+# saltarse cambios de transacciones aún abiertas
+SYNC_PAGINA = int(os.getenv("SYNC_PAGINA", "500"))
+SYNC_MARGEN_SEGUNDOS = int(os.getenv("SYNC_MARGEN_SEGUNDOS", "2"))
+
+# Resultados por defecto del endpoint de búsqueda de vehículos
+BUSQUEDA_LIMITE = int(os.getenv("BUSQUEDA_LIMITE", "20"))
+
+# ------------------------------------------------------------------------------
+# PAGES
+# ------------------------------------------------------------------------------
+# Publicaciones por página en el listado
+PAGINAS_POR_PAGINA = int(os.getenv("PAGINAS_POR_PAGINA", "12"))
+
+# Calidad (1-100) de las variantes WebP/JPEG de las imágenes (pages/imagenes.py)
+IMAGENES_CALIDAD = int(os.getenv("IMAGENES_CALIDAD", "80"))
+
+# ------------------------------------------------------------------------------
+# MENSAJERÍA
+# ------------------------------------------------------------------------------
+# Hilos por página en la bandeja y mensajes por página dentro de un hilo
+MENSAJES_POR_PAGINA = int(os.getenv("MENSAJES_POR_PAGINA", "30"))
+
+# ------------------------------------------------------------------------------
+# TELEMETRÍA
+# ------------------------------------------------------------------------------
+# Token (Authorization: Bearer) de los gateways que envían lecturas; vacío
+# deshabilita la ingesta por HTTP (queda el comando importar_telemetria)
+TELEMETRIA_TOKEN = os.getenv("TELEMETRIA_TOKEN", "")
+
+# Líneas por lote de ingesta (una transacción y un bulk_create por lote)
+TELEMETRIA_LOTE = int(os.getenv("TELEMETRIA_LOTE", "10000"))
+
+# Series: intervalo por defecto en segundos y rango máximo consultable
+TELEMETRIA_INTERVALO = int(os.getenv("TELEMETRIA_INTERVALO", "300"))
+TELEMETRIA_MAX_DIAS = int(os.getenv("TELEMETRIA_MAX_DIAS", "31"))
+
+# Índice espacial en memoria (/telemetria/cercanos/ y /area/): lado de la
+# celda de la grilla en grados (0.05° ≈ 5,5 km), segundos entre lecturas de
+# las posiciones nuevas y entre reconstrucciones completas
+TELEMETRIA_CELDA_GRADOS = float(os.getenv("TELEMETRIA_CELDA_GRADOS", "0.05"))
+TELEMETRIA_REFRESCO_SEGUNDOS = int(os.getenv("TELEMETRIA_REFRESCO_SEGUNDOS", "5"))
+TELEMETRIA_RECONSTRUIR_SEGUNDOS = int(os.getenv("TELEMETRIA_RECONSTRUIR_SEGUNDOS", "3600"))
+
+# Máximo de vehículos por respuesta de /cercanos/ (k) y de /area/
+TELEMETRIA_MAX_CERCANOS = int(os.getenv("TELEMETRIA_MAX_CERCANOS", "50"))
+TELEMETRIA_MAX_AREA = int(os.getenv("TELEMETRIA_MAX_AREA", "5000"))
+
+# ------------------------------------------------------------------------------
+# MANTENIMIENTO (manage.py programar_mantenimiento)
+# ------------------------------------------------------------------------------
+# El dashboard muestra las mantenciones que vencen dentro de estos días
+MANTENIMIENTO_HORIZONTE_DIAS = int(os.getenv("MANTENIMIENTO_HORIZONTE_DIAS", "14"))
+
+# Segundos que se cachean esas mantenciones por alcance (se invalidan al
+# reprogramar o al cambiar la flota)
+MANTENIMIENTO_CACHE_TIMEOUT = int(os.getenv("MANTENIMIENTO_CACHE_TIMEOUT", "300"))
+
+# Uso (km/día) supuesto si ningún vehículo tiene datos para estimarlo, y
+# antigüedad mínima del servicio de referencia para calcular el uso
+MANTENIMIENTO_KM_DIA = int(os.getenv("MANTENIMIENTO_KM_DIA", "50"))
+MANTENIMIENTO_MIN_DIAS_TASA = int(os.getenv("MANTENIMIENTO_MIN_DIAS_TASA", "7"))
+
+# ------------------------------------------------------------------------------
+# RESERVAS (flota en reserva)
+# ------------------------------------------------------------------------------
+# Duración máxima de una reserva
+RESERVAS_MAX_DIAS = int(os.getenv("RESERVAS_MAX_DIAS", "7"))
+
+# Segundos que cada proceso reutiliza su índice de disponibilidad en memoria
+# (también se reconstruye al cambiar las reservas o la flota)
+RESERVAS_INDICE_SEGUNDOS = int(os.getenv("RESERVAS_INDICE_SEGUNDOS", "300"))
+
+# Ventanas por consulta a /reservas/disponibles/
+RESERVAS_MAX_VENTANAS = int(os.getenv("RESERVAS_MAX_VENTANAS", "50"))
+
+# ------------------------------------------------------------------------------
+# EVENTOS EN TIEMPO REAL (SSE en /eventos/, solo bajo ASGI)
+# ------------------------------------------------------------------------------
+# local: un solo proceso; redis: varios workers ASGI o publicadores WSGI/tareas
+EVENTOS_BACKEND = os.getenv("EVENTOS_BACKEND", "local")
+EVENTOS_REDIS_URL = os.getenv("EVENTOS_REDIS_URL", "redis://127.0.0.1:6379/2")
+
+# Segundos entre latidos de una conexión sin eventos (proxies con timeout)
+EVENTOS_LATIDO_SEGUNDOS = int(os.getenv("EVENTOS_LATIDO_SEGUNDOS", "20"))
+
+# Eventos pendientes por conexión antes de cortarla, y eventos recientes que
+# se reenvían al reconectar con Last-Event-ID
+EVENTOS_COLA_MAXIMA = int(os.getenv("EVENTOS_COLA_MAXIMA", "100"))
+EVENTOS_RECIENTES = int(os.getenv("EVENTOS_RECIENTES", "500"))
+
+# ------------------------------------------------------------------------------
+# TAREAS EN SEGUNDO PLANO (manage.py procesar_tareas)
+# ------------------------------------------------------------------------------
+# Procesos del worker y segundos entre consultas a la cola vacía
+TAREAS_PROCESOS = int(os.getenv("TAREAS_PROCESOS", "2"))
+TAREAS_INTERVALO = int(os.getenv("TAREAS_INTERVALO", "2"))
+
+# Solicitudes idénticas reutilizan el resultado completado hace menos de esto
+TAREAS_REUTILIZAR_SEGUNDOS = int(os.getenv("TAREAS_REUTILIZAR_SEGUNDOS", "600"))
+
+# Una tarea "en curso" más antigua que esto se considera huérfana (worker caído)
+TAREAS_TIMEOUT_SEGUNDOS = int(os.getenv("TAREAS_TIMEOUT_SEGUNDOS", "1800"))
+TAREAS_MAX_INTENTOS = int(os.getenv("TAREAS_MAX_INTENTOS", "3"))
+
+# Horas que se conservan las tareas terminadas y sus archivos en MEDIA_ROOT
+TAREAS_RETENCION_HORAS = int(os.getenv("TAREAS_RETENCION_HORAS", "24"))
+
+# ------------------------------------------------------------------------------
+# INSTRUMENTACIÓN (consultas / latencia por vista)
+# ------------------------------------------------------------------------------
+# Mediciones que se conservan por vista en el histograma rodante (/metricas/)
+INSTRUMENTACION_VENTANA = int(os.getenv("INSTRUMENTACION_VENTANA", "500"))
+
+# Presupuestos por nombre de URL. Incluyen las consultas de sesión y usuario.
+# Una regresión (p. ej. N+1 sobre `usuario` en el listado) los supera.
+PRESUPUESTOS_VISTAS = {
+    # Con la caché vacía: sesión, usuario, métricas, últimos vehículos,
+    # próximas mantenciones y contador de no leídos. Con caché: 3.
+    "vehiculos:dashboard": {"consultas": 6},
+    "vehiculos:detalle_vehiculos": {"consultas": 5},
+    "vehiculos:buscar": {"consultas": 8},
+    "pages:page_list": {"consultas": 5},
+    "accounts:profile": {"consultas": 4},
+    # Sesión, usuario, participaciones y contador de no leídos
+    "messaging:bandeja": {"consultas": 4},
+    # Primera visita con pendientes: participación, mensajes, marcar leído
+    # (participación, contador y su relectura), badge y participantes; +2 del
+    # SAVEPOINT/RELEASE cuando la request ya corre en una transacción (tests)
+    "messaging:hilo": {"consultas": 12},
+}
+
+# True: lanzar PresupuestoExcedido en vez de registrar un warning (tests / CI)
+PRESUPUESTOS_ESTRICTO = os.getenv("PRESUPUESTOS_ESTRICTO", "False") == "True"
@@ -0,0 +1,17 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import incrementar_generacion
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidar_cache_usuarios(sender, instance, update_fields=None, **kwargs):
+    """
+    Navbar, listados y métricas muestran datos del usuario. Se ignora el
+    guardado de last_login al iniciar sesión para no invalidar en cada login.
+    """
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    incrementar_generacion("usuarios")
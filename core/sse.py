@@ -0,0 +1,136 @@
+import asyncio
+import json
+from importlib import import_module
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+from django.http import parse_cookie
+
+from .eventos import Evento, centro
+
+
+# --- Canal de Server-Sent Events ---
+#
+# Aplicación ASGI montada en core/asgi.py (RUTA_EVENTOS), fuera del stack de
+# Django: una conexión abierta por pestaña no debe ocupar middlewares ni una
+# conexión a la base de datos mientras espera. La sesión se valida una sola
+# vez al conectar; después solo se esperan eventos y la desconexión.
+#
+# Formato SSE: cada evento viaja como
+#
+#     id: <ns>
+#     event: vehiculo.actualizado
+#     data: {"id": 5, ...}
+#
+# y el navegador (EventSource) reconecta solo enviando Last-Event-ID, con lo
+# que recibe los eventos recientes que se perdió.
+
+RUTA_EVENTOS = "/eventos/"
+
+REINTENTO_MS = 5000
+
+
+def _latido_segundos() -> int:
+    return getattr(settings, "EVENTOS_LATIDO_SEGUNDOS", 20)
+
+
+def _usuario_de_sesion(session_key: str | None):
+    """El usuario autenticado en la sesión (o AnonymousUser), como lo vería la request."""
+    try:
+        engine = import_module(settings.SESSION_ENGINE)
+        return get_user(SimpleNamespace(session=engine.SessionStore(session_key)))
+    finally:
+        close_old_connections()
+
+
+def _cabeceras(scope) -> dict:
+    return {nombre.decode("latin-1").lower(): valor.decode("latin-1") for nombre, valor in scope.get("headers", [])}
+
+
+def _ultimo_id(cabeceras: dict) -> int | None:
+    valor = cabeceras.get("last-event-id", "")
+    try:
+        return int(valor) if valor else None
+    except ValueError:
+        return None
+
+
+def formatear(evento: Evento, usuario_id: int) -> bytes:
+    datos = json.dumps(evento.datos_para(usuario_id), separators=(",", ":"), default=str)
+    return f"id: {evento.id}\nevent: {evento.tipo}\ndata: {datos}\n\n".encode()
+
+
+async def _responder_error(send, estado: int, mensaje: str) -> None:
+    await send({"type": "http.response.start", "status": estado, "headers": [(b"content-type", b"text/plain; charset=utf-8")]})
+    await send({"type": "http.response.body", "body": mensaje.encode()})
+
+
+async def canal_eventos(scope, receive, send) -> None:
+    if scope["method"] not in ("GET", "HEAD"):
+        await _responder_error(send, 405, "Método no permitido.")
+        return
+
+    cabeceras = _cabeceras(scope)
+    sesion = parse_cookie(cabeceras.get("cookie", "")).get(settings.SESSION_COOKIE_NAME)
+    usuario = await sync_to_async(_usuario_de_sesion)(sesion)
+    if not usuario.is_authenticated:
+        await _responder_error(send, 403, "Debe iniciar sesión.")
+        return
+
+    suscripcion, pendientes = centro().suscribir(usuario.pk, usuario.is_staff, _ultimo_id(cabeceras))
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache, no-store"),
+                # nginx no debe acumular el stream en su buffer
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+        inicio = f"retry: {REINTENTO_MS}\n\n".encode() + b"".join(formatear(e, usuario.pk) for e in pendientes)
+        await send({"type": "http.response.body", "body": inicio, "more_body": True})
+        await _transmitir(suscripcion, usuario.pk, receive, send)
+    finally:
+        centro().desuscribir(suscripcion)
+
+
+async def _transmitir(suscripcion, usuario_id: int, receive, send) -> None:
+    """Envía eventos (o un comentario de latido) hasta que el cliente se desconecta."""
+    desconexion = asyncio.ensure_future(_esperar_desconexion(receive))
+    try:
+        while True:
+            siguiente = asyncio.ensure_future(suscripcion.cola.get())
+            listos, _ = await asyncio.wait({siguiente, desconexion}, timeout=_latido_segundos(), return_when=asyncio.FIRST_COMPLETED)
+            if desconexion in listos:
+                siguiente.cancel()
+                return
+            if siguiente not in listos:
+                siguiente.cancel()
+                # El latido mantiene viva la conexión a través de proxies
+                await send({"type": "http.response.body", "body": b": latido\n\n", "more_body": True})
+                continue
+
+            cuerpo = formatear(siguiente.result(), usuario_id)
+            while not suscripcion.cola.empty():
+                cuerpo += formatear(suscripcion.cola.get_nowait(), usuario_id)
+            await send({"type": "http.response.body", "body": cuerpo, "more_body": True})
+
+            if suscripcion.desbordada:
+                # Se cierra el stream: el navegador reconecta con Last-Event-ID
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+                return
+    finally:
+        desconexion.cancel()
+
+
+async def _esperar_desconexion(receive) -> None:
+    while True:
+        mensaje = await receive()
+        if mensaje["type"] == "http.disconnect":
+            return
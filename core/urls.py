@@ -1,9 +1,10 @@
 from django.urls import path
-from .views import HomeView, AboutView
+from .views import HomeView, AboutView, MetricasView
 
 app_name = "core"
 
 urlpatterns = [
     path("", HomeView.as_view(), name="home"),
     path("about/", AboutView.as_view(), name="about"),
+    path("metricas/", MetricasView.as_view(), name="metricas"),
 ]
@@ -1,5 +1,10 @@
+from django.contrib.auth.mixins import UserPassesTestMixin
+from django.http import JsonResponse
+from django.views import View
 from django.views.generic import TemplateView
 
+from .instrumentacion import registro
+
 
 class HomeView(TemplateView):
     template_name = "core/home.html"
@@ -7,3 +12,24 @@ class HomeView(TemplateView):
 
 class AboutView(TemplateView):
     template_name = "core/about.html"
+
+
+class MetricasView(UserPassesTestMixin, View):
+    """
+    Métricas de rendimiento por vista (solo staff): percentiles de tiempo,
+    consultas SQL e histograma de la ventana rodante de este proceso.
+    GET las consulta; POST (con token CSRF) las reinicia.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request):
+        return JsonResponse({
+            "ventana": registro.ventana,
+            "vistas": registro.resumen(),
+        })
+
+    def post(self, request):
+        registro.limpiar()
+        return self.get(request)
@@ -0,0 +1,40 @@
+from django.contrib import admin
+
+from .models import PlanMantenimiento, RegistroServicio, Vencimiento
+
+
+@admin.register(PlanMantenimiento)
+class PlanMantenimientoAdmin(admin.ModelAdmin):
+    list_display = ("nombre", "marca", "modelo", "cada_km", "cada_meses", "activo")
+    list_filter = ("activo",)
+    search_fields = ("nombre", "marca", "modelo")
+
+
+@admin.register(RegistroServicio)
+class RegistroServicioAdmin(admin.ModelAdmin):
+    list_display = ("vehiculo", "plan", "fecha", "odometro", "registrado_por")
+    list_select_related = ("vehiculo", "plan", "registrado_por")
+    list_filter = ("plan",)
+    search_fields = ("vehiculo__patente",)
+    raw_id_fields = ("vehiculo",)
+    readonly_fields = ("registrado_por",)
+    date_hierarchy = "fecha"
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            obj.registrado_por = request.user
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(Vencimiento)
+class VencimientoAdmin(admin.ModelAdmin):
+    # Calculados por programador.py: solo lectura
+    list_display = ("vehiculo", "plan", "fecha", "motivo", "km_vence", "km_estimado", "calculado")
+    list_select_related = ("vehiculo", "plan")
+    list_filter = ("motivo", "plan")
+    search_fields = ("vehiculo__patente",)
+    date_hierarchy = "fecha"
+    readonly_fields = list_display
+
+    def has_add_permission(self, request):
+        return False
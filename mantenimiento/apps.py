@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class MantenimientoConfig(AppConfig):
+    """
+    Planes de mantención (cada N km o M meses por marca/modelo), servicios
+    realizados y la tabla de vencimientos que calcula programador.py.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "mantenimiento"
+    verbose_name = "Mantenimiento"
+
+    def ready(self):
+        from . import signals  # noqa: F401
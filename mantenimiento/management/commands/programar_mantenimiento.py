@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from mantenimiento.programador import programar
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula la próxima mantención de cada vehículo según los planes, "
+        "los servicios registrados y el uso (pensado para cron, p. ej. a diario)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--vehiculo", type=int, action="append", help="Solo estos vehículos (id; repetible).")
+
+    def handle(self, *args, **options):
+        resumen = programar(options["vehiculo"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Vehículos: {resumen['vehiculos']} | Vencimientos: {resumen['vencimientos']} | "
+            f"Vencidos: {resumen['vencidos']} | Próximos: {resumen['proximos']}"
+        ))
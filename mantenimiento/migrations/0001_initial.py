@@ -0,0 +1,91 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:15
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('vehiculos', '0008_lapidas_sincronizacion'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlanMantenimiento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('marca', models.CharField(blank=True, max_length=50, verbose_name='Marca')),
+                ('modelo', models.CharField(blank=True, max_length=50, verbose_name='Modelo')),
+                ('cada_km', models.PositiveIntegerField(blank=True, null=True, verbose_name='Cada (km)')),
+                ('cada_meses', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Cada (meses)')),
+                ('activo', models.BooleanField(default=True, verbose_name='Activo')),
+            ],
+            options={
+                'verbose_name': 'Plan de mantención',
+                'verbose_name_plural': 'Planes de mantención',
+                'ordering': ['nombre', 'marca', 'modelo'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Vencimiento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Vence')),
+                ('motivo', models.CharField(choices=[('km', 'Kilometraje'), ('tiempo', 'Tiempo')], max_length=10, verbose_name='Motivo')),
+                ('km_vence', models.PositiveIntegerField(blank=True, null=True, verbose_name='Vence a los (km)')),
+                ('km_estimado', models.PositiveIntegerField(blank=True, null=True, verbose_name='Odómetro estimado (km)')),
+                ('calculado', models.DateTimeField(verbose_name='Calculado')),
+                ('plan', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vencimientos', to='mantenimiento.planmantenimiento', verbose_name='Plan')),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='vencimientos', to='vehiculos.vehiculo', verbose_name='Vehículo')),
+            ],
+            options={
+                'verbose_name': 'Vencimiento',
+                'verbose_name_plural': 'Vencimientos',
+                'ordering': ['fecha', 'vehiculo_id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RegistroServicio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(default=django.utils.timezone.localdate, verbose_name='Fecha')),
+                ('odometro', models.PositiveIntegerField(blank=True, null=True, verbose_name='Odómetro (km)')),
+                ('notas', models.TextField(blank=True, verbose_name='Notas')),
+                ('plan', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='servicios', to='mantenimiento.planmantenimiento', verbose_name='Plan')),
+                ('registrado_por', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='servicios_registrados', to=settings.AUTH_USER_MODEL, verbose_name='Registrado por')),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='servicios', to='vehiculos.vehiculo', verbose_name='Vehículo')),
+            ],
+            options={
+                'verbose_name': 'Servicio realizado',
+                'verbose_name_plural': 'Servicios realizados',
+                'ordering': ['-fecha', '-id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='planmantenimiento',
+            constraint=models.CheckConstraint(check=models.Q(('cada_km__gt', 0), ('cada_meses__gt', 0), _connector='OR'), name='plan_con_intervalo', violation_error_message='Indique un intervalo en kilómetros, en meses o ambos.'),
+        ),
+        migrations.AddConstraint(
+            model_name='planmantenimiento',
+            constraint=models.UniqueConstraint(fields=('nombre', 'marca', 'modelo'), name='plan_unico'),
+        ),
+        migrations.AddIndex(
+            model_name='vencimiento',
+            index=models.Index(fields=['fecha'], name='vencimiento_fecha_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='vencimiento',
+            constraint=models.UniqueConstraint(fields=('vehiculo', 'plan'), name='vencimiento_unico'),
+        ),
+        migrations.AddIndex(
+            model_name='registroservicio',
+            index=models.Index(fields=['vehiculo', 'plan', '-fecha'], name='servicio_vehiculo_plan_idx'),
+        ),
+    ]
@@ -0,0 +1,140 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+from vehiculos.models import Vehiculo
+
+
+class PlanMantenimiento(models.Model):
+    """
+    Mantención periódica: cada `cada_km` kilómetros o `cada_meses` meses,
+    lo que ocurra primero.
+
+    Aplica a los vehículos de `marca` y `modelo` (en blanco = cualquiera).
+    Si varios planes con el mismo nombre aplican a un vehículo, rige el más
+    específico (marca y modelo > solo marca > general).
+    """
+
+    nombre = models.CharField(max_length=100, verbose_name="Nombre")
+    marca = models.CharField(max_length=50, blank=True, verbose_name="Marca")
+    modelo = models.CharField(max_length=50, blank=True, verbose_name="Modelo")
+
+    cada_km = models.PositiveIntegerField(null=True, blank=True, verbose_name="Cada (km)")
+    cada_meses = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="Cada (meses)")
+
+    activo = models.BooleanField(default=True, verbose_name="Activo")
+
+    class Meta:
+        verbose_name = "Plan de mantención"
+        verbose_name_plural = "Planes de mantención"
+        ordering = ["nombre", "marca", "modelo"]
+        constraints = [
+            models.CheckConstraint(
+                check=Q(cada_km__gt=0) | Q(cada_meses__gt=0),
+                name="plan_con_intervalo",
+                violation_error_message="Indique un intervalo en kilómetros, en meses o ambos.",
+            ),
+            models.UniqueConstraint(fields=["nombre", "marca", "modelo"], name="plan_unico"),
+        ]
+
+    def __str__(self) -> str:
+        alcance = " ".join(filter(None, [self.marca, self.modelo])) or "Toda la flota"
+        return f"{self.nombre} ({alcance})"
+
+
+class RegistroServicio(models.Model):
+    """Mantención realizada a un vehículo. Reinicia el conteo de su plan."""
+
+    vehiculo = models.ForeignKey(
+        Vehiculo,
+        on_delete=models.CASCADE,
+        related_name="servicios",
+        verbose_name="Vehículo",
+    )
+
+    plan = models.ForeignKey(
+        PlanMantenimiento,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="servicios",
+        verbose_name="Plan",
+    )
+
+    fecha = models.DateField(default=timezone.localdate, verbose_name="Fecha")
+    odometro = models.PositiveIntegerField(null=True, blank=True, verbose_name="Odómetro (km)")
+    notas = models.TextField(blank=True, verbose_name="Notas")
+
+    registrado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="servicios_registrados",
+        verbose_name="Registrado por",
+    )
+
+    class Meta:
+        verbose_name = "Servicio realizado"
+        verbose_name_plural = "Servicios realizados"
+        ordering = ["-fecha", "-id"]
+        indexes = [
+            models.Index(fields=["vehiculo", "plan", "-fecha"], name="servicio_vehiculo_plan_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.vehiculo} · {self.plan or 'Servicio'} · {self.fecha:%d/%m/%Y}"
+
+
+class Vencimiento(models.Model):
+    """
+    Próxima mantención de cada vehículo por plan, recalculada por
+    programador.py. El dashboard lee "vence en los próximos N días" con un
+    rango sobre `fecha` (indexado), sin calcular nada por request.
+    """
+
+    KM = "km"
+    TIEMPO = "tiempo"
+    MOTIVOS = [(KM, "Kilometraje"), (TIEMPO, "Tiempo")]
+
+    vehiculo = models.ForeignKey(
+        Vehiculo,
+        on_delete=models.CASCADE,
+        related_name="vencimientos",
+        verbose_name="Vehículo",
+    )
+
+    plan = models.ForeignKey(
+        PlanMantenimiento,
+        on_delete=models.CASCADE,
+        related_name="vencimientos",
+        verbose_name="Plan",
+    )
+
+    fecha = models.DateField(verbose_name="Vence")
+    motivo = models.CharField(max_length=10, choices=MOTIVOS, verbose_name="Motivo")
+
+    # Kilometraje en que vence y el estimado hoy (null: plan solo por tiempo)
+    km_vence = models.PositiveIntegerField(null=True, blank=True, verbose_name="Vence a los (km)")
+    km_estimado = models.PositiveIntegerField(null=True, blank=True, verbose_name="Odómetro estimado (km)")
+
+    calculado = models.DateTimeField(verbose_name="Calculado")
+
+    class Meta:
+        verbose_name = "Vencimiento"
+        verbose_name_plural = "Vencimientos"
+        ordering = ["fecha", "vehiculo_id"]
+        constraints = [
+            models.UniqueConstraint(fields=["vehiculo", "plan"], name="vencimiento_unico"),
+        ]
+        indexes = [
+            models.Index(fields=["fecha"], name="vencimiento_fecha_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.vehiculo} · {self.plan.nombre} · {self.fecha:%d/%m/%Y}"
+
+    @property
+    def vencido(self) -> bool:
+        return self.fecha < timezone.localdate()
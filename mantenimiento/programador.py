@@ -0,0 +1,329 @@
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import TruncDate, Trim, Upper
+from django.utils import timezone
+
+from core.cache import incrementar_generacion
+from vehiculos.models import Vehiculo
+
+from .models import PlanMantenimiento, RegistroServicio, Vencimiento
+from .services import horizonte_dias
+
+
+# --- Programador de Mantenciones ---
+#
+# Calcula la próxima mantención de cada par (vehículo, plan) de la flota en
+# una sola pasada vectorizada con NumPy: cada dato es un array alineado por
+# vehículo o por par, y no hay un ciclo de Python por vehículo.
+#
+#   1. Carga: vehículos activos (con el odómetro de telemetria.UltimaLectura),
+#      planes activos y, agregados en SQL, el último servicio por
+#      (vehículo, plan) y la referencia de kilometraje por vehículo.
+#   2. Pares: máscaras por plan (marca/modelo); rige el plan más específico
+#      de cada nombre.
+#   3. Uso (km/día) por vehículo desde su último servicio con odómetro; sin
+#      datos, la mediana de la flota o MANTENIMIENTO_KM_DIA.
+#   4. Vence por km (fecha estimada con el uso) o por meses, lo primero.
+#   5. Upsert en Vencimiento y borrado de los pares que ya no aplican.
+#
+# Sin servicios registrados, el conteo parte del alta del vehículo. Pensado
+# para correr a diario (programar_mantenimiento) y, para un vehículo, al
+# registrar uno de sus servicios.
+
+DIA = np.timedelta64(1, "D")
+
+# Las fechas estimadas se acotan a ±20 años (uso ~0 km/día o datos erróneos)
+MARGEN_DIAS = 20 * 365
+
+# Marca "sin fecha" en los cálculos por día (plan sin km o sin meses)
+SIN_FECHA = np.iinfo(np.int64).max
+
+
+def _km_dia_por_defecto() -> float:
+    return getattr(settings, "MANTENIMIENTO_KM_DIA", 50)
+
+
+def _min_dias_tasa() -> int:
+    return getattr(settings, "MANTENIMIENTO_MIN_DIAS_TASA", 7)
+
+
+def _fechas(valores) -> np.ndarray:
+    return np.array(valores, dtype="datetime64[D]")
+
+
+def _numeros(valores) -> np.ndarray:
+    # None → NaN
+    return np.array(valores, dtype=float)
+
+
+def sumar_meses(fechas: np.ndarray, meses: np.ndarray) -> np.ndarray:
+    """fechas + meses, llevando el día al último del mes si no existe (31/01 + 1 → 28/02)."""
+    mes = fechas.astype("datetime64[M]")
+    dia = fechas - mes.astype("datetime64[D]")
+    destino = mes + meses.astype("timedelta64[M]")
+    ultimo_dia = (destino + np.timedelta64(1, "M")).astype("datetime64[D]") - DIA
+    return np.minimum(destino.astype("datetime64[D]") + dia, ultimo_dia)
+
+
+def _unir(claves_izq: np.ndarray, claves_der: np.ndarray) -> tuple:
+    """
+    Posición en `claves_der` de cada clave de `claves_izq`. Devuelve
+    (posiciones, encontradas); JOIN vectorizado por búsqueda binaria.
+    """
+    if claves_der.size == 0:
+        return np.zeros(claves_izq.size, dtype=np.int64), np.zeros(claves_izq.size, dtype=bool)
+    orden = np.argsort(claves_der)
+    posiciones = np.searchsorted(claves_der, claves_izq, sorter=orden).clip(max=claves_der.size - 1)
+    posiciones = orden[posiciones]
+    return posiciones, claves_der[posiciones] == claves_izq
+
+
+def _tomar(valores: np.ndarray, posiciones: np.ndarray, encontradas: np.ndarray, relleno) -> np.ndarray:
+    """valores[posiciones] donde hubo coincidencia; `relleno` (escalar o array) donde no."""
+    if valores.size == 0:
+        return np.broadcast_to(relleno, posiciones.shape).copy()
+    return np.where(encontradas, valores[posiciones], relleno)
+
+
+def _clave(vehiculo_ids: np.ndarray, plan_ids: np.ndarray) -> np.ndarray:
+    return vehiculo_ids.astype(np.int64) << 32 | plan_ids.astype(np.int64)
+
+
+# --- Carga ---
+
+def _cargar_vehiculos(vehiculo_ids) -> dict:
+    qs = Vehiculo.objects.filter(activo=True)
+    if vehiculo_ids is not None:
+        qs = qs.filter(pk__in=vehiculo_ids)
+    filas = list(qs.order_by("pk").values_list(
+        "pk",
+        Upper(Trim("marca")),
+        Upper(Trim("modelo")),
+        TruncDate("fecha_creacion"),
+        "ultima_lectura__odometro",
+    ))
+    ids, marcas, modelos, altas, odometros = zip(*filas) if filas else ((),) * 5
+    return {
+        "ids": np.array(ids, dtype=np.int64),
+        "marcas": np.array(marcas, dtype=str),
+        "modelos": np.array(modelos, dtype=str),
+        "altas": _fechas(altas),
+        "odometros": _numeros(odometros),
+    }
+
+
+def _cargar_planes() -> list:
+    return list(
+        PlanMantenimiento.objects.filter(activo=True)
+        .order_by("pk")
+        .values("pk", "nombre", "cada_km", "cada_meses", marca_n=Upper(Trim("marca")), modelo_n=Upper(Trim("modelo")))
+    )
+
+
+def _servicios(vehiculo_ids, **filtros):
+    qs = RegistroServicio.objects.filter(**filtros)
+    if vehiculo_ids is not None:
+        qs = qs.filter(vehiculo_id__in=vehiculo_ids)
+    return qs
+
+
+def _ultimos_servicios(vehiculo_ids, plan_ids) -> dict:
+    """Último servicio (fecha y mayor odómetro) de cada (vehículo, plan), agregado en SQL."""
+    filas = list(
+        _servicios(vehiculo_ids, plan_id__in=plan_ids)
+        .values("vehiculo_id", "plan_id")
+        .annotate(ultima=Max("fecha"), km=Max("odometro"))
+        .values_list("vehiculo_id", "plan_id", "ultima", "km")
+    )
+    vehiculos, planes, fechas, km = zip(*filas) if filas else ((),) * 4
+    return {
+        "claves": _clave(np.array(vehiculos, dtype=np.int64), np.array(planes, dtype=np.int64)),
+        "fechas": _fechas(fechas),
+        "km": _numeros(km),
+    }
+
+
+def _referencias_km(vehiculo_ids, hasta=None) -> dict:
+    """Última fecha y mayor odómetro registrados en servicios de cada vehículo (opcionalmente hasta una fecha)."""
+    filtros = {"odometro__isnull": False}
+    if hasta is not None:
+        filtros["fecha__lte"] = hasta
+    filas = list(
+        _servicios(vehiculo_ids, **filtros)
+        .values("vehiculo_id")
+        .annotate(ultima=Max("fecha"), km=Max("odometro"))
+        .values_list("vehiculo_id", "ultima", "km")
+    )
+    vehiculos, fechas, km = zip(*filas) if filas else ((),) * 3
+    return {"ids": np.array(vehiculos, dtype=np.int64), "fechas": _fechas(fechas), "km": _numeros(km)}
+
+
+# --- Cálculo ---
+
+def asignar_planes(marcas: np.ndarray, modelos: np.ndarray, planes: list) -> tuple:
+    """
+    Pares (índice de vehículo, índice de plan) que aplican. Un ciclo por
+    plan (decenas), no por vehículo: cada plan es una máscara sobre la flota.
+    """
+    por_nombre = defaultdict(list)
+    for indice, plan in enumerate(planes):
+        por_nombre[plan["nombre"].strip().lower()].append(indice)
+
+    especificidad = lambda i: (bool(planes[i]["marca_n"]) + bool(planes[i]["modelo_n"]), bool(planes[i]["modelo_n"]))
+    pares_vehiculo, pares_plan = [np.empty(0, dtype=np.int64)], [np.empty(0, dtype=np.int64)]
+    for indices in por_nombre.values():
+        asignado = np.full(marcas.size, -1, dtype=np.int64)
+        # De menos a más específico: el último plan que aplica es el que rige
+        for indice in sorted(indices, key=especificidad):
+            aplica = np.ones(marcas.size, dtype=bool)
+            if planes[indice]["marca_n"]:
+                aplica &= marcas == planes[indice]["marca_n"]
+            if planes[indice]["modelo_n"]:
+                aplica &= modelos == planes[indice]["modelo_n"]
+            asignado[aplica] = indice
+        vehiculos = np.flatnonzero(asignado >= 0)
+        pares_vehiculo.append(vehiculos)
+        pares_plan.append(asignado[vehiculos])
+    return np.concatenate(pares_vehiculo), np.concatenate(pares_plan)
+
+
+def calcular_uso(ids: np.ndarray, odometros: np.ndarray, referencias: dict, hoy, por_defecto: float) -> np.ndarray:
+    """
+    km/día de cada vehículo: (odómetro actual − odómetro de referencia) /
+    días transcurridos. Sin dato válido, la mediana de la flota (o
+    `por_defecto` si nadie tiene dato).
+    """
+    posiciones, encontradas = _unir(ids, referencias["ids"])
+    dias = _tomar((hoy - referencias["fechas"]) / DIA, posiciones, encontradas, 0.0)
+    km_ref = _tomar(referencias["km"], posiciones, encontradas, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        uso = (odometros - km_ref) / dias
+    validas = (dias > 0) & np.isfinite(uso) & (uso > 0)
+    respaldo = float(np.median(uso[validas])) if validas.any() else por_defecto
+    return np.where(validas, uso, respaldo)
+
+
+def estimar_odometro(ids: np.ndarray, odometros: np.ndarray, altas: np.ndarray, referencias: dict, uso: np.ndarray, hoy) -> np.ndarray:
+    """
+    Odómetro de hoy: el de telemetría; si no hay, el último registrado en un
+    servicio más el uso desde entonces; si tampoco, el uso desde el alta.
+    """
+    posiciones, encontradas = _unir(ids, referencias["ids"])
+    fecha_ref = _tomar(referencias["fechas"], posiciones, encontradas, altas)
+    km_ref = _tomar(referencias["km"], posiciones, encontradas, 0.0)
+    desde_referencia = km_ref + uso * ((hoy - fecha_ref) / DIA)
+    return np.where(np.isfinite(odometros), odometros, desde_referencia)
+
+
+def calcular_vencimientos(base_fecha, base_km, estimado, uso, cada_km, cada_meses, hoy) -> tuple:
+    """
+    Por par: (fecha de vencimiento en días desde 1970, motivo, km en que vence).
+    Vence por km en la fecha en que el uso actual alcanza base_km + cada_km,
+    o por tiempo a base_fecha + cada_meses; lo que ocurra primero.
+    """
+    hoy_dias = hoy.astype(np.int64)
+    km_vence = base_km + cada_km
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dias_km = np.floor((km_vence - estimado) / uso)
+    fecha_km = np.where(
+        np.isfinite(cada_km),
+        hoy_dias + np.nan_to_num(dias_km).clip(-MARGEN_DIAS, MARGEN_DIAS).astype(np.int64),
+        SIN_FECHA,
+    )
+
+    fecha_meses = np.where(
+        np.isfinite(cada_meses),
+        sumar_meses(base_fecha, np.nan_to_num(cada_meses).astype(np.int64)).astype(np.int64),
+        SIN_FECHA,
+    )
+
+    fecha = np.minimum(fecha_km, fecha_meses).clip(hoy_dias - MARGEN_DIAS, hoy_dias + MARGEN_DIAS)
+    motivo = np.where(fecha_km <= fecha_meses, Vencimiento.KM, Vencimiento.TIEMPO)
+    return fecha, motivo, km_vence
+
+
+def programar(vehiculo_ids=None) -> dict:
+    """
+    Recalcula los vencimientos de toda la flota (o de `vehiculo_ids`).
+    Devuelve un resumen con los pares calculados, vencidos y próximos.
+    """
+    hoy = np.datetime64(timezone.localdate(), "D")
+    ahora = timezone.now()
+
+    vehiculos = _cargar_vehiculos(vehiculo_ids)
+    planes = _cargar_planes()
+    ids = vehiculos["ids"]
+
+    # Uso diario desde una referencia de al menos MANTENIMIENTO_MIN_DIAS_TASA días
+    limite_tasa = timezone.localdate() - timedelta(days=_min_dias_tasa())
+    uso = calcular_uso(ids, vehiculos["odometros"], _referencias_km(vehiculo_ids, hasta=limite_tasa), hoy, _km_dia_por_defecto())
+    estimado = estimar_odometro(ids, vehiculos["odometros"], vehiculos["altas"], _referencias_km(vehiculo_ids), uso, hoy)
+
+    # Pares (vehículo, plan), con los datos del plan alineados por par
+    v, p = asignar_planes(vehiculos["marcas"], vehiculos["modelos"], planes)
+    plan_ids = np.array([plan["pk"] for plan in planes], dtype=np.int64)[p]
+    cada_km = _numeros([plan["cada_km"] for plan in planes])[p]
+    cada_meses = _numeros([plan["cada_meses"] for plan in planes])[p]
+
+    # Base de cada par: su último servicio o, si no tiene, el alta del vehículo
+    ultimos = _ultimos_servicios(vehiculo_ids, plan_ids.tolist())
+    posiciones, con_servicio = _unir(_clave(ids[v], plan_ids), ultimos["claves"])
+    base_fecha = _tomar(ultimos["fechas"], posiciones, con_servicio, vehiculos["altas"][v])
+    km_servicio = _tomar(ultimos["km"], posiciones, con_servicio, np.nan)
+    # Sin odómetro registrado en la base: el estimado para ese día según el uso
+    dias_base = (hoy - base_fecha) / DIA
+    base_km = np.where(np.isfinite(km_servicio), km_servicio, np.maximum(estimado[v] - uso[v] * dias_base, 0))
+
+    fecha, motivo, km_vence = calcular_vencimientos(base_fecha, base_km, estimado[v], uso[v], cada_km, cada_meses, hoy)
+
+    filas = [
+        Vencimiento(
+            vehiculo_id=vehiculo_id,
+            plan_id=plan_id,
+            fecha=dia,
+            motivo=razon,
+            km_vence=km,
+            km_estimado=km_hoy,
+            calculado=ahora,
+        )
+        for vehiculo_id, plan_id, dia, razon, km, km_hoy in zip(
+            ids[v].tolist(),
+            plan_ids.tolist(),
+            fecha.astype("datetime64[D]").tolist(),
+            motivo.tolist(),
+            [None if np.isnan(km) else int(km) for km in np.round(km_vence).tolist()],
+            np.round(estimado[v]).clip(min=0).astype(np.int64).tolist(),
+        )
+    ]
+    _guardar(filas, ahora, vehiculo_ids)
+
+    hoy_dias = hoy.astype(np.int64)
+    return {
+        "vehiculos": int(ids.size),
+        "vencimientos": len(filas),
+        "vencidos": int((fecha < hoy_dias).sum()),
+        "proximos": int(((fecha >= hoy_dias) & (fecha <= hoy_dias + horizonte_dias())).sum()),
+    }
+
+
+def _guardar(filas: list, ahora, vehiculo_ids) -> None:
+    """Upsert por (vehículo, plan); los pares no recalculados ya no aplican y se borran."""
+    with transaction.atomic():
+        Vencimiento.objects.bulk_create(
+            filas,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["vehiculo", "plan"],
+            update_fields=["fecha", "motivo", "km_vence", "km_estimado", "calculado"],
+        )
+        obsoletos = Vencimiento.objects.filter(calculado__lt=ahora)
+        if vehiculo_ids is not None:
+            obsoletos = obsoletos.filter(vehiculo_id__in=vehiculo_ids)
+        obsoletos.delete()
+        # Invalida las próximas mantenciones cacheadas del dashboard
+        transaction.on_commit(lambda: incrementar_generacion("mantenimiento"))
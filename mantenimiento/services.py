@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from core.cache import aclave_versionada, clave_versionada
+from core.routers import leer_de_primaria
+
+from .models import Vencimiento
+
+
+# Filas de "próximas mantenciones" que muestra el dashboard
+LIMITE_DASHBOARD = 10
+
+
+def horizonte_dias() -> int:
+    return getattr(settings, "MANTENIMIENTO_HORIZONTE_DIAS", 14)
+
+
+def vencimientos_proximos(usuario, dias: int | None = None):
+    """
+    Mantenciones vencidas o que vencen en los próximos `dias` (por defecto
+    MANTENIMIENTO_HORIZONTE_DIAS), de los vehículos visibles para el
+    usuario. Un rango sobre Vencimiento.fecha (indexado).
+    """
+    limite = timezone.localdate() + timedelta(days=horizonte_dias() if dias is None else dias)
+    qs = (
+        Vencimiento.objects
+        .filter(fecha__lte=limite)
+        .select_related("vehiculo", "plan")
+        .only("fecha", "motivo", "km_vence", "km_estimado", "vehiculo__patente", "vehiculo__marca", "vehiculo__modelo", "plan__nombre")
+        .order_by("fecha", "vehiculo_id")
+    )
+    if not usuario.is_staff:
+        qs = qs.filter(vehiculo__usuario=usuario)
+    return qs
+
+
+# --- Próximas Mantenciones del Dashboard (caché) ---
+#
+# Por alcance (staff o conductor) y día, versionadas por las generaciones
+# "mantenimiento" (el programador reescribe los vencimientos, un plan
+# cambia) y "vehiculos" (altas, bajas, reasignaciones).
+
+GRUPOS_DASHBOARD = ("mantenimiento", "vehiculos")
+
+
+def _timeout_dashboard() -> int:
+    return getattr(settings, "MANTENIMIENTO_CACHE_TIMEOUT", 300)
+
+
+def _partes_dashboard(usuario) -> tuple:
+    alcance = "staff" if usuario.is_staff else f"usuario:{usuario.pk}"
+    return alcance, timezone.localdate().isoformat(), horizonte_dias()
+
+
+def proximos_dashboard(usuario) -> list:
+    """Las LIMITE_DASHBOARD primeras de vencimientos_proximos(), cacheadas."""
+    clave = clave_versionada("mantenimiento:dashboard", GRUPOS_DASHBOARD, *_partes_dashboard(usuario))
+    proximos = cache.get(clave)
+    if proximos is None:
+        with leer_de_primaria():
+            proximos = list(vencimientos_proximos(usuario)[:LIMITE_DASHBOARD])
+        cache.set(clave, proximos, _timeout_dashboard())
+    return proximos
+
+
+async def aproximos_dashboard(usuario) -> list:
+    clave = await aclave_versionada("mantenimiento:dashboard", GRUPOS_DASHBOARD, *_partes_dashboard(usuario))
+    proximos = await cache.aget(clave)
+    if proximos is None:
+        with leer_de_primaria():
+            proximos = [v async for v in vencimientos_proximos(usuario)[:LIMITE_DASHBOARD]]
+        await cache.aset(clave, proximos, _timeout_dashboard())
+    return proximos
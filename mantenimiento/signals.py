@@ -0,0 +1,34 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import incrementar_generacion
+from tareas.servicios import encolar
+from vehiculos.models import Vehiculo
+
+from .models import PlanMantenimiento, RegistroServicio
+from .programador import programar
+
+
+# Un servicio nuevo solo cambia los vencimientos de su vehículo: se
+# recalculan en el momento. Un plan puede afectar a toda la flota: se encola.
+
+@receiver(post_save, sender=RegistroServicio)
+@receiver(post_delete, sender=RegistroServicio)
+def reprogramar_vehiculo(sender, instance, raw=False, origin=None, **kwargs):
+    # Al eliminar el vehículo sus vencimientos caen en cascada: no hay qué recalcular
+    if raw or isinstance(origin, Vehiculo) or getattr(origin, "model", None) is Vehiculo:
+        return
+    vehiculo_id = instance.vehiculo_id
+    transaction.on_commit(lambda: programar([vehiculo_id]))
+
+
+@receiver(post_save, sender=PlanMantenimiento)
+@receiver(post_delete, sender=PlanMantenimiento)
+def reprogramar_flota(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # La generación entra en la huella: una edición posterior no reutiliza
+    # una tarea ya completada con los planes anteriores
+    incrementar_generacion("mantenimiento")
+    transaction.on_commit(lambda: encolar("mantenimiento.programar", {}, grupos=("mantenimiento",)))
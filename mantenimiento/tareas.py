@@ -0,0 +1,12 @@
+from tareas.registro import tarea
+
+from .programador import programar
+
+
+# --- Tareas en Segundo Plano de Mantenimiento ---
+
+@tarea("mantenimiento.programar")
+def programar_flota(parametros: dict, progreso) -> str:
+    """Recalcula los vencimientos de toda la flota (p. ej. tras editar un plan)."""
+    programar()
+    return ""
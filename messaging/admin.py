@@ -1,3 +1,47 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ContadorNoLeidos, Hilo, Mensaje, Participante
+
+
+class ParticipanteInline(admin.TabularInline):
+    model = Participante
+    extra = 0
+    fields = ("usuario", "no_leidos", "ultimo_mensaje", "leido")
+    readonly_fields = ("no_leidos", "ultimo_mensaje", "leido")
+    raw_id_fields = ("usuario",)
+
+
+class MensajeInline(admin.TabularInline):
+    model = Mensaje
+    extra = 0
+    fields = ("autor", "cuerpo", "enviado")
+    readonly_fields = fields
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        # Los mensajes se envían desde la app (actualiza bandejas y contadores)
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("autor")
+
+
+@admin.register(Hilo)
+class HiloAdmin(admin.ModelAdmin):
+    list_display = ("asunto", "vehiculo", "creado_por", "ultimo_mensaje")
+    list_select_related = ("vehiculo", "creado_por")
+    search_fields = ("asunto", "vehiculo__patente")
+    raw_id_fields = ("vehiculo", "creado_por")
+    readonly_fields = ("creado", "ultimo_mensaje", "resumen")
+    inlines = [ParticipanteInline, MensajeInline]
+
+
+@admin.register(ContadorNoLeidos)
+class ContadorNoLeidosAdmin(admin.ModelAdmin):
+    list_display = ("usuario", "no_leidos")
+    list_select_related = ("usuario",)
+    search_fields = ("usuario__username",)
+    readonly_fields = ("usuario", "no_leidos")
+
+    def has_add_permission(self, request):
+        return False
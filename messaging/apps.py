@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MessagingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'messaging'
+    verbose_name = "Mensajería"
+
+    def ready(self):
+        from . import signals  # noqa: F401
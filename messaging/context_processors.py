@@ -0,0 +1,27 @@
+from django.core.exceptions import SynchronousOnlyOperation
+from django.utils.functional import SimpleLazyObject
+
+from .services import no_leidos
+
+
+def mensajes(request):
+    """
+    Badge de mensajes no leídos de la navbar. Se lee solo si el template lo
+    usa, con una consulta por clave primaria a ContadorNoLeidos.
+
+    Las vistas async lo precargan (services.aprecargar_no_leidos); si alguna
+    no lo hizo, el badge se omite en vez de consultar dentro del event loop.
+    """
+    if hasattr(request, "mensajes_no_leidos"):
+        return {"mensajes_no_leidos": request.mensajes_no_leidos}
+
+    def contar():
+        user = request.user
+        if not user.is_authenticated:
+            return 0
+        try:
+            return no_leidos(user)
+        except SynchronousOnlyOperation:
+            return 0
+
+    return {"mensajes_no_leidos": SimpleLazyObject(contar)}
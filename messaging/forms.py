@@ -0,0 +1,52 @@
+from django import forms
+from django.contrib.auth.models import User
+
+from accounts.autocompletar import CAMPOS_USUARIO, AutocompletarUsuarioSelect, UsuarioChoiceField
+from vehiculos.models import Vehiculo
+
+
+class NuevoHiloForm(forms.Form):
+    """
+    Nuevo mensaje. Los administradores escriben a cualquier usuario (selector
+    con autocompletado); los conductores, a los administradores de flota.
+    """
+
+    destinatario = UsuarioChoiceField(
+        label="Para",
+        empty_label="--- Seleccione un destinatario ---",
+        widget=AutocompletarUsuarioSelect(attrs={"class": "form-select"}),
+    )
+
+    asunto = forms.CharField(
+        max_length=150,
+        widget=forms.TextInput(attrs={"class": "form-control", "placeholder": "Ej: Mantención programada"}),
+    )
+
+    cuerpo = forms.CharField(
+        label="Mensaje",
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 5}),
+    )
+
+    # Hilo sobre un vehículo (?vehiculo=<pk> desde el listado de la flota)
+    vehiculo = forms.ModelChoiceField(
+        queryset=Vehiculo.objects.only("id", "patente"),
+        required=False,
+        widget=forms.HiddenInput,
+    )
+
+    def __init__(self, *args, usuario=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if usuario is not None and not usuario.is_staff:
+            campo = self.fields["destinatario"]
+            campo.queryset = User.objects.filter(is_staff=True, is_active=True).only(*CAMPOS_USUARIO).order_by("username")
+            campo.widget = forms.Select(attrs={"class": "form-select"})
+            campo.widget.choices = campo.choices
+            # Un conductor solo abre hilos sobre sus propios vehículos
+            self.fields["vehiculo"].queryset = Vehiculo.objects.filter(usuario=usuario).only("id", "patente")
+
+
+class RespuestaForm(forms.Form):
+    cuerpo = forms.CharField(
+        label="Respuesta",
+        widget=forms.Textarea(attrs={"class": "form-control", "rows": 3, "placeholder": "Escriba su respuesta..."}),
+    )
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from messaging.services import recalcular_contadores
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye los contadores de mensajes no leídos desde las bandejas. "
+        "Solo es necesario tras editar datos a mano (p. ej. con SQL directo)."
+    )
+
+    def handle(self, *args, **options):
+        corregidos = recalcular_contadores()
+        self.stdout.write(self.style.SUCCESS(f"Contadores corregidos: {corregidos}."))
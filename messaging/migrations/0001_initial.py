@@ -0,0 +1,87 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('vehiculos', '0008_lapidas_sincronizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorNoLeidos',
+            fields=[
+                ('usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='contador_no_leidos', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+                ('no_leidos', models.PositiveIntegerField(default=0, verbose_name='No leídos')),
+            ],
+            options={
+                'verbose_name': 'Contador de no leídos',
+                'verbose_name_plural': 'Contadores de no leídos',
+            },
+        ),
+        migrations.CreateModel(
+            name='Hilo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asunto', models.CharField(max_length=150, verbose_name='Asunto')),
+                ('creado', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Creado')),
+                ('ultimo_mensaje', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Último mensaje')),
+                ('resumen', models.CharField(blank=True, max_length=160, verbose_name='Resumen')),
+                ('creado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hilos_creados', to=settings.AUTH_USER_MODEL, verbose_name='Creado por')),
+                ('vehiculo', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='hilos', to='vehiculos.vehiculo', verbose_name='Vehículo')),
+            ],
+            options={
+                'verbose_name': 'Hilo',
+                'verbose_name_plural': 'Hilos',
+                'ordering': ['-ultimo_mensaje'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Mensaje',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cuerpo', models.TextField(verbose_name='Mensaje')),
+                ('enviado', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Enviado')),
+                ('autor', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='mensajes_enviados', to=settings.AUTH_USER_MODEL, verbose_name='Autor')),
+                ('hilo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mensajes', to='messaging.hilo', verbose_name='Hilo')),
+            ],
+            options={
+                'verbose_name': 'Mensaje',
+                'verbose_name_plural': 'Mensajes',
+                'ordering': ['enviado', 'id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Participante',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ultimo_mensaje', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Último mensaje')),
+                ('no_leidos', models.PositiveIntegerField(default=0, verbose_name='No leídos')),
+                ('leido', models.DateTimeField(blank=True, null=True, verbose_name='Leído por última vez')),
+                ('hilo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='participantes', to='messaging.hilo', verbose_name='Hilo')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bandeja', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+            ],
+            options={
+                'verbose_name': 'Participante',
+                'verbose_name_plural': 'Participantes',
+                'indexes': [models.Index(fields=['usuario', '-ultimo_mensaje', '-id'], name='msg_bandeja_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='participante',
+            constraint=models.UniqueConstraint(fields=('hilo', 'usuario'), name='participante_unico'),
+        ),
+        migrations.AddIndex(
+            model_name='mensaje',
+            index=models.Index(fields=['hilo', 'enviado', 'id'], name='msg_hilo_enviado_idx'),
+        ),
+    ]
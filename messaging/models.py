@@ -1,3 +1,126 @@
 from django.db import models
+from django.contrib.auth.models import User
+from django.utils import timezone
 
-# Create your models here.
+
+class Hilo(models.Model):
+    """
+    Conversación entre usuarios (administradores de flota y conductores),
+    opcionalmente sobre un vehículo ("vehículo X debe ir a mantención").
+    """
+
+    asunto = models.CharField(max_length=150, verbose_name="Asunto")
+
+    vehiculo = models.ForeignKey(
+        "vehiculos.Vehiculo",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="hilos",
+        verbose_name="Vehículo",
+    )
+
+    creado_por = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="hilos_creados",
+        verbose_name="Creado por",
+    )
+
+    creado = models.DateTimeField(default=timezone.now, verbose_name="Creado")
+    ultimo_mensaje = models.DateTimeField(default=timezone.now, verbose_name="Último mensaje")
+
+    # Inicio del último mensaje, para la bandeja (evita leer `Mensaje` por hilo)
+    resumen = models.CharField(max_length=160, blank=True, verbose_name="Resumen")
+
+    class Meta:
+        verbose_name = "Hilo"
+        verbose_name_plural = "Hilos"
+        ordering = ["-ultimo_mensaje"]
+
+    def __str__(self) -> str:
+        return self.asunto
+
+
+class Participante(models.Model):
+    """
+    Fila de la bandeja de entrada: un hilo visto por uno de sus usuarios.
+
+    Repite `ultimo_mensaje` del hilo para que la bandeja sea un recorrido
+    del índice (usuario, ultimo_mensaje, id) sin JOIN ni ORDER BY en memoria,
+    y guarda los mensajes que ese usuario aún no lee.
+    """
+
+    hilo = models.ForeignKey(Hilo, on_delete=models.CASCADE, related_name="participantes", verbose_name="Hilo")
+    usuario = models.ForeignKey(User, on_delete=models.CASCADE, related_name="bandeja", verbose_name="Usuario")
+
+    ultimo_mensaje = models.DateTimeField(default=timezone.now, verbose_name="Último mensaje")
+    no_leidos = models.PositiveIntegerField(default=0, verbose_name="No leídos")
+    leido = models.DateTimeField(null=True, blank=True, verbose_name="Leído por última vez")
+
+    class Meta:
+        verbose_name = "Participante"
+        verbose_name_plural = "Participantes"
+        constraints = [
+            models.UniqueConstraint(fields=["hilo", "usuario"], name="participante_unico"),
+        ]
+        indexes = [
+            # Bandeja: hilos del usuario del más reciente al más antiguo (keyset)
+            models.Index(fields=["usuario", "-ultimo_mensaje", "-id"], name="msg_bandeja_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.usuario} en {self.hilo}"
+
+
+class Mensaje(models.Model):
+    hilo = models.ForeignKey(Hilo, on_delete=models.CASCADE, related_name="mensajes", verbose_name="Hilo")
+
+    autor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="mensajes_enviados",
+        verbose_name="Autor",
+    )
+
+    cuerpo = models.TextField(verbose_name="Mensaje")
+    enviado = models.DateTimeField(default=timezone.now, verbose_name="Enviado")
+
+    class Meta:
+        verbose_name = "Mensaje"
+        verbose_name_plural = "Mensajes"
+        ordering = ["enviado", "id"]
+        indexes = [
+            # Mensajes de un hilo en orden cronológico (keyset hacia atrás)
+            models.Index(fields=["hilo", "enviado", "id"], name="msg_hilo_enviado_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.autor} · {self.enviado:%d/%m/%Y %H:%M}"
+
+
+class ContadorNoLeidos(models.Model):
+    """
+    Total de mensajes no leídos de un usuario, mantenido en la misma
+    transacción que envía o marca como leído (ver services.py). El badge del
+    navbar lo lee por clave primaria en vez de sumar la bandeja.
+    """
+
+    usuario = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="contador_no_leidos",
+        verbose_name="Usuario",
+    )
+
+    no_leidos = models.PositiveIntegerField(default=0, verbose_name="No leídos")
+
+    class Meta:
+        verbose_name = "Contador de no leídos"
+        verbose_name_plural = "Contadores de no leídos"
+
+    def __str__(self) -> str:
+        return f"{self.usuario}: {self.no_leidos}"
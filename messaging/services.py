@@ -0,0 +1,175 @@
+import textwrap
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from core.cache import grupo_navbar, incrementar_generacion
+from core.eventos import publicar_al_confirmar
+from core.paginacion import paginar_keyset
+
+from .models import ContadorNoLeidos, Hilo, Mensaje, Participante
+
+
+# --- Envío ---
+#
+# Cada mensaje actualiza, en la misma transacción, la fila de bandeja de
+# cada participante y el ContadorNoLeidos de los destinatarios: el contador
+# nunca queda desfasado respecto de los mensajes guardados.
+
+RESUMEN_CARACTERES = 150
+
+ORDEN_BANDEJA = ("-ultimo_mensaje", "-id")
+ORDEN_MENSAJES = ("-enviado", "-id")
+
+
+def _mensajes_por_pagina() -> int:
+    return getattr(settings, "MENSAJES_POR_PAGINA", 30)
+
+
+def _invalidar_navbar(usuario_ids) -> None:
+    """Las respuestas cacheadas incluyen el badge: se invalidan tras el commit."""
+    ids = list(usuario_ids)
+    transaction.on_commit(lambda: incrementar_generacion(*(grupo_navbar(pk) for pk in ids)))
+
+
+def _sumar_no_leidos(usuario_ids, cantidad: int) -> None:
+    if not usuario_ids:
+        return
+    # Solo al sumar hace falta crear el contador: sin fila ya vale 0 y un
+    # descuento (p. ej. durante el borrado del usuario) no debe insertarla
+    if cantidad > 0:
+        ContadorNoLeidos.objects.bulk_create(
+            [ContadorNoLeidos(usuario_id=pk) for pk in usuario_ids],
+            ignore_conflicts=True,
+        )
+    contadores = ContadorNoLeidos.objects.filter(usuario_id__in=usuario_ids)
+    contadores.update(no_leidos=Greatest(F("no_leidos") + cantidad, Value(0)))
+    _invalidar_navbar(usuario_ids)
+
+    # Badge en vivo (core/sse.py): cada usuario recibe solo su propio total
+    publicar_al_confirmar(
+        "mensajes.no_leidos",
+        {},
+        usuarios=usuario_ids,
+        por_usuario={pk: {"no_leidos": n} for pk, n in contadores.values_list("usuario_id", "no_leidos")},
+    )
+
+
+def _publicar(hilo: Hilo, autor, cuerpo: str, ahora) -> Mensaje:
+    mensaje = Mensaje.objects.create(hilo=hilo, autor=autor, cuerpo=cuerpo, enviado=ahora)
+
+    resumen = textwrap.shorten(cuerpo, RESUMEN_CARACTERES, placeholder="…")
+    Hilo.objects.filter(pk=hilo.pk).update(ultimo_mensaje=ahora, resumen=resumen)
+    filas = Participante.objects.filter(hilo=hilo)
+    filas.filter(usuario=autor).update(ultimo_mensaje=ahora, leido=ahora)
+    destinatarios = list(filas.exclude(usuario=autor).values_list("usuario_id", flat=True))
+    filas.exclude(usuario=autor).update(ultimo_mensaje=ahora, no_leidos=F("no_leidos") + 1)
+
+    _sumar_no_leidos(destinatarios, 1)
+    publicar_al_confirmar(
+        "mensaje.nuevo",
+        {"hilo": hilo.pk, "asunto": hilo.asunto, "autor": autor.get_full_name() or autor.username, "resumen": resumen},
+        usuarios=destinatarios,
+    )
+    return mensaje
+
+
+@transaction.atomic
+def crear_hilo(autor, destinatarios, asunto: str, cuerpo: str, vehiculo=None) -> Hilo:
+    """Abre un hilo entre `autor` y `destinatarios` con su primer mensaje."""
+    ahora = timezone.now()
+    hilo = Hilo.objects.create(asunto=asunto, vehiculo=vehiculo, creado_por=autor, creado=ahora, ultimo_mensaje=ahora)
+
+    usuario_ids = {autor.pk} | {u.pk for u in destinatarios}
+    Participante.objects.bulk_create([
+        Participante(hilo=hilo, usuario_id=pk, ultimo_mensaje=ahora)
+        for pk in sorted(usuario_ids)
+    ])
+    _publicar(hilo, autor, cuerpo, ahora)
+    return hilo
+
+
+@transaction.atomic
+def responder(hilo: Hilo, autor, cuerpo: str) -> Mensaje:
+    return _publicar(hilo, autor, cuerpo, timezone.now())
+
+
+# --- Lectura ---
+
+def marcar_leido(hilo: Hilo, usuario) -> int:
+    """
+    Deja en cero los no leídos del usuario en el hilo y los descuenta de su
+    contador. Devuelve cuántos había.
+
+    El UPDATE va condicionado al valor leído: si entretanto llegó otro
+    mensaje, se relee y se reintenta, así nunca se descuenta de más.
+    """
+    filas = Participante.objects.filter(hilo=hilo, usuario=usuario)
+    while True:
+        pendientes = filas.values_list("no_leidos", flat=True).first()
+        if not pendientes:
+            return 0
+        with transaction.atomic():
+            if filas.filter(no_leidos=pendientes).update(no_leidos=0, leido=timezone.now()):
+                _sumar_no_leidos([usuario.pk], -pendientes)
+                return pendientes
+
+
+def no_leidos(usuario) -> int:
+    """Total de mensajes no leídos: una lectura por clave primaria."""
+    return ContadorNoLeidos.objects.filter(pk=usuario.pk).values_list("no_leidos", flat=True).first() or 0
+
+
+async def ano_leidos(usuario) -> int:
+    return await ContadorNoLeidos.objects.filter(pk=usuario.pk).values_list("no_leidos", flat=True).afirst() or 0
+
+
+async def aprecargar_no_leidos(request) -> None:
+    """
+    Para vistas async: los templates corren en el event loop, así que el
+    badge de la navbar debe llegar ya leído (ver context_processors.py).
+    """
+    user = request.user
+    request.mensajes_no_leidos = await ano_leidos(user) if user.is_authenticated else 0
+
+
+def recalcular_contadores() -> int:
+    """
+    Reconstruye ContadorNoLeidos desde la bandeja (reparación; en operación
+    normal se mantiene solo). Devuelve los contadores corregidos.
+    """
+    reales = dict(
+        Participante.objects.filter(no_leidos__gt=0)
+        .values("usuario_id")
+        .annotate(total=Sum("no_leidos"))
+        .values_list("usuario_id", "total")
+    )
+    corregidos = []
+    with transaction.atomic():
+        for contador in ContadorNoLeidos.objects.select_for_update():
+            total = reales.pop(contador.pk, 0)
+            if contador.no_leidos != total:
+                contador.no_leidos = total
+                corregidos.append(contador)
+        ContadorNoLeidos.objects.bulk_update(corregidos, ["no_leidos"])
+        ContadorNoLeidos.objects.bulk_create([ContadorNoLeidos(usuario_id=pk, no_leidos=n) for pk, n in reales.items()])
+        _invalidar_navbar([c.pk for c in corregidos] + list(reales))
+    return len(corregidos) + len(reales)
+
+
+# --- Listados (paginación por cursor) ---
+
+def bandeja(usuario):
+    return Participante.objects.filter(usuario=usuario).select_related("hilo", "hilo__vehiculo")
+
+
+def paginar_bandeja(usuario, cursor: str | None, tamano: int | None = None):
+    return paginar_keyset(bandeja(usuario), ORDEN_BANDEJA, cursor, tamano or _mensajes_por_pagina())
+
+
+def paginar_mensajes(hilo: Hilo, cursor: str | None, tamano: int | None = None):
+    """Del más reciente hacia atrás; el cursor lleva a mensajes anteriores."""
+    return paginar_keyset(hilo.mensajes.select_related("autor"), ORDEN_MENSAJES, cursor, tamano or _mensajes_por_pagina())
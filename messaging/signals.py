@@ -0,0 +1,19 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Participante
+from .services import _sumar_no_leidos
+
+
+@receiver(post_delete, sender=Participante)
+def descontar_no_leidos(sender, instance, origin=None, **kwargs):
+    """
+    Al eliminar un hilo (o sacar a alguien de él) sus mensajes pendientes
+    dejan de contar en el badge. Si se borra el usuario, su contador cae con
+    él en la misma cascada: no hay nada que descontar.
+    """
+    if isinstance(origin, User) or getattr(origin, "model", None) is User:
+        return
+    if instance.no_leidos:
+        _sumar_no_leidos([instance.usuario_id], -instance.no_leidos)
@@ -1,3 +1,98 @@
-from django.test import TestCase
+import base64
+import json
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .models import ContadorNoLeidos, Hilo, Participante
+from .services import crear_hilo, no_leidos, responder
+
+
+class ContadorNoLeidosTests(TestCase):
+    """El contador del badge sigue a los borrados en cascada sin romperlos."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        self.conductor = User.objects.create_user("conductor", password="x")
+        self.hilo = crear_hilo(self.admin, [self.conductor], "Mantención", "Pasar por el taller")
+
+    def test_borrar_usuario_con_mensajes_pendientes(self):
+        self.assertEqual(no_leidos(self.conductor), 1)
+        pk = self.conductor.pk
+
+        self.conductor.delete()
+
+        self.assertFalse(ContadorNoLeidos.objects.filter(usuario_id=pk).exists())
+        self.assertFalse(Participante.objects.filter(usuario_id=pk).exists())
+        # Las claves foráneas diferidas (SQLite) se verifican aquí y no al final del test
+        connection.check_constraints()
+
+    def test_borrar_autor_no_toca_contador_del_destinatario(self):
+        self.admin.delete()
+
+        self.assertEqual(no_leidos(self.conductor), 1)
+        connection.check_constraints()
+
+    def test_borrar_hilo_descuenta_pendientes(self):
+        Hilo.objects.filter(pk=self.hilo.pk).delete()
+
+        self.assertEqual(ContadorNoLeidos.objects.get(usuario=self.conductor).no_leidos, 0)
+
+    def test_descuento_no_crea_contador(self):
+        ContadorNoLeidos.objects.filter(usuario=self.conductor).delete()
+
+        Hilo.objects.filter(pk=self.hilo.pk).delete()
+
+        self.assertFalse(ContadorNoLeidos.objects.filter(usuario=self.conductor).exists())
+
+
+class BandejaCursorTests(TestCase):
+    """Cursores alterados de la bandeja y de un hilo responden 400."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        self.conductor = User.objects.create_user("conductor", password="x")
+        self.hilo = crear_hilo(self.admin, [self.conductor], "Mantención", "Pasar por el taller")
+        self.client.force_login(self.conductor)
+
+    def test_valores_alterados(self):
+        urls = (reverse("messaging:bandeja"), reverse("messaging:hilo", args=[self.hilo.pk]))
+        for url in urls:
+            for valores in (["2025-01-01T10:00:00+00:00", "x"], [{"a": 1}, 1], [None, 1]):
+                cursor = base64.urlsafe_b64encode(json.dumps(valores).encode()).decode()
+                with self.subTest(url=url, valores=valores):
+                    self.assertEqual(self.client.get(url, {"cursor": cursor}).status_code, 400)
+
+
+@override_settings(PRESUPUESTOS_ESTRICTO=True)
+class PresupuestosTests(TestCase):
+    """
+    Bandeja e hilo dentro de PRESUPUESTOS_VISTAS en modo estricto, con
+    suficientes hilos y participantes para que un N+1 exceda el presupuesto.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.conductores = [User.objects.create_user(f"conductor{i}", password="x") for i in range(4)]
+        for i in range(20):
+            cls.hilo = crear_hilo(cls.admin, cls.conductores, f"Aviso {i}", "Pasar por el taller")
+            responder(cls.hilo, cls.conductores[1], "Recibido")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.conductores[0])
+
+    def test_bandeja(self):
+        respuesta = self.client.get(reverse("messaging:bandeja"))
+
+        self.assertEqual(respuesta.status_code, 200)
+
+    def test_hilo_con_pendientes(self):
+        respuesta = self.client.get(reverse("messaging:hilo", args=[self.hilo.pk]))
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(Participante.objects.get(hilo=self.hilo, usuario=self.conductores[0]).no_leidos, 0)
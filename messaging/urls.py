@@ -5,5 +5,8 @@ from . import views
 app_name = "messaging"
 
 urlpatterns = [
-    # por ahora vacío a nivel funcional
+    path("", views.bandeja, name="bandeja"),
+    path("nuevo/", views.nuevo, name="nuevo"),
+    path("no-leidos/", views.contador, name="no_leidos"),
+    path("<int:pk>/", views.hilo, name="hilo"),
 ]
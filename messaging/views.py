@@ -1,3 +1,81 @@
-from django.shortcuts import render
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
 
-# Create your views here.
+from core.paginacion import CursorInvalido
+
+from .forms import NuevoHiloForm, RespuestaForm
+from .models import Participante
+from .services import crear_hilo, marcar_leido, no_leidos, paginar_bandeja, paginar_mensajes, responder
+
+
+# --- Bandeja de Entrada ---
+
+@login_required
+def bandeja(request: HttpRequest) -> HttpResponse:
+    """
+    Hilos del usuario del más reciente al más antiguo, paginados por cursor
+    sobre el índice (usuario, ultimo_mensaje, id).
+    """
+    try:
+        pagina = paginar_bandeja(request.user, request.GET.get("cursor"))
+    except CursorInvalido as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    return render(request, "messaging/bandeja.html", {
+        "filas": pagina.items,
+        "pagina": pagina,
+    })
+
+
+@login_required
+def hilo(request: HttpRequest, pk: int) -> HttpResponse:
+    """Mensajes del hilo (los más recientes; ?cursor= para los anteriores) y respuesta."""
+    participacion = get_object_or_404(Participante.objects.select_related("hilo", "hilo__vehiculo"), hilo_id=pk, usuario=request.user)
+    hilo = participacion.hilo
+
+    if request.method == "POST":
+        form = RespuestaForm(request.POST)
+        if form.is_valid():
+            responder(hilo, request.user, form.cleaned_data["cuerpo"])
+            return redirect("messaging:hilo", pk=hilo.pk)
+    else:
+        form = RespuestaForm()
+
+    try:
+        pagina = paginar_mensajes(hilo, request.GET.get("cursor"))
+    except CursorInvalido as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    if participacion.no_leidos:
+        marcar_leido(hilo, request.user)
+
+    return render(request, "messaging/hilo.html", {
+        "hilo": hilo,
+        "mensajes": pagina.items[::-1],
+        "pagina": pagina,
+        "participantes": hilo.participantes.select_related("usuario").exclude(usuario=request.user),
+        "form": form,
+    })
+
+
+@login_required
+def nuevo(request: HttpRequest) -> HttpResponse:
+    if request.method == "POST":
+        form = NuevoHiloForm(request.POST, usuario=request.user)
+        if form.is_valid():
+            datos = form.cleaned_data
+            hilo = crear_hilo(request.user, [datos["destinatario"]], datos["asunto"], datos["cuerpo"], datos["vehiculo"])
+            messages.success(request, f"Mensaje enviado a {datos['destinatario'].username}.")
+            return redirect("messaging:hilo", pk=hilo.pk)
+    else:
+        form = NuevoHiloForm(initial=request.GET.dict(), usuario=request.user)
+
+    return render(request, "messaging/nuevo.html", {"form": form})
+
+
+@login_required
+def contador(request: HttpRequest) -> JsonResponse:
+    """No leídos del usuario (una lectura por clave primaria)."""
+    return JsonResponse({"no_leidos": no_leidos(request.user)})
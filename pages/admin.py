@@ -4,6 +4,15 @@ from .models import Page
 
 @admin.register(Page)
 class PageAdmin(admin.ModelAdmin):
-    list_display = ("titulo", "autor", "fecha_creacion")
+    list_display = ("titulo", "autor", "palabras", "fecha_creacion")
+    list_select_related = ("autor",)
     search_fields = ("titulo", "subtitulo", "contenido")
     list_filter = ("fecha_creacion",)
+    readonly_fields = ("extracto", "palabras")
+
+    def get_queryset(self, request):
+        # El listado no muestra el contenido: no se lee de la base de datos
+        qs = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith("changelist"):
+            qs = qs.defer("contenido", "contenido_html")
+        return qs
@@ -0,0 +1,173 @@
+import os
+from io import BytesIO
+
+from ckeditor_uploader.backends import PillowBackend
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from tareas.servicios import encolar
+
+
+# --- Variantes de Imágenes ---
+#
+# Las fotos se suben tal cual (a menudo varios MB desde un teléfono) y se
+# procesan en segundo plano con la cola de `tareas`:
+#
+#   - Page.imagen: variantes thumb/medio/grande en WebP y JPEG, sin
+#     metadatos (EXIF, GPS, ICC) y con sus dimensiones, registradas en
+#     Page.imagen_variantes. Las plantillas las sirven con srcset
+#     (ver templatetags/imagenes.py).
+#   - Subidas de CKEditor: la URL ya quedó incrustada en el contenido, así
+#     que el archivo se reemplaza en el mismo nombre por una versión
+#     reducida a ANCHO_MAXIMO_EDITOR y sin metadatos.
+
+# (nombre, ancho máximo en px); de menor a mayor
+VARIANTES = (
+    ("thumb", 400),
+    ("medio", 960),
+    ("grande", 1920),
+)
+
+FORMATOS = {
+    "webp": {"format": "WEBP", "method": 4},
+    "jpeg": {"format": "JPEG", "optimize": True, "progressive": True},
+}
+
+ANCHO_MAXIMO_EDITOR = 1920
+
+DIRECTORIO_VARIANTES = "variantes"
+
+FONDO_TRANSPARENCIA = (255, 255, 255)
+
+
+def _calidad() -> int:
+    return getattr(settings, "IMAGENES_CALIDAD", 80)
+
+
+def _abrir(nombre: str, lado_maximo: int) -> tuple:
+    """
+    Abre la imagen ya orientada según EXIF. Devuelve (imagen, (ancho, alto))
+    con las dimensiones originales.
+
+    Para JPEG, draft() decodifica directamente a una escala reducida cercana
+    a `lado_maximo`: una foto de 12 MP no se descomprime completa para
+    generar variantes de 1920 px.
+    """
+    with default_storage.open(nombre, "rb") as archivo:
+        imagen = Image.open(archivo)
+        original = imagen.size
+        orientacion = imagen.getexif().get(0x0112, 1)
+        imagen.draft("RGB", (lado_maximo, lado_maximo))
+        imagen.load()
+
+    imagen = ImageOps.exif_transpose(imagen)
+    if orientacion in (5, 6, 7, 8):
+        original = original[::-1]
+    return imagen, original
+
+
+def _sin_transparencia(imagen: Image.Image) -> Image.Image:
+    if imagen.mode in ("RGBA", "LA") or (imagen.mode == "P" and "transparency" in imagen.info):
+        imagen = imagen.convert("RGBA")
+        fondo = Image.new("RGB", imagen.size, FONDO_TRANSPARENCIA)
+        fondo.paste(imagen, mask=imagen.getchannel("A"))
+        return fondo
+    return imagen.convert("RGB")
+
+
+def _codificar(imagen: Image.Image, formato: str, **opciones) -> ContentFile:
+    # Solo se conserva la transparencia; EXIF, ICC, XMP y comentarios se descartan
+    imagen.info = {clave: valor for clave, valor in imagen.info.items() if clave == "transparency"}
+    salida = BytesIO()
+    imagen.save(salida, quality=_calidad(), **FORMATOS.get(formato, {"format": formato.upper()}), **opciones)
+    return ContentFile(salida.getvalue())
+
+
+def _nombre_variante(origen: str, variante: str, extension: str) -> str:
+    directorio, archivo = os.path.split(origen)
+    base = os.path.splitext(archivo)[0]
+    return os.path.join(directorio, DIRECTORIO_VARIANTES, f"{base}-{variante}.{extension}")
+
+
+def generar_variantes(origen: str, progreso=None) -> dict:
+    """
+    Genera las variantes de `origen` (nombre en el storage) y devuelve su
+    descripción para Page.imagen_variantes:
+
+        {"origen": ..., "ancho": ..., "alto": ...,
+         "variantes": [{"nombre", "ancho", "alto", "webp", "jpeg"}, ...]}
+
+    No se generan variantes más grandes que el original: una imagen de
+    700 px solo tiene "thumb" y una variante de 700 px.
+    """
+    imagen, (ancho, alto) = _abrir(origen, VARIANTES[-1][1])
+    imagen = _sin_transparencia(imagen)
+
+    variantes = []
+    for indice, (nombre, maximo) in enumerate(VARIANTES, start=1):
+        copia = imagen.copy()
+        copia.thumbnail((maximo, maximo * 2), Image.Resampling.LANCZOS)
+        variante = {"nombre": nombre, "ancho": copia.width, "alto": copia.height}
+        for extension in FORMATOS:
+            variante[extension] = default_storage.save(
+                _nombre_variante(origen, nombre, extension), _codificar(copia, extension)
+            )
+        variantes.append(variante)
+        if progreso:
+            progreso(indice, len(VARIANTES))
+        if maximo >= ancho:
+            break
+
+    return {"origen": origen, "ancho": ancho, "alto": alto, "variantes": variantes}
+
+
+def eliminar_variantes(descripcion: dict) -> None:
+    for variante in (descripcion or {}).get("variantes", []):
+        for extension in FORMATOS:
+            if variante.get(extension):
+                default_storage.delete(variante[extension])
+
+
+def optimizar_en_sitio(nombre: str) -> bool:
+    """
+    Reemplaza el archivo `nombre` por una versión reducida a
+    ANCHO_MAXIMO_EDITOR y sin metadatos, en el mismo formato y nombre.
+    Las imágenes animadas y los formatos no soportados se dejan igual.
+    """
+    with default_storage.open(nombre, "rb") as archivo, Image.open(archivo) as imagen:
+        formato, animada = imagen.format, getattr(imagen, "is_animated", False)
+    if animada or formato not in ("JPEG", "PNG", "WEBP"):
+        return False
+
+    imagen, _ = _abrir(nombre, ANCHO_MAXIMO_EDITOR)
+    imagen.thumbnail((ANCHO_MAXIMO_EDITOR, ANCHO_MAXIMO_EDITOR * 2), Image.Resampling.LANCZOS)
+    if formato == "JPEG":
+        imagen = _sin_transparencia(imagen)
+    contenido = _codificar(imagen, formato.lower(), **({"optimize": True} if formato == "PNG" else {}))
+
+    # El nombre debe ser el mismo: ya está referenciado en el HTML del editor
+    default_storage.delete(nombre)
+    return default_storage.save(nombre, contenido) == nombre
+
+
+# --- Encolado ---
+
+def encolar_variantes(page_id: int, origen: str):
+    return encolar("pages.variantes_imagen", {"page_id": page_id, "imagen": origen})
+
+
+class BackendEditor(PillowBackend):
+    """
+    Backend de subidas de CKEditor (CKEDITOR_IMAGE_BACKEND). Guarda igual que
+    PillowBackend (incluida la miniatura del navegador de archivos) y encola
+    la optimización del archivo subido.
+    """
+
+    def save_as(self, filepath):
+        guardado = super().save_as(filepath)
+        if self.is_image:
+            transaction.on_commit(lambda: encolar("pages.optimizar_subida", {"archivo": guardado}))
+        return guardado
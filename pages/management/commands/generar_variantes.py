@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from pages.imagenes import encolar_variantes
+from pages.models import Page
+
+
+class Command(BaseCommand):
+    help = (
+        "Encola la generación de variantes para las páginas cuya imagen aún "
+        "no las tiene (p. ej. imágenes subidas antes del pipeline). Las "
+        "procesa `manage.py procesar_tareas`."
+    )
+
+    def handle(self, *args, **options):
+        encoladas = 0
+        for pagina in Page.objects.exclude(imagen="").exclude(imagen=None).only("id", "imagen", "imagen_variantes").iterator():
+            if pagina.variantes_pendientes:
+                _, creada = encolar_variantes(pagina.pk, pagina.imagen.name)
+                encoladas += creada
+        self.stdout.write(self.style.SUCCESS(f"Tareas encoladas: {encoladas}."))
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+from pages.sanitizacion import procesar_contenido
+
+
+# Calcula los campos derivados de las páginas existentes. Los modelos
+# históricos no tienen el save() del modelo real: se procesa aquí en lotes.
+LOTE = 200
+
+
+def calcular_derivados(apps, schema_editor):
+    Page = apps.get_model("pages", "Page")
+    # Se leen los ids primero: en SQLite no conviene escribir en la tabla
+    # mientras un iterator() sigue abierto sobre ella
+    ids = list(Page.objects.order_by("id").values_list("id", flat=True))
+    for inicio in range(0, len(ids), LOTE):
+        pages = list(Page.objects.only("id", "contenido").filter(id__in=ids[inicio:inicio + LOTE]))
+        for page in pages:
+            procesado = procesar_contenido(page.contenido)
+            page.contenido_html = procesado.html
+            page.extracto = procesado.extracto
+            page.palabras = procesado.palabras
+        Page.objects.bulk_update(pages, ["contenido_html", "extracto", "palabras"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='contenido_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Contenido sanitizado'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='extracto',
+            field=models.CharField(blank=True, editable=False, max_length=300, verbose_name='Extracto'),
+        ),
+        migrations.AddField(
+            model_name='page',
+            name='palabras',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Palabras'),
+        ),
+        migrations.AddIndex(
+            model_name='page',
+            index=models.Index(fields=['fecha_creacion'], name='page_fecha_creacion_idx'),
+        ),
+        migrations.RunPython(calcular_derivados, migrations.RunPython.noop),
+    ]
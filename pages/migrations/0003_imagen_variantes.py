@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pages', '0002_contenido_derivado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='page',
+            name='imagen_variantes',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Variantes de la imagen'),
+        ),
+    ]
@@ -2,6 +2,13 @@ from django.db import models
 from django.contrib.auth.models import User
 from ckeditor.fields import RichTextField
 
+from .sanitizacion import procesar_contenido
+
+# Campos derivados de `contenido` que se recalculan al guardarlo
+CAMPOS_DERIVADOS = ("contenido_html", "extracto", "palabras")
+
+PALABRAS_POR_MINUTO = 200
+
 
 class Page(models.Model):
     titulo = models.CharField(
@@ -18,6 +25,26 @@ class Page(models.Model):
         verbose_name="Contenido"
     )
 
+    # --- Derivados de `contenido`, calculados una vez en save() ---
+    contenido_html = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name="Contenido sanitizado"
+    )
+
+    extracto = models.CharField(
+        max_length=300,
+        blank=True,
+        editable=False,
+        verbose_name="Extracto"
+    )
+
+    palabras = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Palabras"
+    )
+
     imagen = models.ImageField(
         upload_to="pages/",
         blank=True,
@@ -25,6 +52,15 @@ class Page(models.Model):
         verbose_name="Imagen"
     )
 
+    # Variantes redimensionadas de `imagen` y sus dimensiones (ver
+    # pages/imagenes.py). Vacío hasta que la tarea en segundo plano termina.
+    imagen_variantes = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Variantes de la imagen"
+    )
+
     fecha_creacion = models.DateTimeField(
         auto_now_add=True,
         verbose_name="Fecha de creación"
@@ -41,6 +77,43 @@ class Page(models.Model):
         ordering = ["-fecha_creacion"]
         verbose_name = "Página"
         verbose_name_plural = "Páginas"
+        indexes = [
+            # Orden del listado paginado
+            models.Index(fields=["fecha_creacion"], name="page_fecha_creacion_idx"),
+        ]
 
     def __str__(self):
         return self.titulo
+
+    def save(self, *args, **kwargs):
+        """
+        Sanitiza el contenido y recalcula extracto y palabras al guardarlo.
+        Si cambió la imagen, descarta sus variantes (se regeneran en segundo plano).
+        """
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "contenido" in update_fields:
+            procesado = procesar_contenido(self.contenido)
+            self.contenido_html = procesado.html
+            self.extracto = procesado.extracto
+            self.palabras = procesado.palabras
+            if update_fields is not None:
+                kwargs["update_fields"] = set(update_fields) | set(CAMPOS_DERIVADOS)
+
+        if update_fields is None or "imagen" in update_fields:
+            origen = self.imagen.name if self.imagen else ""
+            if self.imagen_variantes and self.imagen_variantes.get("origen") != origen:
+                # La imagen cambió: las variantes anteriores se eliminan (signals.py)
+                self._variantes_obsoletas = self.imagen_variantes
+                self.imagen_variantes = {}
+                if update_fields is not None:
+                    kwargs["update_fields"] = set(kwargs["update_fields"]) | {"imagen_variantes"}
+        super().save(*args, **kwargs)
+
+    @property
+    def variantes_pendientes(self) -> bool:
+        """Tiene imagen pero sus variantes aún no se generan."""
+        return bool(self.imagen) and self.imagen_variantes.get("origen") != self.imagen.name
+
+    @property
+    def minutos_lectura(self) -> int:
+        return max(1, round(self.palabras / PALABRAS_POR_MINUTO))
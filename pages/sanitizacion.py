@@ -0,0 +1,180 @@
+import re
+from dataclasses import dataclass
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+
+# --- Sanitización del HTML de CKEditor ---
+#
+# Se ejecuta una sola vez al guardar la página (ver Page.save): el detalle
+# muestra el HTML ya limpio y el listado usa el extracto y el conteo de
+# palabras, sin volver a leer ni procesar `contenido`.
+#
+# Lista blanca de etiquetas y atributos; el resto de etiquetas se elimina
+# conservando su texto, salvo las de CONTENIDO_DESCARTADO, que se eliminan
+# completas. El resultado siempre queda con las etiquetas balanceadas.
+
+ETIQUETAS_PERMITIDAS = {
+    "p", "br", "hr", "div", "span", "blockquote", "pre", "code",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+    "strong", "b", "em", "i", "u", "s", "strike", "sub", "sup", "small",
+    "ul", "ol", "li", "dl", "dt", "dd",
+    "a", "img", "figure", "figcaption",
+    "table", "caption", "thead", "tbody", "tfoot", "tr", "th", "td",
+}
+
+ETIQUETAS_VACIAS = {"br", "hr", "img"}
+
+CONTENIDO_DESCARTADO = {"script", "style", "iframe", "object", "embed", "noscript", "template", "textarea", "select"}
+
+ATRIBUTOS_PERMITIDOS = {
+    "*": {"class", "style", "title"},
+    "a": {"href", "target", "rel"},
+    "img": {"src", "alt", "width", "height"},
+    "ol": {"start", "type"},
+    "th": {"colspan", "rowspan", "scope"},
+    "td": {"colspan", "rowspan"},
+}
+
+# Propiedades CSS que CKEditor usa para alineación y tamaño de imágenes/tablas
+ESTILOS_PERMITIDOS = {
+    "text-align", "float", "width", "height", "margin-left", "margin-right",
+    "color", "background-color", "font-size", "font-weight", "font-style", "text-decoration",
+}
+
+ESQUEMAS_PERMITIDOS = {"", "http", "https", "mailto", "tel"}
+
+# Etiquetas que separan palabras en el texto plano (extracto / conteo)
+ETIQUETAS_BLOQUE = {
+    "p", "br", "hr", "div", "blockquote", "pre", "li", "dt", "dd", "tr", "th", "td",
+    "h1", "h2", "h3", "h4", "h5", "h6", "figcaption", "caption",
+}
+
+EXTRACTO_CARACTERES = 280
+
+_VALOR_CSS_PELIGROSO = re.compile(r"url\s*\(|expression\s*\(|javascript:|[<>\\]", re.IGNORECASE)
+
+
+def _url_segura(valor: str) -> bool:
+    # Se ignoran espacios y caracteres de control que el navegador descarta ("java\tscript:")
+    limpio = "".join(c for c in valor if c > " ").lower()
+    try:
+        return urlsplit(limpio).scheme in ESQUEMAS_PERMITIDOS
+    except ValueError:
+        return False
+
+
+def _estilo_seguro(valor: str) -> str:
+    declaraciones = []
+    for declaracion in valor.split(";"):
+        propiedad, _, contenido = declaracion.partition(":")
+        propiedad, contenido = propiedad.strip().lower(), contenido.strip()
+        if propiedad in ESTILOS_PERMITIDOS and contenido and not _VALOR_CSS_PELIGROSO.search(contenido):
+            declaraciones.append(f"{propiedad}: {contenido}")
+    return "; ".join(declaraciones)
+
+
+class _Sanitizador(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.html = []
+        self.texto = []
+        self.abiertas = []
+        self.descartando = 0
+
+    def _atributos(self, etiqueta: str, attrs) -> str:
+        permitidos = ATRIBUTOS_PERMITIDOS["*"] | ATRIBUTOS_PERMITIDOS.get(etiqueta, set())
+        resultado = {}
+        for nombre, valor in attrs:
+            nombre = nombre.lower()
+            if nombre not in permitidos or valor is None:
+                continue
+            if nombre in ("href", "src") and not _url_segura(valor):
+                continue
+            if nombre == "style":
+                valor = _estilo_seguro(valor)
+                if not valor:
+                    continue
+            resultado[nombre] = valor
+
+        if etiqueta == "a" and resultado.get("target") == "_blank":
+            resultado["rel"] = "noopener noreferrer"
+        return "".join(f' {nombre}="{escape(valor, quote=True)}"' for nombre, valor in resultado.items())
+
+    def handle_starttag(self, etiqueta, attrs):
+        if etiqueta in CONTENIDO_DESCARTADO:
+            self.descartando += 1
+            return
+        if self.descartando:
+            return
+        if etiqueta in ETIQUETAS_BLOQUE:
+            self.texto.append(" ")
+        if etiqueta not in ETIQUETAS_PERMITIDAS:
+            return
+
+        self.html.append(f"<{etiqueta}{self._atributos(etiqueta, attrs)}>")
+        if etiqueta not in ETIQUETAS_VACIAS:
+            self.abiertas.append(etiqueta)
+
+    def handle_startendtag(self, etiqueta, attrs):
+        self.handle_starttag(etiqueta, attrs)
+        if etiqueta not in ETIQUETAS_VACIAS and not self.descartando:
+            self.handle_endtag(etiqueta)
+
+    def handle_endtag(self, etiqueta):
+        if etiqueta in CONTENIDO_DESCARTADO:
+            self.descartando = max(0, self.descartando - 1)
+            return
+        if self.descartando:
+            return
+        if etiqueta in ETIQUETAS_BLOQUE:
+            self.texto.append(" ")
+        if etiqueta not in self.abiertas:
+            return
+        # Cierra también las etiquetas internas que quedaron abiertas
+        while self.abiertas:
+            abierta = self.abiertas.pop()
+            self.html.append(f"</{abierta}>")
+            if abierta == etiqueta:
+                break
+
+    def handle_data(self, datos):
+        if self.descartando:
+            return
+        self.html.append(escape(datos, quote=False))
+        self.texto.append(datos)
+
+    def cerrar(self):
+        self.close()
+        while self.abiertas:
+            self.html.append(f"</{self.abiertas.pop()}>")
+
+
+@dataclass
+class ContenidoProcesado:
+    html: str
+    extracto: str
+    palabras: int
+
+
+def recortar(texto: str, limite: int = EXTRACTO_CARACTERES) -> str:
+    """Recorta en el último espacio antes de `limite` y agrega "…"."""
+    if len(texto) <= limite:
+        return texto
+    corte = texto.rfind(" ", 0, limite)
+    return texto[: corte if corte > 0 else limite].rstrip(" ,.;:") + "…"
+
+
+def procesar_contenido(contenido: str) -> ContenidoProcesado:
+    """HTML sanitizado, extracto en texto plano y cantidad de palabras."""
+    parser = _Sanitizador()
+    parser.feed(contenido or "")
+    parser.cerrar()
+
+    texto = " ".join("".join(parser.texto).split())
+    return ContenidoProcesado(
+        html="".join(parser.html),
+        extracto=recortar(texto),
+        palabras=len(texto.split()),
+    )
@@ -0,0 +1,36 @@
+from django.conf import settings
+
+from .models import Page
+
+
+# --- Consultas de Páginas ---
+
+# Columnas que usa el listado: nunca `contenido` ni `contenido_html`, que
+# pueden pesar cientos de KB por artículo
+CAMPOS_LISTADO = (
+    "id",
+    "titulo",
+    "subtitulo",
+    "extracto",
+    "palabras",
+    "imagen",
+    "imagen_variantes",
+    "fecha_creacion",
+    "autor",
+    "autor__username",
+    "autor__first_name",
+    "autor__last_name",
+)
+
+
+def paginas_listado():
+    return Page.objects.select_related("autor").only(*CAMPOS_LISTADO)
+
+
+def paginas_detalle():
+    """El detalle muestra el HTML ya sanitizado; el original no se lee."""
+    return Page.objects.select_related("autor").defer("contenido")
+
+
+def paginas_por_pagina() -> int:
+    return getattr(settings, "PAGINAS_POR_PAGINA", 12)
@@ -0,0 +1,36 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import incrementar_generacion
+
+from .imagenes import eliminar_variantes, encolar_variantes
+from .models import Page
+
+
+@receiver(post_save, sender=Page)
+@receiver(post_delete, sender=Page)
+def invalidar_cache_paginas(sender, instance, **kwargs):
+    """Invalida el listado y los detalles de páginas cacheados."""
+    incrementar_generacion("paginas")
+
+
+# --- Variantes de la imagen ---
+
+@receiver(post_save, sender=Page)
+def generar_variantes_imagen(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "imagen" not in update_fields:
+        return
+    obsoletas = instance.__dict__.pop("_variantes_obsoletas", None)
+    if obsoletas:
+        transaction.on_commit(lambda: eliminar_variantes(obsoletas))
+    if instance.variantes_pendientes:
+        pk, origen = instance.pk, instance.imagen.name
+        transaction.on_commit(lambda: encolar_variantes(pk, origen))
+
+
+@receiver(post_delete, sender=Page)
+def eliminar_variantes_imagen(sender, instance, **kwargs):
+    variantes = instance.imagen_variantes
+    if variantes:
+        transaction.on_commit(lambda: eliminar_variantes(variantes))
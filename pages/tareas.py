@@ -0,0 +1,35 @@
+from core.cache import incrementar_generacion
+from tareas.registro import tarea
+
+from .imagenes import eliminar_variantes, generar_variantes, optimizar_en_sitio
+from .models import Page
+
+
+# --- Tareas en Segundo Plano de Pages ---
+#
+# Ninguna produce un archivo descargable: devuelven "" para que la purga de
+# tareas vencidas no borre las variantes generadas.
+
+@tarea("pages.variantes_imagen")
+def variantes_imagen(parametros: dict, progreso) -> str:
+    """Genera las variantes de Page.imagen y las registra en imagen_variantes."""
+    pagina = Page.objects.filter(pk=parametros["page_id"], imagen=parametros["imagen"])
+    anteriores = pagina.values_list("imagen_variantes", flat=True).first()
+    if anteriores is None:
+        return ""  # la página se eliminó o su imagen cambió desde que se encoló
+
+    descripcion = generar_variantes(parametros["imagen"], progreso)
+    # Condicionado a la misma imagen: si cambió mientras se procesaba, estas variantes sobran
+    if pagina.update(imagen_variantes=descripcion):
+        eliminar_variantes(anteriores)
+        incrementar_generacion("paginas")
+    else:
+        eliminar_variantes(descripcion)
+    return ""
+
+
+@tarea("pages.optimizar_subida")
+def optimizar_subida(parametros: dict, progreso) -> str:
+    """Reduce y limpia de metadatos una imagen subida desde CKEditor."""
+    optimizar_en_sitio(parametros["archivo"])
+    return ""
@@ -0,0 +1,64 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html
+
+
+register = template.Library()
+
+
+# --- Imágenes Responsivas ---
+#
+#     {% load imagenes %}
+#     {% imagen_responsiva page.imagen page.imagen_variantes "thumb" sizes="(max-width: 768px) 100vw, 360px" alt=page.titulo %}
+#
+# Emite <picture> con srcset WebP y JPEG de todas las variantes: el navegador
+# elige la más pequeña que cubre `sizes` según la densidad de pantalla. Sin
+# variantes (aún en proceso) se muestra el original.
+
+@register.filter
+def srcset(descripcion, formato="jpeg"):
+    """"url 400w, url 960w, ..." de las variantes en `formato` (webp | jpeg)."""
+    return ", ".join(
+        f"{default_storage.url(variante[formato])} {variante['ancho']}w"
+        for variante in (descripcion or {}).get("variantes", [])
+        if variante.get(formato)
+    )
+
+
+def _variante(descripcion: dict, nombre: str):
+    variantes = descripcion.get("variantes", [])
+    for variante in variantes:
+        if variante["nombre"] == nombre:
+            return variante
+    # El original era más chico que la variante pedida: se usa la mayor generada
+    return variantes[-1] if variantes else None
+
+
+@register.simple_tag
+def imagen_responsiva(imagen, descripcion, variante="medio", sizes="100vw", alt="", clase="", lazy=True):
+    """
+    `lazy=False` para la imagen principal de la página (LCP): se carga de
+    inmediato y con prioridad alta.
+    """
+    if not imagen:
+        return ""
+    carga, prioridad = ("lazy", "auto") if lazy else ("eager", "high")
+
+    vigente = descripcion and descripcion.get("origen") == imagen.name
+    elegida = _variante(descripcion, variante) if vigente else None
+    if elegida is None:
+        return format_html(
+            '<img src="{}" alt="{}" class="{}" loading="{}" fetchpriority="{}" decoding="async">',
+            imagen.url, alt, clase, carga, prioridad,
+        )
+
+    return format_html(
+        '<picture>'
+        '<source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" width="{}" height="{}" alt="{}" class="{}" '
+        'loading="{}" fetchpriority="{}" decoding="async">'
+        '</picture>',
+        srcset(descripcion, "webp"), sizes,
+        default_storage.url(elegida["jpeg"]), srcset(descripcion, "jpeg"), sizes,
+        elegida["ancho"], elegida["alto"], alt, clase, carga, prioridad,
+    )
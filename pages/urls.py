@@ -1,7 +1,7 @@
+from django.conf import settings
 from django.urls import path
+from . import views, views_async
 from .views import (
-    PageListView,
-    PageDetailView,
     PageCreateView,
     PageUpdateView,
     PageDeleteView
@@ -9,12 +9,15 @@ from .views import (
 
 app_name = "pages"
 
+# Vistas de lectura: versión async def bajo ASGI (ver VISTAS_ASYNC)
+lectura = views_async if settings.VISTAS_ASYNC else views
+
 urlpatterns = [
     # Cambiado 'list' por 'page_list' para que coincida con el Navbar
-    path("", PageListView.as_view(), name="page_list"),
+    path("", lectura.PageListView.as_view(), name="page_list"),
     
     # Cambiado 'detail' por 'page_detail' para ser más descriptivo
-    path("<int:pk>/", PageDetailView.as_view(), name="page_detail"),
+    path("<int:pk>/", lectura.PageDetailView.as_view(), name="page_detail"),
     
     path("create/", PageCreateView.as_view(), name="page_create"),
     path("<int:pk>/update/", PageUpdateView.as_view(), name="page_update"),
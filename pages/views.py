@@ -7,26 +7,41 @@ from django.views.generic import (
 )
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse_lazy
+from django.utils.decorators import method_decorator
+
+from core.cache import cachear_respuesta
 
 from .models import Page
+from .services import paginas_detalle, paginas_listado, paginas_por_pagina
 
 
+@method_decorator(cachear_respuesta("paginas", "usuarios"), name="dispatch")
 class PageListView(ListView):
     model = Page
     template_name = "pages/page_list.html"
     context_object_name = "pages"
 
+    def get_queryset(self):
+        return paginas_listado()
+
+    def get_paginate_by(self, queryset):
+        return paginas_por_pagina()
 
+
+@method_decorator(cachear_respuesta("paginas", "usuarios"), name="dispatch")
 class PageDetailView(DetailView):
     model = Page
     template_name = "pages/page_detail.html"
 
+    def get_queryset(self):
+        return paginas_detalle()
+
 
 class PageCreateView(LoginRequiredMixin, CreateView):
     model = Page
     template_name = "pages/page_form.html"
     fields = ["titulo", "subtitulo", "contenido", "imagen"]
-    success_url = reverse_lazy("pages:list")
+    success_url = reverse_lazy("pages:page_list")
 
     def form_valid(self, form):
         form.instance.autor = self.request.user
@@ -37,11 +52,11 @@ class PageUpdateView(LoginRequiredMixin, UpdateView):
     model = Page
     template_name = "pages/page_form.html"
     fields = ["titulo", "subtitulo", "contenido", "imagen"]
-    success_url = reverse_lazy("pages:list")
+    success_url = reverse_lazy("pages:page_list")
 
 
 class PageDeleteView(LoginRequiredMixin, DeleteView):
     model = Page
     template_name = "pages/page_confirm_delete.html"
-    success_url = reverse_lazy("pages:list")
+    success_url = reverse_lazy("pages:page_list")
 
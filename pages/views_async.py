@@ -0,0 +1,73 @@
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from django.views import View
+
+from core.asincrono import ausuario
+from core.cache import cachear_respuesta
+from messaging.services import aprecargar_no_leidos
+
+from .models import Page
+from .services import paginas_detalle, paginas_listado, paginas_por_pagina
+
+
+# --- Vistas Asíncronas de Lectura (ASGI) ---
+#
+# Mismos nombres que PageListView y PageDetailView de views.py, con el ORM
+# asíncrono. Se activan con VISTAS_ASYNC (ver urls.py). El usuario y el badge de mensajes
+# se resuelven antes de renderizar porque la navbar los usa y el template
+# corre en el event loop.
+
+
+class _VistaAsync(View):
+    """
+    View.dispatch es síncrono (devuelve la corrutina del handler); aquí es
+    async def para que method_decorator(cachear_respuesta) lo trate como
+    vista asíncrona, igual que en las vistas síncronas de views.py.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        return await super().dispatch(request, *args, **kwargs)
+
+
+@method_decorator(cachear_respuesta("paginas", "usuarios"), name="dispatch")
+class PageListView(_VistaAsync):
+    template_name = "pages/page_list.html"
+
+    async def get(self, request, *args, **kwargs):
+        await ausuario(request)
+        await aprecargar_no_leidos(request)
+        qs = paginas_listado()
+
+        paginator = Paginator(qs, paginas_por_pagina())
+        paginator.count = await qs.acount()  # evita el COUNT síncrono de Paginator
+        page_obj = paginator.get_page(request.GET.get("page"))
+        page_obj.object_list = [page async for page in page_obj.object_list]
+
+        return render(request, self.template_name, {
+            "pages": page_obj.object_list,
+            "object_list": page_obj.object_list,
+            "page_obj": page_obj,
+            "paginator": paginator,
+            "is_paginated": paginator.num_pages > 1,
+            "view": self,
+        })
+
+
+@method_decorator(cachear_respuesta("paginas", "usuarios"), name="dispatch")
+class PageDetailView(_VistaAsync):
+    template_name = "pages/page_detail.html"
+
+    async def get(self, request, pk, *args, **kwargs):
+        await ausuario(request)
+        await aprecargar_no_leidos(request)
+        try:
+            page = await paginas_detalle().aget(pk=pk)
+        except Page.DoesNotExist:
+            raise Http404("No se encontró la página solicitada.")
+        return render(request, self.template_name, {
+            "page": page,
+            "object": page,
+            "view": self,
+        })
@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import Reserva
+from .services import cancelar
+
+
+@admin.register(Reserva)
+class ReservaAdmin(admin.ModelAdmin):
+    # Las altas pasan por services.reservar() (verifica solapamientos bajo bloqueo)
+    list_display = ("vehiculo", "usuario", "inicio", "fin", "estado", "creada")
+    list_select_related = ("vehiculo", "usuario")
+    list_filter = ("estado",)
+    search_fields = ("vehiculo__patente", "usuario__username", "motivo")
+    date_hierarchy = "inicio"
+    readonly_fields = ("vehiculo", "usuario", "inicio", "fin", "estado", "creada")
+    actions = ["cancelar_reservas"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description="Cancelar las reservas seleccionadas")
+    def cancelar_reservas(self, request, queryset):
+        canceladas = sum(cancelar(reserva) for reserva in queryset.filter(estado=Reserva.ACTIVA))
+        self.message_user(request, f"{canceladas} reservas canceladas.")
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class ReservasConfig(AppConfig):
+    """
+    Reservas de los vehículos de la flota en reserva (sin responsable) por
+    intervalos de tiempo, con búsqueda de disponibilidad sobre un árbol de
+    intervalos en memoria (ver intervalos.py y services.py).
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "reservas"
+    verbose_name = "Reservas"
+
+    def ready(self):
+        from . import signals  # noqa: F401
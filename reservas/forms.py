@@ -0,0 +1,35 @@
+from django import forms
+
+from .services import ReservaRechazada, validar_rango
+
+
+class _Fecha(forms.DateTimeInput):
+    input_type = "datetime-local"
+
+    def __init__(self):
+        super().__init__(attrs={"class": "form-control"}, format="%Y-%m-%dT%H:%M")
+
+
+class RangoForm(forms.Form):
+    """Intervalo [inicio, fin) de una búsqueda o reserva (hora local)."""
+
+    inicio = forms.DateTimeField(label="Desde", widget=_Fecha())
+    fin = forms.DateTimeField(label="Hasta", widget=_Fecha())
+
+    def clean(self):
+        datos = super().clean()
+        if datos.get("inicio") and datos.get("fin"):
+            try:
+                validar_rango(datos["inicio"], datos["fin"])
+            except ReservaRechazada as exc:
+                raise forms.ValidationError(str(exc))
+        return datos
+
+
+class ReservaForm(RangoForm):
+    vehiculo = forms.IntegerField(widget=forms.HiddenInput)
+    motivo = forms.CharField(
+        max_length=200,
+        required=False,
+        widget=forms.TextInput(attrs={"class": "form-control", "placeholder": "Ej: Visita a obra"}),
+    )
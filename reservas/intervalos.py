@@ -0,0 +1,54 @@
+# --- Árbol de Intervalos (estático) ---
+#
+# Los intervalos [inicio, fin) se ordenan por inicio en listas paralelas; el
+# árbol es implícito sobre esas listas: la raíz del tramo [lo, hi) es su
+# elemento central y `max_fin[medio]` guarda el mayor `fin` de todo el tramo.
+# Una consulta descarta subárboles enteros cuando:
+#   - el mayor fin del tramo no supera el inicio pedido (terminan antes), o
+#   - el inicio del nodo ya no es anterior al fin pedido (su subárbol
+#     derecho empieza después).
+# Costo O(log n + k) por consulta, con k intervalos solapados. Se construye
+# de una vez (O(n log n)) y no admite altas: al cambiar las reservas se
+# reconstruye completo.
+
+
+class ArbolIntervalos:
+    def __init__(self, intervalos):
+        """`intervalos`: iterable de (inicio, fin, valor), con inicio < fin comparables."""
+        ordenados = sorted(intervalos, key=lambda i: (i[0], i[1]))
+        self.inicios = [i[0] for i in ordenados]
+        self.fines = [i[1] for i in ordenados]
+        self.valores = [i[2] for i in ordenados]
+        self.max_fin = list(self.fines)
+        self._construir(0, len(ordenados))
+
+    def __len__(self) -> int:
+        return len(self.inicios)
+
+    def _construir(self, lo: int, hi: int):
+        if lo >= hi:
+            return None
+        medio = (lo + hi) // 2
+        maximo = self.fines[medio]
+        for hijo in (self._construir(lo, medio), self._construir(medio + 1, hi)):
+            if hijo is not None and hijo > maximo:
+                maximo = hijo
+        self.max_fin[medio] = maximo
+        return maximo
+
+    def solapados(self, inicio, fin):
+        """Valores de los intervalos que se solapan con [inicio, fin)."""
+        inicios, fines, max_fin, valores = self.inicios, self.fines, self.max_fin, self.valores
+        pendientes = [(0, len(inicios))]
+        while pendientes:
+            lo, hi = pendientes.pop()
+            if lo >= hi:
+                continue
+            medio = (lo + hi) // 2
+            if max_fin[medio] <= inicio:
+                continue
+            pendientes.append((lo, medio))
+            if inicios[medio] < fin:
+                if fines[medio] > inicio:
+                    yield valores[medio]
+                pendientes.append((medio + 1, hi))
@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('vehiculos', '0008_lapidas_sincronizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reserva',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inicio', models.DateTimeField(verbose_name='Desde')),
+                ('fin', models.DateTimeField(verbose_name='Hasta')),
+                ('motivo', models.CharField(blank=True, max_length=200, verbose_name='Motivo')),
+                ('estado', models.CharField(choices=[('activa', 'Activa'), ('cancelada', 'Cancelada')], default='activa', max_length=10, verbose_name='Estado')),
+                ('creada', models.DateTimeField(auto_now_add=True, verbose_name='Creada')),
+                ('usuario', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reservas', to=settings.AUTH_USER_MODEL, verbose_name='Usuario')),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reservas', to='vehiculos.vehiculo', verbose_name='Vehículo')),
+            ],
+            options={
+                'verbose_name': 'Reserva',
+                'verbose_name_plural': 'Reservas',
+                'ordering': ['inicio', 'id'],
+                'indexes': [models.Index(condition=models.Q(('estado', 'activa')), fields=['vehiculo', 'fin'], name='reserva_vehiculo_fin_idx'), models.Index(condition=models.Q(('estado', 'activa')), fields=['fin'], name='reserva_fin_idx'), models.Index(fields=['usuario', '-inicio'], name='reserva_usuario_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reserva',
+            constraint=models.CheckConstraint(check=models.Q(('fin__gt', models.F('inicio'))), name='reserva_fin_posterior', violation_error_message='El término debe ser posterior al inicio.'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+from django.contrib.auth.models import User
+from django.db import models
+from django.db.models import F, Q
+
+from vehiculos.models import Vehiculo
+
+
+class Reserva(models.Model):
+    """
+    Uso de un vehículo de la flota en reserva durante [inicio, fin). Dos
+    reservas activas del mismo vehículo no se solapan: lo garantiza
+    services.reservar(), que verifica y crea bajo el bloqueo del vehículo.
+    """
+
+    ACTIVA = "activa"
+    CANCELADA = "cancelada"
+    ESTADOS = [(ACTIVA, "Activa"), (CANCELADA, "Cancelada")]
+
+    vehiculo = models.ForeignKey(
+        Vehiculo,
+        on_delete=models.CASCADE,
+        related_name="reservas",
+        verbose_name="Vehículo",
+    )
+
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="reservas",
+        verbose_name="Usuario",
+        db_index=False,  # cubierto por reserva_usuario_idx
+    )
+
+    inicio = models.DateTimeField(verbose_name="Desde")
+    fin = models.DateTimeField(verbose_name="Hasta")
+    motivo = models.CharField(max_length=200, blank=True, verbose_name="Motivo")
+
+    estado = models.CharField(max_length=10, choices=ESTADOS, default=ACTIVA, verbose_name="Estado")
+    creada = models.DateTimeField(auto_now_add=True, verbose_name="Creada")
+
+    class Meta:
+        verbose_name = "Reserva"
+        verbose_name_plural = "Reservas"
+        ordering = ["inicio", "id"]
+        constraints = [
+            models.CheckConstraint(
+                check=Q(fin__gt=F("inicio")),
+                name="reserva_fin_posterior",
+                violation_error_message="El término debe ser posterior al inicio.",
+            ),
+        ]
+        indexes = [
+            # Solapamiento con un vehículo: vehiculo = X AND fin > inicio_pedido
+            models.Index(fields=["vehiculo", "fin"], condition=Q(estado="activa"), name="reserva_vehiculo_fin_idx"),
+            # Reservas vigentes de toda la flota (reconstrucción del índice en memoria)
+            models.Index(fields=["fin"], condition=Q(estado="activa"), name="reserva_fin_idx"),
+            models.Index(fields=["usuario", "-inicio"], name="reserva_usuario_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.vehiculo} · {self.inicio:%d/%m/%Y %H:%M} – {self.fin:%d/%m/%Y %H:%M}"
+
+    @property
+    def activa(self) -> bool:
+        return self.estado == self.ACTIVA
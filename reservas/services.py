@@ -0,0 +1,189 @@
+import threading
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.cache import generaciones, incrementar_generacion
+from vehiculos.models import Vehiculo
+
+from .intervalos import ArbolIntervalos
+from .models import Reserva
+
+
+class ReservaRechazada(ValueError):
+    """La reserva no se puede crear (choque, vehículo fuera de la flota en reserva, rango inválido)."""
+
+
+# Próximas reservas que muestra la página de reservas
+LIMITE_LISTADO = 100
+
+# Inicio ya pasado que aún se acepta (el formulario se llenó hace un momento)
+TOLERANCIA_PASADO = timedelta(minutes=5)
+
+
+def max_dias() -> int:
+    return getattr(settings, "RESERVAS_MAX_DIAS", 7)
+
+
+def flota_en_reserva():
+    """Vehículos reservables: activos y sin responsable."""
+    return Vehiculo.objects.filter(usuario__isnull=True, activo=True)
+
+
+# --- Reservar / Cancelar ---
+
+def validar_rango(inicio, fin) -> None:
+    if fin <= inicio:
+        raise ReservaRechazada("El término debe ser posterior al inicio.")
+    if inicio < timezone.now() - TOLERANCIA_PASADO:
+        raise ReservaRechazada("No se puede reservar en el pasado.")
+    if fin - inicio > timedelta(days=max_dias()):
+        raise ReservaRechazada(f"Una reserva no puede superar {max_dias()} días.")
+
+
+def solapadas(vehiculo_id: int, inicio, fin):
+    """Reservas activas del vehículo que se solapan con [inicio, fin) (reserva_vehiculo_fin_idx)."""
+    return Reserva.objects.filter(vehiculo_id=vehiculo_id, estado=Reserva.ACTIVA, fin__gt=inicio, inicio__lt=fin)
+
+
+def reservar(usuario, vehiculo_id: int, inicio, fin, motivo: str = "") -> Reserva:
+    """
+    Crea la reserva si el vehículo está en la flota en reserva y libre en
+    [inicio, fin); si no, lanza ReservaRechazada.
+
+    La primera sentencia de la transacción es un UPDATE condicionado sobre
+    la fila del vehículo (sin cambiar nada): en PostgreSQL bloquea esa fila
+    hasta el commit y en SQLite toma el bloqueo de escritura de la base. Dos
+    reservas concurrentes del mismo vehículo se serializan y la segunda ve
+    la primera al verificar el solapamiento (funciona igual en ambos motores,
+    sin SELECT ... FOR UPDATE ni restricciones de exclusión).
+    """
+    validar_rango(inicio, fin)
+    with transaction.atomic():
+        if not flota_en_reserva().filter(pk=vehiculo_id).update(activo=True):
+            raise ReservaRechazada("El vehículo no está disponible para reservas.")
+        choque = solapadas(vehiculo_id, inicio, fin).order_by("inicio").first()
+        if choque is not None:
+            raise ReservaRechazada(
+                f"El vehículo ya está reservado entre {timezone.localtime(choque.inicio):%d/%m %H:%M} "
+                f"y {timezone.localtime(choque.fin):%d/%m %H:%M}."
+            )
+        reserva = Reserva.objects.create(vehiculo_id=vehiculo_id, usuario=usuario, inicio=inicio, fin=fin, motivo=motivo)
+        transaction.on_commit(lambda: incrementar_generacion("reservas"))
+    return reserva
+
+
+def cancelar(reserva: Reserva) -> bool:
+    """Cancela una reserva activa. Devuelve False si ya estaba cancelada."""
+    cancelada = Reserva.objects.filter(pk=reserva.pk, estado=Reserva.ACTIVA).update(estado=Reserva.CANCELADA)
+    if cancelada:
+        reserva.estado = Reserva.CANCELADA
+        transaction.on_commit(lambda: incrementar_generacion("reservas"))
+    return bool(cancelada)
+
+
+def proximas(usuario):
+    """Reservas activas del usuario (todas, para los administradores) que aún no terminan."""
+    qs = (
+        Reserva.objects
+        .filter(estado=Reserva.ACTIVA, fin__gt=timezone.now())
+        .select_related("vehiculo", "usuario")
+        .only("inicio", "fin", "motivo", "estado", "vehiculo__patente", "vehiculo__marca", "vehiculo__modelo", "usuario__username")
+        .order_by("inicio", "id")
+    )
+    if not usuario.is_staff:
+        qs = qs.filter(usuario=usuario)
+    return qs
+
+
+# --- Disponibilidad (índice en memoria) ---
+#
+# Por proceso se guarda un árbol de intervalos con las reservas activas que
+# aún no terminaban al construirlo, junto con la flota en reserva. Se
+# reconstruye (dos consultas) cuando cambia la generación "reservas" o
+# "vehiculos" (altas, bajas y reasignaciones de vehículos) o al cumplir
+# RESERVAS_INDICE_SEGUNDOS, para descartar las reservas ya terminadas.
+#
+# El índice solo responde búsquedas: reservar() verifica siempre contra la
+# base de datos bajo el bloqueo del vehículo.
+
+@dataclass(frozen=True)
+class VehiculoLibre:
+    pk: int
+    patente: str
+    marca: str
+    modelo: str
+
+
+@dataclass
+class _Indice:
+    version: tuple
+    construido: object
+    flota: list
+    arbol: ArbolIntervalos
+
+
+_indice: _Indice | None = None
+_cerrojo = threading.Lock()
+
+
+def _vigencia() -> timedelta:
+    return timedelta(seconds=getattr(settings, "RESERVAS_INDICE_SEGUNDOS", 300))
+
+
+def _construir(version: tuple) -> _Indice:
+    ahora = timezone.now()
+    flota = [
+        VehiculoLibre(*fila)
+        for fila in flota_en_reserva().order_by("patente").values_list("pk", "patente", "marca", "modelo")
+    ]
+    reservas = (
+        Reserva.objects
+        .filter(estado=Reserva.ACTIVA, fin__gt=ahora)
+        .values_list("inicio", "fin", "vehiculo_id")
+    )
+    arbol = ArbolIntervalos((inicio.timestamp(), fin.timestamp(), pk) for inicio, fin, pk in reservas)
+    return _Indice(version, ahora, flota, arbol)
+
+
+def indice() -> _Indice:
+    global _indice
+    version = tuple(sorted(generaciones("reservas", "vehiculos").items()))
+    actual = _indice
+    if actual is not None and actual.version == version and timezone.now() - actual.construido < _vigencia():
+        return actual
+    with _cerrojo:
+        # Otro hilo pudo reconstruirlo mientras se esperaba el cerrojo
+        actual = _indice
+        if actual is None or actual.version != version or timezone.now() - actual.construido >= _vigencia():
+            actual = _indice = _construir(version)
+    return actual
+
+
+def _ocupados(actual: _Indice, inicio, fin) -> set:
+    if inicio < actual.construido:
+        # El árbol no incluye las reservas que ya habían terminado al construirlo
+        return set(Reserva.objects.filter(estado=Reserva.ACTIVA, fin__gt=inicio, inicio__lt=fin).values_list("vehiculo_id", flat=True))
+    return set(actual.arbol.solapados(inicio.timestamp(), fin.timestamp()))
+
+
+def disponibilidad(ventanas) -> list:
+    """
+    Para cada ventana (inicio, fin), la lista de vehículos de la flota en
+    reserva libres en todo el intervalo. Una sola lectura de generaciones
+    para todas las ventanas; cada una cuesta O(log n + k) sobre el árbol.
+    """
+    actual = indice()
+    resultado = []
+    for inicio, fin in ventanas:
+        ocupados = _ocupados(actual, inicio, fin)
+        resultado.append([vehiculo for vehiculo in actual.flota if vehiculo.pk not in ocupados])
+    return resultado
+
+
+def disponibles(inicio, fin) -> list:
+    """Vehículos de la flota en reserva libres en [inicio, fin)."""
+    return disponibilidad([(inicio, fin)])[0]
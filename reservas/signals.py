@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from core.cache import incrementar_generacion
+
+from .models import Reserva
+
+
+# Las altas y cancelaciones pasan por services.py, que ya invalida el índice
+# de disponibilidad; las eliminaciones (admin, cascada al borrar un usuario)
+# llegan por aquí.
+
+@receiver(post_delete, sender=Reserva)
+def invalidar_indice(sender, instance, **kwargs):
+    transaction.on_commit(lambda: incrementar_generacion("reservas"))
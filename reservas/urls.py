@@ -0,0 +1,12 @@
+# reservas/urls.py
+from django.urls import path
+from . import views
+
+app_name = "reservas"
+
+urlpatterns = [
+    path("", views.reservas, name="reservas"),
+    path("nueva/", views.nueva, name="nueva"),
+    path("disponibles/", views.disponibilidad_json, name="disponibles"),
+    path("<int:pk>/cancelar/", views.cancelar_reserva, name="cancelar"),
+]
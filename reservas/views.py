@@ -0,0 +1,114 @@
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import require_GET, require_POST
+
+from .forms import RangoForm, ReservaForm
+from .models import Reserva
+from .services import LIMITE_LISTADO, ReservaRechazada, cancelar, disponibilidad, disponibles, proximas, reservar
+
+
+# --- Búsqueda y Reservas del Usuario ---
+
+@login_required
+def reservas(request: HttpRequest) -> HttpResponse:
+    """
+    Próximas reservas del usuario y, con ?inicio=&fin=, los vehículos de la
+    flota en reserva libres en ese intervalo.
+    """
+    busqueda = RangoForm(request.GET or None)
+    libres = None
+    if busqueda.is_valid():
+        libres = disponibles(busqueda.cleaned_data["inicio"], busqueda.cleaned_data["fin"])
+
+    return render(request, "reservas/reservas.html", {
+        "busqueda": busqueda,
+        "libres": libres,
+        "reservas": proximas(request.user)[:LIMITE_LISTADO],
+    })
+
+
+@login_required
+@require_POST
+def nueva(request: HttpRequest) -> HttpResponse:
+    form = ReservaForm(request.POST)
+    destino = reverse("reservas:reservas")
+    if not form.is_valid():
+        for errores in form.errors.values():
+            for error in errores:
+                messages.error(request, error)
+        return redirect(destino)
+
+    datos = form.cleaned_data
+    try:
+        reserva = reservar(request.user, datos["vehiculo"], datos["inicio"], datos["fin"], datos["motivo"])
+    except ReservaRechazada as exc:
+        messages.error(request, str(exc))
+        # De vuelta a la misma búsqueda, con la disponibilidad actualizada
+        rango = {campo: timezone.localtime(datos[campo]).strftime("%Y-%m-%dT%H:%M") for campo in ("inicio", "fin")}
+        return redirect(f"{destino}?{urlencode(rango)}")
+
+    messages.success(request, f"Reserva de {reserva.vehiculo.patente} confirmada.")
+    return redirect(destino)
+
+
+@login_required
+@require_POST
+def cancelar_reserva(request: HttpRequest, pk: int) -> HttpResponse:
+    reserva = get_object_or_404(Reserva.objects.select_related("vehiculo"), pk=pk)
+    if not request.user.is_staff and reserva.usuario_id != request.user.pk:
+        raise PermissionDenied
+
+    if cancelar(reserva):
+        messages.success(request, f"Reserva de {reserva.vehiculo.patente} cancelada.")
+    return redirect("reservas:reservas")
+
+
+# --- Disponibilidad (JSON) ---
+
+def _momento(valor: str):
+    momento = parse_datetime(valor)
+    if momento is None:
+        raise ValueError(valor)
+    return timezone.make_aware(momento) if timezone.is_naive(momento) else momento
+
+
+@login_required
+@require_GET
+def disponibilidad_json(request: HttpRequest) -> JsonResponse:
+    """
+    Vehículos libres por ventana: ?inicio=...&fin=... (ISO-8601), repetibles
+    para consultar varias ventanas en una sola llamada.
+    """
+    inicios, fines = request.GET.getlist("inicio"), request.GET.getlist("fin")
+    maximo = getattr(settings, "RESERVAS_MAX_VENTANAS", 50)
+    if not inicios or len(inicios) != len(fines):
+        return HttpResponseBadRequest("Indique pares de parámetros 'inicio' y 'fin'.")
+    if len(inicios) > maximo:
+        return HttpResponseBadRequest(f"Se pueden consultar hasta {maximo} ventanas por llamada.")
+    try:
+        ventanas = [(_momento(inicio), _momento(fin)) for inicio, fin in zip(inicios, fines)]
+    except ValueError:
+        return HttpResponseBadRequest("Parámetros 'inicio'/'fin' inválidos (use ISO-8601).")
+    if any(inicio >= fin for inicio, fin in ventanas):
+        return HttpResponseBadRequest("'inicio' debe ser anterior a 'fin'.")
+
+    return JsonResponse({
+        "campos": ["vehiculo", "patente", "marca", "modelo"],
+        "ventanas": [
+            {
+                "inicio": inicio.isoformat(),
+                "fin": fin.isoformat(),
+                "libres": [[v.pk, v.patente, v.marca, v.modelo] for v in libres],
+            }
+            for (inicio, fin), libres in zip(ventanas, disponibilidad(ventanas))
+        ],
+    }, json_dumps_params={"separators": (",", ":")})
@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from .models import Tarea
+
+
+@admin.register(Tarea)
+class TareaAdmin(admin.ModelAdmin):
+    """
+    Monitoreo de la cola (solo lectura).
+    Las tareas se crean desde las vistas y las procesa `procesar_tareas`.
+    """
+
+    list_display = ("id", "tipo", "estado", "progreso", "usuario", "intentos", "creada", "finalizada")
+    list_select_related = ("usuario",)
+    list_filter = ("estado", "tipo")
+    search_fields = ("tipo", "usuario__username", "huella")
+    readonly_fields = [campo.name for campo in Tarea._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class TareasConfig(AppConfig):
+    """
+    Cola de tareas en segundo plano respaldada por la base de datos.
+
+    Las exportaciones e informes pesados se encolan como `Tarea`, los procesa
+    el comando `procesar_tareas` (pool de procesos) y el resultado queda en
+    MEDIA_ROOT. Cada app declara sus tareas en un módulo `tareas.py`, que se
+    importa automáticamente en ready().
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "tareas"
+    verbose_name = "Tareas en Segundo Plano"
+
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+
+        autodiscover_modules("tareas")
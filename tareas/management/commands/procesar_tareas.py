@@ -0,0 +1,103 @@
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from time import monotonic, sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from tareas import proceso
+from tareas.models import Tarea
+from tareas.servicios import nombre_trabajador, purgar_vencidas, reclamar, recuperar_huerfanas
+
+
+class Command(BaseCommand):
+    help = (
+        "Worker de la cola de tareas: reclama tareas pendientes y las ejecuta "
+        "en un pool de procesos (exportaciones, informes)."
+    )
+
+    # Cada cuánto se recuperan tareas huérfanas y se purgan resultados vencidos
+    MANTENIMIENTO_SEGUNDOS = 300
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--procesos",
+            type=int,
+            default=getattr(settings, "TAREAS_PROCESOS", 2),
+            help="Tareas simultáneas (procesos del pool).",
+        )
+        parser.add_argument(
+            "--intervalo",
+            type=float,
+            default=getattr(settings, "TAREAS_INTERVALO", 2),
+            help="Segundos entre consultas a la cola cuando está vacía.",
+        )
+        parser.add_argument(
+            "--una-vez",
+            action="store_true",
+            help="Procesa lo pendiente y termina (cron / pruebas).",
+        )
+
+    def handle(self, *args, **options):
+        procesos = max(1, options["procesos"])
+        trabajador = nombre_trabajador()
+        self.stdout.write(f"Worker {trabajador} con {procesos} procesos")
+
+        self._mantenimiento()
+        ultimo_mantenimiento = monotonic()
+
+        # Los hijos abren sus propias conexiones; el principal no las comparte
+        connections.close_all()
+        pool = ProcessPoolExecutor(
+            max_workers=procesos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=proceso.inicializar,
+        )
+        en_vuelo = {}
+        try:
+            while True:
+                while len(en_vuelo) < procesos:
+                    tarea = reclamar(trabajador)
+                    if tarea is None:
+                        break
+                    self.stdout.write(f"→ {tarea}")
+                    en_vuelo[pool.submit(proceso.ejecutar, tarea.pk)] = tarea
+
+                if not en_vuelo:
+                    if options["una_vez"]:
+                        break
+                    sleep(options["intervalo"])
+                else:
+                    terminadas, _ = wait(en_vuelo, timeout=options["intervalo"], return_when=FIRST_COMPLETED)
+                    for futuro in terminadas:
+                        self._informar(en_vuelo.pop(futuro), futuro)
+
+                if monotonic() - ultimo_mantenimiento > self.MANTENIMIENTO_SEGUNDOS:
+                    self._mantenimiento()
+                    ultimo_mantenimiento = monotonic()
+        except KeyboardInterrupt:
+            self.stdout.write("Deteniendo: se esperan las tareas en curso...")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            for futuro, tarea in en_vuelo.items():
+                if futuro.done():
+                    self._informar(tarea, futuro)
+
+    def _informar(self, tarea, futuro):
+        try:
+            estado = futuro.result()
+        except Exception as exc:
+            # El proceso murió (p. ej. sin memoria): recuperar_huerfanas la reencolará
+            self.stderr.write(self.style.ERROR(f"✗ {tarea.tipo} #{tarea.pk}: {exc}"))
+            return
+        if estado == Tarea.COMPLETADA:
+            self.stdout.write(self.style.SUCCESS(f"✓ {tarea.tipo} #{tarea.pk}"))
+        else:
+            self.stdout.write(self.style.ERROR(f"✗ {tarea.tipo} #{tarea.pk}: {estado}"))
+
+    def _mantenimiento(self):
+        recuperadas = recuperar_huerfanas()
+        purgadas = purgar_vencidas()
+        if recuperadas or purgadas:
+            self.stdout.write(f"Mantenimiento: {recuperadas} recuperadas, {purgadas} purgadas")
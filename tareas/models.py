@@ -0,0 +1,78 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.db.models import Q
+
+
+class Tarea(models.Model):
+    """
+    Trabajo encolado para el worker (`manage.py procesar_tareas`).
+
+    `huella` identifica tipo + parámetros + versión de los datos: dos
+    solicitudes idénticas comparten la misma tarea mientras esté pendiente,
+    en curso o se haya completado hace poco (ver TAREAS_REUTILIZAR_SEGUNDOS).
+    """
+
+    PENDIENTE = "pendiente"
+    EN_CURSO = "en_curso"
+    COMPLETADA = "completada"
+    FALLIDA = "fallida"
+
+    ESTADOS = [
+        (PENDIENTE, "Pendiente"),
+        (EN_CURSO, "En curso"),
+        (COMPLETADA, "Completada"),
+        (FALLIDA, "Fallida"),
+    ]
+
+    ACTIVOS = (PENDIENTE, EN_CURSO)
+
+    tipo = models.CharField(max_length=100, verbose_name="Tipo")
+    parametros = models.JSONField(default=dict, blank=True, verbose_name="Parámetros")
+    huella = models.CharField(max_length=64, verbose_name="Huella")
+
+    estado = models.CharField(max_length=12, choices=ESTADOS, default=PENDIENTE, verbose_name="Estado")
+    progreso = models.PositiveSmallIntegerField(default=0, verbose_name="Progreso (%)")
+    mensaje = models.CharField(max_length=255, blank=True, verbose_name="Mensaje")
+    resultado = models.CharField(max_length=255, blank=True, verbose_name="Archivo resultado")
+    intentos = models.PositiveSmallIntegerField(default=0, verbose_name="Intentos")
+    trabajador = models.CharField(max_length=100, blank=True, verbose_name="Trabajador")
+
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="tareas",
+        verbose_name="Solicitada por",
+    )
+
+    creada = models.DateTimeField(auto_now_add=True, verbose_name="Creada")
+    iniciada = models.DateTimeField(null=True, blank=True, verbose_name="Iniciada")
+    finalizada = models.DateTimeField(null=True, blank=True, verbose_name="Finalizada")
+
+    class Meta:
+        verbose_name = "Tarea"
+        verbose_name_plural = "Tareas"
+        ordering = ["-creada"]
+        constraints = [
+            # Una sola tarea activa por huella: encolar dos veces lo mismo
+            # en paralelo falla con IntegrityError y se reutiliza la existente
+            models.UniqueConstraint(
+                fields=["huella"],
+                condition=Q(estado__in=["pendiente", "en_curso"]),
+                name="tarea_activa_unica",
+            ),
+        ]
+        indexes = [
+            # Cola: pendientes en orden de llegada
+            models.Index(fields=["estado", "creada"], name="tarea_estado_creada_idx"),
+            # Reutilización de resultados recientes
+            models.Index(fields=["huella", "finalizada"], name="tarea_huella_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.tipo} #{self.pk} ({self.get_estado_display()})"
+
+    @property
+    def terminada(self) -> bool:
+        return self.estado in (self.COMPLETADA, self.FALLIDA)
@@ -0,0 +1,17 @@
+# --- Punto de Entrada de los Procesos del Pool ---
+#
+# Los workers se crean con "spawn" (procesos limpios: no heredan conexiones
+# de base de datos abiertas por el proceso principal). Este módulo no importa
+# modelos al cargarse porque se importa antes de django.setup().
+
+
+def inicializar() -> None:
+    import django
+
+    django.setup()
+
+
+def ejecutar(tarea_id: int) -> str:
+    from .servicios import ejecutar_tarea
+
+    return ejecutar_tarea(tarea_id)
@@ -0,0 +1,35 @@
+# --- Registro de Tipos de Tarea ---
+#
+# Cada app declara sus tareas en `<app>/tareas.py`:
+#
+#     @tarea("vehiculos.exportar")
+#     def exportar(parametros: dict, progreso) -> str:
+#         ...
+#         return guardar_resultado("vehiculos.csv", archivo)
+#
+# La función recibe los parámetros (JSON) y un callable progreso(hechos, total),
+# y devuelve el nombre del archivo guardado en el storage (MEDIA_ROOT).
+
+_tareas: dict = {}
+
+
+class TareaDesconocida(KeyError):
+    """No hay ninguna función registrada para ese tipo de tarea."""
+
+
+def tarea(nombre: str):
+    def decorador(funcion):
+        _tareas[nombre] = funcion
+        return funcion
+    return decorador
+
+
+def obtener(nombre: str):
+    try:
+        return _tareas[nombre]
+    except KeyError:
+        raise TareaDesconocida(nombre) from None
+
+
+def registradas() -> list:
+    return sorted(_tareas)
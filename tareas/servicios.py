@@ -0,0 +1,208 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, OperationalError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.cache import generaciones
+
+from .models import Tarea
+from .registro import obtener
+
+
+logger = logging.getLogger(__name__)
+
+DIRECTORIO_RESULTADOS = "tareas"
+SEPARADOR_NOMBRE = "--"
+
+
+def _reutilizar_segundos() -> int:
+    return getattr(settings, "TAREAS_REUTILIZAR_SEGUNDOS", 600)
+
+
+# --- Encolado con Deduplicación ---
+
+def calcular_huella(tipo: str, parametros: dict, grupos=()) -> str:
+    """
+    Huella de la solicitud. Incluye la generación de caché de `grupos`
+    (ver core.cache): si los datos cambiaron, la misma consulta produce otra
+    huella y no se reutiliza un resultado obsoleto.
+    """
+    contenido = {"tipo": tipo, "parametros": parametros, "version": generaciones(*grupos) if grupos else {}}
+    crudo = json.dumps(contenido, sort_keys=True, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return hashlib.sha256(crudo.encode()).hexdigest()
+
+
+def _reutilizable(huella: str) -> Tarea | None:
+    limite = timezone.now() - timedelta(seconds=_reutilizar_segundos())
+    candidatas = Tarea.objects.filter(huella=huella).filter(
+        Q(estado__in=Tarea.ACTIVOS) | Q(estado=Tarea.COMPLETADA, finalizada__gte=limite)
+    ).order_by("-creada")
+    for tarea in candidatas[:2]:
+        if tarea.estado != Tarea.COMPLETADA or default_storage.exists(tarea.resultado):
+            return tarea
+    return None
+
+
+def encolar(tipo: str, parametros: dict, usuario=None, grupos=()) -> tuple:
+    """
+    Encola una tarea o reutiliza una idéntica pendiente, en curso o reciente.
+    Devuelve (tarea, creada).
+
+    `parametros` debe incluir todo lo que cambia el resultado (filtros y
+    alcance del usuario); `grupos` son las generaciones de datos de las que
+    depende.
+    """
+    obtener(tipo)  # falla temprano si el tipo no está registrado
+    huella = calcular_huella(tipo, parametros, grupos)
+
+    existente = _reutilizable(huella)
+    if existente is not None:
+        return existente, False
+
+    try:
+        with transaction.atomic():
+            return Tarea.objects.create(tipo=tipo, parametros=parametros, huella=huella, usuario=usuario), True
+    except IntegrityError:
+        # Otra request encoló la misma tarea entre la búsqueda y el INSERT
+        return Tarea.objects.get(huella=huella, estado__in=Tarea.ACTIVOS), False
+
+
+# --- Ejecución (worker) ---
+
+def nombre_trabajador() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def reclamar(trabajador: str) -> Tarea | None:
+    """
+    Toma la tarea pendiente más antigua. El UPDATE condicionado al estado
+    hace que dos workers nunca reclamen la misma (funciona igual en SQLite y
+    PostgreSQL, sin SELECT ... FOR UPDATE).
+    """
+    for pk in Tarea.objects.filter(estado=Tarea.PENDIENTE).order_by("creada", "id").values_list("pk", flat=True)[:10]:
+        tomada = Tarea.objects.filter(pk=pk, estado=Tarea.PENDIENTE).update(
+            estado=Tarea.EN_CURSO,
+            iniciada=timezone.now(),
+            trabajador=trabajador,
+            intentos=F("intentos") + 1,
+            progreso=0,
+        )
+        if tomada:
+            return Tarea.objects.get(pk=pk)
+    return None
+
+
+class Progreso:
+    """
+    progreso(hechos, total) para las funciones de tarea. Solo escribe en la
+    base de datos cuando el porcentaje entero cambia.
+
+    Es de mejor esfuerzo: en SQLite una conexión con una lectura abierta
+    (iterator()) no puede escribir si otro proceso escribió entretanto, y
+    un avance perdido no debe hacer fallar la tarea.
+    """
+
+    def __init__(self, tarea_id: int):
+        self.tarea_id = tarea_id
+        self.ultimo = -1
+
+    def __call__(self, hechos: int, total: int) -> None:
+        porcentaje = min(99, int(hechos * 100 / total)) if total else 0
+        if porcentaje > self.ultimo:
+            try:
+                Tarea.objects.filter(pk=self.tarea_id).update(progreso=porcentaje)
+            except OperationalError:
+                return
+            self.ultimo = porcentaje
+
+
+def ejecutar_tarea(tarea_id: int) -> str:
+    """Ejecuta una tarea ya reclamada y registra su resultado. Devuelve el estado final."""
+    close_old_connections()
+    tarea = Tarea.objects.get(pk=tarea_id)
+    try:
+        resultado = obtener(tarea.tipo)(tarea.parametros, Progreso(tarea.pk))
+    except Exception as exc:
+        logger.exception("Tarea %s (%s) falló", tarea.pk, tarea.tipo)
+        Tarea.objects.filter(pk=tarea.pk).update(
+            estado=Tarea.FALLIDA,
+            mensaje=str(exc)[:255],
+            finalizada=timezone.now(),
+        )
+        estado = Tarea.FALLIDA
+    else:
+        Tarea.objects.filter(pk=tarea.pk).update(
+            estado=Tarea.COMPLETADA,
+            progreso=100,
+            resultado=resultado,
+            mensaje="",
+            finalizada=timezone.now(),
+        )
+        estado = Tarea.COMPLETADA
+    finally:
+        close_old_connections()
+    return estado
+
+
+def guardar_resultado(nombre: str, archivo) -> str:
+    """
+    Guarda el archivo generado en el storage por defecto como
+    MEDIA_ROOT/tareas/<uuid>--<nombre> (ver nombre_descarga).
+    """
+    archivo.seek(0)
+    return default_storage.save(
+        f"{DIRECTORIO_RESULTADOS}/{uuid.uuid4().hex}{SEPARADOR_NOMBRE}{nombre}",
+        File(archivo, name=nombre),
+    )
+
+
+def nombre_descarga(resultado: str) -> str:
+    """Nombre con que se descarga el resultado (sin el prefijo único)."""
+    return os.path.basename(resultado).split(SEPARADOR_NOMBRE, 1)[-1]
+
+
+# --- Mantenimiento ---
+
+def recuperar_huerfanas() -> int:
+    """
+    Devuelve a la cola las tareas "en curso" de workers que murieron
+    (más de TAREAS_TIMEOUT_SEGUNDOS sin terminar). Tras TAREAS_MAX_INTENTOS
+    se marcan como fallidas.
+    """
+    limite = timezone.now() - timedelta(seconds=getattr(settings, "TAREAS_TIMEOUT_SEGUNDOS", 1800))
+    max_intentos = getattr(settings, "TAREAS_MAX_INTENTOS", 3)
+    colgadas = Tarea.objects.filter(estado=Tarea.EN_CURSO, iniciada__lt=limite)
+
+    fallidas = colgadas.filter(intentos__gte=max_intentos).update(
+        estado=Tarea.FALLIDA,
+        mensaje="Se agotaron los reintentos (el worker no terminó a tiempo).",
+        finalizada=timezone.now(),
+    )
+    reencoladas = colgadas.filter(intentos__lt=max_intentos).update(
+        estado=Tarea.PENDIENTE,
+        trabajador="",
+        progreso=0,
+    )
+    return fallidas + reencoladas
+
+
+def purgar_vencidas() -> int:
+    """Elimina tareas terminadas (y sus archivos) más antiguas que TAREAS_RETENCION_HORAS."""
+    limite = timezone.now() - timedelta(hours=getattr(settings, "TAREAS_RETENCION_HORAS", 24))
+    vencidas = Tarea.objects.filter(estado__in=(Tarea.COMPLETADA, Tarea.FALLIDA), finalizada__lt=limite)
+
+    for resultado in vencidas.exclude(resultado="").values_list("resultado", flat=True).iterator():
+        default_storage.delete(resultado)
+    eliminadas, _ = vencidas.delete()
+    return eliminadas
@@ -0,0 +1,15 @@
+from django.urls import path
+from . import views
+
+app_name = "tareas"
+
+urlpatterns = [
+    # Página de seguimiento con barra de progreso
+    path("<int:pk>/", views.detalle_tarea, name="detalle"),
+
+    # Estado en JSON (polling desde la página de seguimiento)
+    path("<int:pk>/estado/", views.estado_tarea, name="estado"),
+
+    # Descarga del archivo generado
+    path("<int:pk>/descargar/", views.descargar_tarea, name="descargar"),
+]
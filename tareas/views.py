@@ -0,0 +1,63 @@
+from django.contrib.auth.decorators import login_required
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
+
+from .models import Tarea
+from .servicios import nombre_descarga
+
+
+# --- Helpers ---
+
+def _tarea_visible(request: HttpRequest, pk: int) -> Tarea:
+    """Staff ve todas las tareas; el resto solo las que solicitó."""
+    tareas = Tarea.objects.all()
+    if not request.user.is_staff:
+        tareas = tareas.filter(usuario=request.user)
+    return get_object_or_404(tareas, pk=pk)
+
+
+def _estado_a_dict(tarea: Tarea) -> dict:
+    return {
+        "id": tarea.pk,
+        "tipo": tarea.tipo,
+        "estado": tarea.estado,
+        "estado_display": tarea.get_estado_display(),
+        "progreso": tarea.progreso,
+        "mensaje": tarea.mensaje,
+        "terminada": tarea.terminada,
+        "descarga": (
+            reverse("tareas:descargar", args=[tarea.pk])
+            if tarea.estado == Tarea.COMPLETADA and tarea.resultado else None
+        ),
+    }
+
+
+# --- Vistas ---
+
+@login_required
+def detalle_tarea(request: HttpRequest, pk: int) -> HttpResponse:
+    tarea = _tarea_visible(request, pk)
+    return render(request, "tareas/detalle.html", {
+        "tarea": tarea,
+        "estado": _estado_a_dict(tarea),
+    })
+
+
+@login_required
+def estado_tarea(request: HttpRequest, pk: int) -> JsonResponse:
+    return JsonResponse(_estado_a_dict(_tarea_visible(request, pk)))
+
+
+@login_required
+def descargar_tarea(request: HttpRequest, pk: int) -> FileResponse:
+    tarea = _tarea_visible(request, pk)
+    if tarea.estado != Tarea.COMPLETADA or not default_storage.exists(tarea.resultado):
+        raise Http404("El archivo no está disponible (aún en proceso o ya vencido).")
+
+    return FileResponse(
+        default_storage.open(tarea.resultado, "rb"),
+        as_attachment=True,
+        filename=nombre_descarga(tarea.resultado),
+    )
@@ -0,0 +1,32 @@
+from django.contrib import admin
+
+from .models import PosicionVehiculo, SegmentoTelemetria, UltimaLectura
+
+
+@admin.register(UltimaLectura)
+class UltimaLecturaAdmin(admin.ModelAdmin):
+    list_display = ("vehiculo", "momento", "odometro", "combustible", "latitud", "longitud")
+    list_select_related = ("vehiculo",)
+    search_fields = ("vehiculo__patente",)
+    readonly_fields = list_display
+
+
+@admin.register(PosicionVehiculo)
+class PosicionVehiculoAdmin(admin.ModelAdmin):
+    list_display = ("vehiculo", "latitud", "longitud", "momento", "recibida")
+    list_select_related = ("vehiculo",)
+    search_fields = ("vehiculo__patente",)
+    readonly_fields = list_display
+
+
+@admin.register(SegmentoTelemetria)
+class SegmentoTelemetriaAdmin(admin.ModelAdmin):
+    # Los datos empaquetados no son editables: solo se inspecciona el índice
+    list_display = ("vehiculo", "fecha", "desde", "hasta", "cantidad")
+    list_select_related = ("vehiculo",)
+    search_fields = ("vehiculo__patente",)
+    exclude = ("datos",)
+    readonly_fields = list_display
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class TelemetriaConfig(AppConfig):
+    """
+    Lecturas periódicas de los vehículos (odómetro, combustible, GPS).
+
+    Los puntos se guardan empaquetados por vehículo y día (ver
+    empaquetado.py) y la última lectura de cada vehículo se mantiene aparte
+    en UltimaLectura, para consultarla sin recorrer la serie.
+    """
+
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "telemetria"
+    verbose_name = "Telemetría"
@@ -0,0 +1,102 @@
+import sys
+import zlib
+from array import array
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from typing import NamedTuple
+
+
+# --- Empaquetado de Segmentos ---
+#
+# Una fila por punto (una lectura por minuto y vehículo) son millones de
+# filas al día, cada una con su sobrecosto de fila e índice. Un segmento
+# guarda las lecturas de un vehículo en un día como columnas:
+#
+#   segundos desde 00:00 UTC | odómetro | combustible | latitud | longitud
+#
+# cada una un array de enteros de ancho fijo (little-endian) con su escala,
+# y el conjunto comprimido con zlib. Un día completo (1440 lecturas) ocupa
+# unos pocos KB y se lee con una sola fila.
+#
+# Precisión: momento al segundo, odómetro al metro, combustible a la
+# centésima de punto porcentual y coordenadas a la millonésima de grado
+# (~11 cm). Un valor ausente se guarda como el centinela de su tipo.
+
+class Lectura(NamedTuple):
+    momento: datetime
+    odometro: float | None = None
+    combustible: float | None = None
+    latitud: float | None = None
+    longitud: float | None = None
+
+
+# (campo de Lectura, typecode de array, escala)
+CANALES = (
+    ("odometro", "I", 1000),
+    ("combustible", "H", 100),
+    ("latitud", "i", 1_000_000),
+    ("longitud", "i", 1_000_000),
+)
+
+NULOS = {"I": 0xFFFFFFFF, "H": 0xFFFF, "i": -0x80000000}
+
+NIVEL_COMPRESION = 6
+
+_INVERTIR = sys.byteorder == "big"
+
+
+def inicio_dia(fecha) -> datetime:
+    return datetime.combine(fecha, time.min, tzinfo=dt_timezone.utc)
+
+
+def _columna(tipo: str, valores) -> bytes:
+    columna = array(tipo, valores)
+    if _INVERTIR:
+        columna.byteswap()
+    return columna.tobytes()
+
+
+def empaquetar(fecha, lecturas: list) -> bytes:
+    """`lecturas`: del día `fecha` (UTC), ordenadas y sin momentos repetidos."""
+    base = inicio_dia(fecha)
+    partes = [_columna("I", (int((lectura.momento - base).total_seconds()) for lectura in lecturas))]
+    for indice, (_, tipo, escala) in enumerate(CANALES, start=1):
+        nulo = NULOS[tipo]
+        partes.append(_columna(tipo, (
+            nulo if lectura[indice] is None else round(lectura[indice] * escala)
+            for lectura in lecturas
+        )))
+    return zlib.compress(b"".join(partes), NIVEL_COMPRESION)
+
+
+def desempaquetar(fecha, cantidad: int, datos) -> list:
+    crudo = memoryview(zlib.decompress(bytes(datos)))
+    posicion = 0
+    columnas = []
+    for tipo in ["I"] + [tipo for _, tipo, _ in CANALES]:
+        columna = array(tipo)
+        fin = posicion + columna.itemsize * cantidad
+        columna.frombytes(crudo[posicion:fin])
+        if _INVERTIR:
+            columna.byteswap()
+        columnas.append(columna)
+        posicion = fin
+
+    base = inicio_dia(fecha)
+    momentos = [base + timedelta(seconds=segundos) for segundos in columnas[0]]
+    valores = [
+        [None if v == NULOS[tipo] else v / escala for v in columna]
+        for (_, tipo, escala), columna in zip(CANALES, columnas[1:])
+    ]
+    return [Lectura(*fila) for fila in zip(momentos, *valores)]
+
+
+def fusionar(grupos) -> list:
+    """
+    Une las lecturas de varios segmentos en orden de momento. Ante un
+    momento repetido (p. ej. un lote reenviado) gana el grupo posterior.
+    """
+    por_momento = {}
+    for lecturas in grupos:
+        for lectura in lecturas:
+            por_momento[lectura.momento] = lectura
+    return sorted(por_momento.values())
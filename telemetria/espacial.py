@@ -0,0 +1,300 @@
+import heapq
+import math
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.cache import generacion
+
+from .models import PosicionVehiculo
+
+
+# --- Índice Espacial en Memoria (grilla) ---
+#
+# Cada proceso mantiene las posiciones de PosicionVehiculo repartidas en una
+# grilla de celdas de TELEMETRIA_CELDA_GRADOS de lado: {(fila, columna): {ids}}.
+#   - Vecinos más cercanos: se recorren anillos de celdas alrededor del
+#     punto, de adentro hacia afuera, hasta que la distancia mínima posible
+#     a los anillos siguientes supera al k-ésimo candidato.
+#   - Rectángulo: solo las celdas que lo cubren.
+# Las distancias son de gran círculo (haversine), en km.
+#
+# Actualización:
+#   - Incremental: cada TELEMETRIA_REFRESCO_SEGUNDOS se releen solo las
+#     posiciones con `recibida` posterior a la última vista (menos un margen
+#     por transacciones de ingesta que confirman tarde) y se mueven de celda.
+#   - Completa: al cambiar la generación "vehiculos" (activo y responsable
+#     son filtros del índice) o cada TELEMETRIA_RECONSTRUIR_SEGUNDOS.
+
+RADIO_TIERRA_KM = 6371.0088
+
+# Posiciones escritas hasta esto antes de la última vista se vuelven a leer
+MARGEN_RECIBIDA = timedelta(seconds=60)
+
+
+def distancia_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dlat, dlon = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dlat / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dlon / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+@dataclass
+class Posicion:
+    vehiculo_id: int
+    patente: str
+    usuario_id: int | None
+    activo: bool
+    latitud: float
+    longitud: float
+    momento: object
+    celda: tuple = None
+
+
+class Grilla:
+    def __init__(self, celda_grados: float):
+        self.lado = celda_grados
+        self.celdas = defaultdict(set)
+        self.posiciones = {}
+        self.por_usuario = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self.posiciones)
+
+    def _celda(self, latitud: float, longitud: float) -> tuple:
+        return math.floor(latitud / self.lado), math.floor(longitud / self.lado)
+
+    def agregar(self, posicion: Posicion) -> None:
+        self.quitar(posicion.vehiculo_id)
+        posicion.celda = self._celda(posicion.latitud, posicion.longitud)
+        self.posiciones[posicion.vehiculo_id] = posicion
+        self.celdas[posicion.celda].add(posicion.vehiculo_id)
+        self.por_usuario[posicion.usuario_id].add(posicion.vehiculo_id)
+
+    def quitar(self, vehiculo_id: int) -> None:
+        anterior = self.posiciones.pop(vehiculo_id, None)
+        if anterior is None:
+            return
+        for indice, clave in ((self.celdas, anterior.celda), (self.por_usuario, anterior.usuario_id)):
+            indice[clave].discard(vehiculo_id)
+            if not indice[clave]:
+                del indice[clave]
+
+    # --- Consultas ---
+
+    def _anillo(self, centro: tuple, radio: int):
+        fila, columna = centro
+        if radio == 0:
+            yield centro
+            return
+        for dc in range(-radio, radio + 1):
+            yield fila - radio, columna + dc
+            yield fila + radio, columna + dc
+        for df in range(-radio + 1, radio):
+            yield fila + df, columna - radio
+            yield fila + df, columna + radio
+
+    def _cota_km(self, latitud: float, radio: int) -> float:
+        """
+        Distancia mínima a cualquier punto fuera de los anillos 0..radio: esos
+        puntos difieren en al menos radio·lado grados de latitud o de longitud.
+        """
+        grados = radio * self.lado
+        por_latitud = math.radians(grados) * RADIO_TIERRA_KM
+        # Distancia al meridiano desplazado `grados` (cota inferior en longitud)
+        por_longitud = RADIO_TIERRA_KM * math.asin(
+            math.cos(math.radians(latitud)) * math.sin(math.radians(min(grados, 90.0)))
+        )
+        return min(por_latitud, por_longitud)
+
+    def _mas_cercanos(self, vehiculo_ids, latitud: float, longitud: float, k: int, acepta, radio_km) -> list:
+        candidatos = []
+        for vehiculo_id in vehiculo_ids:
+            posicion = self.posiciones[vehiculo_id]
+            if acepta(posicion):
+                distancia = distancia_km(latitud, longitud, posicion.latitud, posicion.longitud)
+                if radio_km is None or distancia <= radio_km:
+                    candidatos.append((distancia, vehiculo_id, posicion))
+        return [(d, posicion) for d, _, posicion in heapq.nsmallest(k, candidatos)]
+
+    def cercanos(self, latitud: float, longitud: float, k: int, acepta, radio_km: float | None = None, entre=None) -> list:
+        """
+        Los k vehículos aceptados por `acepta(posicion)` más cercanos al punto
+        (y a menos de `radio_km`, si se indica): [(distancia_km, Posicion)].
+        Con `entre` (pocos ids, p. ej. los de un usuario) se recorren solo esos.
+        """
+        if k <= 0:
+            return []
+        if entre is not None:
+            return self._mas_cercanos(entre, latitud, longitud, k, acepta, radio_km)
+
+        centro = self._celda(latitud, longitud)
+        mejores = []  # heap de (-distancia, vehiculo_id, posicion) con los k más cercanos
+        radio = 0
+        while True:
+            if (2 * radio + 1) ** 2 > 4 * len(self.celdas):
+                # Pocos aceptados o muy lejos: los anillos ya cubren más celdas
+                # que las ocupadas; se termina recorriendo todas las posiciones
+                return self._mas_cercanos(self.posiciones, latitud, longitud, k, acepta, radio_km)
+            for celda in self._anillo(centro, radio):
+                for vehiculo_id in self.celdas.get(celda, ()):
+                    posicion = self.posiciones[vehiculo_id]
+                    if not acepta(posicion):
+                        continue
+                    distancia = distancia_km(latitud, longitud, posicion.latitud, posicion.longitud)
+                    if radio_km is not None and distancia > radio_km:
+                        continue
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, (-distancia, vehiculo_id, posicion))
+                    elif distancia < -mejores[0][0]:
+                        heapq.heapreplace(mejores, (-distancia, vehiculo_id, posicion))
+            cota = self._cota_km(latitud, radio)
+            if radio_km is not None and cota > radio_km:
+                break
+            if len(mejores) == k and cota >= -mejores[0][0]:
+                break
+            radio += 1
+        return [(-d, posicion) for d, _, posicion in sorted(mejores, key=lambda m: (-m[0], m[1]))]
+
+    def en_rectangulo(self, sur: float, oeste: float, norte: float, este: float, acepta, limite: int, entre=None) -> tuple:
+        """
+        Vehículos aceptados dentro del rectángulo (oeste > este si cruza el
+        antimeridiano): (hasta `limite` posiciones ordenadas por id, total).
+        """
+        tramos = [(oeste, este)] if oeste <= este else [(oeste, 180.0), (-180.0, este)]
+        fila_min, fila_max = math.floor(sur / self.lado), math.floor(norte / self.lado)
+        celdas = [
+            (fila_min, fila_max, math.floor(desde / self.lado), math.floor(hasta / self.lado))
+            for desde, hasta in tramos
+        ]
+        cantidad_celdas = sum((f2 - f1 + 1) * (c2 - c1 + 1) for f1, f2, c1, c2 in celdas)
+
+        if entre is not None:
+            ids = entre
+        elif cantidad_celdas > len(self.celdas):
+            # Rectángulo más grande que la zona con vehículos: se recorren las celdas ocupadas
+            ids = (
+                vehiculo_id
+                for (fila, columna), del_celda in self.celdas.items()
+                if any(f1 <= fila <= f2 and c1 <= columna <= c2 for f1, f2, c1, c2 in celdas)
+                for vehiculo_id in del_celda
+            )
+        else:
+            ids = (
+                vehiculo_id
+                for f1, f2, c1, c2 in celdas
+                for fila in range(f1, f2 + 1)
+                for columna in range(c1, c2 + 1)
+                for vehiculo_id in self.celdas.get((fila, columna), ())
+            )
+
+        def adentro(posicion: Posicion) -> bool:
+            return sur <= posicion.latitud <= norte and any(d <= posicion.longitud <= h for d, h in tramos)
+
+        encontrados = sorted(
+            vehiculo_id for vehiculo_id in ids
+            if adentro(self.posiciones[vehiculo_id]) and acepta(self.posiciones[vehiculo_id])
+        )
+        return [self.posiciones[vehiculo_id] for vehiculo_id in encontrados[:limite]], len(encontrados)
+
+
+# --- Índice del Proceso ---
+
+@dataclass
+class _Estado:
+    grilla: Grilla
+    version: int
+    construido: object
+    refrescado: object
+    ultima_recibida: object
+
+
+_estado: _Estado | None = None
+_cerrojo = threading.Lock()
+
+CAMPOS = ["vehiculo_id", "vehiculo__patente", "vehiculo__usuario_id", "vehiculo__activo", "latitud", "longitud", "momento", "recibida"]
+
+
+def _segundos(nombre: str, por_defecto: int) -> timedelta:
+    return timedelta(seconds=getattr(settings, nombre, por_defecto))
+
+
+def _cargar(grilla: Grilla, filas) -> object:
+    """Agrega las filas a la grilla; devuelve la `recibida` más reciente."""
+    ultima = None
+    for *datos, recibida in filas:
+        grilla.agregar(Posicion(*datos))
+        if ultima is None or recibida > ultima:
+            ultima = recibida
+    return ultima
+
+
+def _construir(version: int) -> _Estado:
+    ahora = timezone.now()
+    grilla = Grilla(getattr(settings, "TELEMETRIA_CELDA_GRADOS", 0.05))
+    ultima = _cargar(grilla, PosicionVehiculo.objects.values_list(*CAMPOS).iterator(chunk_size=5000))
+    return _Estado(grilla, version, ahora, ahora, ultima)
+
+
+def _refrescar(estado: _Estado) -> None:
+    ahora = timezone.now()
+    qs = PosicionVehiculo.objects.values_list(*CAMPOS)
+    if estado.ultima_recibida is not None:
+        qs = qs.filter(recibida__gte=estado.ultima_recibida - MARGEN_RECIBIDA)
+    ultima = _cargar(estado.grilla, qs)
+    if ultima is not None and (estado.ultima_recibida is None or ultima > estado.ultima_recibida):
+        estado.ultima_recibida = ultima
+    estado.refrescado = ahora
+
+
+def _vigente() -> _Estado:
+    """Índice al día (se llama con _cerrojo tomado)."""
+    global _estado
+    version = generacion("vehiculos")
+    ahora = timezone.now()
+    if (
+        _estado is None
+        or _estado.version != version
+        or ahora - _estado.construido >= _segundos("TELEMETRIA_RECONSTRUIR_SEGUNDOS", 3600)
+    ):
+        _estado = _construir(version)
+    elif ahora - _estado.refrescado >= _segundos("TELEMETRIA_REFRESCO_SEGUNDOS", 5):
+        _refrescar(_estado)
+    return _estado
+
+
+def _acepta(inactivos: bool):
+    if inactivos:
+        return lambda posicion: True
+    return lambda posicion: posicion.activo
+
+
+def _visibles(grilla: Grilla, usuario):
+    """Ids a recorrer para el usuario: None (toda la grilla) para staff."""
+    if usuario.is_staff:
+        return None
+    return tuple(grilla.por_usuario.get(usuario.pk, ()))
+
+
+def cercanos(usuario, latitud: float, longitud: float, k: int, radio_km: float | None = None, inactivos: bool = False) -> list:
+    """
+    Los k vehículos visibles para el usuario (staff: toda la flota) más
+    cercanos al punto: [(distancia_km, Posicion)]. Por defecto solo activos.
+    """
+    with _cerrojo:
+        grilla = _vigente().grilla
+        return grilla.cercanos(latitud, longitud, k, _acepta(inactivos), radio_km, entre=_visibles(grilla, usuario))
+
+
+def en_rectangulo(usuario, sur: float, oeste: float, norte: float, este: float, limite: int, inactivos: bool = False) -> tuple:
+    """
+    Vehículos visibles para el usuario dentro del rectángulo: (hasta
+    `limite` posiciones, total encontrado). Por defecto solo activos.
+    """
+    with _cerrojo:
+        grilla = _vigente().grilla
+        return grilla.en_rectangulo(sur, oeste, norte, este, _acepta(inactivos), limite, entre=_visibles(grilla, usuario))
@@ -0,0 +1,368 @@
+import csv
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from itertools import islice
+
+from django import forms
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from vehiculos.forms import normalizar_patente
+from vehiculos.models import Vehiculo
+
+from .empaquetado import Lectura, fusionar
+from .models import PosicionVehiculo, SegmentoTelemetria, UltimaLectura
+
+
+# --- Ingesta de Telemetría (NDJSON / CSV) ---
+#
+# Flujo por lote de TELEMETRIA_LOTE líneas:
+#   1. Validación de cada lectura y una sola consulta IN para resolver
+#      patentes / ids de vehículo
+#   2. Agrupación por vehículo y día: un SegmentoTelemetria por grupo,
+#      insertados con bulk_create (sin leer los segmentos existentes)
+#   3. UltimaLectura y PosicionVehiculo de cada vehículo, solo si el lote
+#      trae una más reciente
+# Las líneas inválidas se cuentan en el reporte; nunca detienen la carga.
+#
+# Cada lectura identifica su vehículo por "vehiculo" (id) o "patente" y
+# trae "momento" (ISO 8601 o segundos Unix) y cualquiera de las medidas:
+#
+#   {"patente": "ABCD12", "momento": "2025-03-01T12:00:00Z",
+#    "odometro": 48211.3, "combustible": 61.5, "latitud": -33.45, "longitud": -70.66}
+
+# Claves / encabezados aceptados (normalizados) → campo
+COLUMNAS = {
+    "vehiculo": "vehiculo",
+    "vehiculo_id": "vehiculo",
+    "patente": "patente",
+    "momento": "momento",
+    "ts": "momento",
+    "timestamp": "momento",
+    "odometro": "odometro",
+    "odómetro": "odometro",
+    "combustible": "combustible",
+    "latitud": "latitud",
+    "lat": "latitud",
+    "longitud": "longitud",
+    "lon": "longitud",
+    "lng": "longitud",
+}
+
+MEDIDAS = ("odometro", "combustible", "latitud", "longitud")
+
+# Rango válido de cada medida (también garantiza que quepa en su columna empaquetada)
+LIMITES = {
+    "odometro": (0, 4_000_000),
+    "combustible": (0, 100),
+    "latitud": (-90, 90),
+    "longitud": (-180, 180),
+}
+
+# Reloj del dispositivo adelantado: más allá de esto la lectura se rechaza
+TOLERANCIA_FUTURO = timedelta(minutes=5)
+
+# El reporte detalla solo los primeros errores (una carga puede traer millones de líneas)
+MAX_ERRORES_REPORTE = 100
+
+
+@dataclass
+class ErrorLectura:
+    linea: int
+    mensaje: str
+
+
+@dataclass
+class ReporteIngesta:
+    procesadas: int = 0
+    guardadas: int = 0
+    segmentos: int = 0
+    con_errores: int = 0
+    errores: list = field(default_factory=list)
+
+    def agregar_error(self, linea: int, mensaje: str) -> None:
+        self.con_errores += 1
+        if len(self.errores) < MAX_ERRORES_REPORTE:
+            self.errores.append(ErrorLectura(linea, mensaje))
+
+    def a_dict(self) -> dict:
+        return {
+            "procesadas": self.procesadas,
+            "guardadas": self.guardadas,
+            "segmentos": self.segmentos,
+            "con_errores": self.con_errores,
+            "errores": [{"linea": e.linea, "mensaje": e.mensaje} for e in self.errores],
+        }
+
+
+def _tamano_lote() -> int:
+    return getattr(settings, "TELEMETRIA_LOTE", 10000)
+
+
+# --- Lectura de formatos ---
+
+def _texto(lineas):
+    for linea in lineas:
+        yield linea.decode("utf-8-sig") if isinstance(linea, bytes) else linea
+
+
+def _normalizar(registro: dict) -> dict:
+    return {
+        COLUMNAS[clave]: valor
+        for clave, valor in ((str(k).strip().lower(), v) for k, v in registro.items())
+        if clave in COLUMNAS and valor not in (None, "")
+    }
+
+
+def leer_ndjson(lineas):
+    """Un objeto JSON por línea → (nro_linea, dict | None si la línea no es un objeto)."""
+    for nro, linea in enumerate(_texto(lineas), start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            registro = json.loads(linea)
+        except ValueError:
+            registro = None
+        yield nro, _normalizar(registro) if isinstance(registro, dict) else None
+
+
+def leer_csv(lineas):
+    lector = csv.reader(_texto(lineas))
+    encabezados = [COLUMNAS.get(h.strip().lower()) for h in next(lector, [])]
+    if "momento" not in encabezados or not {"vehiculo", "patente"} & set(encabezados):
+        raise ValueError("El CSV debe incluir la columna 'momento' y 'patente' o 'vehiculo'.")
+
+    # La línea 1 es el encabezado
+    for nro, valores in enumerate(lector, start=2):
+        if any(valores):
+            yield nro, {
+                campo: valor
+                for campo, valor in zip(encabezados, valores)
+                if campo is not None and valor != ""
+            }
+
+
+def leer(lineas, formato: str):
+    """Iterador de (nro_linea, dict) para formato "ndjson" o "csv"."""
+    if formato == "csv":
+        return leer_csv(lineas)
+    return leer_ndjson(lineas)
+
+
+def formato_por_nombre(nombre: str) -> str:
+    nombre = nombre.lower().removesuffix(".gz")
+    return "csv" if nombre.endswith(".csv") else "ndjson"
+
+
+# --- Validación ---
+
+def _momento(valor, limite: datetime) -> datetime:
+    if isinstance(valor, bool):
+        raise forms.ValidationError(f"Momento inválido: '{valor}'.")
+    try:
+        momento = datetime.fromtimestamp(float(valor), tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        try:
+            momento = parse_datetime(str(valor).strip())
+        except ValueError:
+            momento = None
+        if momento is None:
+            raise forms.ValidationError(f"Momento inválido: '{valor}'.")
+        if timezone.is_naive(momento):
+            momento = timezone.make_aware(momento)
+
+    momento = momento.astimezone(dt_timezone.utc).replace(microsecond=0)
+    if momento > limite:
+        raise forms.ValidationError(f"Momento en el futuro: '{valor}'.")
+    return momento
+
+
+def _medida(fila: dict, campo: str):
+    valor = fila.get(campo)
+    if valor is None:
+        return None
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        raise forms.ValidationError(f"{campo.capitalize()} inválido: '{valor}'.")
+    minimo, maximo = LIMITES[campo]
+    if not minimo <= numero <= maximo:
+        raise forms.ValidationError(f"{campo.capitalize()} fuera de rango: '{valor}'.")
+    return numero
+
+
+def _limpiar(fila: dict, limite: datetime) -> tuple:
+    """Devuelve (referencia del vehículo, Lectura)."""
+    if "vehiculo" in fila:
+        try:
+            referencia = int(fila["vehiculo"])
+        except (TypeError, ValueError):
+            raise forms.ValidationError(f"Vehículo inválido: '{fila['vehiculo']}'.")
+    elif "patente" in fila:
+        referencia = normalizar_patente(str(fila["patente"]))
+    else:
+        raise forms.ValidationError("Falta 'vehiculo' o 'patente'.")
+
+    if "momento" not in fila:
+        raise forms.ValidationError("Falta 'momento'.")
+    lectura = Lectura(_momento(fila["momento"], limite), *(_medida(fila, campo) for campo in MEDIDAS))
+    if all(getattr(lectura, campo) is None for campo in MEDIDAS):
+        raise forms.ValidationError("La lectura no trae ninguna medida.")
+    return referencia, lectura
+
+
+def _resolver_vehiculos(referencias: set) -> dict:
+    """{id o patente: id} con una sola consulta."""
+    ids = {r for r in referencias if isinstance(r, int)}
+    patentes = referencias - ids
+    resueltos = {}
+    for pk, patente in Vehiculo.objects.filter(Q(pk__in=ids) | Q(patente__in=patentes)).values_list("pk", "patente"):
+        resueltos[pk] = pk
+        resueltos[patente] = pk
+    return resueltos
+
+
+def validar_lote(lote, reporte: ReporteIngesta) -> dict:
+    """Devuelve {vehiculo_id: [Lectura, ...]} con las lecturas válidas del lote."""
+    limite = timezone.now() + TOLERANCIA_FUTURO
+    candidatas = []
+    for nro, fila in lote:
+        if fila is None:
+            reporte.agregar_error(nro, "La línea no es un objeto JSON.")
+            continue
+        try:
+            candidatas.append((nro, *_limpiar(fila, limite)))
+        except forms.ValidationError as exc:
+            reporte.agregar_error(nro, "; ".join(exc.messages))
+
+    vehiculos = _resolver_vehiculos({referencia for _, referencia, _ in candidatas})
+    por_vehiculo = defaultdict(list)
+    for nro, referencia, lectura in candidatas:
+        if referencia not in vehiculos:
+            reporte.agregar_error(nro, f"Vehículo '{referencia}' no existe.")
+            continue
+        por_vehiculo[vehiculos[referencia]].append(lectura)
+    return por_vehiculo
+
+
+# --- Escritura ---
+
+CAMPOS_ULTIMA = ["momento", "odometro", "combustible", "latitud", "longitud"]
+CAMPOS_POSICION = ["momento", "latitud", "longitud", "recibida"]
+
+
+def _registrar_recientes(modelo, lecturas: dict, valores, campos: list) -> None:
+    """
+    Registra en `modelo` (una fila por vehículo) lo que `valores(lecturas)`
+    calcula a partir de {vehiculo_id: [Lectura, ...] ordenadas}, usando solo
+    las lecturas posteriores al `momento` ya guardado (lotes atrasados o
+    reenviados no retroceden la fila). Un valor None conserva el guardado.
+    Debe llamarse dentro de una transacción.
+    """
+    filas = {pk: modelo(vehiculo_id=pk, **valores(lecturas[pk])) for pk in sorted(lecturas)}
+    modelo.objects.bulk_create(list(filas.values()), ignore_conflicts=True)
+
+    # Las filas ya existentes se bloquean (en orden de pk) antes de comparar:
+    # dos lotes concurrentes del mismo vehículo no retroceden el valor
+    vigentes = dict(
+        modelo.objects.select_for_update()
+        .filter(vehiculo_id__in=lecturas)
+        .order_by("pk")
+        .values_list("vehiculo_id", "momento")
+    )
+    nuevas = []
+    for pk, fila in filas.items():
+        posteriores = [lectura for lectura in lecturas[pk] if lectura.momento > vigentes.get(pk, fila.momento)]
+        if posteriores:
+            nuevas.append(modelo(vehiculo_id=pk, **{
+                campo: F(campo) if valor is None else valor
+                for campo, valor in valores(posteriores).items()
+            }))
+    modelo.objects.bulk_update(nuevas, campos, batch_size=500)
+
+
+def _combinar(lecturas: list) -> dict:
+    """Momento de la última lectura y, por medida, su último valor informado (None si ninguna lo trae)."""
+    combinada = {"momento": lecturas[-1].momento}
+    for campo in MEDIDAS:
+        combinada[campo] = next(
+            (getattr(lectura, campo) for lectura in reversed(lecturas) if getattr(lectura, campo) is not None),
+            None,
+        )
+    return combinada
+
+
+def actualizar_ultimas(lecturas: dict) -> None:
+    """
+    Registra {vehiculo_id: [Lectura, ...] ordenadas} como última lectura de
+    cada vehículo. Una lectura parcial (p. ej. solo GPS) no borra las demás
+    medidas: cada una conserva su último valor informado.
+    """
+    _registrar_recientes(UltimaLectura, lecturas, _combinar, CAMPOS_ULTIMA)
+
+
+def actualizar_posiciones(lecturas: dict) -> None:
+    """Registra {vehiculo_id: [Lectura con latitud y longitud, ...] ordenadas} como última posición conocida."""
+    recibida = timezone.now()
+
+    def valores(del_vehiculo: list) -> dict:
+        ultima = del_vehiculo[-1]
+        return {"momento": ultima.momento, "latitud": ultima.latitud, "longitud": ultima.longitud, "recibida": recibida}
+
+    _registrar_recientes(PosicionVehiculo, lecturas, valores, CAMPOS_POSICION)
+
+
+def guardar_lecturas(por_vehiculo: dict) -> int:
+    """Inserta un segmento por vehículo y día. Devuelve cuántos segmentos creó."""
+    segmentos = []
+    ultimas = {}
+    posiciones = {}
+    for vehiculo_id, lecturas in por_vehiculo.items():
+        por_dia = defaultdict(list)
+        for lectura in lecturas:
+            por_dia[lectura.momento.date()].append(lectura)
+        for fecha, del_dia in sorted(por_dia.items()):
+            del_dia = fusionar([del_dia])
+            segmentos.append(SegmentoTelemetria.crear_desde(vehiculo_id, fecha, del_dia))
+            ultimas.setdefault(vehiculo_id, []).extend(del_dia)
+            posiciones.setdefault(vehiculo_id, []).extend(
+                lectura for lectura in del_dia
+                if lectura.latitud is not None and lectura.longitud is not None
+            )
+        if not posiciones[vehiculo_id]:
+            del posiciones[vehiculo_id]
+
+    with transaction.atomic():
+        SegmentoTelemetria.objects.bulk_create(segmentos, batch_size=500)
+        actualizar_ultimas(ultimas)
+        actualizar_posiciones(posiciones)
+    return len(segmentos)
+
+
+# --- Orquestación ---
+
+def _lotes(iterable, tamano: int):
+    iterador = iter(iterable)
+    while lote := list(islice(iterador, tamano)):
+        yield lote
+
+
+def ingerir(registros, tamano_lote: int | None = None) -> ReporteIngesta:
+    """
+    Ingiere un iterador de (nro_linea, dict) (ver leer()). Cada lote se
+    escribe en su propia transacción; devuelve el reporte.
+    """
+    reporte = ReporteIngesta()
+    for lote in _lotes(registros, tamano_lote or _tamano_lote()):
+        reporte.procesadas += len(lote)
+        por_vehiculo = validar_lote(lote, reporte)
+        if por_vehiculo:
+            reporte.segmentos += guardar_lecturas(por_vehiculo)
+            reporte.guardadas += sum(len(lecturas) for lecturas in por_vehiculo.values())
+    return reporte
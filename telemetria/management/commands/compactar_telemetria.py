@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from telemetria.services import compactar
+
+
+class Command(BaseCommand):
+    help = (
+        "Fusiona los segmentos de telemetría de cada vehículo y día en uno solo "
+        "(pensado para cron, p. ej. cada hora)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--incluir-hoy",
+            action="store_true",
+            help="Compacta también el día en curso (por defecto solo días cerrados).",
+        )
+        parser.add_argument("--vehiculo", type=int, help="Solo este vehículo (id).")
+
+    def handle(self, *args, **options):
+        hasta = None if options["incluir_hoy"] else timezone.now().date() - timedelta(days=1)
+        compactados = compactar(vehiculo_id=options["vehiculo"], hasta_fecha=hasta)
+        self.stdout.write(self.style.SUCCESS(f"{compactados} grupos vehículo/día compactados."))
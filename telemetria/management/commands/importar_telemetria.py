@@ -0,0 +1,46 @@
+import gzip
+
+from django.core.management.base import BaseCommand, CommandError
+
+from telemetria.ingesta import formato_por_nombre, ingerir, leer
+
+
+class Command(BaseCommand):
+    help = "Ingiere lecturas de telemetría desde archivos NDJSON o CSV (también .gz)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivos", nargs="+", help="Rutas a archivos .ndjson/.jsonl/.csv (opcionalmente .gz)")
+        parser.add_argument(
+            "--formato",
+            choices=["ndjson", "csv"],
+            help="Formato de los archivos (por defecto, según la extensión).",
+        )
+        parser.add_argument(
+            "--lote",
+            type=int,
+            default=None,
+            help="Líneas por lote (por defecto TELEMETRIA_LOTE).",
+        )
+
+    def handle(self, *args, **options):
+        for ruta in options["archivos"]:
+            abrir = gzip.open if ruta.endswith(".gz") else open
+            try:
+                with abrir(ruta, "rb") as archivo:
+                    reporte = ingerir(
+                        leer(archivo, options["formato"] or formato_por_nombre(ruta)),
+                        tamano_lote=options["lote"],
+                    )
+            except FileNotFoundError:
+                raise CommandError(f"No existe el archivo: {ruta}")
+            except (ValueError, OSError) as exc:
+                raise CommandError(f"{ruta}: {exc}")
+
+            self.stdout.write(self.style.SUCCESS(
+                f"{ruta}: Procesadas: {reporte.procesadas} | Guardadas: {reporte.guardadas} | "
+                f"Segmentos: {reporte.segmentos} | Errores: {reporte.con_errores}"
+            ))
+            for error in reporte.errores[:20]:
+                self.stdout.write(self.style.WARNING(f"  Línea {error.linea}: {error.mensaje}"))
+            if reporte.con_errores > 20:
+                self.stdout.write(f"  ... y {reporte.con_errores - 20} errores más.")
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('vehiculos', '0008_lapidas_sincronizacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UltimaLectura',
+            fields=[
+                ('vehiculo', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ultima_lectura', serialize=False, to='vehiculos.vehiculo', verbose_name='Vehículo')),
+                ('momento', models.DateTimeField(verbose_name='Momento')),
+                ('odometro', models.FloatField(blank=True, null=True, verbose_name='Odómetro (km)')),
+                ('combustible', models.FloatField(blank=True, null=True, verbose_name='Combustible (%)')),
+                ('latitud', models.FloatField(blank=True, null=True, verbose_name='Latitud')),
+                ('longitud', models.FloatField(blank=True, null=True, verbose_name='Longitud')),
+            ],
+            options={
+                'verbose_name': 'Última lectura',
+                'verbose_name_plural': 'Últimas lecturas',
+            },
+        ),
+        migrations.CreateModel(
+            name='SegmentoTelemetria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha (UTC)')),
+                ('desde', models.DateTimeField(verbose_name='Desde')),
+                ('hasta', models.DateTimeField(verbose_name='Hasta')),
+                ('cantidad', models.PositiveIntegerField(verbose_name='Lecturas')),
+                ('datos', models.BinaryField(verbose_name='Datos empaquetados')),
+                ('vehiculo', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='segmentos_telemetria', to='vehiculos.vehiculo', verbose_name='Vehículo')),
+            ],
+            options={
+                'verbose_name': 'Segmento de telemetría',
+                'verbose_name_plural': 'Segmentos de telemetría',
+                'indexes': [models.Index(fields=['vehiculo', 'fecha'], name='tel_vehiculo_fecha_idx')],
+            },
+        ),
+    ]
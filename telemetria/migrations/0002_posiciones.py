@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 11:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def copiar_ultimas(apps, schema_editor):
+    # Posición inicial: la de la última lectura, si la trae
+    UltimaLectura = apps.get_model("telemetria", "UltimaLectura")
+    PosicionVehiculo = apps.get_model("telemetria", "PosicionVehiculo")
+    filas = UltimaLectura.objects.filter(latitud__isnull=False, longitud__isnull=False).values_list("vehiculo_id", "momento", "latitud", "longitud")
+    PosicionVehiculo.objects.bulk_create(
+        (PosicionVehiculo(vehiculo_id=pk, momento=momento, latitud=lat, longitud=lon, recibida=momento) for pk, momento, lat, lon in filas.iterator()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehiculos', '0008_lapidas_sincronizacion'),
+        ('telemetria', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PosicionVehiculo',
+            fields=[
+                ('vehiculo', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='posicion', serialize=False, to='vehiculos.vehiculo', verbose_name='Vehículo')),
+                ('momento', models.DateTimeField(verbose_name='Momento')),
+                ('latitud', models.FloatField(verbose_name='Latitud')),
+                ('longitud', models.FloatField(verbose_name='Longitud')),
+                ('recibida', models.DateTimeField(db_index=True, verbose_name='Recibida')),
+            ],
+            options={
+                'verbose_name': 'Posición',
+                'verbose_name_plural': 'Posiciones',
+            },
+        ),
+        migrations.RunPython(copiar_ultimas, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,116 @@
+from django.db import models
+
+from vehiculos.models import Vehiculo
+
+from .empaquetado import empaquetar
+
+
+class SegmentoTelemetria(models.Model):
+    """
+    Lecturas de un vehículo en un día (UTC), empaquetadas en columnas
+    binarias comprimidas (ver empaquetado.py) en vez de una fila por punto.
+
+    La ingesta solo inserta segmentos nuevos (un lote no relee ni reescribe
+    los anteriores); `compactar_telemetria` fusiona después los segmentos
+    de cada vehículo y día en uno solo.
+    """
+
+    vehiculo = models.ForeignKey(
+        Vehiculo,
+        on_delete=models.CASCADE,
+        related_name="segmentos_telemetria",
+        verbose_name="Vehículo",
+        db_index=False,  # cubierto por tel_vehiculo_fecha_idx
+    )
+
+    fecha = models.DateField(verbose_name="Fecha (UTC)")
+
+    # Primera y última lectura del segmento: acotan los rangos sin descomprimir
+    desde = models.DateTimeField(verbose_name="Desde")
+    hasta = models.DateTimeField(verbose_name="Hasta")
+
+    cantidad = models.PositiveIntegerField(verbose_name="Lecturas")
+    datos = models.BinaryField(verbose_name="Datos empaquetados")
+
+    class Meta:
+        verbose_name = "Segmento de telemetría"
+        verbose_name_plural = "Segmentos de telemetría"
+        indexes = [
+            models.Index(fields=["vehiculo", "fecha"], name="tel_vehiculo_fecha_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.vehiculo_id} · {self.fecha} ({self.cantidad})"
+
+    @classmethod
+    def crear_desde(cls, vehiculo_id: int, fecha, lecturas: list) -> "SegmentoTelemetria":
+        """Segmento (sin guardar) con `lecturas` del día, ordenadas y sin repetidos."""
+        return cls(
+            vehiculo_id=vehiculo_id,
+            fecha=fecha,
+            desde=lecturas[0].momento,
+            hasta=lecturas[-1].momento,
+            cantidad=len(lecturas),
+            datos=empaquetar(fecha, lecturas),
+        )
+
+
+class UltimaLectura(models.Model):
+    """
+    Lectura más reciente de cada vehículo, actualizada en la misma
+    transacción que inserta sus segmentos. Cada medida guarda su último
+    valor informado (una lectura solo GPS no borra el odómetro). Consultar
+    la posición o el odómetro actual de la flota es leer una fila por vehículo.
+    """
+
+    vehiculo = models.OneToOneField(
+        Vehiculo,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ultima_lectura",
+        verbose_name="Vehículo",
+    )
+
+    momento = models.DateTimeField(verbose_name="Momento")
+    odometro = models.FloatField(null=True, blank=True, verbose_name="Odómetro (km)")
+    combustible = models.FloatField(null=True, blank=True, verbose_name="Combustible (%)")
+    latitud = models.FloatField(null=True, blank=True, verbose_name="Latitud")
+    longitud = models.FloatField(null=True, blank=True, verbose_name="Longitud")
+
+    class Meta:
+        verbose_name = "Última lectura"
+        verbose_name_plural = "Últimas lecturas"
+
+    def __str__(self) -> str:
+        return f"{self.vehiculo_id} · {self.momento:%d/%m/%Y %H:%M}"
+
+
+class PosicionVehiculo(models.Model):
+    """
+    Última posición conocida de cada vehículo: la lectura más reciente con
+    latitud y longitud (la de UltimaLectura puede no traerlas). La carga el
+    índice espacial en memoria (espacial.py), que con `recibida` relee solo
+    las posiciones escritas desde su última actualización.
+    """
+
+    vehiculo = models.OneToOneField(
+        Vehiculo,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="posicion",
+        verbose_name="Vehículo",
+    )
+
+    momento = models.DateTimeField(verbose_name="Momento")
+    latitud = models.FloatField(verbose_name="Latitud")
+    longitud = models.FloatField(verbose_name="Longitud")
+
+    # Hora del servidor al escribirla (el momento lo fija el dispositivo)
+    recibida = models.DateTimeField(db_index=True, verbose_name="Recibida")
+
+    class Meta:
+        verbose_name = "Posición"
+        verbose_name_plural = "Posiciones"
+
+    def __str__(self) -> str:
+        return f"{self.vehiculo_id} · {self.latitud:.5f}, {self.longitud:.5f}"
@@ -0,0 +1,110 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count
+
+from .empaquetado import desempaquetar, fusionar
+from .models import SegmentoTelemetria, UltimaLectura
+
+
+# --- Consultas de Telemetría ---
+
+CAMPOS_ULTIMAS = ["vehiculo_id", "vehiculo__patente", "momento", "odometro", "combustible", "latitud", "longitud"]
+
+
+def ultimas_lecturas(usuario, vehiculo_ids=None):
+    """
+    Última lectura de cada vehículo visible para el usuario (staff: toda la
+    flota). Una fila por vehículo: no recorre los segmentos.
+    """
+    qs = UltimaLectura.objects.order_by("vehiculo_id")
+    if not usuario.is_staff:
+        qs = qs.filter(vehiculo__usuario=usuario)
+    if vehiculo_ids is not None:
+        qs = qs.filter(vehiculo_id__in=vehiculo_ids)
+    return qs.values_list(*CAMPOS_ULTIMAS)
+
+
+def _segmentos(vehiculo_id: int, desde, hasta):
+    # fecha acota por índice; desde/hasta descartan segmentos fuera del rango sin descomprimirlos
+    return (
+        SegmentoTelemetria.objects
+        .filter(
+            vehiculo_id=vehiculo_id,
+            fecha__gte=desde.astimezone(dt_timezone.utc).date(),
+            fecha__lte=hasta.astimezone(dt_timezone.utc).date(),
+            hasta__gte=desde,
+            desde__lt=hasta,
+        )
+        .order_by("pk")
+        .values_list("fecha", "cantidad", "datos")
+    )
+
+
+def lecturas(vehiculo_id: int, desde, hasta) -> list:
+    """Lecturas del vehículo en [desde, hasta), ordenadas por momento."""
+    todas = fusionar(desempaquetar(*fila) for fila in _segmentos(vehiculo_id, desde, hasta))
+    return [lectura for lectura in todas if desde <= lectura.momento < hasta]
+
+
+def serie(vehiculo_id: int, desde, hasta, intervalo: int) -> list:
+    """
+    Serie reducida a un punto por cada `intervalo` segundos con datos:
+    odómetro máximo, combustible promedio y última posición del intervalo.
+    """
+    puntos = []
+    actual = None
+    for lectura in lecturas(vehiculo_id, desde, hasta):
+        inicio = int((lectura.momento - desde).total_seconds()) // intervalo
+        if actual is None or actual["inicio"] != inicio:
+            actual = {"inicio": inicio, "lecturas": 0, "odometro": None, "combustible": [], "latitud": None, "longitud": None}
+            puntos.append(actual)
+        actual["lecturas"] += 1
+        if lectura.odometro is not None:
+            actual["odometro"] = max(actual["odometro"] or 0, lectura.odometro)
+        if lectura.combustible is not None:
+            actual["combustible"].append(lectura.combustible)
+        if lectura.latitud is not None and lectura.longitud is not None:
+            actual["latitud"], actual["longitud"] = lectura.latitud, lectura.longitud
+
+    for punto in puntos:
+        combustible = punto["combustible"]
+        punto["momento"] = desde + timedelta(seconds=punto.pop("inicio") * intervalo)
+        punto["combustible"] = round(sum(combustible) / len(combustible), 2) if combustible else None
+    return puntos
+
+
+# --- Compactación ---
+
+def compactar(vehiculo_id: int | None = None, hasta_fecha=None) -> int:
+    """
+    Fusiona en un solo segmento los segmentos de cada vehículo y día que
+    tengan varios (uno por lote de ingesta). Devuelve los grupos compactados.
+
+    Cada grupo se bloquea y reescribe en su propia transacción; un lote que
+    llegue mientras tanto crea un segmento aparte, que se compactará en la
+    próxima pasada.
+    """
+    grupos = SegmentoTelemetria.objects.values("vehiculo_id", "fecha").annotate(n=Count("pk")).filter(n__gt=1)
+    if vehiculo_id is not None:
+        grupos = grupos.filter(vehiculo_id=vehiculo_id)
+    if hasta_fecha is not None:
+        grupos = grupos.filter(fecha__lte=hasta_fecha)
+
+    compactados = 0
+    for grupo in list(grupos.order_by("fecha", "vehiculo_id")):
+        with transaction.atomic():
+            segmentos = list(
+                SegmentoTelemetria.objects.select_for_update()
+                .filter(vehiculo_id=grupo["vehiculo_id"], fecha=grupo["fecha"])
+                .order_by("pk")
+                .values_list("pk", "cantidad", "datos")
+            )
+            if len(segmentos) < 2:
+                continue
+            fecha = grupo["fecha"]
+            del_dia = fusionar(desempaquetar(fecha, cantidad, datos) for _, cantidad, datos in segmentos)
+            SegmentoTelemetria.crear_desde(grupo["vehiculo_id"], fecha, del_dia).save()
+            SegmentoTelemetria.objects.filter(pk__in=[pk for pk, _, _ in segmentos]).delete()
+        compactados += 1
+    return compactados
@@ -0,0 +1,19 @@
+from django.urls import path
+from . import views
+
+app_name = "telemetria"
+
+urlpatterns = [
+    # Ingesta por lotes desde gateways (NDJSON/CSV, token en Authorization)
+    path("ingesta/", views.ingerir_telemetria, name="ingesta"),
+
+    # Última lectura por vehículo (JSON)
+    path("ultimas/", views.ultimas, name="ultimas"),
+
+    # Vehículos más cercanos a un punto y dentro de un rectángulo (JSON)
+    path("cercanos/", views.cercanos, name="cercanos"),
+    path("area/", views.en_area, name="area"),
+
+    # Serie reducida de un vehículo (JSON)
+    path("<int:pk>/serie/", views.serie_vehiculo, name="serie"),
+]
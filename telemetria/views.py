@@ -0,0 +1,193 @@
+import gzip
+import hmac
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import HttpRequest, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_GET, require_POST
+
+from vehiculos.models import Vehiculo
+
+from . import espacial
+from .ingesta import ingerir, leer
+from .services import serie, ultimas_lecturas
+
+
+# --- Ingesta (gateways de telemetría) ---
+
+def _token_valido(request: HttpRequest) -> bool:
+    esperado = getattr(settings, "TELEMETRIA_TOKEN", "")
+    recibido = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    return bool(esperado) and hmac.compare_digest(recibido.encode(), esperado.encode())
+
+
+@csrf_exempt
+@require_POST
+def ingerir_telemetria(request: HttpRequest) -> JsonResponse:
+    """
+    Recibe un lote de lecturas en el cuerpo: NDJSON (por defecto) o CSV
+    (Content-Type: text/csv), opcionalmente con Content-Encoding: gzip.
+    Se autentica con `Authorization: Bearer <TELEMETRIA_TOKEN>`, no con sesión.
+
+    El cuerpo se lee línea a línea desde el stream (no con request.body), así
+    que su tamaño no está limitado por DATA_UPLOAD_MAX_MEMORY_SIZE.
+    """
+    if not _token_valido(request):
+        return HttpResponseForbidden("Token de telemetría inválido.")
+
+    lineas = gzip.GzipFile(fileobj=request) if request.headers.get("Content-Encoding") == "gzip" else request
+    formato = "csv" if request.content_type == "text/csv" else "ndjson"
+    try:
+        reporte = ingerir(leer(lineas, formato))
+    except (ValueError, OSError) as exc:
+        # Encabezado CSV inválido o gzip corrupto
+        return HttpResponseBadRequest(str(exc))
+    return JsonResponse(reporte.a_dict())
+
+
+# --- Consultas ---
+
+@login_required
+@require_GET
+@gzip_page
+def ultimas(request: HttpRequest) -> JsonResponse:
+    """
+    Última lectura de cada vehículo visible (?ids=1,2,3 para acotar), en
+    filas compactas según "campos".
+    """
+    ids = None
+    if request.GET.get("ids"):
+        try:
+            ids = [int(pk) for pk in request.GET["ids"].split(",")]
+        except ValueError:
+            return HttpResponseBadRequest("Parámetro 'ids' inválido.")
+
+    return JsonResponse({
+        "campos": ["vehiculo", "patente", "momento", "odometro", "combustible", "latitud", "longitud"],
+        "lecturas": list(ultimas_lecturas(request.user, ids)),
+    }, json_dumps_params={"separators": (",", ":")})
+
+
+def _momento(valor: str | None, por_defecto):
+    if not valor:
+        return por_defecto
+    momento = parse_datetime(valor)
+    if momento is None:
+        raise ValueError(valor)
+    return timezone.make_aware(momento) if timezone.is_naive(momento) else momento
+
+
+@login_required
+@require_GET
+@gzip_page
+def serie_vehiculo(request: HttpRequest, pk: int) -> JsonResponse:
+    """
+    Serie reducida de un vehículo (?desde=...&hasta=...&intervalo=300).
+    Por defecto, las últimas 24 horas en intervalos de TELEMETRIA_INTERVALO.
+    """
+    vehiculo = get_object_or_404(Vehiculo.objects.only("pk", "patente", "usuario_id"), pk=pk)
+    if not request.user.is_staff and vehiculo.usuario_id != request.user.pk:
+        raise PermissionDenied
+
+    try:
+        hasta = _momento(request.GET.get("hasta"), timezone.now())
+        desde = _momento(request.GET.get("desde"), hasta - timedelta(days=1))
+    except ValueError:
+        return HttpResponseBadRequest("Parámetros 'desde'/'hasta' inválidos (use ISO-8601).")
+    if desde >= hasta:
+        return HttpResponseBadRequest("'desde' debe ser anterior a 'hasta'.")
+    max_dias = getattr(settings, "TELEMETRIA_MAX_DIAS", 31)
+    if hasta - desde > timedelta(days=max_dias):
+        return HttpResponseBadRequest(f"El rango no puede superar {max_dias} días.")
+
+    try:
+        intervalo = int(request.GET.get("intervalo", getattr(settings, "TELEMETRIA_INTERVALO", 300)))
+    except ValueError:
+        return HttpResponseBadRequest("Parámetro 'intervalo' inválido (segundos).")
+    intervalo = max(intervalo, 60)
+
+    return JsonResponse({
+        "vehiculo": vehiculo.pk,
+        "patente": vehiculo.patente,
+        "desde": desde.isoformat(),
+        "hasta": hasta.isoformat(),
+        "intervalo": intervalo,
+        "serie": serie(vehiculo.pk, desde, hasta, intervalo),
+    })
+
+
+# --- Consultas Espaciales (índice en memoria, ver espacial.py) ---
+
+def _coordenada(request: HttpRequest, nombre: str, limite: float) -> float:
+    try:
+        valor = float(request.GET[nombre])
+    except (KeyError, ValueError):
+        raise ValueError(f"Parámetro '{nombre}' requerido (grados decimales).")
+    if not -limite <= valor <= limite:
+        raise ValueError(f"Parámetro '{nombre}' fuera de rango.")
+    return valor
+
+
+def _fila_posicion(posicion, distancia: float | None = None) -> list:
+    fila = [posicion.vehiculo_id, posicion.patente, posicion.latitud, posicion.longitud, posicion.momento.isoformat()]
+    if distancia is not None:
+        fila.append(round(distancia, 3))
+    return fila
+
+
+@login_required
+@require_GET
+def cercanos(request: HttpRequest) -> JsonResponse:
+    """
+    Vehículos visibles más cercanos a un punto por su última posición:
+    ?lat=&lon=&k=5 (opcional &radio_km=, &inactivos=1 para incluirlos).
+    """
+    try:
+        latitud, longitud = _coordenada(request, "lat", 90), _coordenada(request, "lon", 180)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    try:
+        k = int(request.GET.get("k", 5))
+        radio_km = float(request.GET["radio_km"]) if request.GET.get("radio_km") else None
+    except ValueError:
+        return HttpResponseBadRequest("Parámetros 'k'/'radio_km' inválidos.")
+    k = min(max(k, 1), getattr(settings, "TELEMETRIA_MAX_CERCANOS", 50))
+
+    resultado = espacial.cercanos(request.user, latitud, longitud, k, radio_km, inactivos=request.GET.get("inactivos") == "1")
+    return JsonResponse({
+        "campos": ["vehiculo", "patente", "latitud", "longitud", "momento", "distancia_km"],
+        "vehiculos": [_fila_posicion(posicion, distancia) for distancia, posicion in resultado],
+    }, json_dumps_params={"separators": (",", ":")})
+
+
+@login_required
+@require_GET
+@gzip_page
+def en_area(request: HttpRequest) -> JsonResponse:
+    """
+    Vehículos visibles dentro de un rectángulo: ?sur=&oeste=&norte=&este=
+    (oeste > este si cruza el antimeridiano; &inactivos=1 para incluirlos).
+    """
+    try:
+        sur, norte = _coordenada(request, "sur", 90), _coordenada(request, "norte", 90)
+        oeste, este = _coordenada(request, "oeste", 180), _coordenada(request, "este", 180)
+    except ValueError as exc:
+        return HttpResponseBadRequest(str(exc))
+    if sur > norte:
+        return HttpResponseBadRequest("'sur' no puede ser mayor que 'norte'.")
+
+    limite = getattr(settings, "TELEMETRIA_MAX_AREA", 5000)
+    posiciones, total = espacial.en_rectangulo(request.user, sur, oeste, norte, este, limite, inactivos=request.GET.get("inactivos") == "1")
+    return JsonResponse({
+        "campos": ["vehiculo", "patente", "latitud", "longitud", "momento"],
+        "total": total,
+        "truncado": total > len(posiciones),
+        "vehiculos": [_fila_posicion(posicion) for posicion in posiciones],
+    }, json_dumps_params={"separators": (",", ":")})
@@ -14,6 +14,9 @@ urlpatterns = [
     path("vehiculos/", include("vehiculos.urls")),
     path("pages/", include("pages.urls")),
     path("messages/", include("messaging.urls")),
+    path("tareas/", include("tareas.urls")),
+    path("telemetria/", include("telemetria.urls")),
+    path("reservas/", include("reservas.urls")),
     path("ckeditor/", include("ckeditor_uploader.urls")),
 ]
 
@@ -0,0 +1,133 @@
+from django.db import models, router, transaction
+from django.utils import timezone
+
+from core.cache import incrementar_generacion
+
+from .busqueda import desindexar_vehiculos, indexar_vehiculos
+from .eventos import publicar_lote
+from .historial import registrar_reasignaciones
+from .models import Vehiculo, VehiculoEliminado
+from .services import invalidar_metricas
+
+
+# --- Acciones Masivas (UI staff y admin) ---
+#
+# Cada acción es un único UPDATE/DELETE sobre el conjunto dentro de una
+# transacción. Ni QuerySet.update() ni el borrado por conjunto emiten
+# signals, así que los efectos que normalmente disparan (historial, índice
+# de búsqueda, lápidas, caché) se aplican una vez por lote. fecha_actualizacion se fija a mano porque
+# auto_now no actúa en update() y la sincronización incremental depende de ella.
+
+
+def _filas(qs) -> list:
+    """(id, usuario_id) de cada vehículo: el responsable define quién ve el cambio."""
+    return list(qs.order_by().values_list("id", "usuario_id"))
+
+
+def _por_usuario(filas) -> dict:
+    agrupados = {}
+    for pk, usuario_id in filas:
+        agrupados.setdefault(usuario_id, []).append(pk)
+    return agrupados
+
+
+def reasignar(qs, usuario) -> int:
+    """Asigna `usuario` (o ninguno) a los vehículos de `qs`. Devuelve cuántos cambiaron."""
+    usuario_id = usuario.pk if usuario is not None else None
+    filas = _filas(qs.exclude(usuario=usuario_id))
+    if not filas:
+        return 0
+
+    ids = [pk for pk, _ in filas]
+    ahora = timezone.now()
+    with transaction.atomic():
+        Vehiculo.objects.filter(pk__in=ids).update(usuario=usuario_id, fecha_actualizacion=ahora)
+        registrar_reasignaciones({pk: usuario_id for pk in ids}, momento=ahora)
+        # El nombre del responsable forma parte del índice de búsqueda
+        indexar_vehiculos(ids)
+        # Lo ven los responsables anteriores y el nuevo
+        publicar_lote("reasignacion", ids, {**_por_usuario(filas), usuario_id: ids})
+    invalidar_metricas()
+    return len(ids)
+
+
+def cambiar_estado(qs, activo: bool) -> int:
+    """Activa o desactiva los vehículos de `qs` que no estén ya en ese estado."""
+    filas = _filas(qs.exclude(activo=activo))
+    if not filas:
+        return 0
+
+    ids = [pk for pk, _ in filas]
+    with transaction.atomic():
+        cambiados = Vehiculo.objects.filter(pk__in=ids).update(activo=activo, fecha_actualizacion=timezone.now())
+        publicar_lote("activacion" if activo else "desactivacion", ids, _por_usuario(filas))
+    if cambiados:
+        invalidar_metricas()
+    return cambiados
+
+
+def _admite_borrado_en_conjunto() -> bool:
+    """
+    True si todas las relaciones hacia Vehiculo son SET_NULL o CASCADE
+    sobre tablas sin dependientes propios: las que _borrar_en_conjunto()
+    sabe resolver con una sentencia por tabla.
+    """
+    for relacion in Vehiculo._meta.related_objects:
+        if relacion.on_delete is models.SET_NULL:
+            continue
+        if relacion.on_delete is models.CASCADE and not relacion.related_model._meta.related_objects:
+            continue
+        return False
+    return True
+
+
+def _borrar_en_conjunto(ids: list) -> dict:
+    """
+    Borra los vehículos con DELETE por conjunto, sin el Collector de Django
+    (que carga cada fila y emite post_delete por cada una, también en las
+    tablas en cascada). Las relaciones hacia Vehiculo se resuelven a mano:
+    CASCADE con un DELETE y SET_NULL con un UPDATE por tabla (ver
+    _admite_borrado_en_conjunto). Devuelve {modelo: filas borradas}.
+    """
+    usando = router.db_for_write(Vehiculo)
+    borradas = {}
+    for relacion in Vehiculo._meta.related_objects:
+        campo = relacion.field.name
+        filas = relacion.related_model._base_manager.using(usando).filter(**{f"{campo}__in": ids})
+        if relacion.on_delete is models.SET_NULL:
+            filas.update(**{campo: None})
+        else:
+            borradas[relacion.related_model] = filas._raw_delete(usando)
+    borradas[Vehiculo] = Vehiculo._base_manager.using(usando).filter(pk__in=ids)._raw_delete(usando)
+    return borradas
+
+
+def eliminar(qs) -> int:
+    """Elimina los vehículos de `qs` dejando sus lápidas de sincronización."""
+    filas = list(qs.order_by().values_list("id", "patente", "usuario_id"))
+    if not filas:
+        return 0
+
+    ids = [pk for pk, _, _ in filas]
+    if not _admite_borrado_en_conjunto():
+        # Alguna relación (PROTECT, SET_DEFAULT, cascadas anidadas...) que el
+        # borrado por conjunto no resuelve: el Collector de Django, con los
+        # receptores por fila de signals.py (lápidas, índice, caché, eventos).
+        # ProtectedError / RestrictedError llegan a quien llama.
+        Vehiculo.objects.filter(pk__in=ids).delete()
+        return len(ids)
+
+    ahora = timezone.now()
+    with transaction.atomic():
+        borradas = _borrar_en_conjunto(ids)
+        VehiculoEliminado.objects.bulk_create([
+            VehiculoEliminado(vehiculo_id=pk, patente=patente, usuario_id=usuario_id, fecha=ahora)
+            for pk, patente, usuario_id in filas
+        ], batch_size=1000)
+        desindexar_vehiculos(ids)
+        publicar_lote("eliminacion", ids, _por_usuario((pk, usuario_id) for pk, _, usuario_id in filas))
+    invalidar_metricas()
+    # Lo que haría reservas.signals por cada reserva borrada en cascada
+    if any(cantidad for modelo, cantidad in borradas.items() if modelo._meta.label == "reservas.Reserva"):
+        incrementar_generacion("reservas")
+    return len(ids)
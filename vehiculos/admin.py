@@ -1,5 +1,11 @@
-from django.contrib import admin
-from .models import Vehiculo
+from django.contrib import admin, messages
+from django.template.response import TemplateResponse
+
+from . import acciones
+from .busqueda import coincidencias
+from .facetas import FiltroActivo, FiltroMarca, PaginadorFacetas, conteo
+from .forms import ReasignacionForm
+from .models import AsignacionVehiculo, Vehiculo
 
 
 @admin.register(Vehiculo)
@@ -23,7 +29,7 @@ class VehiculoAdmin(admin.ModelAdmin):
         "fecha_creacion",
     )
 
-    # Campos por los que se puede buscar
+    # Campos por los que se puede buscar (con índice FTS5 se usa get_search_results)
     search_fields = (
         "patente",
         "marca",
@@ -31,16 +37,26 @@ class VehiculoAdmin(admin.ModelAdmin):
         "usuario__username",
     )
 
-    # Filtros laterales
+    # Responsable en el mismo SELECT (sin una consulta por fila)
+    list_select_related = ("usuario",)
+
+    # Filtros laterales: marca y estado con opciones y conteos desde las
+    # facetas cacheadas (vehiculos/facetas.py), sin DISTINCT por carga
     list_filter = (
-        "activo",
-        "marca",
+        FiltroActivo,
+        FiltroMarca,
         "fecha_creacion",
     )
 
+    # Rangos sobre fecha_creacion: usan vehiculo_creacion_id_idx
+    date_hierarchy = "fecha_creacion"
+
     # Orden por defecto
     ordering = ("-fecha_creacion",)
 
+    # Sin el segundo COUNT(*) de "N resultados (M en total)"
+    show_full_result_count = False
+
     # Campos de solo lectura (auditoría)
     readonly_fields = (
         "fecha_creacion",
@@ -76,3 +92,98 @@ class VehiculoAdmin(admin.ModelAdmin):
             },
         ),
     )
+
+    # Acciones masivas: un único UPDATE por lote (ver vehiculos/acciones.py).
+    # "Eliminar seleccionados" (de Django) usa delete_queryset más abajo.
+    actions = ("activar_vehiculos", "desactivar_vehiculos", "reasignar_vehiculos")
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Con el índice de búsqueda disponible, las coincidencias se resuelven
+        en FTS5 (sin LIKE '%x%' sobre la tabla) con una subconsulta de ids:
+        el changelist y su paginador ven todos los resultados. Los términos
+        de menos de 3 caracteres usan la búsqueda estándar del admin.
+        """
+        subconsulta = coincidencias(search_term)
+        if subconsulta is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=subconsulta), False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        """Sin filtros o solo con facetas, el total sale de la caché en vez de un COUNT(*)."""
+        return PaginadorFacetas(queryset, per_page, orphans, allow_empty_first_page, conteo=conteo(request.GET))
+
+    # --- Acciones masivas ---
+
+    @admin.action(description="Activar vehículos seleccionados", permissions=["change"])
+    def activar_vehiculos(self, request, queryset):
+        cantidad = acciones.cambiar_estado(queryset, True)
+        self.message_user(request, f"{cantidad} vehículos activados.", messages.SUCCESS)
+
+    @admin.action(description="Desactivar vehículos seleccionados", permissions=["change"])
+    def desactivar_vehiculos(self, request, queryset):
+        cantidad = acciones.cambiar_estado(queryset, False)
+        self.message_user(request, f"{cantidad} vehículos desactivados.", messages.SUCCESS)
+
+    @admin.action(description="Reasignar vehículos seleccionados", permissions=["change"])
+    def reasignar_vehiculos(self, request, queryset):
+        """Muestra un paso intermedio para elegir el responsable y luego reasigna en lote."""
+        if "aplicar" in request.POST:
+            form = ReasignacionForm(request.POST)
+            if form.is_valid():
+                usuario = form.cleaned_data["usuario"]
+                cantidad = acciones.reasignar(queryset, usuario)
+                destino = usuario.username if usuario else "reserva"
+                self.message_user(request, f"{cantidad} vehículos reasignados a {destino}.", messages.SUCCESS)
+                return None
+        else:
+            form = ReasignacionForm()
+
+        return TemplateResponse(request, "admin/vehiculos/vehiculo/reasignar.html", {
+            **self.admin_site.each_context(request),
+            "title": "Reasignar vehículos",
+            "opts": self.model._meta,
+            "form": form,
+            "vehiculos": queryset.order_by("patente")[:50],
+            "cantidad": queryset.count(),
+            "ids": queryset.values_list("pk", flat=True),
+            "accion": "reasignar_vehiculos",
+            "action_checkbox_name": admin.helpers.ACTION_CHECKBOX_NAME,
+        })
+
+    def get_deleted_objects(self, objs, request):
+        """
+        El historial de asignaciones no se borra desde el admin, pero cae en
+        cascada con su vehículo: no cuenta como permiso faltante.
+        """
+        eliminados, conteo, permisos_faltantes, protegidos = super().get_deleted_objects(objs, request)
+        permisos_faltantes.discard(AsignacionVehiculo._meta.verbose_name)
+        return eliminados, conteo, permisos_faltantes, protegidos
+
+    def delete_queryset(self, request, queryset):
+        """Eliminación masiva del admin: un DELETE por lote con lápidas y caché en bloque."""
+        acciones.eliminar(queryset)
+
+
+@admin.register(AsignacionVehiculo)
+class AsignacionVehiculoAdmin(admin.ModelAdmin):
+    """
+    Historial de asignaciones (solo lectura: sin altas, ediciones ni bajas).
+    Los registros se generan automáticamente al reasignar un vehículo.
+    """
+
+    list_display = ("vehiculo", "usuario", "inicio", "fin")
+    list_select_related = ("vehiculo", "usuario")
+    list_filter = ("inicio",)
+    search_fields = ("vehiculo__patente", "usuario__username")
+    date_hierarchy = "inicio"
+    raw_id_fields = ("vehiculo", "usuario")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
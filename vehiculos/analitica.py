@@ -0,0 +1,205 @@
+from collections import OrderedDict
+from datetime import datetime, time, timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import DistribucionDiaria, MarcaRollup, ResumenDiario, Vehiculo
+
+
+# --- Analítica de Flota: Rollups Diarios ---
+#
+# `actualizar_rollups` mantiene ResumenDiario / DistribucionDiaria a partir
+# de los cambios posteriores a una marca de agua:
+#   - registrados: solo se recalculan los días de los vehículos creados
+#     después de la marca (rangos sobre vehiculo_creacion_id_idx)
+#   - foto del día (activos/inactivos y distribuciones): se rehace solo si
+#     hubo modificaciones desde la marca (vehiculo_actualizacion_id_idx)
+# Las bajas no dejan rastro en Vehiculo: se concilian con --completo.
+#
+# La API lee únicamente los rollups; el día en curso se complementa con un
+# agregado en vivo acotado a ese día.
+
+NOMBRE_MARCA = "analitica"
+DIMENSIONES = [clave for clave, _ in DistribucionDiaria.DIMENSIONES]
+
+# Días por consulta al recalcular `registrados` (cada día es un rango OR)
+DIAS_POR_CONSULTA = 200
+
+
+def _inicio_dia(fecha):
+    return timezone.make_aware(datetime.combine(fecha, time.min))
+
+
+def _rango_dias(dias) -> Q:
+    return reduce(or_, (
+        Q(fecha_creacion__gte=_inicio_dia(dia), fecha_creacion__lt=_inicio_dia(dia + timedelta(days=1)))
+        for dia in dias
+    ))
+
+
+def _registrados_por_dia(dias: list) -> dict:
+    conteos = {dia: 0 for dia in dias}
+    for i in range(0, len(dias), DIAS_POR_CONSULTA):
+        lote = dias[i:i + DIAS_POR_CONSULTA]
+        filas = (
+            Vehiculo.objects.filter(_rango_dias(lote))
+            .annotate(dia=TruncDate("fecha_creacion"))
+            .order_by()
+            .values_list("dia")
+            .annotate(total=Count("id"))
+        )
+        conteos.update(dict(filas))
+    return conteos
+
+
+def _estado_actual() -> dict:
+    return Vehiculo.objects.aggregate(
+        activos=Count("id", filter=Q(activo=True)),
+        inactivos=Count("id", filter=Q(activo=False)),
+    )
+
+
+def _distribucion_actual(dimension: str) -> list:
+    filas = (
+        Vehiculo.objects.order_by()
+        .values_list(dimension)
+        .annotate(total=Count("id"))
+    )
+    return [("" if valor is None else str(valor), total) for valor, total in filas]
+
+
+def actualizar_rollups(completo: bool = False) -> dict:
+    """
+    Procesa los cambios desde la última ejecución. Devuelve un resumen
+    {"dias": n, "foto": bool} para el comando.
+    """
+    marca, _ = MarcaRollup.objects.get_or_create(nombre=NOMBRE_MARCA)
+    desde = None if completo else marca.hasta
+    corte = timezone.now()
+    hoy = timezone.localdate(corte)
+
+    nuevos = Vehiculo.objects.filter(fecha_creacion__lte=corte)
+    if desde is not None:
+        nuevos = nuevos.filter(fecha_creacion__gt=desde)
+    dias = sorted(
+        nuevos.annotate(dia=TruncDate("fecha_creacion")).order_by().values_list("dia", flat=True).distinct()
+    )
+    if completo:
+        # Días con resumen previo que pudieron quedar sin vehículos (bajas)
+        dias = sorted(set(dias) | set(ResumenDiario.objects.values_list("fecha", flat=True)))
+
+    hay_cambios = desde is None or Vehiculo.objects.filter(
+        fecha_actualizacion__gt=desde, fecha_actualizacion__lte=corte
+    ).exists()
+    sin_foto = not ResumenDiario.objects.filter(fecha=hoy, activos__isnull=False).exists()
+    tomar_foto = hay_cambios or sin_foto
+
+    with transaction.atomic():
+        if dias:
+            conteos = _registrados_por_dia(dias)
+            ResumenDiario.objects.bulk_create(
+                [ResumenDiario(fecha=dia, registrados=total) for dia, total in conteos.items()],
+                update_conflicts=True,
+                unique_fields=["fecha"],
+                update_fields=["registrados", "actualizado"],
+                batch_size=500,
+            )
+
+        if tomar_foto:
+            estado = _estado_actual()
+            ResumenDiario.objects.update_or_create(fecha=hoy, defaults=estado)
+            DistribucionDiaria.objects.filter(fecha=hoy).delete()
+            DistribucionDiaria.objects.bulk_create([
+                DistribucionDiaria(fecha=hoy, dimension=dimension, valor=valor[:50], total=total)
+                for dimension in DIMENSIONES
+                for valor, total in _distribucion_actual(dimension)
+            ])
+
+        marca.hasta = corte
+        marca.save(update_fields=["hasta"])
+
+    return {"dias": len(dias), "foto": tomar_foto}
+
+
+# --- Consultas para la API ---
+
+def _periodo(fecha, agrupacion: str) -> str:
+    return fecha.strftime("%Y-%m") if agrupacion == "mes" else fecha.isoformat()
+
+
+def serie_temporal(desde, hasta, agrupacion: str = "dia") -> list:
+    """
+    Serie de registrados y estado (activos/inactivos) por día o mes, leída
+    de ResumenDiario. Si el rango incluye hoy, el día en curso se calcula
+    en vivo (registros de hoy + estado actual si aún no hay foto).
+    """
+    hoy = timezone.localdate()
+    filas = {
+        fecha: (registrados, activos, inactivos)
+        for fecha, registrados, activos, inactivos in ResumenDiario.objects.filter(
+            fecha__gte=desde, fecha__lte=hasta
+        ).values_list("fecha", "registrados", "activos", "inactivos")
+    }
+
+    if desde <= hoy <= hasta:
+        _, activos, inactivos = filas.get(hoy, (0, None, None))
+        registrados = Vehiculo.objects.filter(fecha_creacion__gte=_inicio_dia(hoy)).count()
+        if activos is None:
+            estado = _estado_actual()
+            activos, inactivos = estado["activos"], estado["inactivos"]
+        filas[hoy] = (registrados, activos, inactivos)
+
+    periodos = OrderedDict()
+    for fecha in sorted(filas):
+        registrados, activos, inactivos = filas[fecha]
+        punto = periodos.setdefault(_periodo(fecha, agrupacion), {
+            "periodo": _periodo(fecha, agrupacion),
+            "registrados": 0,
+            "activos": None,
+            "inactivos": None,
+        })
+        punto["registrados"] += registrados
+        # Por mes se informa la última foto disponible del período
+        if activos is not None:
+            punto["activos"], punto["inactivos"] = activos, inactivos
+    return list(periodos.values())
+
+
+def distribucion(fecha=None) -> dict:
+    """
+    Distribución por marca, año y color según la última foto disponible
+    hasta `fecha` (hoy por defecto); hoy sin foto se agrega en vivo.
+    """
+    hoy = timezone.localdate()
+    fecha = fecha or hoy
+    ultima = (
+        DistribucionDiaria.objects.filter(fecha__lte=fecha)
+        .order_by("-fecha").values_list("fecha", flat=True).first()
+    )
+
+    if fecha == hoy and ultima != hoy:
+        return {
+            "fecha": hoy.isoformat(),
+            "en_vivo": True,
+            **{
+                dimension: [
+                    {"valor": valor, "total": total}
+                    for valor, total in sorted(_distribucion_actual(dimension), key=lambda f: -f[1])
+                ]
+                for dimension in DIMENSIONES
+            },
+        }
+
+    resultado = {"fecha": ultima.isoformat() if ultima else None, "en_vivo": False}
+    resultado.update({dimension: [] for dimension in DIMENSIONES})
+    if ultima:
+        for dimension, valor, total in DistribucionDiaria.objects.filter(fecha=ultima).values_list(
+            "dimension", "valor", "total"
+        ):
+            resultado[dimension].append({"valor": valor, "total": total})
+    return resultado
@@ -22,9 +22,6 @@ class VehiculosConfig(AppConfig):
         """
         Punto de entrada para inicializar lógica de la app.
 
-        Ejemplos de uso futuro:
-        - Registro de signals
-        - Inicialización de validadores
-        - Auditoría
+        - Registro de signals (invalidación de caché de métricas)
         """
-        pass
+        from . import signals  # noqa: F401
@@ -0,0 +1,193 @@
+import json
+import platform
+import random
+import tracemalloc
+from dataclasses import dataclass
+from time import perf_counter
+
+import django
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Vehiculo
+from .sintetico import generar_patente, sembrar_flota
+
+
+# --- Benchmark de Vistas de Vehiculos ---
+#
+# Cada escenario se ejecuta N veces con el cliente de pruebas de Django
+# midiendo latencia (p50/p95) y consultas SQL; una ejecución adicional
+# con tracemalloc mide el pico de memoria (no se mezcla con la latencia).
+
+METRICAS_COMPARABLES = ("p50_ms", "p95_ms", "consultas", "memoria_pico_kb")
+
+
+@dataclass
+class Escenario:
+    nombre: str
+    ejecutar: object  # callable(cliente, iteracion) -> HttpResponse
+    staff: bool = True
+    cache_fria: bool = False
+
+
+def _consumir(response):
+    """Fuerza la generación completa de respuestas streaming (exportaciones)."""
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def _datos_formulario(vehiculo=None, patente=None) -> dict:
+    return {
+        "patente": patente or vehiculo.patente,
+        "marca": "Toyota",
+        "modelo": "Hilux",
+        "anio": timezone.now().year - 2,
+        "color": "Blanco",
+        "activo": "on",
+        "usuario": vehiculo.usuario_id if vehiculo and vehiculo.usuario_id else "",
+    }
+
+
+def escenarios(rng) -> list:
+    def patente_libre(_):
+        patente = generar_patente(rng)
+        while Vehiculo.objects.filter(patente=patente).exists():
+            patente = generar_patente(rng)
+        return patente
+
+    def editar(cliente, i):
+        vehiculo = Vehiculo.objects.order_by("id")[i % 50]
+        return cliente.post(
+            reverse("vehiculos:editar", args=[vehiculo.pk]),
+            _datos_formulario(vehiculo),
+        )
+
+    return [
+        Escenario("dashboard", lambda c, i: c.get(reverse("vehiculos:dashboard"))),
+        Escenario("dashboard_cache_fria", lambda c, i: c.get(reverse("vehiculos:dashboard")), cache_fria=True),
+        Escenario("dashboard_usuario", lambda c, i: c.get(reverse("vehiculos:dashboard")), staff=False),
+        Escenario("detalle_vehiculos", lambda c, i: c.get(reverse("vehiculos:detalle_vehiculos"))),
+        Escenario("detalle_vehiculos_usuario", lambda c, i: c.get(reverse("vehiculos:detalle_vehiculos")), staff=False),
+        Escenario("exportar_csv", lambda c, i: _consumir(c.get(reverse("vehiculos:exportar_excel"), {"formato": "csv", "directo": 1}))),
+        Escenario("exportar_xlsx", lambda c, i: _consumir(c.get(reverse("vehiculos:exportar_excel"), {"directo": 1}))),
+        Escenario("registrar_vehiculo_get", lambda c, i: c.get(reverse("vehiculos:registro"))),
+        Escenario(
+            "registrar_vehiculo_post",
+            lambda c, i: c.post(reverse("vehiculos:registro"), _datos_formulario(patente=patente_libre(i))),
+        ),
+        Escenario(
+            "editar_vehiculo_get",
+            lambda c, i: c.get(reverse("vehiculos:editar", args=[Vehiculo.objects.order_by("id")[0].pk])),
+        ),
+        Escenario("editar_vehiculo_post", editar),
+    ]
+
+
+def _percentil(valores: list, p: float) -> float:
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, round(p / 100 * (len(ordenados) - 1)))
+    return ordenados[indice]
+
+
+def medir_escenario(escenario: Escenario, cliente: Client, repeticiones: int) -> dict:
+    tiempos, consultas = [], []
+
+    for i in range(repeticiones):
+        if escenario.cache_fria:
+            cache.clear()
+        with CaptureQueriesContext(connection) as capturadas:
+            inicio = perf_counter()
+            response = escenario.ejecutar(cliente, i)
+            tiempos.append((perf_counter() - inicio) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{escenario.nombre}: respuesta HTTP {response.status_code}")
+        consultas.append(len(capturadas))
+
+    if escenario.cache_fria:
+        cache.clear()
+    tracemalloc.start()
+    escenario.ejecutar(cliente, repeticiones)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": round(_percentil(tiempos, 50), 2),
+        "p95_ms": round(_percentil(tiempos, 95), 2),
+        "consultas": max(consultas),
+        "memoria_pico_kb": round(pico / 1024, 1),
+    }
+
+
+def ejecutar_benchmark(tamano: int, repeticiones: int, usuarios: int, semilla: int, log=print) -> dict:
+    """
+    Siembra `tamano` vehículos en la base de datos actual y mide cada escenario.
+    Se espera que se ejecute sobre una base de datos de pruebas desechable.
+    """
+    log(f"Sembrando {tamano} vehículos...")
+    sembrar_flota(tamano, usuarios=usuarios, semilla=semilla)
+
+    staff, _ = User.objects.get_or_create(username="benchmark_staff", defaults={"is_staff": True})
+    conductor = User.objects.filter(flota__isnull=False).exclude(pk=staff.pk).first()
+
+    clientes = {True: Client(), False: Client()}
+    clientes[True].force_login(staff)
+    clientes[False].force_login(conductor)
+
+    resultados = {}
+    for escenario in escenarios(random.Random(semilla)):
+        log(f"  {escenario.nombre}...")
+        resultados[escenario.nombre] = medir_escenario(
+            escenario, clientes[escenario.staff], repeticiones
+        )
+    return resultados
+
+
+def metadatos() -> dict:
+    return {
+        "fecha": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "motor_bd": connection.vendor,
+    }
+
+
+def comparar(actual: dict, base: dict, tolerancia: float) -> list:
+    """
+    Compara dos resultados ({tamano: {escenario: métricas}}) y devuelve las
+    regresiones. Las consultas no toleran aumentos; tiempos y memoria sí
+    (p. ej. 0.2 = 20 %).
+    """
+    regresiones = []
+    for tamano, escenarios_base in base.get("resultados", {}).items():
+        escenarios_actuales = actual.get("resultados", {}).get(tamano, {})
+        for nombre, metricas_base in escenarios_base.items():
+            metricas = escenarios_actuales.get(nombre)
+            if metricas is None:
+                continue
+            for clave in METRICAS_COMPARABLES:
+                antes, ahora = metricas_base.get(clave), metricas.get(clave)
+                if antes is None or ahora is None:
+                    continue
+                limite = antes if clave == "consultas" else antes * (1 + tolerancia)
+                if ahora > limite:
+                    regresiones.append(
+                        f"[{tamano}] {nombre}.{clave}: {antes} → {ahora}"
+                    )
+    return regresiones
+
+
+def guardar(resultado: dict, ruta: str) -> None:
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(resultado, archivo, indent=2, ensure_ascii=False)
+
+
+def cargar(ruta: str) -> dict:
+    with open(ruta, encoding="utf-8") as archivo:
+        return json.load(archivo)
@@ -0,0 +1,247 @@
+import re
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.expressions import RawSQL
+
+from .models import Vehiculo
+
+
+# --- Índice de Búsqueda (patente / marca / modelo / usuario) ---
+#
+# En SQLite se usa una tabla virtual FTS5 con tokenizador trigram:
+# permite buscar subcadenas ("BB12", "HLX") usando el índice en vez de
+# recorrer la tabla con LIKE '%x%'. Se mantiene sincronizada por signals.
+# Si la búsqueda exacta no alcanza, se recurre a similitud de trigramas
+# sobre la patente (tolerante a errores de tipeo).
+# En otros motores se usa icontains como respaldo.
+
+TABLA = "vehiculos_busqueda"
+
+# Pesos bm25 por columna: la patente pesa más que marca/modelo/usuario
+PESOS_BM25 = (10.0, 2.0, 2.0, 1.0)
+
+# Similitud mínima (Jaccard de trigramas) para aceptar una patente aproximada
+SIMILITUD_MINIMA = 0.3
+
+_disponible = None
+
+
+def indice_disponible() -> bool:
+    """Indica si existe la tabla FTS5 (solo SQLite con soporte trigram). Se cachea por proceso."""
+    global _disponible
+    if _disponible is None:
+        if connection.vendor != "sqlite":
+            _disponible = False
+        else:
+            _disponible = TABLA in connection.introspection.table_names(include_views=True)
+    return _disponible
+
+
+def crear_indice(schema_editor) -> bool:
+    """Crea la tabla virtual. Devuelve False si SQLite no soporta trigram."""
+    try:
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLA} "
+            f"USING fts5(patente, marca, modelo, usuario, tokenize='trigram')"
+        )
+    except DatabaseError:
+        return False
+
+    global _disponible
+    _disponible = None
+    return True
+
+
+def _normalizar(texto: str) -> str:
+    return re.sub(r"[^A-Z0-9]", "", (texto or "").upper())
+
+
+def trigramas(texto: str) -> set:
+    texto = _normalizar(texto)
+    return {texto[i:i + 3] for i in range(len(texto) - 2)}
+
+
+def similitud(a: str, b: str) -> float:
+    ta, tb = trigramas(a), trigramas(b)
+    if not ta or not tb:
+        return 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+# --- Sincronización ---
+
+def _usuario_texto(first_name, last_name, username) -> str:
+    return " ".join(p for p in (first_name, last_name, username) if p)
+
+
+def _indexar(qs) -> None:
+    filas = qs.values_list(
+        "id", "patente", "marca", "modelo",
+        "usuario__first_name", "usuario__last_name", "usuario__username",
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT OR REPLACE INTO {TABLA}(rowid, patente, marca, modelo, usuario) "
+            f"VALUES (%s, %s, %s, %s, %s)",
+            [(pk, patente, marca, modelo, _usuario_texto(fn, ln, un))
+             for pk, patente, marca, modelo, fn, ln, un in filas],
+        )
+
+
+def indexar_vehiculos(ids) -> None:
+    """(Re)indexa los vehículos indicados leyendo sus datos en una sola consulta."""
+    if indice_disponible() and ids:
+        _indexar(Vehiculo.objects.filter(pk__in=ids))
+
+
+def desindexar_vehiculos(ids) -> None:
+    if not indice_disponible() or not ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {TABLA} WHERE rowid = %s", [(pk,) for pk in ids])
+
+
+def reconstruir_indice(chunk_size: int = 2000) -> int:
+    """Vacía y reconstruye el índice completo. Devuelve la cantidad indexada."""
+    if not indice_disponible():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLA}")
+    ids = list(Vehiculo.objects.values_list("id", flat=True))
+    for i in range(0, len(ids), chunk_size):
+        indexar_vehiculos(ids[i:i + chunk_size])
+    return len(ids)
+
+
+# --- Consulta ---
+
+def _expresion_match(consulta: str) -> str:
+    # Cada palabra se cita como frase: el tokenizador trigram la trata como subcadena.
+    # "BB-12" también se busca normalizado ("BB12"), igual que se guarda la patente.
+    terminos = []
+    for palabra in consulta.split():
+        variantes = {palabra.replace('"', '""')}
+        if len(_normalizar(palabra)) >= 3:
+            variantes.add(_normalizar(palabra))
+        terminos.append("(" + " OR ".join(f'"{v}"' for v in sorted(variantes)) + ")")
+    return " AND ".join(terminos)
+
+
+def _filtro_alcance(qs) -> tuple:
+    """
+    (" AND rowid IN (...)", params) con los ids de `qs`, para aplicar el
+    alcance dentro de la consulta al índice (antes del LIMIT). Vacío si
+    `qs` es toda la flota.
+    """
+    if qs is None or not qs.query.where:
+        return "", []
+    sql, params = qs.order_by().values("id").query.sql_with_params()
+    return f" AND rowid IN ({sql})", list(params)
+
+
+def _buscar_fts(consulta: str, limite: int, qs=None) -> list:
+    """Coincidencias por subcadena dentro de `qs`, ordenadas por bm25 (mejor primero)."""
+    # El tokenizador trigram necesita al menos 3 caracteres por término
+    if any(len(p) < 3 for p in consulta.split()):
+        return []
+    pesos = ", ".join(str(p) for p in PESOS_BM25)
+    alcance, params = _filtro_alcance(qs)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {TABLA} WHERE {TABLA} MATCH %s{alcance} "
+            f"ORDER BY bm25({TABLA}, {pesos}) LIMIT %s",
+            [_expresion_match(consulta), *params, limite],
+        )
+        return [fila[0] for fila in cursor.fetchall()]
+
+
+def coincidencias(consulta: str) -> RawSQL | None:
+    """
+    Subconsulta con los ids de todas las coincidencias por subcadena (sin
+    límite ni ranking), para filtrar un queryset completo como el del
+    changelist. None sin índice o si algún término tiene menos de 3
+    caracteres (el tokenizador trigram no los indexa).
+    """
+    consulta = (consulta or "").strip()
+    if not consulta or not indice_disponible() or any(len(p) < 3 for p in consulta.split()):
+        return None
+    return RawSQL(f"SELECT rowid FROM {TABLA} WHERE {TABLA} MATCH %s", [_expresion_match(consulta)])
+
+
+def _buscar_aproximado(consulta: str, limite: int, qs=None) -> list:
+    """Patentes parecidas dentro de `qs`: candidatos que comparten algún trigrama, rankeados por Jaccard."""
+    grupos = trigramas(consulta)
+    if not grupos:
+        return []
+    expresion = "patente : (" + " OR ".join(f'"{t}"' for t in sorted(grupos)) + ")"
+    alcance, params = _filtro_alcance(qs)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, patente FROM {TABLA} WHERE {TABLA} MATCH %s{alcance} LIMIT %s",
+            [expresion, *params, limite * 20],
+        )
+        candidatos = cursor.fetchall()
+
+    puntuados = [(similitud(consulta, patente), pk) for pk, patente in candidatos]
+    puntuados = [(s, pk) for s, pk in puntuados if s >= SIMILITUD_MINIMA]
+    puntuados.sort(reverse=True)
+    return [pk for _, pk in puntuados[:limite]]
+
+
+def _buscar_orm(qs, consulta: str, limite: int) -> list:
+    """Respaldo sin índice (motores distintos de SQLite)."""
+    patente = _normalizar(consulta)
+    filtro = (
+        Q(marca__icontains=consulta)
+        | Q(modelo__icontains=consulta)
+        | Q(usuario__username__icontains=consulta)
+    )
+    if patente:
+        filtro |= Q(patente__icontains=patente)
+    return list(
+        qs.filter(filtro)
+        .annotate(prioridad=Case(
+            When(patente__istartswith=patente or consulta, then=0),
+            default=1,
+            output_field=IntegerField(),
+        ))
+        .order_by("prioridad", "patente")
+        .values_list("id", flat=True)[:limite]
+    )
+
+
+def buscar_ids(consulta: str, limite: int = 20, qs=None) -> list:
+    """
+    Devuelve ids de vehículos ordenados por relevancia.
+
+    Si se entrega `qs`, solo se consideran los vehículos de ese queryset
+    (p. ej. el alcance visible para el usuario).
+    """
+    consulta = (consulta or "").strip()
+    if not consulta:
+        return []
+    qs = qs if qs is not None else Vehiculo.objects.all()
+
+    # Menos de 3 caracteres no forman un trigrama: búsqueda sobre todos los
+    # campos con icontains (patentes que empiezan así primero)
+    if not indice_disponible() or len(consulta) < 3:
+        return _buscar_orm(qs, consulta, limite)
+
+    # El alcance se filtra en la misma consulta al índice, antes del LIMIT
+    ids = _buscar_fts(consulta, limite, qs)
+    if len(ids) < limite:
+        ids += [pk for pk in _buscar_aproximado(consulta, limite, qs) if pk not in ids]
+    return ids[:limite]
+
+
+def buscar(consulta: str, limite: int = 20, qs=None) -> list:
+    """Igual que buscar_ids() pero devuelve instancias, respetando el ranking."""
+    ids = buscar_ids(consulta, limite, qs)
+    por_id = Vehiculo.objects.select_related("usuario").in_bulk(ids)
+    return [por_id[pk] for pk in ids if pk in por_id]
+
+
+def limite_busqueda() -> int:
+    return getattr(settings, "BUSQUEDA_LIMITE", 20)
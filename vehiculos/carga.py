@@ -0,0 +1,116 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import AsyncClient, Client
+from django.urls import reverse
+
+from .benchmark import _percentil
+from .sintetico import sembrar_flota
+
+
+# --- Prueba de Carga WSGI vs ASGI ---
+#
+# Lanza muchas requests concurrentes contra las vistas de lectura usando la
+# pila real de cada protocolo (WSGIHandler con un pool de hilos, ASGIHandler
+# con un event loop). Qué implementación responde (def o async def) depende
+# de VISTAS_ASYNC al cargar las URLs, por eso cada modo se mide en su propio
+# proceso (ver el comando comparar_wsgi_asgi).
+
+MODOS = ("wsgi", "asgi")
+
+
+def rutas_lectura() -> list:
+    """(nombre, url, staff) de las vistas de lectura que se comparan."""
+    return [
+        ("dashboard", reverse("vehiculos:dashboard"), True),
+        ("dashboard_usuario", reverse("vehiculos:dashboard"), False),
+        ("detalle_vehiculos", reverse("vehiculos:detalle_vehiculos"), True),
+        ("detalle_vehiculos_usuario", reverse("vehiculos:detalle_vehiculos"), False),
+        ("detalle_vehiculos_json", reverse("vehiculos:detalle_vehiculos") + "?formato=json", True),
+        ("page_list", reverse("pages:page_list"), False),
+    ]
+
+
+def _resumen(tiempos: list, duracion: float, errores: int) -> dict:
+    return {
+        "peticiones": len(tiempos),
+        "errores": errores,
+        "req_s": round(len(tiempos) / duracion, 1) if duracion else 0.0,
+        "p50_ms": round(_percentil(tiempos, 50), 2),
+        "p95_ms": round(_percentil(tiempos, 95), 2),
+    }
+
+
+def _carga_wsgi(url: str, cookies: dict, peticiones: int, concurrencia: int) -> dict:
+    def trabajador(cantidad):
+        # Un cliente por hilo: el de pruebas no es seguro entre hilos
+        cliente = Client()
+        cliente.cookies.load(cookies)
+        tiempos, errores = [], 0
+        for _ in range(cantidad):
+            inicio = perf_counter()
+            response = cliente.get(url)
+            tiempos.append((perf_counter() - inicio) * 1000)
+            errores += response.status_code >= 400
+        return tiempos, errores
+
+    reparto = [peticiones // concurrencia + (i < peticiones % concurrencia) for i in range(concurrencia)]
+    inicio = perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        resultados = list(pool.map(trabajador, reparto))
+    duracion = perf_counter() - inicio
+
+    tiempos = [t for parcial, _ in resultados for t in parcial]
+    return _resumen(tiempos, duracion, sum(e for _, e in resultados))
+
+
+async def _carga_asgi(url: str, cookies: dict, peticiones: int, concurrencia: int) -> dict:
+    limite = asyncio.Semaphore(concurrencia)
+    tiempos, errores = [], 0
+
+    async def pedir():
+        nonlocal errores
+        async with limite:
+            cliente = AsyncClient()
+            cliente.cookies.load(cookies)
+            inicio = perf_counter()
+            response = await cliente.get(url)
+            tiempos.append((perf_counter() - inicio) * 1000)
+            errores += response.status_code >= 400
+
+    inicio = perf_counter()
+    await asyncio.gather(*(pedir() for _ in range(peticiones)))
+    return _resumen(tiempos, perf_counter() - inicio, errores)
+
+
+def ejecutar_carga(modo: str, tamano: int, peticiones: int, concurrencia: int,
+                   usuarios: int, semilla: int, log=print) -> dict:
+    """
+    Siembra la flota (misma semilla = mismos datos en ambos modos) en la base
+    de datos actual, que debe ser desechable, y mide cada ruta de lectura.
+    """
+    log(f"[{modo}] Sembrando {tamano} vehículos...")
+    sembrar_flota(tamano, usuarios=usuarios, semilla=semilla)
+
+    staff, _ = User.objects.get_or_create(username="carga_staff", defaults={"is_staff": True})
+    conductor = User.objects.filter(flota__isnull=False).exclude(pk=staff.pk).first()
+
+    # Las sesiones se crean con el cliente síncrono y se comparten por cookie
+    cookies = {}
+    for es_staff, usuario in ((True, staff), (False, conductor)):
+        cliente = Client()
+        cliente.force_login(usuario)
+        cookies[es_staff] = {nombre: morsel.value for nombre, morsel in cliente.cookies.items()}
+
+    resultados = {}
+    for nombre, url, es_staff in rutas_lectura():
+        log(f"  {nombre}...")
+        cache.clear()
+        if modo == "asgi":
+            resultados[nombre] = asyncio.run(_carga_asgi(url, cookies[es_staff], peticiones, concurrencia))
+        else:
+            resultados[nombre] = _carga_wsgi(url, cookies[es_staff], peticiones, concurrencia)
+    return resultados
@@ -0,0 +1,45 @@
+from core.eventos import publicar_al_confirmar
+
+
+# --- Eventos de Flota en Tiempo Real ---
+#
+# Misma visibilidad que el dashboard: el staff ve toda la flota y cada
+# conductor solo sus vehículos. Un cambio de responsable se notifica al
+# anterior y al nuevo. Se publican tras el COMMIT (ver core/eventos.py).
+
+# Los eventos de lote listan ids solo hasta este tamaño; más allá el cliente
+# debe volver a consultar (p. ej. con la sincronización incremental)
+LIMITE_IDS_LOTE = 500
+
+
+def _datos(vehiculo) -> dict:
+    return {
+        "id": vehiculo.pk,
+        "patente": vehiculo.patente,
+        "activo": vehiculo.activo,
+        "usuario_id": vehiculo.usuario_id,
+    }
+
+
+def publicar_vehiculo(accion: str, vehiculo, usuarios=()) -> None:
+    """accion: creado | actualizado | eliminado."""
+    publicar_al_confirmar(f"vehiculo.{accion}", _datos(vehiculo), usuarios=usuarios, staff=True)
+
+
+def _resumen_ids(ids: list) -> dict:
+    return {"cantidad": len(ids), "ids": ids[:LIMITE_IDS_LOTE], "completo": len(ids) <= LIMITE_IDS_LOTE}
+
+
+def publicar_lote(accion: str, ids: list, ids_por_usuario: dict) -> None:
+    """
+    Un evento por acción masiva o importación. El staff recibe todos los ids;
+    cada conductor afectado, solo los de sus vehículos.
+    """
+    ids_por_usuario = {pk: propios for pk, propios in ids_por_usuario.items() if pk is not None}
+    publicar_al_confirmar(
+        "vehiculos.lote",
+        {"accion": accion, **_resumen_ids(ids)},
+        usuarios=list(ids_por_usuario),
+        staff=True,
+        por_usuario={pk: _resumen_ids(propios) for pk, propios in ids_por_usuario.items()},
+    )
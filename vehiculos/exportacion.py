@@ -0,0 +1,142 @@
+import csv
+import io
+import tempfile
+
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+from openpyxl import Workbook
+
+from .models import Vehiculo
+from .services import filtrar_vehiculos
+
+
+# --- Exportación de Vehículos (memoria constante) ---
+
+ENCABEZADOS = ["Patente", "Marca", "Modelo", "Responsable", "Estado"]
+
+# Solo se leen las columnas necesarias; nunca se instancian modelos
+CAMPOS = (
+    "patente",
+    "marca",
+    "modelo",
+    "usuario__first_name",
+    "usuario__last_name",
+    "usuario__username",
+    "activo",
+)
+
+CONTENT_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+FORMATOS_TEXTO = {
+    "csv": (",", "text/csv"),
+    "tsv": ("\t", "text/tab-separated-values"),
+}
+
+
+def _chunk_size() -> int:
+    return getattr(settings, "EXPORTACION_CHUNK_SIZE", 2000)
+
+
+def vehiculos_a_exportar(filtros, usuario_id=None):
+    """QuerySet a exportar: filtros GET y, para no-staff, solo sus vehículos."""
+    qs = Vehiculo.objects.order_by("-fecha_creacion")
+    if usuario_id is not None:
+        qs = qs.filter(usuario_id=usuario_id)
+    return filtrar_vehiculos(qs, filtros)
+
+
+def filas_exportacion(qs):
+    """
+    Genera las filas a exportar directamente desde la BD.
+
+    Usa values_list() + iterator(chunk_size) para que el consumo de memoria
+    sea constante sin importar el tamaño de la flota.
+    """
+    filas = qs.values_list(*CAMPOS).iterator(chunk_size=_chunk_size())
+    for patente, marca, modelo, nombre, apellido, username, activo in filas:
+        responsable = f"{nombre or ''} {apellido or ''}".strip() or username or "Sin asignar"
+        yield [
+            patente,
+            marca,
+            modelo,
+            responsable,
+            "Activo" if activo else "Inactivo",
+        ]
+
+
+class _Eco:
+    """Buffer mínimo para csv.writer: devuelve cada línea en vez de almacenarla."""
+
+    def write(self, valor):
+        return valor
+
+
+def respuesta_texto(qs, formato: str, nombre: str) -> StreamingHttpResponse:
+    """Respuesta CSV/TSV que se envía al cliente a medida que se generan las filas."""
+    delimitador, content_type = FORMATOS_TEXTO[formato]
+    writer = csv.writer(_Eco(), delimiter=delimitador)
+
+    def contenido():
+        # BOM para que Excel reconozca UTF-8 (tildes y ñ)
+        yield "\ufeff"
+        yield writer.writerow(ENCABEZADOS)
+        for fila in filas_exportacion(qs):
+            yield writer.writerow(fila)
+
+    response = StreamingHttpResponse(contenido(), content_type=f"{content_type}; charset=utf-8")
+    response["Content-Disposition"] = f'attachment; filename="{nombre}.{formato}"'
+    return response
+
+
+def respuesta_xlsx(qs, nombre: str) -> FileResponse:
+    """
+    Respuesta Excel generada con openpyxl en modo write-only.
+
+    Las filas se vuelcan a disco a medida que se escriben (no se mantiene
+    el libro completo en memoria) y el archivo resultante se envía en bloques.
+    """
+    # TemporaryFile se elimina automáticamente al cerrarse la respuesta
+    archivo = tempfile.TemporaryFile()
+    escribir_xlsx(filas_exportacion(qs), archivo)
+    archivo.seek(0)
+
+    return FileResponse(
+        archivo,
+        as_attachment=True,
+        filename=f"{nombre}.xlsx",
+        content_type=CONTENT_TYPE_XLSX,
+    )
+
+
+# --- Escritura a Archivo (tareas en segundo plano) ---
+
+def con_avance(filas, total: int, progreso, cada: int | None = None):
+    """Reenvía las filas llamando a progreso(hechos, total) cada `cada` filas."""
+    cada = cada or _chunk_size()
+    hechos = 0
+    for fila in filas:
+        yield fila
+        hechos += 1
+        if hechos % cada == 0:
+            progreso(hechos, total)
+    progreso(hechos, total)
+
+
+def escribir_texto(filas, formato: str, archivo, encabezados=ENCABEZADOS) -> None:
+    """CSV/TSV en UTF-8 con BOM sobre un archivo binario abierto."""
+    delimitador, _ = FORMATOS_TEXTO[formato]
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    writer = csv.writer(texto, delimiter=delimitador)
+    writer.writerow(encabezados)
+    writer.writerows(filas)
+    texto.flush()
+    texto.detach()  # el archivo binario sigue abierto para quien lo creó
+
+
+def escribir_xlsx(filas, archivo, encabezados=ENCABEZADOS, titulo: str = "Vehículos") -> None:
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=titulo)
+    ws.append(encabezados)
+    for fila in filas:
+        ws.append(fila)
+    wb.save(archivo)
@@ -0,0 +1,167 @@
+from collections import Counter
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ALL_VAR, ERROR_FLAG, IS_POPUP_VAR, ORDER_VAR, PAGE_VAR, TO_FIELD_VAR
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+from django.utils.functional import cached_property
+
+from core.cache import clave_versionada
+
+from .models import Vehiculo
+
+
+# --- Facetas del Changelist de Vehículos (admin) ---
+#
+# Una sola consulta GROUP BY (marca, activo, año de registro) con la cantidad
+# de vehículos de cada combinación, cacheada por generación "vehiculos" (los
+# receptores de signals.py y las acciones en lote la incrementan en cada
+# alta, edición o baja). De esa tabla, sin recorrer la de vehículos en cada
+# carga del changelist, salen:
+#   - las opciones de los filtros de marca y estado, con su conteo
+#   - los años de la jerarquía de fechas
+#   - el conteo exacto del paginador cuando solo se filtra por esos campos
+
+MARCA, ACTIVO, ANIO, CANTIDAD = range(4)
+
+# Parámetro del changelist → columna de la faceta
+PARAMETROS = {
+    "marca": MARCA,
+    "activo": ACTIVO,
+    "fecha_creacion__year": ANIO,
+}
+
+# Parámetros que no filtran (paginación, orden, popups)
+IGNORADOS = {PAGE_VAR, ORDER_VAR, ALL_VAR, IS_POPUP_VAR, TO_FIELD_VAR, ERROR_FLAG}
+
+
+def _timeout() -> int:
+    return getattr(settings, "ADMIN_FACETAS_TIMEOUT", 3600)
+
+
+def facetas() -> list:
+    """[(marca, activo, anio, cantidad), ...] de toda la flota."""
+    clave = clave_versionada("vehiculos:facetas", ("vehiculos",))
+    filas = cache.get(clave)
+    if filas is None:
+        filas = list(
+            Vehiculo.objects.order_by()
+            .annotate(anio_registro=ExtractYear("fecha_creacion"))
+            .values_list("marca", "activo", "anio_registro")
+            .annotate(cantidad=Count("id"))
+        )
+        cache.set(clave, filas, _timeout())
+    return filas
+
+
+def _valor(columna: int, texto: str):
+    if columna == ACTIVO:
+        return {"1": True, "0": False}[texto]
+    if columna == ANIO:
+        return int(texto)
+    return texto
+
+
+def criterios(parametros, excluir: str | None = None) -> dict | None:
+    """
+    {columna: valor} de los parámetros del changelist, o None si alguno
+    filtra por algo que las facetas no cubren (búsqueda, rangos de fecha...).
+    """
+    resultado = {}
+    for nombre, valor in parametros.items():
+        if nombre in IGNORADOS or nombre == excluir:
+            continue
+        if nombre not in PARAMETROS:
+            return None
+        try:
+            resultado[PARAMETROS[nombre]] = _valor(PARAMETROS[nombre], valor)
+        except (KeyError, ValueError):
+            return None
+    return resultado
+
+
+def conteos(columna: int, filtro: dict) -> Counter:
+    """Vehículos por valor de `columna` entre las facetas que cumplen `filtro`."""
+    resultado = Counter()
+    for fila in facetas():
+        if all(fila[c] == v for c, v in filtro.items()):
+            resultado[fila[columna]] += fila[CANTIDAD]
+    return resultado
+
+
+def conteo(parametros) -> int | None:
+    """Resultado exacto del changelist desde las facetas, o None si no alcanza."""
+    filtro = criterios(parametros)
+    if filtro is None:
+        return None
+    return sum(conteos(MARCA, filtro).values())
+
+
+# --- Filtros y Paginador ---
+
+class FiltroFaceta(admin.SimpleListFilter):
+    """
+    Filtro cuyas opciones salen de las facetas cacheadas. Los conteos
+    respetan los demás filtros de facetas aplicados; con otros filtros
+    (búsqueda, fechas) se omiten.
+    """
+
+    columna: int
+
+    def etiqueta(self, valor) -> str:
+        return str(valor)
+
+    def lookups(self, request, model_admin):
+        filtro = criterios(request.GET, excluir=self.parameter_name)
+        cantidades = conteos(self.columna, filtro or {})
+        return [
+            (str(int(valor)) if isinstance(valor, bool) else valor,
+             f"{self.etiqueta(valor)} ({cantidad})" if filtro is not None else self.etiqueta(valor))
+            for valor, cantidad in sorted(cantidades.items())
+            if cantidad or filtro is None
+        ]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        try:
+            valor = _valor(self.columna, self.value())
+        except (KeyError, ValueError) as exc:
+            # Como los filtros de Django: el changelist redirige con ?e=1
+            raise IncorrectLookupParameters(exc)
+        return queryset.filter(**{self.campo: valor})
+
+
+class FiltroMarca(FiltroFaceta):
+    title = "marca"
+    parameter_name = "marca"
+    campo = "marca"
+    columna = MARCA
+
+
+class FiltroActivo(FiltroFaceta):
+    title = "estado operativo"
+    parameter_name = "activo"
+    campo = "activo"
+    columna = ACTIVO
+
+    def etiqueta(self, valor) -> str:
+        return "Activo" if valor else "Inactivo"
+
+
+class PaginadorFacetas(Paginator):
+    """Paginator que toma el total conocido (facetas) en vez de ejecutar COUNT(*)."""
+
+    def __init__(self, *args, conteo: int | None = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._conteo = conteo
+
+    @cached_property
+    def count(self) -> int:
+        if self._conteo is not None:
+            return self._conteo
+        return super().count
@@ -1,6 +1,7 @@
 from django import forms
 from .models import Vehiculo
-from django.contrib.auth.models import User
+from accounts.autocompletar import AutocompletarUsuarioSelect, UsuarioChoiceField
+import datetime
 import re
 
 class VehiculoForm(forms.ModelForm):
@@ -9,13 +10,13 @@ class VehiculoForm(forms.ModelForm):
     Incluye validación avanzada de patentes y personalización de selección de usuarios.
     """
 
-    # Personalizamos el queryset del usuario para que se vea Nombre + Apellido
-    usuario = forms.ModelChoiceField(
-        queryset=User.objects.all(),
+    # Selector con autocompletado: se muestra Nombre Apellido (username) y solo
+    # se renderiza el usuario seleccionado; el resto se busca bajo demanda
+    usuario = UsuarioChoiceField(
         required=False,
         label="Usuario Responsable",
         empty_label="--- Sin asignar (Flota en reserva) ---",
-        widget=forms.Select(attrs={"class": "form-select"})
+        widget=AutocompletarUsuarioSelect(attrs={"class": "form-select"})
     )
 
     class Meta:
@@ -31,34 +32,122 @@ class VehiculoForm(forms.ModelForm):
             "activo": forms.CheckboxInput(attrs={"class": "form-check-input"}),
         }
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Modificamos la representación del usuario en el desplegable
-        self.fields['usuario'].label_from_instance = lambda obj: f"{obj.get_full_name()} ({obj.username})" if obj.get_full_name() else obj.username
-
     def clean_patente(self):
         """
         Limpia y valida la patente chilena.
         Elimina guiones, espacios y verifica formato alfanumérico.
         """
-        patente = self.cleaned_data.get("patente", "").strip().upper()
-        # Eliminar cualquier caracter no alfanumérico (guiones, espacios, puntos)
-        patente = re.sub(r'[^A-Z0-9]', '', patente)
-
-        # Validación de longitud (Estándar chileno actual es de 6 caracteres)
-        if len(patente) < 5 or len(patente) > 6:
-            raise forms.ValidationError(
-                "La patente debe tener entre 5 y 6 caracteres alfanuméricos."
-            )
-        
         # Opcional: Validar que el vehículo no esté ya registrado con esa patente corregida
         # (Django ya lo hace por el 'unique=True' en el modelo, pero aquí podemos personalizar el error)
-        return patente
+        return normalizar_patente(self.cleaned_data.get("patente", ""))
 
     def clean_anio(self):
-        anio = self.cleaned_data.get("anio")
-        import datetime
-        current_year = datetime.date.today().year
-        if anio and (anio < 1980 or anio > current_year + 1):
-            raise forms.ValidationError(f"El año debe estar entre 1980 y {current_year + 1}")
-        return anio
\ No newline at end of file
+        return validar_anio(self.cleaned_data.get("anio"))
+
+
+# --- Reglas de validación reutilizables (formulario e importación masiva) ---
+
+def normalizar_patente(valor) -> str:
+    """
+    Normaliza una patente chilena (mayúsculas, sin guiones/espacios/puntos)
+    y valida su longitud. Lanza ValidationError si no es válida.
+    """
+    patente = (valor or "").strip().upper()
+    # Eliminar cualquier caracter no alfanumérico (guiones, espacios, puntos)
+    patente = re.sub(r'[^A-Z0-9]', '', patente)
+
+    # Validación de longitud (Estándar chileno actual es de 6 caracteres)
+    if len(patente) < 5 or len(patente) > 6:
+        raise forms.ValidationError(
+            "La patente debe tener entre 5 y 6 caracteres alfanuméricos."
+        )
+    return patente
+
+
+def validar_anio(anio):
+    """Valida que el año esté entre 1980 y el año siguiente al actual."""
+    current_year = datetime.date.today().year
+    if anio is not None and (anio < 1980 or anio > current_year + 1):
+        raise forms.ValidationError(f"El año debe estar entre 1980 y {current_year + 1}")
+    return anio
+
+
+class ImportacionVehiculosForm(forms.Form):
+    """Carga masiva de vehículos desde un archivo CSV o XLSX."""
+
+    archivo = forms.FileField(
+        label="Archivo (CSV o XLSX)",
+        widget=forms.ClearableFileInput(attrs={"class": "form-control", "accept": ".csv,.xlsx"}),
+    )
+    actualizar = forms.BooleanField(
+        label="Actualizar vehículos existentes",
+        required=False,
+        initial=True,
+        help_text="Si se desmarca, las patentes ya registradas se reportan como error.",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    def clean_archivo(self):
+        archivo = self.cleaned_data["archivo"]
+        if not archivo.name.lower().endswith((".csv", ".xlsx")):
+            raise forms.ValidationError("Formato no soportado. Use un archivo .csv o .xlsx.")
+        return archivo
+
+
+class ListaIdsField(forms.Field):
+    """Lista de ids enviada como varios valores con el mismo nombre (checkboxes)."""
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(v) for v in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Selección de vehículos inválida.")
+
+
+class AccionMasivaForm(forms.Form):
+    """Acción sobre varios vehículos del listado (seleccionados o todos los filtrados)."""
+
+    ACCIONES = [
+        ("activar", "Activar"),
+        ("desactivar", "Desactivar"),
+        ("reasignar", "Reasignar a..."),
+        ("eliminar", "Eliminar"),
+    ]
+
+    accion = forms.ChoiceField(
+        choices=ACCIONES,
+        widget=forms.Select(attrs={"class": "form-select"}),
+    )
+    ids = ListaIdsField(required=False)
+    todos = forms.BooleanField(
+        required=False,
+        label="Todos los que coinciden con el filtro",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+    usuario = UsuarioChoiceField(
+        required=False,
+        label="Nuevo responsable",
+        empty_label="--- Sin asignar (Flota en reserva) ---",
+        widget=AutocompletarUsuarioSelect(attrs={"class": "form-select"}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get("todos") and not cleaned_data.get("ids"):
+            raise forms.ValidationError("Selecciona al menos un vehículo.")
+        return cleaned_data
+
+
+class ReasignacionForm(forms.Form):
+    """Paso intermedio de la acción "Reasignar" del admin."""
+
+    usuario = UsuarioChoiceField(
+        required=False,
+        label="Nuevo responsable",
+        empty_label="--- Sin asignar (Flota en reserva) ---",
+        widget=AutocompletarUsuarioSelect(attrs={"class": "form-select"}),
+    )
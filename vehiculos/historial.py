@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AsignacionVehiculo
+
+
+# --- Historial de Asignaciones ---
+#
+# Los intervalos son [inicio, fin): una asignación que termina a las 10:00
+# y la siguiente que empieza a las 10:00 no se superponen.
+
+
+def _vigente_en(momento) -> Q:
+    return Q(inicio__lte=momento) & (Q(fin__isnull=True) | Q(fin__gt=momento))
+
+
+def registrar_reasignaciones(cambios: dict, momento=None) -> None:
+    """
+    Registra reasignaciones en lote: {vehiculo_id: usuario_id | None}.
+
+    Cierra las asignaciones abiertas de todos los vehículos con un único
+    UPDATE y abre las nuevas con un único bulk_create, sin importar cuántos
+    vehículos cambien.
+    """
+    if not cambios:
+        return
+    momento = momento or timezone.now()
+
+    with transaction.atomic():
+        AsignacionVehiculo.objects.filter(
+            vehiculo_id__in=list(cambios), fin__isnull=True
+        ).update(fin=momento)
+
+        AsignacionVehiculo.objects.bulk_create([
+            AsignacionVehiculo(vehiculo_id=vehiculo_id, usuario_id=usuario_id, inicio=momento)
+            for vehiculo_id, usuario_id in cambios.items()
+            if usuario_id is not None
+        ])
+
+
+def asignaciones_vigentes(momento, vehiculo_ids=None):
+    """QuerySet de las asignaciones vigentes en `momento` (una fila por vehículo)."""
+    qs = AsignacionVehiculo.objects.filter(_vigente_en(momento))
+    if vehiculo_ids is not None:
+        qs = qs.filter(vehiculo_id__in=list(vehiculo_ids))
+    return qs.order_by()
+
+
+def asignaciones_a_fecha(momento, vehiculo_ids=None) -> dict:
+    """
+    Resuelve el responsable de muchos vehículos en un instante, en una sola consulta.
+
+    Devuelve {vehiculo_id: usuario_id}; los vehículos sin responsable en ese
+    momento (flota en reserva) no aparecen. Sin `vehiculo_ids` considera
+    toda la flota.
+    """
+    return dict(
+        asignaciones_vigentes(momento, vehiculo_ids).values_list("vehiculo_id", "usuario_id")
+    )
+
+
+def asignaciones_en_rango(desde, hasta, vehiculo=None, usuario=None):
+    """Asignaciones que se superponen con [desde, hasta), opcionalmente filtradas."""
+    qs = AsignacionVehiculo.objects.filter(inicio__lt=hasta).filter(
+        Q(fin__isnull=True) | Q(fin__gt=desde)
+    )
+    if vehiculo is not None:
+        qs = qs.filter(vehiculo=vehiculo)
+    if usuario is not None:
+        qs = qs.filter(usuario=usuario)
+    return qs.select_related("vehiculo", "usuario").order_by("inicio")
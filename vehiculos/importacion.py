@@ -0,0 +1,329 @@
+import csv
+import io
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django import forms
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from .busqueda import indexar_vehiculos
+from .eventos import publicar_lote
+from .forms import normalizar_patente, validar_anio
+from .historial import registrar_reasignaciones
+from .models import Vehiculo
+from .services import invalidar_metricas
+
+
+# --- Importación Masiva de Vehículos (CSV / XLSX) ---
+#
+# Flujo por lote:
+#   1. Validación de todas las filas del lote con las reglas de VehiculoForm
+#   2. Una consulta IN para usuarios y otra para patentes ya registradas
+#   3. bulk_create con upsert sobre `patente`
+# Las filas inválidas se acumulan en el reporte; nunca detienen la carga.
+
+# Encabezados aceptados (normalizados) → campo del modelo
+COLUMNAS = {
+    "patente": "patente",
+    "marca": "marca",
+    "modelo": "modelo",
+    "anio": "anio",
+    "año": "anio",
+    "color": "color",
+    "activo": "activo",
+    "estado": "activo",
+    "usuario": "usuario",
+    "responsable": "usuario",
+}
+
+# Al actualizar solo se escriben las columnas presentes en el archivo (un
+# archivo sin "usuario" no desasigna la flota); fecha_actualizacion, siempre
+CAMPOS_ACTUALIZABLES = ["marca", "modelo", "anio", "color", "activo", "usuario"]
+
+VALORES_VERDADEROS = {"1", "true", "yes", "si", "sí", "activo", "x"}
+VALORES_FALSOS = {"0", "false", "no", "inactivo"}
+
+
+@dataclass
+class ErrorFila:
+    fila: int
+    patente: str
+    mensaje: str
+
+
+@dataclass
+class ReporteImportacion:
+    procesadas: int = 0
+    creados: int = 0
+    actualizados: int = 0
+    errores: list = field(default_factory=list)
+
+    @property
+    def con_errores(self) -> int:
+        return len(self.errores)
+
+    def escribir_csv(self, destino) -> None:
+        """Escribe el detalle de errores (fila, patente, mensaje) en `destino`."""
+        writer = csv.writer(destino)
+        writer.writerow(["Fila", "Patente", "Error"])
+        for error in self.errores:
+            writer.writerow([error.fila, error.patente, error.mensaje])
+
+
+def _chunk_size() -> int:
+    return getattr(settings, "IMPORTACION_CHUNK_SIZE", 1000)
+
+
+# --- Lectura de archivos ---
+
+def _normalizar_encabezados(encabezados) -> list:
+    return [COLUMNAS.get(str(h or "").strip().lower()) for h in encabezados]
+
+
+def _filas_desde_tabla(filas):
+    """Convierte una secuencia de tuplas (1ª = encabezados) en (nro_fila, dict)."""
+    filas = iter(filas)
+    encabezados = _normalizar_encabezados(next(filas, []))
+    if "patente" not in encabezados:
+        raise ValueError("El archivo debe incluir al menos la columna 'patente'.")
+
+    # La fila 1 es el encabezado; los números de fila coinciden con Excel
+    for nro, valores in enumerate(filas, start=2):
+        if not any(v not in (None, "") for v in valores):
+            continue
+        yield nro, {
+            campo: valor
+            for campo, valor in zip(encabezados, valores)
+            if campo is not None
+        }
+
+
+def leer_csv(archivo):
+    texto = io.TextIOWrapper(archivo, encoding="utf-8-sig", newline="")
+    muestra = texto.read(4096)
+    texto.seek(0)
+    try:
+        dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+    except csv.Error:
+        dialecto = csv.excel
+    yield from _filas_desde_tabla(csv.reader(texto, dialecto))
+
+
+def leer_xlsx(archivo):
+    # read_only: openpyxl recorre la hoja en streaming sin cargarla completa
+    wb = load_workbook(archivo, read_only=True, data_only=True)
+    try:
+        yield from _filas_desde_tabla(wb.active.iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+def leer_archivo(archivo, nombre: str):
+    """Devuelve un iterador de (nro_fila, dict) según la extensión del archivo."""
+    if nombre.lower().endswith(".xlsx"):
+        return leer_xlsx(archivo)
+    return leer_csv(archivo)
+
+
+# --- Validación por lote ---
+
+def _texto(valor) -> str:
+    return str(valor).strip() if valor is not None else ""
+
+
+def _parsear_activo(valor) -> bool:
+    if isinstance(valor, bool):
+        return valor
+    texto = _texto(valor).lower()
+    if not texto or texto in VALORES_VERDADEROS:
+        return True
+    if texto in VALORES_FALSOS:
+        return False
+    raise forms.ValidationError(f"Valor de estado no reconocido: '{valor}'.")
+
+
+def _parsear_anio(valor):
+    texto = _texto(valor)
+    if not texto:
+        return None
+    try:
+        anio = int(float(texto))
+    except (ValueError, OverflowError):
+        # OverflowError: "inf", "1e400"
+        raise forms.ValidationError(f"Año inválido: '{valor}'.")
+    # bulk_create no ejecuta los validadores del modelo: se aplican aquí
+    Vehiculo._meta.get_field("anio").run_validators(anio)
+    return validar_anio(anio)
+
+
+class ValidadorLote:
+    """
+    Valida un lote de filas aplicando las mismas reglas que VehiculoForm
+    (normalizar_patente / validar_anio) y resolviendo usuarios y patentes
+    existentes con una sola consulta IN cada uno.
+    """
+
+    def __init__(self, actualizar: bool = True):
+        self.actualizar = actualizar
+        # Patentes ya vistas en el archivo (detecta duplicados entre lotes)
+        self.vistas = set()
+
+    def validar(self, lote):
+        """Devuelve (vehiculos_validos, existentes {patente: usuario_id}, errores)."""
+        errores = []
+        candidatos = []
+
+        for nro, fila in lote:
+            patente_original = _texto(fila.get("patente"))
+            try:
+                datos = self._limpiar_fila(fila)
+            except forms.ValidationError as exc:
+                errores.append(ErrorFila(nro, patente_original, "; ".join(exc.messages)))
+                continue
+
+            if datos["patente"] in self.vistas:
+                errores.append(ErrorFila(nro, datos["patente"], "Patente duplicada dentro del archivo."))
+                continue
+            self.vistas.add(datos["patente"])
+            candidatos.append((nro, datos))
+
+        usuarios = self._resolver_usuarios(candidatos)
+        existentes = dict(
+            Vehiculo.objects.filter(
+                patente__in=[d["patente"] for _, d in candidatos]
+            ).values_list("patente", "usuario_id")
+        )
+
+        ahora = timezone.now()
+        validos = []
+        for nro, datos in candidatos:
+            username = datos.pop("username")
+            if username and username not in usuarios:
+                errores.append(ErrorFila(nro, datos["patente"], f"Usuario '{username}' no existe."))
+                continue
+            if datos["patente"] in existentes and not self.actualizar:
+                errores.append(ErrorFila(nro, datos["patente"], "La patente ya está registrada."))
+                continue
+
+            validos.append(Vehiculo(
+                usuario_id=usuarios.get(username),
+                fecha_actualizacion=ahora,
+                **datos,
+            ))
+
+        return validos, existentes, errores
+
+    def _limpiar_fila(self, fila) -> dict:
+        marca = _texto(fila.get("marca"))
+        modelo = _texto(fila.get("modelo"))
+        if not marca or not modelo:
+            raise forms.ValidationError("Marca y modelo son obligatorios.")
+
+        return {
+            "patente": normalizar_patente(_texto(fila.get("patente"))),
+            "marca": marca[:50],
+            "modelo": modelo[:50],
+            "anio": _parsear_anio(fila.get("anio")),
+            "color": _texto(fila.get("color"))[:30] or None,
+            "activo": _parsear_activo(fila.get("activo")),
+            "username": _texto(fila.get("usuario")),
+        }
+
+    @staticmethod
+    def _resolver_usuarios(candidatos) -> dict:
+        usernames = {d["username"] for _, d in candidatos if d["username"]}
+        if not usernames:
+            return {}
+        return dict(
+            User.objects.filter(username__in=usernames).values_list("username", "id")
+        )
+
+
+# --- Orquestación ---
+
+def _campos_actualizables(lote) -> list:
+    """Campos que el upsert sobrescribe: los de las columnas presentes en el lote."""
+    columnas = set().union(*(fila.keys() for _, fila in lote))
+    return [campo for campo in CAMPOS_ACTUALIZABLES if campo in columnas] + ["fecha_actualizacion"]
+
+
+def _ids_por_usuario(validos, ids: dict, existentes: dict, con_usuario: bool = True) -> dict:
+    """
+    Ids importados por responsable, incluido el anterior si la fila lo cambió.
+    Sin columna "usuario" los existentes conservan su responsable.
+    """
+    agrupados = {}
+    for v in validos:
+        usuarios = {v.usuario_id, existentes.get(v.patente)} if con_usuario else {existentes.get(v.patente)}
+        for usuario_id in usuarios:
+            agrupados.setdefault(usuario_id, []).append(ids[v.patente])
+    return agrupados
+
+
+def _lotes(iterable, tamano: int):
+    iterador = iter(iterable)
+    while lote := list(islice(iterador, tamano)):
+        yield lote
+
+
+def importar_vehiculos(filas, chunk_size: int | None = None, actualizar: bool = True) -> ReporteImportacion:
+    """
+    Importa vehículos desde un iterador de (nro_fila, dict).
+
+    Cada lote se valida y se escribe en su propia transacción con
+    bulk_create (upsert por `patente`). Devuelve el reporte por fila.
+    """
+    chunk_size = chunk_size or _chunk_size()
+    validador = ValidadorLote(actualizar=actualizar)
+    reporte = ReporteImportacion()
+
+    for lote in _lotes(filas, chunk_size):
+        reporte.procesadas += len(lote)
+        validos, existentes, errores = validador.validar(lote)
+        reporte.errores.extend(errores)
+
+        if not validos:
+            continue
+
+        campos = _campos_actualizables(lote)
+        con_usuario = "usuario" in campos
+        with transaction.atomic():
+            Vehiculo.objects.bulk_create(
+                validos,
+                batch_size=chunk_size,
+                update_conflicts=True,
+                unique_fields=["patente"],
+                update_fields=campos,
+            )
+            ids = dict(
+                Vehiculo.objects.filter(
+                    patente__in=[v.patente for v in validos]
+                ).values_list("patente", "id")
+            )
+            indexar_vehiculos(list(ids.values()))
+            if con_usuario:
+                registrar_reasignaciones({
+                    ids[v.patente]: v.usuario_id
+                    for v in validos
+                    if existentes.get(v.patente, None) != v.usuario_id
+                })
+            publicar_lote("importacion", list(ids.values()), _ids_por_usuario(validos, ids, existentes, con_usuario))
+
+        actualizados = sum(1 for v in validos if v.patente in existentes)
+        reporte.actualizados += actualizados
+        reporte.creados += len(validos) - actualizados
+
+    # bulk_create no emite post_save: se invalida una sola vez al final
+    if reporte.creados or reporte.actualizados:
+        invalidar_metricas()
+
+    return reporte
+
+
+def importar_archivo(archivo, nombre: str, **kwargs) -> ReporteImportacion:
+    """Atajo: lee un archivo CSV/XLSX e importa su contenido."""
+    return importar_vehiculos(leer_archivo(archivo, nombre), **kwargs)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from vehiculos.analitica import actualizar_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Actualiza los rollups diarios de analítica de flota a partir de los "
+        "cambios desde la última ejecución (pensado para cron, p. ej. cada hora)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--completo",
+            action="store_true",
+            help="Recalcula todos los días (concilia bajas de vehículos).",
+        )
+
+    def handle(self, *args, **options):
+        resultado = actualizar_rollups(completo=options["completo"])
+        foto = "foto del día actualizada" if resultado["foto"] else "sin cambios en el estado"
+        self.stdout.write(self.style.SUCCESS(f"{resultado['dias']} días recalculados, {foto}."))
@@ -0,0 +1,82 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from vehiculos import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide latencia, consultas y memoria de las vistas de vehículos sobre "
+        "flotas sintéticas, cada una en una base de datos de pruebas desechable."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tamanos",
+            default="1000,10000",
+            help="Tamaños de flota separados por coma (ej: 1000,10000,100000).",
+        )
+        parser.add_argument("--repeticiones", type=int, default=20)
+        parser.add_argument("--usuarios", type=int, default=200)
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument("--salida", default="benchmark_vehiculos.json", help="Archivo JSON de resultados.")
+        parser.add_argument("--baseline", help="JSON previo contra el cual comparar.")
+        parser.add_argument(
+            "--tolerancia",
+            type=float,
+            default=0.2,
+            help="Aumento relativo tolerado en tiempos/memoria antes de marcar regresión.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            tamanos = [int(t) for t in options["tamanos"].split(",") if t.strip()]
+        except ValueError:
+            raise CommandError("--tamanos debe ser una lista de enteros separados por coma.")
+
+        resultado = {"meta": benchmark.metadatos(), "resultados": {}}
+
+        setup_test_environment()
+        try:
+            for tamano in tamanos:
+                nombre_original = connection.settings_dict["NAME"]
+                connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+                cache.clear()
+                try:
+                    resultado["resultados"][str(tamano)] = benchmark.ejecutar_benchmark(
+                        tamano,
+                        repeticiones=options["repeticiones"],
+                        usuarios=options["usuarios"],
+                        semilla=options["semilla"],
+                        log=self.stdout.write,
+                    )
+                finally:
+                    connection.creation.destroy_test_db(nombre_original, verbosity=0)
+        finally:
+            teardown_test_environment()
+
+        benchmark.guardar(resultado, options["salida"])
+        self._imprimir(resultado)
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['salida']}"))
+
+        if options["baseline"]:
+            regresiones = benchmark.comparar(
+                resultado, benchmark.cargar(options["baseline"]), options["tolerancia"]
+            )
+            if regresiones:
+                for regresion in regresiones:
+                    self.stdout.write(self.style.ERROR(f"  REGRESIÓN {regresion}"))
+                raise CommandError(f"{len(regresiones)} regresiones respecto de la línea base.")
+            self.stdout.write(self.style.SUCCESS("Sin regresiones respecto de la línea base."))
+
+    def _imprimir(self, resultado):
+        for tamano, escenarios in resultado["resultados"].items():
+            self.stdout.write(f"\nFlota de {tamano} vehículos")
+            self.stdout.write(f"  {'escenario':<28}{'p50 ms':>10}{'p95 ms':>10}{'consultas':>11}{'pico KB':>11}")
+            for nombre, m in escenarios.items():
+                self.stdout.write(
+                    f"  {nombre:<28}{m['p50_ms']:>10}{m['p95_ms']:>10}"
+                    f"{m['consultas']:>11}{m['memoria_pico_kb']:>11}"
+                )
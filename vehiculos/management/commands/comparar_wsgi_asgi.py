@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from vehiculos import benchmark
+from vehiculos.carga import MODOS, ejecutar_carga
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara throughput y latencia de las vistas de lectura servidas por "
+        "WSGI (vistas síncronas) y ASGI (vistas async def) sobre la misma "
+        "flota sintética, en bases de datos de pruebas desechables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tamano", type=int, default=5000, help="Vehículos de la flota sintética.")
+        parser.add_argument("--peticiones", type=int, default=200, help="Requests por vista.")
+        parser.add_argument("--concurrencia", type=int, default=20, help="Requests simultáneas.")
+        parser.add_argument("--usuarios", type=int, default=200)
+        parser.add_argument("--semilla", type=int, default=42)
+        parser.add_argument("--salida", default="carga_wsgi_asgi.json", help="Archivo JSON de resultados.")
+        # Uso interno: cada modo se mide en un proceso hijo con su VISTAS_ASYNC
+        parser.add_argument("--modo", choices=MODOS, help="Mide un solo modo e imprime JSON.")
+
+    def handle(self, *args, **options):
+        if options["modo"]:
+            self.stdout.write(json.dumps(self._medir(options)))
+            return
+
+        resultado = {"meta": benchmark.metadatos(), "resultados": {}}
+        for modo in MODOS:
+            self.stdout.write(f"Midiendo {modo.upper()}...")
+            resultado["resultados"][modo] = self._medir_en_subproceso(modo, options)
+
+        benchmark.guardar(resultado, options["salida"])
+        self._imprimir(resultado["resultados"])
+        self.stdout.write(self.style.SUCCESS(f"Resultados guardados en {options['salida']}"))
+
+    def _medir(self, options) -> dict:
+        setup_test_environment()
+        nombre_original = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cache.clear()
+        try:
+            return ejecutar_carga(
+                options["modo"],
+                tamano=options["tamano"],
+                peticiones=options["peticiones"],
+                concurrencia=options["concurrencia"],
+                usuarios=options["usuarios"],
+                semilla=options["semilla"],
+                log=lambda mensaje: self.stderr.write(mensaje),
+            )
+        finally:
+            connection.creation.destroy_test_db(nombre_original, verbosity=0)
+            teardown_test_environment()
+
+    def _medir_en_subproceso(self, modo: str, options) -> dict:
+        comando = [
+            sys.executable, sys.argv[0], "comparar_wsgi_asgi", "--modo", modo,
+            *(f"--{opcion}={options[opcion]}" for opcion in ("tamano", "peticiones", "concurrencia", "usuarios", "semilla")),
+        ]
+        entorno = {**os.environ, "VISTAS_ASYNC": "True" if modo == "asgi" else "False"}
+        proceso = subprocess.run(comando, env=entorno, stdout=subprocess.PIPE, text=True)
+        if proceso.returncode != 0:
+            raise CommandError(f"Falló la medición {modo.upper()} (código {proceso.returncode}).")
+        return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+    def _imprimir(self, resultados):
+        wsgi, asgi = resultados["wsgi"], resultados["asgi"]
+        self.stdout.write(
+            f"\n  {'vista':<28}{'WSGI req/s':>12}{'ASGI req/s':>12}{'Δ %':>8}"
+            f"{'WSGI p95':>10}{'ASGI p95':>10}{'errores':>9}"
+        )
+        for nombre, w in wsgi.items():
+            a = asgi.get(nombre)
+            if a is None:
+                continue
+            delta = (a["req_s"] - w["req_s"]) / w["req_s"] * 100 if w["req_s"] else 0.0
+            self.stdout.write(
+                f"  {nombre:<28}{w['req_s']:>12}{a['req_s']:>12}{delta:>+8.1f}"
+                f"{w['p95_ms']:>10}{a['p95_ms']:>10}{w['errores'] + a['errores']:>9}"
+            )
@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from vehiculos.importacion import importar_archivo
+
+
+class Command(BaseCommand):
+    help = "Importa vehículos de forma masiva desde un archivo CSV o XLSX."
+
+    def add_arguments(self, parser):
+        parser.add_argument("archivo", help="Ruta al archivo .csv o .xlsx")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Filas por lote (por defecto IMPORTACION_CHUNK_SIZE).",
+        )
+        parser.add_argument(
+            "--sin-actualizar",
+            action="store_true",
+            help="No actualiza patentes existentes; las reporta como error.",
+        )
+        parser.add_argument(
+            "--reporte",
+            help="Ruta donde escribir el reporte de errores en CSV.",
+        )
+
+    def handle(self, *args, **options):
+        ruta = options["archivo"]
+        try:
+            with open(ruta, "rb") as archivo:
+                reporte = importar_archivo(
+                    archivo,
+                    ruta,
+                    chunk_size=options["chunk_size"],
+                    actualizar=not options["sin_actualizar"],
+                )
+        except FileNotFoundError:
+            raise CommandError(f"No existe el archivo: {ruta}")
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Procesadas: {reporte.procesadas} | Creados: {reporte.creados} | "
+            f"Actualizados: {reporte.actualizados} | Errores: {reporte.con_errores}"
+        ))
+
+        if reporte.errores:
+            if options["reporte"]:
+                with open(options["reporte"], "w", newline="", encoding="utf-8") as destino:
+                    reporte.escribir_csv(destino)
+                self.stdout.write(f"Reporte de errores: {options['reporte']}")
+            else:
+                for error in reporte.errores[:20]:
+                    self.stdout.write(self.style.WARNING(
+                        f"  Fila {error.fila} ({error.patente or '-'}): {error.mensaje}"
+                    ))
+                if reporte.con_errores > 20:
+                    self.stdout.write(f"  ... y {reporte.con_errores - 20} errores más (use --reporte).")
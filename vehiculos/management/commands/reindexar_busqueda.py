@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from vehiculos.busqueda import indice_disponible, reconstruir_indice
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de vehículos (FTS5 en SQLite)."
+
+    def handle(self, *args, **options):
+        if not indice_disponible():
+            self.stdout.write(self.style.WARNING(
+                "El índice FTS5 no está disponible en esta base de datos; "
+                "la búsqueda usa el respaldo icontains."
+            ))
+            return
+
+        total = reconstruir_indice()
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruido: {total} vehículos."))
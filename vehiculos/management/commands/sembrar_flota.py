@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from vehiculos.models import Vehiculo
+from vehiculos.sintetico import PREFIJO_USUARIO, sembrar_flota
+
+
+class Command(BaseCommand):
+    help = "Crea una flota sintética (patentes chilenas, conductores) para benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cantidad", type=int, default=1000, help="Vehículos a crear.")
+        parser.add_argument("--usuarios", type=int, default=100, help="Conductores a repartir.")
+        parser.add_argument("--semilla", type=int, default=42, help="Semilla del generador.")
+        parser.add_argument(
+            "--limpiar",
+            action="store_true",
+            help="Elimina antes los vehículos asignados a conductores sintéticos.",
+        )
+
+    def handle(self, *args, **options):
+        if options["limpiar"]:
+            eliminados, _ = Vehiculo.objects.filter(
+                usuario__username__startswith=PREFIJO_USUARIO
+            ).delete()
+            self.stdout.write(f"Eliminados: {eliminados} registros previos.")
+
+        creados = sembrar_flota(
+            options["cantidad"],
+            usuarios=options["usuarios"],
+            semilla=options["semilla"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Flota sintética creada: {creados} vehículos."))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehiculos', '0003_alter_vehiculo_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['fecha_creacion', 'id'], name='vehiculo_creacion_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['usuario', 'patente'], name='vehiculo_usuario_patente_idx'),
+        ),
+    ]
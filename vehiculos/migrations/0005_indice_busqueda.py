@@ -0,0 +1,43 @@
+from django.db import migrations
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    # Solo SQLite: tabla virtual FTS5 (trigram). Otros motores usan el respaldo ORM.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    from vehiculos.busqueda import TABLA, crear_indice
+
+    if not crear_indice(schema_editor):
+        return
+
+    Vehiculo = apps.get_model("vehiculos", "Vehiculo")
+    filas = Vehiculo.objects.values_list(
+        "id", "patente", "marca", "modelo",
+        "usuario__first_name", "usuario__last_name", "usuario__username",
+    )
+    for pk, patente, marca, modelo, *usuario in filas.iterator():
+        schema_editor.execute(
+            f"INSERT INTO {TABLA}(rowid, patente, marca, modelo, usuario) VALUES (%s, %s, %s, %s, %s)",
+            [pk, patente, marca, modelo, " ".join(p for p in usuario if p)],
+        )
+
+
+def eliminar_indice_busqueda(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+
+    from vehiculos.busqueda import TABLA
+
+    schema_editor.execute(f"DROP TABLE IF EXISTS {TABLA}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehiculos', '0004_indices_paginacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_busqueda, eliminar_indice_busqueda),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:30
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def abrir_asignaciones_vigentes(apps, schema_editor):
+    # Punto de partida del historial: la asignación actual de cada vehículo,
+    # con la última modificación como mejor estimación de su inicio.
+    Vehiculo = apps.get_model("vehiculos", "Vehiculo")
+    AsignacionVehiculo = apps.get_model("vehiculos", "AsignacionVehiculo")
+    vigentes = Vehiculo.objects.filter(usuario__isnull=False).values_list(
+        "id", "usuario_id", "fecha_actualizacion"
+    )
+    AsignacionVehiculo.objects.bulk_create(
+        (
+            AsignacionVehiculo(vehiculo_id=pk, usuario_id=usuario_id, inicio=desde)
+            for pk, usuario_id, desde in vigentes.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('vehiculos', '0005_indice_busqueda'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AsignacionVehiculo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('inicio', models.DateTimeField(verbose_name='Inicio')),
+                ('fin', models.DateTimeField(blank=True, help_text='Vacío mientras la asignación está vigente.', null=True, verbose_name='Fin')),
+                ('usuario', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='asignaciones_vehiculos', to=settings.AUTH_USER_MODEL, verbose_name='Usuario responsable')),
+                ('vehiculo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asignaciones', to='vehiculos.vehiculo', verbose_name='Vehículo')),
+            ],
+            options={
+                'verbose_name': 'Asignación de vehículo',
+                'verbose_name_plural': 'Historial de asignaciones',
+                'ordering': ['vehiculo', '-inicio'],
+                'indexes': [models.Index(fields=['vehiculo', 'inicio', 'fin'], name='asignacion_vehiculo_idx'), models.Index(fields=['inicio', 'fin'], name='asignacion_rango_idx'), models.Index(fields=['usuario', 'inicio'], name='asignacion_usuario_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='asignacionvehiculo',
+            constraint=models.UniqueConstraint(condition=models.Q(('fin__isnull', True)), fields=('vehiculo',), name='asignacion_unica_vigente'),
+        ),
+        migrations.RunPython(abrir_asignaciones_vigentes, migrations.RunPython.noop),
+    ]
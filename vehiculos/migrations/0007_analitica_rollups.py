@@ -0,0 +1,68 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehiculos', '0006_historial_asignaciones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DistribucionDiaria',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('dimension', models.CharField(choices=[('marca', 'Marca'), ('anio', 'Año'), ('color', 'Color')], max_length=10, verbose_name='Dimensión')),
+                ('valor', models.CharField(blank=True, max_length=50, verbose_name='Valor')),
+                ('total', models.PositiveIntegerField(verbose_name='Vehículos')),
+            ],
+            options={
+                'verbose_name': 'Distribución diaria de flota',
+                'verbose_name_plural': 'Distribuciones diarias de flota',
+                'ordering': ['fecha', 'dimension', '-total'],
+            },
+        ),
+        migrations.CreateModel(
+            name='MarcaRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nombre', models.CharField(max_length=50, unique=True)),
+                ('hasta', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Marca de rollup',
+                'verbose_name_plural': 'Marcas de rollup',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenDiario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(unique=True, verbose_name='Fecha')),
+                ('registrados', models.PositiveIntegerField(default=0, verbose_name='Vehículos registrados')),
+                ('activos', models.PositiveIntegerField(blank=True, null=True, verbose_name='Activos al cierre')),
+                ('inactivos', models.PositiveIntegerField(blank=True, null=True, verbose_name='Inactivos al cierre')),
+                ('actualizado', models.DateTimeField(auto_now=True, verbose_name='Última actualización')),
+            ],
+            options={
+                'verbose_name': 'Resumen diario de flota',
+                'verbose_name_plural': 'Resúmenes diarios de flota',
+                'ordering': ['fecha'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='vehiculo',
+            index=models.Index(fields=['fecha_actualizacion', 'id'], name='vehiculo_actualizacion_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='distribuciondiaria',
+            index=models.Index(fields=['dimension', 'fecha'], name='distribucion_dimension_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='distribuciondiaria',
+            constraint=models.UniqueConstraint(fields=('fecha', 'dimension', 'valor'), name='distribucion_unica_dia'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 10:41
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehiculos', '0007_analitica_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VehiculoEliminado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('vehiculo_id', models.BigIntegerField(verbose_name='ID del vehículo')),
+                ('patente', models.CharField(max_length=10, verbose_name='Patente')),
+                ('usuario_id', models.BigIntegerField(blank=True, null=True, verbose_name='ID del responsable')),
+                ('fecha', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Fecha de eliminación')),
+            ],
+            options={
+                'verbose_name': 'Vehículo eliminado',
+                'verbose_name_plural': 'Vehículos eliminados',
+                'ordering': ['fecha', 'id'],
+                'indexes': [models.Index(fields=['fecha', 'id'], name='eliminado_fecha_id_idx'), models.Index(fields=['usuario_id', 'fecha'], name='eliminado_usuario_fecha_idx')],
+            },
+        ),
+    ]
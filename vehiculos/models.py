@@ -1,8 +1,13 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.utils import timezone
 import datetime
 
+# Marca para instancias cuyo responsable original no se cargó (campo diferido)
+USUARIO_DESCONOCIDO = object()
+
+
 class Vehiculo(models.Model):
     """
     Modelo que representa un vehículo corporativo.
@@ -82,12 +87,179 @@ class Vehiculo(models.Model):
         indexes = [
             models.Index(fields=["patente"]),
             models.Index(fields=["activo"]),
+            # Paginación por cursor: staff (fecha_creacion, id) / usuario (patente, id)
+            models.Index(fields=["fecha_creacion", "id"], name="vehiculo_creacion_id_idx"),
+            models.Index(fields=["usuario", "patente"], name="vehiculo_usuario_patente_idx"),
+            # Cambios desde una marca de agua (rollups de analítica)
+            models.Index(fields=["fecha_actualizacion", "id"], name="vehiculo_actualizacion_id_idx"),
         ]
 
     def __str__(self) -> str:
         return f"{self.patente} | {self.marca} {self.modelo} ({self.anio})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instancia = super().from_db(db, field_names, values)
+        # Se recuerda el responsable cargado para detectar reasignaciones al guardar
+        instancia._usuario_id_original = instancia.__dict__.get("usuario_id", USUARIO_DESCONOCIDO)
+        return instancia
+
     def save(self, *args, **kwargs):
         # Normalización: Siempre guardar la patente en mayúsculas
         self.patente = self.patente.upper().replace(" ", "").replace("-", "")
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+
+
+class AsignacionVehiculo(models.Model):
+    """
+    Historial de responsables de cada vehículo.
+
+    Cada registro es un intervalo [inicio, fin); `fin` NULL indica la
+    asignación vigente. Una reasignación cierra el intervalo vigente
+    (actualiza su `fin`) y abre uno nuevo; nada más modifica ni borra
+    registros. Permite responder "¿quién tenía el vehículo X
+    en la fecha Y?" sin depender de respaldos.
+    """
+
+    vehiculo = models.ForeignKey(
+        Vehiculo,
+        on_delete=models.CASCADE,
+        related_name="asignaciones",
+        verbose_name="Vehículo",
+    )
+
+    usuario = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="asignaciones_vehiculos",
+        verbose_name="Usuario responsable",
+    )
+
+    inicio = models.DateTimeField(verbose_name="Inicio")
+
+    fin = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name="Fin",
+        help_text="Vacío mientras la asignación está vigente.",
+    )
+
+    class Meta:
+        verbose_name = "Asignación de vehículo"
+        verbose_name_plural = "Historial de asignaciones"
+        ordering = ["vehiculo", "-inicio"]
+        indexes = [
+            # Punto en el tiempo / rango por vehículo
+            models.Index(fields=["vehiculo", "inicio", "fin"], name="asignacion_vehiculo_idx"),
+            # Consultas "as-of" sobre toda la flota
+            models.Index(fields=["inicio", "fin"], name="asignacion_rango_idx"),
+            # Historial de un usuario
+            models.Index(fields=["usuario", "inicio"], name="asignacion_usuario_idx"),
+        ]
+        constraints = [
+            # Un vehículo tiene a lo más una asignación abierta
+            models.UniqueConstraint(
+                fields=["vehiculo"],
+                condition=models.Q(fin__isnull=True),
+                name="asignacion_unica_vigente",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        hasta = self.fin.strftime("%d/%m/%Y %H:%M") if self.fin else "vigente"
+        return f"{self.vehiculo_id} → {self.usuario_id} ({self.inicio:%d/%m/%Y %H:%M} - {hasta})"
+
+
+class VehiculoEliminado(models.Model):
+    """
+    Lápida de un vehículo eliminado, para que los clientes de sincronización
+    incremental (app de terreno) puedan borrarlo de su copia local.
+    """
+
+    vehiculo_id = models.BigIntegerField(verbose_name="ID del vehículo")
+    patente = models.CharField(max_length=10, verbose_name="Patente")
+    # Responsable al momento de la baja: acota qué usuarios deben enterarse
+    usuario_id = models.BigIntegerField(null=True, blank=True, verbose_name="ID del responsable")
+    fecha = models.DateTimeField(default=timezone.now, verbose_name="Fecha de eliminación")
+
+    class Meta:
+        verbose_name = "Vehículo eliminado"
+        verbose_name_plural = "Vehículos eliminados"
+        ordering = ["fecha", "id"]
+        indexes = [
+            models.Index(fields=["fecha", "id"], name="eliminado_fecha_id_idx"),
+            models.Index(fields=["usuario_id", "fecha"], name="eliminado_usuario_fecha_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.patente} (eliminado {self.fecha:%d/%m/%Y %H:%M})"
+
+
+# --- Analítica de Flota (rollups diarios) ---
+
+class ResumenDiario(models.Model):
+    """
+    Agregados precalculados por día, mantenidos por `actualizar_rollups`.
+
+    `registrados` se recalcula para los días afectados por cambios; la foto
+    del estado (activos/inactivos) se toma el día en que corre el proceso,
+    por lo que queda vacía en días anteriores a su primera ejecución.
+    """
+
+    fecha = models.DateField(unique=True, verbose_name="Fecha")
+    registrados = models.PositiveIntegerField(default=0, verbose_name="Vehículos registrados")
+    activos = models.PositiveIntegerField(null=True, blank=True, verbose_name="Activos al cierre")
+    inactivos = models.PositiveIntegerField(null=True, blank=True, verbose_name="Inactivos al cierre")
+    actualizado = models.DateTimeField(auto_now=True, verbose_name="Última actualización")
+
+    class Meta:
+        verbose_name = "Resumen diario de flota"
+        verbose_name_plural = "Resúmenes diarios de flota"
+        ordering = ["fecha"]
+
+    def __str__(self) -> str:
+        return f"{self.fecha:%d/%m/%Y}: {self.registrados} registrados"
+
+
+class DistribucionDiaria(models.Model):
+    """Foto diaria de la flota agrupada por marca, año o color."""
+
+    DIMENSIONES = [
+        ("marca", "Marca"),
+        ("anio", "Año"),
+        ("color", "Color"),
+    ]
+
+    fecha = models.DateField(verbose_name="Fecha")
+    dimension = models.CharField(max_length=10, choices=DIMENSIONES, verbose_name="Dimensión")
+    valor = models.CharField(max_length=50, blank=True, verbose_name="Valor")
+    total = models.PositiveIntegerField(verbose_name="Vehículos")
+
+    class Meta:
+        verbose_name = "Distribución diaria de flota"
+        verbose_name_plural = "Distribuciones diarias de flota"
+        ordering = ["fecha", "dimension", "-total"]
+        constraints = [
+            models.UniqueConstraint(fields=["fecha", "dimension", "valor"], name="distribucion_unica_dia"),
+        ]
+        indexes = [
+            models.Index(fields=["dimension", "fecha"], name="distribucion_dimension_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.fecha:%d/%m/%Y} {self.dimension}={self.valor}: {self.total}"
+
+
+class MarcaRollup(models.Model):
+    """Marca de agua: hasta qué fecha_actualizacion se procesaron los cambios."""
+
+    nombre = models.CharField(max_length=50, unique=True)
+    hasta = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Marca de rollup"
+        verbose_name_plural = "Marcas de rollup"
+
+    def __str__(self) -> str:
+        return f"{self.nombre}: {self.hasta}"
@@ -0,0 +1,164 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from core.cache import aclave_versionada, clave_versionada, incrementar_generacion
+from core.routers import leer_de_primaria
+
+from .models import Vehiculo
+
+
+# --- Métricas de Flota (Dashboard) ---
+
+def _timeout_metricas() -> int:
+    return getattr(settings, "FLOTA_STATS_CACHE_TIMEOUT", 300)
+
+
+def _alcance_metricas(user) -> str:
+    return "staff" if user.is_staff else f"usuario:{user.pk}"
+
+
+def _clave_metricas(user) -> str:
+    # El top de responsables muestra nombres de usuario: también depende de "usuarios"
+    return clave_versionada("vehiculos:metricas", ("vehiculos", "usuarios"), _alcance_metricas(user))
+
+
+def invalidar_metricas() -> None:
+    """
+    Invalida las métricas cacheadas de todos los alcances (staff y usuarios)
+    y, con ellas, los listados de vehículos cacheados: ambos dependen de la
+    generación "vehiculos".
+    """
+    incrementar_generacion("vehiculos")
+
+
+# Conteos condicionales compartidos por la versión síncrona y la asíncrona
+CONTEOS_METRICAS = {
+    "total": Count("id"),
+    "activos": Count("id", filter=Q(activo=True)),
+    "inactivos": Count("id", filter=Q(activo=False)),
+}
+
+
+def _grupos_por_usuario():
+    return Vehiculo.objects.order_by().values("usuario__username").annotate(**CONTEOS_METRICAS)
+
+
+def _resumir_grupos(grupos: list) -> dict:
+    top_usuarios = sorted(grupos, key=lambda g: g["total"], reverse=True)[:5]
+
+    return {
+        "total": sum(g["total"] for g in grupos),
+        "activos": sum(g["activos"] for g in grupos),
+        "inactivos": sum(g["inactivos"] for g in grupos),
+        "stats_usuarios": [
+            {"usuario__username": g["usuario__username"], "total": g["total"]}
+            for g in top_usuarios
+        ],
+    }
+
+
+def calcular_metricas(user) -> dict:
+    """
+    Calcula las métricas del dashboard en una única consulta.
+
+    - Admin: un GROUP BY por usuario con conteos condicionales; los totales
+      de la flota se obtienen sumando los grupos y el top-5 se ordena en memoria.
+    - Usuario: un aggregate condicional sobre sus vehículos asignados.
+    """
+    if not user.is_staff:
+        metricas = Vehiculo.objects.filter(usuario=user).aggregate(**CONTEOS_METRICAS)
+        metricas["stats_usuarios"] = []
+        return metricas
+
+    return _resumir_grupos(list(_grupos_por_usuario()))
+
+
+def obtener_metricas(user) -> dict:
+    """
+    Devuelve las métricas del dashboard desde caché, calculándolas solo
+    cuando no existen para el alcance del usuario (staff o propio). Se
+    calculan en la primaria: cacheadas desde una réplica atrasada durarían
+    todo el timeout pese a la invalidación.
+    """
+    clave = _clave_metricas(user)
+    metricas = cache.get(clave)
+    if metricas is None:
+        with leer_de_primaria():
+            metricas = calcular_metricas(user)
+        cache.set(clave, metricas, _timeout_metricas())
+    return metricas
+
+
+# --- Últimos Vehículos Registrados (Dashboard) ---
+
+LIMITE_ULTIMOS = 5
+
+
+def _ultimos(user):
+    qs = Vehiculo.objects.select_related("usuario").order_by("-fecha_creacion")
+    if not user.is_staff:
+        qs = qs.filter(usuario=user)
+    return qs[:LIMITE_ULTIMOS]
+
+
+def obtener_ultimos(user) -> list:
+    """Últimos vehículos registrados visibles para el usuario, cacheados igual que las métricas."""
+    clave = clave_versionada("vehiculos:ultimos", ("vehiculos", "usuarios"), _alcance_metricas(user))
+    ultimos = cache.get(clave)
+    if ultimos is None:
+        with leer_de_primaria():
+            ultimos = list(_ultimos(user))
+        cache.set(clave, ultimos, _timeout_metricas())
+    return ultimos
+
+
+# --- Versiones asíncronas (vistas ASGI) ---
+
+async def acalcular_metricas(user) -> dict:
+    if not user.is_staff:
+        metricas = await Vehiculo.objects.filter(usuario=user).aaggregate(**CONTEOS_METRICAS)
+        metricas["stats_usuarios"] = []
+        return metricas
+
+    return _resumir_grupos([grupo async for grupo in _grupos_por_usuario()])
+
+
+async def aobtener_metricas(user) -> dict:
+    clave = await aclave_versionada("vehiculos:metricas", ("vehiculos", "usuarios"), _alcance_metricas(user))
+    metricas = await cache.aget(clave)
+    if metricas is None:
+        with leer_de_primaria():
+            metricas = await acalcular_metricas(user)
+        await cache.aset(clave, metricas, _timeout_metricas())
+    return metricas
+
+
+async def aobtener_ultimos(user) -> list:
+    clave = await aclave_versionada("vehiculos:ultimos", ("vehiculos", "usuarios"), _alcance_metricas(user))
+    ultimos = await cache.aget(clave)
+    if ultimos is None:
+        with leer_de_primaria():
+            ultimos = [vehiculo async for vehiculo in _ultimos(user)]
+        await cache.aset(clave, ultimos, _timeout_metricas())
+    return ultimos
+
+
+# --- Filtros de Listado / Exportación ---
+
+def filtrar_vehiculos(qs, params):
+    """
+    Aplica los filtros dinámicos recibidos por GET (?activo=1, ?usuario=juan).
+    Compartido por la exportación y el listado para que ambos respondan igual.
+    """
+    activo = params.get("activo")
+    usuario = params.get("usuario")
+
+    # "" = "Todos los estados" en el formulario de filtros
+    if activo:
+        qs = qs.filter(activo=activo.lower() in ["1", "true", "yes"])
+
+    if usuario:
+        qs = qs.filter(usuario__username__icontains=usuario)
+
+    return qs
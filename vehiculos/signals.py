@@ -0,0 +1,95 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .busqueda import desindexar_vehiculos, indexar_vehiculos
+from .eventos import publicar_vehiculo
+from .historial import registrar_reasignaciones
+from .models import USUARIO_DESCONOCIDO, AsignacionVehiculo, Vehiculo, VehiculoEliminado
+from .services import invalidar_metricas
+
+
+@receiver(post_save, sender=Vehiculo)
+@receiver(post_delete, sender=Vehiculo)
+def invalidar_metricas_vehiculo(sender, instance, **kwargs):
+    """Cualquier alta, edición o baja de un vehículo deja obsoletas las métricas."""
+    invalidar_metricas()
+
+
+# --- Eventos en tiempo real ---
+#
+# Debe registrarse antes que registrar_asignacion, que actualiza
+# _usuario_id_original: aquí todavía indica el responsable anterior.
+
+@receiver(post_save, sender=Vehiculo)
+def publicar_cambio_vehiculo(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = getattr(instance, "_usuario_id_original", None)
+    usuarios = [instance.usuario_id, None if anterior is USUARIO_DESCONOCIDO else anterior]
+    publicar_vehiculo("creado" if created else "actualizado", instance, usuarios)
+
+
+@receiver(post_delete, sender=Vehiculo)
+def publicar_baja_vehiculo(sender, instance, **kwargs):
+    publicar_vehiculo("eliminado", instance, [instance.usuario_id])
+
+
+# --- Índice de búsqueda ---
+
+@receiver(post_save, sender=Vehiculo)
+def indexar_vehiculo(sender, instance, **kwargs):
+    indexar_vehiculos([instance.pk])
+
+
+@receiver(post_delete, sender=Vehiculo)
+def desindexar_vehiculo(sender, instance, **kwargs):
+    desindexar_vehiculos([instance.pk])
+
+
+@receiver(post_save, sender=User)
+def reindexar_flota_usuario(sender, instance, created, update_fields=None, **kwargs):
+    """El nombre del responsable también es buscable: se reindexa su flota si cambia."""
+    if created:
+        return
+    if update_fields and not {"username", "first_name", "last_name"} & set(update_fields):
+        return  # p. ej. actualización de last_login al iniciar sesión
+    indexar_vehiculos(list(instance.flota.values_list("id", flat=True)))
+
+
+# --- Historial de asignaciones ---
+
+@receiver(post_save, sender=Vehiculo)
+def registrar_asignacion(sender, instance, created, raw=False, **kwargs):
+    """Abre/cierra el intervalo de asignación cuando cambia el responsable."""
+    if raw:
+        return
+
+    original = getattr(instance, "_usuario_id_original", USUARIO_DESCONOCIDO)
+    if created:
+        cambio = instance.usuario_id is not None
+    elif original is USUARIO_DESCONOCIDO:
+        vigente = (
+            AsignacionVehiculo.objects.filter(vehiculo=instance, fin__isnull=True)
+            .values_list("usuario_id", flat=True)
+            .first()
+        )
+        cambio = vigente != instance.usuario_id
+    else:
+        cambio = original != instance.usuario_id
+
+    if cambio:
+        registrar_reasignaciones({instance.pk: instance.usuario_id})
+    instance._usuario_id_original = instance.usuario_id
+
+
+# --- Sincronización incremental ---
+
+@receiver(post_delete, sender=Vehiculo)
+def registrar_lapida(sender, instance, **kwargs):
+    """Deja constancia de la baja para los clientes que sincronizan por deltas."""
+    VehiculoEliminado.objects.create(
+        vehiculo_id=instance.pk,
+        patente=instance.patente,
+        usuario_id=instance.usuario_id,
+    )
@@ -0,0 +1,198 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import AsignacionVehiculo, Vehiculo, VehiculoEliminado
+
+
+# --- Sincronización Incremental (clientes móviles / offline) ---
+#
+# El cliente guarda un token opaco y lo reenvía en ?desde=. El token lleva:
+#   - v: (fecha_actualizacion, id) del último vehículo entregado (keyset)
+#   - e: fecha de la última baja entregada (lápidas y, para usuarios no
+#        staff, asignaciones que dejaron de ser suyas)
+# Solo se entregan cambios anteriores a `ahora - SYNC_MARGEN_SEGUNDOS`, para
+# no saltarse filas de transacciones que aún no confirman.
+# Sin cambios, el token devuelto es el mismo que se recibió: la respuesta es
+# idéntica y el ETag permite responder 304.
+
+CAMPOS_SINCRONIZACION = [
+    "id", "patente", "marca", "modelo", "anio", "color", "activo", "usuario_id", "fecha_actualizacion",
+]
+
+
+class TokenInvalido(ValueError):
+    """El token de sincronización no pudo decodificarse."""
+
+
+@dataclass
+class Marca:
+    v_fecha: object = None
+    v_id: int = 0
+    e_fecha: object = None
+
+    @property
+    def vacia(self) -> bool:
+        return self.v_fecha is None
+
+
+@dataclass
+class Delta:
+    cambios: list = field(default_factory=list)
+    eliminados: list = field(default_factory=list)
+    token: str = ""
+    hay_mas: bool = False
+    completo: bool = False
+
+
+def codificar_token(marca: Marca) -> str:
+    crudo = json.dumps(
+        [marca.v_fecha.isoformat() if marca.v_fecha else None, marca.v_id,
+         marca.e_fecha.isoformat() if marca.e_fecha else None],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(crudo.encode()).decode().rstrip("=")
+
+
+def decodificar_token(token: str | None) -> Marca:
+    if not token:
+        return Marca()
+    try:
+        relleno = "=" * (-len(token) % 4)
+        v_fecha, v_id, e_fecha = json.loads(base64.urlsafe_b64decode(token + relleno))
+        marca = Marca(
+            v_fecha=parse_datetime(v_fecha) if v_fecha else None,
+            v_id=int(v_id),
+            e_fecha=parse_datetime(e_fecha) if e_fecha else None,
+        )
+    except (ValueError, TypeError) as exc:
+        raise TokenInvalido("Token de sincronización inválido.") from exc
+    if (v_fecha and marca.v_fecha is None) or (e_fecha and marca.e_fecha is None):
+        raise TokenInvalido("Fecha inválida en el token de sincronización.")
+    return marca
+
+
+def corte_actual():
+    return timezone.now() - timedelta(seconds=getattr(settings, "SYNC_MARGEN_SEGUNDOS", 2))
+
+
+# --- Consultas por alcance ---
+
+def _vehiculos(user):
+    qs = Vehiculo.objects.order_by()
+    return qs if user.is_staff else qs.filter(usuario=user)
+
+
+def _vehiculos_posteriores(user, marca: Marca, corte):
+    qs = _vehiculos(user).filter(fecha_actualizacion__lte=corte)
+    if not marca.vacia:
+        qs = qs.filter(
+            Q(fecha_actualizacion__gt=marca.v_fecha)
+            | Q(fecha_actualizacion=marca.v_fecha, id__gt=marca.v_id)
+        )
+    return qs
+
+
+def _lapidas_posteriores(user, marca: Marca, corte):
+    qs = VehiculoEliminado.objects.filter(fecha__lte=corte).order_by()
+    if marca.e_fecha is not None:
+        qs = qs.filter(fecha__gt=marca.e_fecha)
+    if not user.is_staff:
+        qs = qs.filter(usuario_id=user.pk)
+    return qs
+
+
+def _asignaciones_terminadas(user, marca: Marca, corte):
+    """Vehículos que dejaron de estar asignados al usuario (para él son bajas)."""
+    qs = AsignacionVehiculo.objects.filter(usuario=user, fin__isnull=False, fin__lte=corte).order_by()
+    if marca.e_fecha is not None:
+        qs = qs.filter(fin__gt=marca.e_fecha)
+    return qs
+
+
+def etag_sincronizacion(user, token: str | None, corte) -> str | None:
+    """
+    ETag de la respuesta. Sin cambios basta una consulta indexada (EXISTS
+    sobre la unión de vehículos y lápidas posteriores a la marca). La
+    sincronización completa (sin token) no lleva ETag.
+    """
+    marca = decodificar_token(token)
+    if marca.vacia:
+        return None
+
+    alcance = "staff" if user.is_staff else f"usuario:{user.pk}"
+    partes = [alcance, token]
+    consultas = [
+        _vehiculos_posteriores(user, marca, corte).values("id"),
+        _lapidas_posteriores(user, marca, corte).values("id"),
+    ]
+    if not user.is_staff:
+        consultas.append(_asignaciones_terminadas(user, marca, corte).values("id"))
+    if consultas[0].union(*consultas[1:], all=True).exists():
+        partes += [
+            str(_vehiculos_posteriores(user, marca, corte).aggregate(m=Max("fecha_actualizacion"))["m"]),
+            str(_lapidas_posteriores(user, marca, corte).aggregate(m=Max("fecha"))["m"]),
+        ]
+        if not user.is_staff:
+            partes.append(str(_asignaciones_terminadas(user, marca, corte).aggregate(m=Max("fin"))["m"]))
+    return hashlib.md5("|".join(partes).encode()).hexdigest()
+
+
+def calcular_delta(user, token: str | None, corte, tamano: int) -> Delta:
+    """
+    Cambios del alcance del usuario posteriores al token, en páginas de
+    `tamano` vehículos (hay_mas indica que se debe volver a pedir con el
+    nuevo token de inmediato).
+    """
+    marca = decodificar_token(token)
+    completo = marca.vacia
+
+    filas = list(
+        _vehiculos_posteriores(user, marca, corte)
+        .order_by("fecha_actualizacion", "id")
+        .values_list(*CAMPOS_SINCRONIZACION)[: tamano + 1]
+    )
+    hay_mas = len(filas) > tamano
+    filas = filas[:tamano]
+
+    nueva = Marca(v_fecha=marca.v_fecha, v_id=marca.v_id, e_fecha=marca.e_fecha)
+    if filas:
+        nueva.v_fecha, nueva.v_id = filas[-1][-1], filas[-1][0]
+
+    eliminados = []
+    if completo:
+        # La copia completa ya excluye los eliminados: las lápidas arrancan aquí
+        nueva.e_fecha = corte
+        if nueva.v_fecha is None:
+            nueva.v_fecha, nueva.v_id = corte, 0
+    else:
+        lapidas = list(_lapidas_posteriores(user, marca, corte).values_list("vehiculo_id", "fecha"))
+        if not user.is_staff:
+            vigentes = set(_vehiculos(user).values_list("id", flat=True))
+            lapidas += [
+                (vehiculo_id, fin)
+                for vehiculo_id, fin in _asignaciones_terminadas(user, marca, corte).values_list("vehiculo_id", "fin")
+                if vehiculo_id not in vigentes
+            ]
+        if lapidas:
+            eliminados = sorted({vehiculo_id for vehiculo_id, _ in lapidas})
+            nueva.e_fecha = max(fecha for _, fecha in lapidas)
+
+    cambios = [
+        [*fila[:-1], fila[-1].isoformat()]
+        for fila in filas
+    ]
+    return Delta(
+        cambios=cambios,
+        eliminados=eliminados,
+        token=codificar_token(nueva),
+        hay_mas=hay_mas,
+        completo=completo,
+    )
@@ -0,0 +1,150 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .busqueda import reconstruir_indice
+from .models import AsignacionVehiculo, Vehiculo
+from .services import invalidar_metricas
+
+
+# --- Generador de Flota Sintética (benchmarks / pruebas de carga) ---
+
+# Formato nuevo (desde 2007): 4 consonantes + 2 dígitos, sin vocales ni M, N, Ñ, Q
+LETRAS_PATENTE_NUEVA = "BCDFGHJKLPRSTVWXYZ"
+# Formato antiguo: 2 letras + 4 dígitos
+LETRAS_PATENTE_ANTIGUA = "ABCDEFGHIJKLPRSTUVWXYZ"
+
+MODELOS = {
+    "Toyota": ["Hilux", "Corolla", "RAV4", "Yaris", "Land Cruiser"],
+    "Nissan": ["Navara", "NP300", "Versa", "X-Trail"],
+    "Chevrolet": ["Colorado", "Sail", "Tracker", "N400"],
+    "Mitsubishi": ["L200", "Montero", "Outlander"],
+    "Ford": ["Ranger", "Transit", "Territory"],
+    "Hyundai": ["Accent", "Tucson", "H-1", "Porter"],
+    "Kia": ["Frontier", "Rio", "Sportage"],
+    "Peugeot": ["Partner", "208", "Expert"],
+    "Suzuki": ["Swift", "Vitara", "Baleno"],
+    "Maxus": ["T60", "Deliver 9"],
+}
+
+COLORES = ["Blanco", "Gris", "Negro", "Plata", "Rojo", "Azul"]
+
+NOMBRES = ["Juan", "María", "José", "Francisca", "Pedro", "Camila", "Diego",
+           "Valentina", "Matías", "Catalina", "Cristóbal", "Javiera", "Felipe", "Constanza"]
+APELLIDOS = ["González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras",
+             "Silva", "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes"]
+
+PREFIJO_USUARIO = "conductor"
+
+
+def generar_patente(rng: random.Random) -> str:
+    if rng.random() < 0.7:
+        letras = "".join(rng.choices(LETRAS_PATENTE_NUEVA, k=4))
+        return f"{letras}{rng.randint(10, 99)}"
+    letras = "".join(rng.choices(LETRAS_PATENTE_ANTIGUA, k=2))
+    return f"{letras}{rng.randint(1000, 9999)}"
+
+
+def sembrar_usuarios(cantidad: int, rng: random.Random) -> list:
+    """Crea (o reutiliza) usuarios conductorNNNN. Devuelve sus ids."""
+    existentes = set(
+        User.objects.filter(username__startswith=PREFIJO_USUARIO).values_list("username", flat=True)
+    )
+    # Sin contraseña utilizable: hashear miles de claves haría lenta la siembra
+    sin_clave = make_password(None)
+    nuevos = []
+    for i in range(cantidad):
+        username = f"{PREFIJO_USUARIO}{i:05d}"
+        if username in existentes:
+            continue
+        nuevos.append(User(
+            username=username,
+            first_name=rng.choice(NOMBRES),
+            last_name=rng.choice(APELLIDOS),
+            email=f"{username}@empresa.cl",
+            password=sin_clave,
+        ))
+    User.objects.bulk_create(nuevos, batch_size=1000)
+    return list(
+        User.objects.filter(username__startswith=PREFIJO_USUARIO)
+        .order_by("id")
+        .values_list("id", flat=True)[:cantidad]
+    )
+
+
+def sembrar_flota(cantidad: int, usuarios: int = 100, semilla: int = 42,
+                  dias_historia: int = 3 * 365, batch_size: int = 1000) -> int:
+    """
+    Crea `cantidad` vehículos con patentes chilenas realistas, repartidos
+    entre `usuarios` conductores (≈15 % queda en reserva) y con fechas de
+    registro distribuidas en los últimos `dias_historia` días.
+
+    Usa bulk_create, por lo que al final reconstruye el índice de búsqueda,
+    abre el historial de asignaciones e invalida las métricas una sola vez.
+    """
+    rng = random.Random(semilla)
+    usuario_ids = sembrar_usuarios(usuarios, rng)
+
+    ocupadas = set(Vehiculo.objects.values_list("patente", flat=True))
+    ahora = timezone.now()
+    anio_actual = ahora.year
+    creados = 0
+
+    while creados < cantidad:
+        lote = []
+        for _ in range(min(batch_size, cantidad - creados)):
+            patente = generar_patente(rng)
+            while patente in ocupadas:
+                patente = generar_patente(rng)
+            ocupadas.add(patente)
+
+            marca = rng.choice(list(MODELOS))
+            lote.append(Vehiculo(
+                patente=patente,
+                marca=marca,
+                modelo=rng.choice(MODELOS[marca]),
+                anio=rng.randint(anio_actual - 12, anio_actual),
+                color=rng.choice(COLORES),
+                activo=rng.random() < 0.9,
+                usuario_id=rng.choice(usuario_ids) if usuario_ids and rng.random() < 0.85 else None,
+            ))
+
+        with transaction.atomic():
+            Vehiculo.objects.bulk_create(lote, batch_size=batch_size)
+            if any(v.pk is None for v in lote):
+                # Motores sin RETURNING en bulk_create: se recuperan los ids por patente
+                ids = dict(
+                    Vehiculo.objects.filter(patente__in=[v.patente for v in lote])
+                    .values_list("patente", "id")
+                )
+                for v in lote:
+                    v.pk = ids[v.patente]
+
+            # auto_now_add ignora valores explícitos: las fechas se reparten después
+            for v in lote:
+                v.fecha_creacion = ahora - timedelta(seconds=rng.randint(0, dias_historia * 86400))
+                v.fecha_actualizacion = v.fecha_creacion + timedelta(
+                    seconds=rng.randint(0, int((ahora - v.fecha_creacion).total_seconds()))
+                )
+            Vehiculo.objects.bulk_update(
+                lote, ["fecha_creacion", "fecha_actualizacion"], batch_size=batch_size
+            )
+
+            # Vehículos nuevos: su asignación vigente parte en la fecha de registro
+            AsignacionVehiculo.objects.bulk_create(
+                [
+                    AsignacionVehiculo(vehiculo_id=v.pk, usuario_id=v.usuario_id, inicio=v.fecha_creacion)
+                    for v in lote if v.usuario_id
+                ],
+                batch_size=batch_size,
+            )
+
+        creados += len(lote)
+
+    reconstruir_indice()
+    invalidar_metricas()
+    return creados
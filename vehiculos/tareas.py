@@ -0,0 +1,77 @@
+import tempfile
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+
+from tareas.registro import tarea
+from tareas.servicios import guardar_resultado
+
+from .exportacion import (
+    ENCABEZADOS,
+    FORMATOS_TEXTO,
+    con_avance,
+    escribir_texto,
+    escribir_xlsx,
+    filas_exportacion,
+    vehiculos_a_exportar,
+    _chunk_size,
+)
+from .historial import asignaciones_en_rango
+
+
+# --- Tareas en Segundo Plano de Vehiculos ---
+
+def _escribir(filas, formato: str, nombre: str, encabezados, titulo: str) -> str:
+    with tempfile.TemporaryFile() as archivo:
+        if formato in FORMATOS_TEXTO:
+            escribir_texto(filas, formato, archivo, encabezados)
+        else:
+            escribir_xlsx(filas, archivo, encabezados, titulo)
+        return guardar_resultado(f"{nombre}.{formato}", archivo)
+
+
+@tarea("vehiculos.exportar")
+def exportar_vehiculos(parametros: dict, progreso) -> str:
+    """Misma exportación que la vista (?directo=1), escrita a MEDIA_ROOT."""
+    qs = vehiculos_a_exportar(parametros.get("filtros", {}), parametros.get("usuario_id"))
+    filas = con_avance(filas_exportacion(qs), qs.count(), progreso)
+    return _escribir(filas, parametros["formato"], "vehiculos_filtrados", ENCABEZADOS, "Vehículos")
+
+
+ENCABEZADOS_ASIGNACIONES = ["Patente", "Marca", "Modelo", "Responsable", "Usuario", "Inicio", "Fin", "Días"]
+
+
+@tarea("vehiculos.reporte_asignaciones")
+def reporte_asignaciones(parametros: dict, progreso) -> str:
+    """
+    Asignaciones que se superponen con [desde, hasta] (fechas locales,
+    ambos días incluidos) con su duración dentro del rango.
+    """
+    desde = timezone.make_aware(datetime.combine(date.fromisoformat(parametros["desde"]), time.min))
+    hasta = timezone.make_aware(datetime.combine(date.fromisoformat(parametros["hasta"]) + timedelta(days=1), time.min))
+
+    qs = asignaciones_en_rango(desde, hasta)
+    total = qs.count()
+    filas = qs.values_list(
+        "vehiculo__patente", "vehiculo__marca", "vehiculo__modelo",
+        "usuario__first_name", "usuario__last_name", "usuario__username",
+        "inicio", "fin",
+    ).iterator(chunk_size=_chunk_size())
+
+    def generar():
+        for patente, marca, modelo, nombre, apellido, username, inicio, fin in filas:
+            dias = (min(fin or hasta, hasta) - max(inicio, desde)).total_seconds() / 86400
+            yield [
+                patente,
+                marca,
+                modelo,
+                f"{nombre or ''} {apellido or ''}".strip() or username,
+                username,
+                timezone.localtime(inicio).strftime("%Y-%m-%d %H:%M"),
+                timezone.localtime(fin).strftime("%Y-%m-%d %H:%M") if fin else "Vigente",
+                round(dias, 2),
+            ]
+
+    nombre = f"asignaciones_{parametros['desde']}_{parametros['hasta']}"
+    return _escribir(con_avance(generar(), total, progreso), parametros["formato"], nombre,
+                     ENCABEZADOS_ASIGNACIONES, "Asignaciones")
@@ -0,0 +1,36 @@
+from django import template
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+
+from ..facetas import ANIO, conteos, criterios
+
+register = template.Library()
+
+
+def jerarquia_fechas(cl):
+    """
+    date_hierarchy de Django, salvo en el primer nivel (sin año elegido) y
+    con solo filtros de facetas: los años salen de las facetas cacheadas en
+    vez de un MIN/MAX y un DISTINCT por año sobre toda la tabla.
+    """
+    campo = cl.date_hierarchy
+    if not any(parametro.startswith(f"{campo}__") for parametro in cl.params):
+        filtro = criterios(cl.params)
+        if filtro is not None:
+            anios = sorted(anio for anio, cantidad in conteos(ANIO, filtro).items() if cantidad)
+            # Con un solo año Django pasa directo a los meses: se le delega
+            if len(anios) != 1:
+                return {
+                    "show": True,
+                    "back": None,
+                    "choices": [
+                        {"link": cl.get_query_string({f"{campo}__year": str(anio)}, [f"{campo}__"]), "title": str(anio)}
+                        for anio in anios
+                    ],
+                }
+    return date_hierarchy(cl)
+
+
+@register.tag(name="jerarquia_fechas")
+def jerarquia_fechas_tag(parser, token):
+    return InclusionAdminNode(parser, token, func=jerarquia_fechas, template_name="date_hierarchy.html", takes_context=False)
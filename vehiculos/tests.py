@@ -1,3 +1,255 @@
-from django.test import TestCase
+import base64
+import json
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.urls import reverse
+
+from core.instrumentacion import PresupuestoExcedido
+from mantenimiento.models import PlanMantenimiento, Vencimiento
+from messaging.services import crear_hilo
+
+from . import acciones
+from .importacion import importar_vehiculos
+from .models import AsignacionVehiculo, Vehiculo, VehiculoEliminado
+
+
+def _cursor(valores) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valores).encode()).decode().rstrip("=")
+
+
+class ListadoCursorTests(TestCase):
+    """Un cursor alterado responde 400, nunca 500."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.conductor = User.objects.create_user("conductor", password="x")
+        for i in range(3):
+            Vehiculo.objects.create(patente=f"AB{i:04d}", marca="Toyota", modelo="Hilux", usuario=cls.conductor)
+
+    def _estado(self, usuario, cursor) -> int:
+        self.client.force_login(usuario)
+        return self.client.get(reverse("vehiculos:detalle_vehiculos"), {"cursor": cursor}).status_code
+
+    def test_cursor_valido(self):
+        self.client.force_login(self.admin)
+        respuesta = self.client.get(reverse("vehiculos:detalle_vehiculos"), {"limite": 2, "formato": "json"})
+        siguiente = respuesta.json()["siguiente"]
+
+        self.assertIsNotNone(siguiente)
+        self.assertEqual(self._estado(self.admin, siguiente), 200)
+
+    def test_valores_alterados_staff(self):
+        # Orden staff: (fecha_creacion, id)
+        for valores in (
+            ["2025-01-01T10:00:00+00:00", "abc"],
+            ["2025-01-01T10:00:00+00:00", [1]],
+            ["2025-01-01T10:00:00+00:00", {"a": 1}],
+            ["2025-02-30T10:00:00+00:00", 1],
+            [5, 1],
+            [None, 1],
+        ):
+            with self.subTest(valores=valores):
+                self.assertEqual(self._estado(self.admin, _cursor(valores)), 400)
+
+    def test_valores_alterados_conductor(self):
+        # Orden del conductor: (patente, id)
+        for valores in ([None, 1], [["AB"], 1], ["AB0001", "x"], ["AB0001", None]):
+            with self.subTest(valores=valores):
+                self.assertEqual(self._estado(self.conductor, _cursor(valores)), 400)
+
+    def test_cursor_mal_formado(self):
+        for cursor in ("%%%", _cursor({"a": 1}), _cursor([1])):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self._estado(self.admin, cursor), 400)
+
+
+class AsignacionesAFechaTests(TestCase):
+    """Responsables vigentes en una fecha: las fechas inválidas responden 400."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.conductor = User.objects.create_user("conductor", password="x")
+        cls.vehiculo = Vehiculo.objects.create(patente="AB0001", marca="Toyota", modelo="Hilux", usuario=cls.conductor)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def _get(self, **params):
+        return self.client.get(reverse("vehiculos:asignaciones"), params)
+
+    def test_fecha_inexistente_o_mal_formada(self):
+        for fecha in ("2025-02-30T10:00", "2025-13-01T10:00", "ayer"):
+            with self.subTest(fecha=fecha):
+                self.assertEqual(self._get(fecha=fecha).status_code, 400)
+
+    def test_fecha_sin_zona_horaria(self):
+        respuesta = self._get(fecha="2999-01-01T10:00")
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(
+            respuesta.json()["asignaciones"],
+            [{"vehiculo": self.vehiculo.pk, "patente": "AB0001", "usuario": self.conductor.pk, "username": "conductor"}],
+        )
+
+    def test_sin_fecha(self):
+        self.assertEqual(self._get().status_code, 200)
+
+
+class BusquedaAlcanceTests(TestCase):
+    """El alcance del usuario se aplica antes del límite de resultados."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.conductor = User.objects.create_user("conductor", password="x")
+        otro = User.objects.create_user("otro", password="x")
+        # Vehículos ajenos que rankean mejor que el propio
+        for i in range(120):
+            Vehiculo.objects.create(patente=f"HLX{i:03d}", marca="Hilux", modelo="Hilux", usuario=otro)
+        cls.propio = Vehiculo.objects.create(patente="ZZ1234", marca="Toyota", modelo="Hilux", usuario=cls.conductor)
+
+    def test_conductor_encuentra_sus_vehiculos(self):
+        self.client.force_login(self.conductor)
+        for consulta in ("hilux", "hi"):
+            with self.subTest(consulta=consulta):
+                respuesta = self.client.get(reverse("vehiculos:buscar"), {"q": consulta})
+                self.assertEqual([v["patente"] for v in respuesta.json()["resultados"]], ["ZZ1234"])
+
+
+class ImportacionAnioTests(TestCase):
+    """Un año inválido rechaza solo su fila, nunca la importación completa."""
+
+    def test_anios_invalidos(self):
+        filas = [
+            (2, {"patente": "AB0001", "marca": "Kia", "modelo": "Rio", "anio": "inf"}),
+            (3, {"patente": "AB0002", "marca": "Kia", "modelo": "Rio", "anio": "1e400"}),
+            (4, {"patente": "AB0003", "marca": "Kia", "modelo": "Rio", "anio": "0"}),
+            (5, {"patente": "AB0004", "marca": "Kia", "modelo": "Rio", "anio": "1899"}),
+            (6, {"patente": "AB0005", "marca": "Kia", "modelo": "Rio", "anio": "2020"}),
+            (7, {"patente": "AB0006", "marca": "Kia", "modelo": "Rio", "anio": ""}),
+        ]
+
+        reporte = importar_vehiculos(iter(filas))
+
+        self.assertEqual(sorted(e.fila for e in reporte.errores), [2, 3, 4, 5])
+        self.assertEqual(
+            dict(Vehiculo.objects.values_list("patente", "anio")),
+            {"AB0005": 2020, "AB0006": None},
+        )
+
+
+class EliminacionMasivaTests(TestCase):
+    """El borrado en lote deja una lápida por vehículo y no deja filas huérfanas."""
+
+    def setUp(self):
+        self.conductor = User.objects.create_user("conductor", password="x")
+        for i in range(3):
+            Vehiculo.objects.create(patente=f"AB{i:04d}", marca="Kia", modelo="Rio", usuario=self.conductor)
+
+    def _verificar(self, cantidad):
+        self.assertEqual(cantidad, 3)
+        self.assertFalse(Vehiculo.objects.exists())
+        self.assertFalse(AsignacionVehiculo.objects.exists())
+        self.assertEqual(VehiculoEliminado.objects.count(), 3)
+
+    def test_borrado_en_conjunto(self):
+        self._verificar(acciones.eliminar(Vehiculo.objects.all()))
+
+    def test_relacion_no_soportada_usa_el_collector(self):
+        with mock.patch.object(acciones, "_admite_borrado_en_conjunto", return_value=False):
+            self._verificar(acciones.eliminar(Vehiculo.objects.all()))
+
+
+class AdminHistorialTests(TestCase):
+    """El historial no se borra por sí solo, pero no impide borrar su vehículo."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", password="x")
+        conductor = User.objects.create_user("conductor", password="x")
+        self.vehiculo = Vehiculo.objects.create(patente="AB0001", marca="Kia", modelo="Rio", usuario=conductor)
+        self.client.force_login(self.admin)
+
+    def test_borrar_vehiculo_con_historial(self):
+        respuesta = self.client.post(reverse("admin:vehiculos_vehiculo_changelist"), {
+            "action": "delete_selected",
+            "_selected_action": [self.vehiculo.pk],
+            "post": "yes",
+        })
+
+        self.assertEqual(respuesta.status_code, 302)
+        self.assertFalse(Vehiculo.objects.exists())
+        self.assertFalse(AsignacionVehiculo.objects.exists())
+
+    def test_historial_sin_borrado_directo(self):
+        asignacion = AsignacionVehiculo.objects.get()
+        respuesta = self.client.get(reverse("admin:vehiculos_asignacionvehiculo_delete", args=[asignacion.pk]))
+
+        self.assertEqual(respuesta.status_code, 403)
+
+
+@override_settings(PRESUPUESTOS_ESTRICTO=True)
+class PresupuestosTests(TestCase):
+    """
+    Presupuestos de consultas (PRESUPUESTOS_VISTAS) en modo estricto: una
+    regresión (N+1, bloque sin caché) hace fallar la request con
+    PresupuestoExcedido. La caché se vacía antes de cada test: se mide la
+    carga en frío, la más cara.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="x", is_staff=True)
+        cls.conductores = [User.objects.create_user(f"conductor{i}", password="x") for i in range(5)]
+        plan = PlanMantenimiento.objects.create(nombre="Cambio de aceite", cada_km=10000)
+        for i in range(30):
+            vehiculo = Vehiculo.objects.create(
+                patente=f"AB{i:04d}", marca="Toyota", modelo="Hilux", usuario=cls.conductores[i % 5],
+            )
+            Vencimiento.objects.create(
+                vehiculo=vehiculo, plan=plan, fecha=timezone.localdate(), motivo=Vencimiento.KM,
+                km_vence=10000, km_estimado=9990, calculado=timezone.now(),
+            )
+        crear_hilo(cls.admin, [cls.conductores[0]], "Mantención", "Pasar por el taller")
+
+    def setUp(self):
+        cache.clear()
+
+    def _get(self, usuario, nombre, **params):
+        self.client.force_login(usuario)
+        respuesta = self.client.get(reverse(nombre), params)
+        self.assertEqual(respuesta.status_code, 200)
+        return respuesta
+
+    def test_modo_estricto_falla_al_exceder(self):
+        with override_settings(PRESUPUESTOS_VISTAS={"vehiculos:dashboard": {"consultas": 1}}):
+            with self.assertRaises(PresupuestoExcedido):
+                self._get(self.admin, "vehiculos:dashboard")
+
+    def test_dashboard(self):
+        for usuario in (self.admin, self.conductores[0]):
+            with self.subTest(usuario=usuario.username):
+                cache.clear()
+                respuesta = self._get(usuario, "vehiculos:dashboard")
+                self.assertTrue(respuesta.context["vencimientos"])
+
+    def test_dashboard_con_cache_no_consulta_la_flota(self):
+        self._get(self.admin, "vehiculos:dashboard")
+        # Sesión, usuario y contador de no leídos
+        with self.assertNumQueries(3):
+            self.client.get(reverse("vehiculos:dashboard"))
+
+    def test_listado(self):
+        for usuario in (self.admin, self.conductores[0]):
+            with self.subTest(usuario=usuario.username):
+                self._get(usuario, "vehiculos:detalle_vehiculos")
+                self._get(usuario, "vehiculos:detalle_vehiculos", formato="json")
+
+    def test_busqueda(self):
+        for usuario in (self.admin, self.conductores[0]):
+            with self.subTest(usuario=usuario.username):
+                self._get(usuario, "vehiculos:buscar", q="hilux")
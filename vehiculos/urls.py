@@ -1,14 +1,18 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import views, views_async
 
 app_name = "vehiculos"
 
+# Vistas de lectura: versión async def bajo ASGI (ver VISTAS_ASYNC)
+lectura = views_async if settings.VISTAS_ASYNC else views
+
 urlpatterns = [
     # --- Dashboard Principal ---
     # Es la vista central que ven todos al entrar a /vehiculos/
     path(
         "", 
-        views.dashboard, 
+        lectura.dashboard,
         name="dashboard"
     ),
     
@@ -16,10 +20,38 @@ urlpatterns = [
     # Nombre actualizado a 'detalle_vehiculos' para coincidir con el redirect de las vistas
     path(
         "listado/", 
-        views.detalle_vehiculos, 
+        lectura.detalle_vehiculos,
         name="detalle_vehiculos"
     ),
 
+    # Búsqueda rankeada (JSON) por patente / marca / modelo / responsable
+    path(
+        "buscar/",
+        views.buscar_vehiculos,
+        name="buscar"
+    ),
+
+    # Historial: responsables vigentes en una fecha (JSON, Solo Staff)
+    path(
+        "asignaciones/",
+        views.asignaciones_a_fecha,
+        name="asignaciones"
+    ),
+
+    # Sincronización incremental para la app de terreno (JSON, gzip + ETag)
+    path(
+        "sincronizar/",
+        views.sincronizar_vehiculos,
+        name="sincronizar"
+    ),
+
+    # Tendencias de flota desde rollups diarios (JSON, Solo Staff)
+    path(
+        "analitica/",
+        views.analitica_flota,
+        name="analitica"
+    ),
+
     # --- Operaciones de Registro (Solo Staff) ---
     path(
         "nuevo/", 
@@ -39,7 +71,16 @@ urlpatterns = [
         views.eliminar_vehiculo, 
         name="eliminar"
     ),
+    # Acciones sobre varios vehículos (Solo Staff)
+    path(
+        "acciones/",
+        views.acciones_masivas,
+        name="acciones_masivas"
+    ),
     # vehiculos/urls.py
     path("exportar/", views.exportar_vehiculos_excel, name="exportar_excel"),
+    # Informe de asignaciones por rango de fechas (tarea en segundo plano)
+    path("reportes/asignaciones/", views.reporte_asignaciones, name="reporte_asignaciones"),
+    path("importar/", views.importar_vehiculos, name="importar"),
 
 ]
\ No newline at end of file
@@ -1,15 +1,35 @@
-from django.http import HttpRequest, HttpResponse
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.db.models import Count, Q
 from django.core.exceptions import PermissionDenied
+from django.db.models import ProtectedError, RestrictedError
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import condition
 
-# NUEVO (import mínimo y seguro)
-from openpyxl import Workbook
+from core.cache import cachear_respuesta
+from core.paginacion import CursorInvalido, paginar_keyset
+from core.routers import usar_replica
+from mantenimiento.services import horizonte_dias, proximos_dashboard
+from tareas.servicios import encolar
 
 from .models import Vehiculo
-from .forms import VehiculoForm
+from .forms import AccionMasivaForm, ImportacionVehiculosForm, VehiculoForm
+from . import acciones
+from .importacion import importar_archivo
+from .busqueda import buscar, limite_busqueda
+from .historial import asignaciones_vigentes
+from .analitica import distribucion, serie_temporal
+from .sincronizacion import CAMPOS_SINCRONIZACION, TokenInvalido, calcular_delta, corte_actual, etag_sincronizacion
+from .services import filtrar_vehiculos, obtener_metricas, obtener_ultimos
+from .exportacion import FORMATOS_TEXTO, respuesta_texto, respuesta_xlsx, vehiculos_a_exportar
 
 
 # --- Helpers de Seguridad ---
@@ -22,6 +42,7 @@ def admin_required(user):
 # --- Vistas del Sistema ---
 
 @login_required
+@usar_replica
 def dashboard(request: HttpRequest) -> HttpResponse:
     """
     Dashboard principal.
@@ -29,29 +50,15 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     - Usuario: Solo ve el estado de sus vehículos asignados.
     """
     user = request.user
-    
-    if user.is_staff:
-        vehiculos_qs = Vehiculo.objects.select_related("usuario").all()
-    else:
-        vehiculos_qs = Vehiculo.objects.filter(usuario=user)
-
-    stats_usuarios = []
-    if user.is_staff:
-        stats_usuarios = list(
-            Vehiculo.objects.values("usuario__username")
-            .annotate(total=Count("id"))
-            .order_by("-total")[:5]
-        )
 
+    # Métricas (una sola consulta agregada) y últimos vehículos, cacheados
+    # por alcance de usuario
     context = {
-        "metricas": {
-            "total": vehiculos_qs.count(),
-            "activos": vehiculos_qs.filter(activo=True).count(),
-            "inactivos": vehiculos_qs.filter(activo=False).count(),
-            "stats_usuarios": stats_usuarios,
-        },
+        "metricas": obtener_metricas(user),
         "es_admin": user.is_staff,
-        "ultimos_vehiculos": vehiculos_qs.order_by("-fecha_creacion")[:5]
+        "ultimos_vehiculos": obtener_ultimos(user),
+        "vencimientos": proximos_dashboard(user),
+        "horizonte_mantenimiento": horizonte_dias(),
     }
 
     return render(request, "vehiculos/dashboard.html", context)
@@ -73,15 +80,205 @@ def registrar_vehiculo(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
+@usar_replica
+@cachear_respuesta("vehiculos", "usuarios", condicion=lambda request: request.user.is_staff)
 def detalle_vehiculos(request: HttpRequest) -> HttpResponse:
+    """
+    Listado de vehículos paginado por cursor (keyset).
+
+    - Admin: toda la flota ordenada por (fecha_creacion, id) descendente.
+    - Usuario: sus vehículos ordenados por (patente, id).
+    - Acepta los mismos filtros GET que la exportación (?activo=, ?usuario=).
+    - ?formato=json devuelve la misma página en JSON (scroll infinito).
+    """
     if request.user.is_staff:
-        vehiculos = Vehiculo.objects.select_related("usuario").all().order_by("-fecha_creacion")
+        vehiculos = Vehiculo.objects.select_related("usuario").all()
+        orden = ("-fecha_creacion", "-id")
     else:
-        vehiculos = Vehiculo.objects.filter(usuario=request.user).order_by("patente")
+        vehiculos = Vehiculo.objects.select_related("usuario").filter(usuario=request.user)
+        orden = ("patente", "id")
+
+    vehiculos = filtrar_vehiculos(vehiculos, request.GET)
+
+    try:
+        pagina = paginar_keyset(
+            vehiculos,
+            orden,
+            cursor=request.GET.get("cursor"),
+            tamano=_tamano_pagina(request),
+        )
+    except CursorInvalido as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    if request.GET.get("formato") == "json":
+        return JsonResponse({
+            "resultados": [_vehiculo_a_dict(v) for v in pagina.items],
+            "siguiente": pagina.siguiente,
+        })
+
+    filtros = {k: request.GET[k] for k in ("activo", "usuario") if request.GET.get(k)}
 
     return render(request, "vehiculos/detalle.html", {
-        "vehiculos": vehiculos,
+        "vehiculos": pagina.items,
+        "pagina": pagina,
+        "filtros": filtros,
+        "filtros_query": urlencode(filtros),
         "es_admin": request.user.is_staff,
+        "form_acciones": AccionMasivaForm() if request.user.is_staff else None,
+    })
+
+
+def _tamano_pagina(request: HttpRequest, por_defecto: int | None = None, maximo: int | None = None) -> int:
+    """Tamaño de página: ?limite= acotado a `maximo` (LISTADO_MAX_PAGINA por defecto)."""
+    por_defecto = por_defecto or getattr(settings, "LISTADO_PAGINA", 50)
+    maximo = maximo or getattr(settings, "LISTADO_MAX_PAGINA", 200)
+    try:
+        limite = int(request.GET.get("limite", por_defecto))
+    except ValueError:
+        limite = por_defecto
+    return max(1, min(limite, maximo))
+
+
+def _vehiculo_a_dict(v: Vehiculo) -> dict:
+    return {
+        "id": v.id,
+        "patente": v.patente,
+        "marca": v.marca,
+        "modelo": v.modelo,
+        "anio": v.anio,
+        "color": v.color,
+        "activo": v.activo,
+        "usuario": {
+            "username": v.usuario.username,
+            "nombre": v.usuario.get_full_name(),
+        } if v.usuario else None,
+        "fecha_creacion": v.fecha_creacion.isoformat(),
+    }
+
+
+@login_required
+def buscar_vehiculos(request: HttpRequest) -> JsonResponse:
+    """
+    Búsqueda rankeada por patente/marca/modelo/responsable (?q=BB12).
+    Respeta el mismo alcance que el listado: staff ve toda la flota.
+    """
+    if request.user.is_staff:
+        alcance = Vehiculo.objects.all()
+    else:
+        alcance = Vehiculo.objects.filter(usuario=request.user)
+
+    resultados = buscar(
+        request.GET.get("q", ""),
+        limite=_tamano_pagina(request, por_defecto=limite_busqueda()),
+        qs=alcance,
+    )
+    return JsonResponse({"resultados": [_vehiculo_a_dict(v) for v in resultados]})
+
+
+@login_required
+@user_passes_test(admin_required, login_url='vehiculos:dashboard')
+def asignaciones_a_fecha(request: HttpRequest) -> JsonResponse:
+    """
+    Responsables vigentes en una fecha (?fecha=2025-03-01T10:00&ids=1,2,3).
+    Sin `ids` resuelve toda la flota; siempre en una sola consulta.
+    """
+    fecha = request.GET.get("fecha")
+    try:
+        # ValueError: bien formada pero inexistente ("2025-02-30T10:00")
+        momento = parse_datetime(fecha) if fecha else timezone.now()
+    except ValueError:
+        momento = None
+    if momento is None:
+        return HttpResponseBadRequest("Parámetro 'fecha' inválido (use ISO-8601).")
+    if timezone.is_naive(momento):
+        momento = timezone.make_aware(momento)
+
+    ids = None
+    if request.GET.get("ids"):
+        try:
+            ids = [int(pk) for pk in request.GET["ids"].split(",")]
+        except ValueError:
+            return HttpResponseBadRequest("Parámetro 'ids' inválido.")
+
+    filas = asignaciones_vigentes(momento, ids).values_list(
+        "vehiculo_id", "vehiculo__patente", "usuario_id", "usuario__username"
+    )
+    return JsonResponse({
+        "fecha": momento.isoformat(),
+        "asignaciones": [
+            {"vehiculo": pk, "patente": patente, "usuario": usuario_id, "username": username}
+            for pk, patente, usuario_id, username in filas
+        ],
+    })
+
+
+def _etag_sincronizacion(request: HttpRequest) -> str | None:
+    # El corte se fija una sola vez: ETag y cuerpo deben describir lo mismo
+    request.corte_sincronizacion = corte_actual()
+    try:
+        return etag_sincronizacion(request.user, request.GET.get("desde"), request.corte_sincronizacion)
+    except TokenInvalido:
+        return None
+
+
+@login_required
+@gzip_page
+@condition(etag_func=_etag_sincronizacion)
+def sincronizar_vehiculos(request: HttpRequest) -> JsonResponse:
+    """
+    Delta de la flota visible para el usuario desde el token ?desde=
+    (sin token: copia completa). Filas compactas según "campos"; si
+    "hay_mas" es verdadero se debe repetir de inmediato con el nuevo token.
+    Responde 304 si el cliente ya tiene este estado (If-None-Match).
+    """
+    corte = getattr(request, "corte_sincronizacion", None) or corte_actual()
+    sync_pagina = getattr(settings, "SYNC_PAGINA", 500)
+    try:
+        delta = calcular_delta(
+            request.user,
+            request.GET.get("desde"),
+            corte,
+            _tamano_pagina(request, por_defecto=sync_pagina, maximo=sync_pagina),
+        )
+    except TokenInvalido as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    return JsonResponse({
+        "token": delta.token,
+        "completo": delta.completo,
+        "hay_mas": delta.hay_mas,
+        "campos": CAMPOS_SINCRONIZACION,
+        "cambios": delta.cambios,
+        "eliminados": delta.eliminados,
+    }, json_dumps_params={"separators": (",", ":")})
+
+
+@login_required
+@user_passes_test(admin_required, login_url='vehiculos:dashboard')
+def analitica_flota(request: HttpRequest) -> JsonResponse:
+    """
+    Datos para gráficos de tendencia (?desde=2025-01-01&hasta=2025-12-31&agrupacion=mes).
+    Lee los rollups diarios; solo el día en curso se agrega en vivo.
+    """
+    hoy = timezone.localdate()
+    try:
+        hasta = date.fromisoformat(request.GET["hasta"]) if request.GET.get("hasta") else hoy
+        desde = date.fromisoformat(request.GET["desde"]) if request.GET.get("desde") else hasta - timedelta(days=365)
+    except ValueError:
+        return HttpResponseBadRequest("Parámetros 'desde'/'hasta' inválidos (use AAAA-MM-DD).")
+    if desde > hasta:
+        return HttpResponseBadRequest("'desde' debe ser anterior a 'hasta'.")
+
+    agrupacion = request.GET.get("agrupacion", "dia")
+    if agrupacion not in ("dia", "mes"):
+        return HttpResponseBadRequest("Parámetro 'agrupacion' inválido (dia o mes).")
+
+    return JsonResponse({
+        "desde": desde.isoformat(),
+        "hasta": hasta.isoformat(),
+        "agrupacion": agrupacion,
+        "serie": serie_temporal(desde, hasta, agrupacion),
+        "distribucion": distribucion(min(hasta, hoy)),
     })
 
 
@@ -119,6 +316,98 @@ def eliminar_vehiculo(request: HttpRequest, pk: int) -> HttpResponse:
     return render(request, "vehiculos/eliminar.html", {"vehiculo": vehiculo})
 
 
+@login_required
+@user_passes_test(admin_required, login_url='vehiculos:dashboard')
+def acciones_masivas(request: HttpRequest) -> HttpResponse:
+    """
+    Activa, desactiva, reasigna o elimina varios vehículos a la vez: los
+    seleccionados en el listado o todos los que coinciden con el filtro.
+    Cada acción es un único UPDATE/DELETE (ver vehiculos/acciones.py).
+    """
+    filtros = {k: request.POST[k] for k in ("activo", "usuario") if request.POST.get(k)}
+    destino = redirect(f"{reverse('vehiculos:detalle_vehiculos')}?{urlencode(filtros)}" if filtros else "vehiculos:detalle_vehiculos")
+
+    if request.method != "POST":
+        return destino
+
+    form = AccionMasivaForm(request.POST)
+    if not form.is_valid():
+        for errores in form.errors.values():
+            for error in errores:
+                messages.error(request, error)
+        return destino
+
+    datos = form.cleaned_data
+    if datos["todos"]:
+        qs = filtrar_vehiculos(Vehiculo.objects.all(), filtros)
+    else:
+        qs = Vehiculo.objects.filter(pk__in=datos["ids"])
+
+    accion = datos["accion"]
+    if accion == "activar":
+        cantidad = acciones.cambiar_estado(qs, True)
+        messages.success(request, f"{cantidad} vehículos activados.")
+    elif accion == "desactivar":
+        cantidad = acciones.cambiar_estado(qs, False)
+        messages.success(request, f"{cantidad} vehículos desactivados.")
+    elif accion == "reasignar":
+        cantidad = acciones.reasignar(qs, datos["usuario"])
+        responsable = datos["usuario"].username if datos["usuario"] else "reserva"
+        messages.success(request, f"{cantidad} vehículos reasignados a {responsable}.")
+    else:
+        try:
+            cantidad = acciones.eliminar(qs)
+        except (ProtectedError, RestrictedError) as exc:
+            bloqueados = len(exc.protected_objects if isinstance(exc, ProtectedError) else exc.restricted_objects)
+            messages.error(request, f"No se eliminó ningún vehículo: {bloqueados} registros relacionados lo impiden.")
+            return destino
+        messages.warning(request, f"{cantidad} vehículos eliminados del sistema.")
+
+    return destino
+
+
+# -------------------------------------------------------------------
+# IMPORTACIÓN MASIVA (CSV / XLSX)
+# -------------------------------------------------------------------
+
+@login_required
+@user_passes_test(admin_required, login_url='vehiculos:dashboard')
+def importar_vehiculos(request: HttpRequest) -> HttpResponse:
+    """
+    Carga masiva de vehículos desde CSV/XLSX.
+    Las filas inválidas no detienen la carga: se listan en el reporte.
+    Para archivos muy grandes usar `manage.py importar_vehiculos`.
+    """
+    reporte = None
+
+    if request.method == "POST":
+        form = ImportacionVehiculosForm(request.POST, request.FILES)
+        if form.is_valid():
+            archivo = form.cleaned_data["archivo"]
+            try:
+                reporte = importar_archivo(
+                    archivo,
+                    archivo.name,
+                    actualizar=form.cleaned_data["actualizar"],
+                )
+            except ValueError as exc:
+                form.add_error("archivo", str(exc))
+            else:
+                messages.success(
+                    request,
+                    f"Importación finalizada: {reporte.creados} creados, "
+                    f"{reporte.actualizados} actualizados, {reporte.con_errores} con errores.",
+                )
+    else:
+        form = ImportacionVehiculosForm()
+
+    return render(request, "vehiculos/importar.html", {
+        "form": form,
+        "reporte": reporte,
+        "errores": reporte.errores[:200] if reporte else [],
+    })
+
+
 # -------------------------------------------------------------------
 # NUEVA VISTA — EXPORTACIÓN A EXCEL (NO rompe nada existente)
 # -------------------------------------------------------------------
@@ -129,56 +418,64 @@ def exportar_vehiculos_excel(request: HttpRequest) -> HttpResponse:
     """
     Exporta SOLO los vehículos filtrados actualmente.
     Respeta filtros por GET y permisos.
+
+    Formatos (?formato=): xlsx (por defecto), csv o tsv.
+
+    Se encola como tarea en segundo plano (`procesar_tareas`) y redirige a
+    la página de seguimiento; filtros idénticos reutilizan la tarea en curso
+    o el archivo reciente. Con ?directo=1 se genera dentro de la request
+    (xlsx con openpyxl write-only; csv/tsv como StreamingHttpResponse).
     """
 
-    # Base queryset
-    qs = Vehiculo.objects.select_related("usuario")
+    formato = request.GET.get("formato", "xlsx").lower()
+    if formato not in FORMATOS_TEXTO:
+        formato = "xlsx"
 
     # 🔐 Seguridad por diseño (aunque solo staff accede)
-    if not request.user.is_staff:
-        qs = qs.filter(usuario=request.user)
-
+    usuario_id = None if request.user.is_staff else request.user.pk
     # 🔎 Filtros dinámicos desde la URL (?activo=1, ?usuario=juan, etc.)
-    activo = request.GET.get("activo")
-    usuario = request.GET.get("usuario")
-
-    if activo is not None:
-        qs = qs.filter(activo=activo.lower() in ["1", "true", "yes"])
-
-    if usuario:
-        qs = qs.filter(usuario__username__icontains=usuario)
-
-    # 📊 Excel
-    from openpyxl import Workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Vehículos"
-
-    # Encabezados
-    ws.append([
-        "Patente",
-        "Marca",
-        "Modelo",
-        "Responsable",
-        "Estado"
-    ])
-
-    # Datos filtrados
-    for v in qs:
-        ws.append([
-            v.patente,
-            v.marca,
-            v.modelo,
-            v.usuario.get_full_name() or v.usuario.username,
-            "Activo" if v.activo else "Inactivo"
-        ])
-
-    # Respuesta
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    filtros = {k: request.GET[k] for k in ("activo", "usuario") if request.GET.get(k)}
+
+    if request.GET.get("directo"):
+        qs = vehiculos_a_exportar(filtros, usuario_id)
+        nombre = "vehiculos_filtrados"
+        if formato in FORMATOS_TEXTO:
+            return respuesta_texto(qs, formato, nombre)
+        return respuesta_xlsx(qs, nombre)
+
+    tarea, _ = encolar(
+        "vehiculos.exportar",
+        {"formato": formato, "filtros": filtros, "usuario_id": usuario_id},
+        usuario=request.user,
+        grupos=("vehiculos", "usuarios"),
     )
-    response["Content-Disposition"] = 'attachment; filename="vehiculos_filtrados.xlsx"'
+    return redirect("tareas:detalle", pk=tarea.pk)
 
-    wb.save(response)
-    return response
 
+@login_required
+@user_passes_test(admin_required, login_url='vehiculos:dashboard')
+def reporte_asignaciones(request: HttpRequest) -> HttpResponse:
+    """
+    Encola el informe de asignaciones en un rango (?desde=2025-01-01&hasta=2025-03-31,
+    por defecto los últimos 30 días) y redirige a la página de seguimiento.
+    """
+    hoy = timezone.localdate()
+    try:
+        hasta = date.fromisoformat(request.GET["hasta"]) if request.GET.get("hasta") else hoy
+        desde = date.fromisoformat(request.GET["desde"]) if request.GET.get("desde") else hasta - timedelta(days=30)
+    except ValueError:
+        return HttpResponseBadRequest("Parámetros 'desde'/'hasta' inválidos (use AAAA-MM-DD).")
+    if desde > hasta:
+        return HttpResponseBadRequest("'desde' debe ser anterior a 'hasta'.")
+
+    formato = request.GET.get("formato", "xlsx").lower()
+    if formato not in FORMATOS_TEXTO:
+        formato = "xlsx"
+
+    tarea, _ = encolar(
+        "vehiculos.reporte_asignaciones",
+        {"desde": desde.isoformat(), "hasta": hasta.isoformat(), "formato": formato},
+        usuario=request.user,
+        grupos=("vehiculos", "usuarios"),
+    )
+    return redirect("tareas:detalle", pk=tarea.pk)
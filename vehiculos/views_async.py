@@ -0,0 +1,88 @@
+from urllib.parse import urlencode
+
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import render
+
+from core.asincrono import ausuario, login_requerido_async
+from core.cache import cachear_respuesta
+from core.paginacion import CursorInvalido, apaginar_keyset
+from core.routers import usar_replica
+from mantenimiento.services import aproximos_dashboard, horizonte_dias
+from messaging.services import aprecargar_no_leidos
+
+from .forms import AccionMasivaForm
+from .models import Vehiculo
+from .services import aobtener_metricas, aobtener_ultimos, filtrar_vehiculos
+from .views import _tamano_pagina, _vehiculo_a_dict
+
+
+# --- Vistas Asíncronas (ASGI) ---
+#
+# Mismas respuestas que dashboard y detalle_vehiculos de views.py, pero con
+# el ORM asíncrono: bajo ASGI la request no ocupa un hilo mientras espera a
+# la base de datos. Se activan con VISTAS_ASYNC (ver urls.py).
+#
+# Los templates se renderizan en el event loop, así que todo lo que usan
+# debe llegar ya materializado (listas con select_related, usuario resuelto,
+# badge de mensajes no leídos).
+
+
+@login_requerido_async
+@usar_replica
+async def dashboard(request: HttpRequest) -> HttpResponse:
+    user = await ausuario(request)
+
+    context = {
+        "metricas": await aobtener_metricas(user),
+        "es_admin": user.is_staff,
+        "ultimos_vehiculos": await aobtener_ultimos(user),
+        "vencimientos": await aproximos_dashboard(user),
+        "horizonte_mantenimiento": horizonte_dias(),
+    }
+    await aprecargar_no_leidos(request)
+
+    return render(request, "vehiculos/dashboard.html", context)
+
+
+@login_requerido_async
+@usar_replica
+@cachear_respuesta("vehiculos", "usuarios", condicion=lambda request: request.user.is_staff)
+async def detalle_vehiculos(request: HttpRequest) -> HttpResponse:
+    user = await ausuario(request)
+
+    if user.is_staff:
+        vehiculos = Vehiculo.objects.select_related("usuario").all()
+        orden = ("-fecha_creacion", "-id")
+    else:
+        vehiculos = Vehiculo.objects.select_related("usuario").filter(usuario=user)
+        orden = ("patente", "id")
+
+    vehiculos = filtrar_vehiculos(vehiculos, request.GET)
+
+    try:
+        pagina = await apaginar_keyset(
+            vehiculos,
+            orden,
+            cursor=request.GET.get("cursor"),
+            tamano=_tamano_pagina(request),
+        )
+    except CursorInvalido as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    if request.GET.get("formato") == "json":
+        return JsonResponse({
+            "resultados": [_vehiculo_a_dict(v) for v in pagina.items],
+            "siguiente": pagina.siguiente,
+        })
+
+    filtros = {k: request.GET[k] for k in ("activo", "usuario") if request.GET.get(k)}
+    await aprecargar_no_leidos(request)
+
+    return render(request, "vehiculos/detalle.html", {
+        "vehiculos": pagina.items,
+        "pagina": pagina,
+        "filtros": filtros,
+        "filtros_query": urlencode(filtros),
+        "es_admin": user.is_staff,
+        "form_acciones": AccionMasivaForm() if user.is_staff else None,
+    })